@@ -0,0 +1,329 @@
+"""
+Incremental Bank Statement Re-analysis
+======================================
+Re-scoring a customer after a new month of transactions arrives normally
+re-runs build_feature_vector() over the whole history: every row is
+cleaned, classified and re-aggregated again. refresh_feature_vector()
+keeps a BankAnalysisState between calls and only does that per-row work
+for rows it has not seen before:
+
+- Raw statement rows are identified by a content hash. Cleaned values and
+  the merchant classification of known rows are reused; only new rows go
+  through _clean_transactions() and the TransactionClassifier.
+- Account-level steps (outlier removal, balance filling, sorting, merging
+  accounts) run on the full history as before; they are vectorized and
+  cheap compared to the row-wise work.
+- Features are reduced from per-month tallies (see
+  bank_analysis.month_tallies). The tallies are kept in the state under a
+  fingerprint of the month's (and the next month's) rows, built from the
+  raw-row hashes, and recomputed only for months whose rows changed; only
+  the final combination over months runs on every refresh.
+
+The result is identical to build_feature_vector() on the same statements.
+Whenever reuse could change the result the account is rebuilt from
+scratch: different columns or dtypes, edited leading rows (the date
+format is inferred from the first dates), or dates in no known format
+(left to pandas' whole-column inference).
+
+Usage:
+    state = BankAnalysisState.load('customer_123.state')
+    features, state = refresh_feature_vector(
+        [{'account_id': 'HDFC_1', 'data': raw_statement_df}], state
+    )
+    state.save('customer_123.state')
+"""
+
+import pickle
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bank_analysis import (
+    MIN_TRANSACTIONS,
+    _clean_transactions,
+    _finalize_transactions,
+    _get_default_feature_vector,
+    _merge_accounts,
+    _parse_dates_robust,
+    _to_feature_frame,
+    compute_feature_vector,
+)
+from date_parsing import SAMPLE_SIZE
+from merchant_classifier import CLASSIFICATION_COLUMNS, TransactionClassifier
+
+# Bump when cleaning/classification logic changes so old states are discarded
+STATE_VERSION = 2
+
+# Leading raw rows re-cleaned with every delta (date format inference sample)
+HEAD_ROWS = SAMPLE_SIZE
+
+# Cleaned columns cached per raw row (those kept by _finalize_transactions)
+CLEANED_COLUMNS = ['txn_date', 'amount', 'type', 'balance', 'description']
+
+# Column carrying each row's identity (raw-row hash ^ account hash) through
+# finalizing and merging, for the month fingerprints
+ROW_KEY = 'row_key'
+
+
+class AccountState:
+    """Cleaned rows of one account, keyed by raw-row hash"""
+
+    def __init__(self):
+        self.signature = None     # (column names, dtypes) of the raw statement
+        self.head_hashes = None   # hashes of the first HEAD_ROWS raw rows
+        self.rows = None          # kept rows: cleaned columns (+ classification)
+        self.dropped = None       # hashes of rows cleaning drops
+
+
+class BankAnalysisState:
+    """Everything refresh_feature_vector() reuses between calls"""
+
+    def __init__(self):
+        self.version = STATE_VERSION
+        self.accounts: Dict[str, AccountState] = {}
+        self.month_cache: Dict = {}
+        self.last_refresh: Dict = {}
+
+    def save(self, path: str) -> None:
+        """Pickle the state to `path`"""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'BankAnalysisState':
+        """Load a saved state; a missing or outdated file gives a new state"""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return cls()
+
+        if not isinstance(state, cls) or getattr(state, 'version', None) != STATE_VERSION:
+            return cls()
+        return state
+
+
+def refresh_feature_vector(
+    statements: List[Dict],
+    state: Optional[BankAnalysisState] = None,
+    debug: bool = False
+) -> Tuple[pd.DataFrame, BankAnalysisState]:
+    """
+    Build the feature vector, reusing work from previous calls.
+
+    Args:
+        statements: List of dicts with 'account_id' and 'data' (raw
+            statement DataFrame) or 'path' (Excel file), each holding the
+            account's full history, as for build_feature_vector()
+        state: State returned by the previous call (None for a first run)
+        debug: Print per-account refresh statistics
+
+    Returns:
+        (single-row feature DataFrame, updated state)
+    """
+    if state is None or state.version != STATE_VERSION:
+        state = BankAnalysisState()
+
+    start = time.perf_counter()
+    feature_seconds = 0.0
+    stats = {}
+
+    try:
+        if not statements:
+            raise ValueError("No bank files provided")
+
+        dfs = []
+        failed_accounts = []
+
+        for entry in statements:
+            account_id = entry['account_id']
+            try:
+                df, stats[account_id] = _refresh_account(entry, state.accounts.setdefault(account_id, AccountState()))
+                if len(df) >= MIN_TRANSACTIONS:
+                    dfs.append(df)
+                else:
+                    failed_accounts.append((account_id, f"Too few transactions: {len(df)}"))
+            except Exception as e:
+                state.accounts.pop(account_id, None)
+                failed_accounts.append((account_id, str(e)))
+
+        # Accounts no longer supplied
+        for account_id in set(state.accounts) - {entry['account_id'] for entry in statements}:
+            del state.accounts[account_id]
+
+        # Cached classification is only usable if every account has it
+        if not all(all(col in df.columns for col in CLASSIFICATION_COLUMNS) for df in dfs):
+            dfs = [df.drop(columns=CLASSIFICATION_COLUMNS, errors='ignore') for df in dfs]
+
+        # Rows re-cleaned from scratch may differ under the same raw-row hash
+        if any(account_stats['mode'] == 'full' for account_stats in stats.values()):
+            state.month_cache.clear()
+
+        df = _merge_accounts(dfs, failed_accounts)
+        row_keys = df.pop(ROW_KEY).to_numpy()
+        feature_start = time.perf_counter()
+        features = compute_feature_vector(df, state.month_cache, row_keys)
+        feature_seconds = time.perf_counter() - feature_start
+
+    except Exception as e:
+        # Catastrophic failure - return default feature vector
+        warnings.warn(f"Feature extraction failed: {str(e)}")
+        features = _get_default_feature_vector()
+        state.month_cache.clear()
+
+    state.last_refresh = {
+        'accounts': stats,
+        'seconds': time.perf_counter() - start,
+        'feature_seconds': feature_seconds
+    }
+
+    if debug:
+        print(f"\n[DEBUG] Incremental refresh ({state.last_refresh['seconds']:.3f}s, "
+              f"features {feature_seconds:.3f}s):")
+        for account_id, account_stats in stats.items():
+            print(f"  {account_id}: {account_stats}")
+
+    return _to_feature_frame(features), state
+
+
+def _read_statement(entry: Dict) -> pd.DataFrame:
+    """Raw statement rows of a statements entry"""
+    if 'data' in entry:
+        return entry['data']
+
+    file_path = Path(entry['path'])
+    if not file_path.exists():
+        raise FileNotFoundError(f"Bank statement not found: {entry['path']}")
+    if file_path.stat().st_size == 0:
+        raise ValueError(f"Empty file: {entry['path']}")
+
+    try:
+        return pd.read_excel(file_path, dtype_backend='numpy_nullable')
+    except Exception as e:
+        raise ValueError(f"Failed to read {entry['path']}: {str(e)}")
+
+
+def _refresh_account(entry: Dict, account: AccountState) -> Tuple[pd.DataFrame, Dict]:
+    """Cleaned transactions of one account, as load_bank_frame() returns them"""
+    account_id = entry['account_id']
+
+    # Remove completely empty rows (as _process_chunk does)
+    raw = _read_statement(entry).dropna(how='all')
+    if len(raw) == 0:
+        raise ValueError(f"No valid transactions found for account {account_id}")
+
+    signature = (tuple(str(col) for col in raw.columns), tuple(str(dtype) for dtype in raw.dtypes))
+    hashes = pd.util.hash_pandas_object(raw, index=False, categorize=False).to_numpy()
+    head_hashes = hashes[:HEAD_ROWS]
+
+    mode = 'incremental'
+    if (account.rows is None or account.signature != signature
+            or not np.array_equal(account.head_hashes, head_hashes)):
+        mode = 'full'
+
+    # Position of each raw row's cleaned row in account.rows (-1: none)
+    row_positions = np.full(len(raw), -1)
+    dropped_positions = np.full(len(raw), -1)
+    new_positions = np.arange(len(raw))
+    if mode == 'incremental':
+        row_positions = account.rows.index.get_indexer(hashes)
+        dropped_positions = account.dropped.get_indexer(hashes)
+        new_positions = np.flatnonzero((row_positions < 0) & (dropped_positions < 0))
+
+    cleaned = _clean_rows(raw, hashes, new_positions)
+    if cleaned is None:
+        # Dates in no known format: their parse depends on the whole column
+        mode = 'full'
+        row_positions[:] = -1
+        dropped_positions[:] = -1
+        new_positions = np.arange(len(raw))
+        cleaned = _clean_rows(raw, hashes, new_positions)
+
+    new_rows, new_dropped = cleaned
+    rows, dropped = new_rows, new_dropped
+    if mode == 'incremental':
+        rows = pd.concat([account.rows, new_rows]) if len(new_rows) else account.rows
+        # Rows no longer in the statement are forgotten
+        present = np.zeros(len(account.dropped), dtype=bool)
+        present[dropped_positions[dropped_positions >= 0]] = True
+        dropped = account.dropped[present].append(new_dropped)
+
+    # One entry per hash (identical raw rows are cleaned once)
+    new_index = new_rows.index.get_indexer(hashes[new_positions])
+    row_positions[new_positions] = np.where(new_index >= 0, len(rows) - len(new_rows) + new_index, -1)
+
+    # Only keep rows of the current statement
+    used = np.zeros(len(rows), dtype=bool)
+    used[row_positions[row_positions >= 0]] = True
+    if not used.all():
+        remap = np.cumsum(used) - 1
+        rows = rows[used]
+        row_positions = np.where(row_positions >= 0, remap[row_positions], -1)
+
+    account.signature = signature
+    account.head_hashes = head_hashes
+    account.rows = rows
+    account.dropped = dropped.unique()
+
+    # Kept rows in statement order
+    df = rows.take(row_positions[row_positions >= 0])
+    if len(df) == 0:
+        raise ValueError(f"No valid transactions found for account {account_id}")
+
+    account_key = pd.util.hash_pandas_object(pd.Index([str(account_id)])).to_numpy()[0]
+    df[ROW_KEY] = df.index.to_numpy() ^ account_key
+    df = _finalize_transactions(df.reset_index(drop=True), account_id,
+                                extra_columns=(*CLASSIFICATION_COLUMNS, ROW_KEY))
+    return df, {'mode': mode, 'rows': len(raw), 'new_rows': len(new_positions)}
+
+
+def _clean_rows(
+    raw: pd.DataFrame,
+    hashes: np.ndarray,
+    positions: np.ndarray
+) -> Optional[Tuple[pd.DataFrame, pd.Index]]:
+    """
+    Clean and classify the raw rows at `positions`.
+
+    The first HEAD_ROWS rows are always cleaned along with them so that the
+    date format is inferred from the same sample as for the full statement;
+    None is returned if the dates are in no known format.
+
+    Returns:
+        (kept rows indexed by (unique) hash, hashes of rows dropped by cleaning)
+    """
+    n_head = min(HEAD_ROWS, len(raw))
+    take = np.union1d(np.arange(n_head), positions)
+
+    subset = raw.iloc[take].copy()
+    subset.index = pd.RangeIndex(len(subset))
+
+    date_report = {}
+
+    def parse_dates(date_series: pd.Series, report: Dict) -> pd.Series:
+        parsed = _parse_dates_robust(date_series, report)
+        date_report.update(report)
+        return parsed
+
+    cleaned = _clean_transactions(subset, date_parser=parse_dates)
+    if date_report['fallback'] and len(take) < len(raw):
+        return None
+
+    # Head rows already cached were only cleaned for their date context
+    new = np.isin(take, positions)
+    cleaned = cleaned[new[cleaned.index]]
+
+    rows = cleaned[[col for col in CLEANED_COLUMNS if col in cleaned.columns]].copy()
+    if 'description' in rows.columns and len(rows):
+        rows = TransactionClassifier().process_dataframe(rows)
+    rows.index = pd.Index(hashes[take[rows.index]])
+    rows = rows[~rows.index.duplicated()]
+
+    dropped_mask = new & ~np.isin(np.arange(len(take)), cleaned.index)
+    dropped = pd.Index(hashes[take[dropped_mask]])
+
+    return rows, dropped
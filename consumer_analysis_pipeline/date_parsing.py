@@ -0,0 +1,238 @@
+"""
+Date Parsing Engine for Statement Ingestion
+===========================================
+Statement date columns repeat the same few hundred strings thousands of
+times, and a file almost always uses one format. DateParser:
+
+- parses each distinct string once and maps the results back to the rows
+- infers the file's format once from its first SAMPLE_SIZE values and
+  parses with that exact format (vectorized strptime, no per-element
+  dateutil guessing)
+- parses strings that do not match it with the other known formats, so
+  statements mixing two layouts are handled value by value
+- keeps a bounded LRU cache of parsed strings shared across calls
+- reports how many values were ambiguous (day and month could be swapped)
+
+Day-first formats come before month-first ones, so for Indian statements a
+sample that fits both (all days <= 12) is read day-first.
+
+This file is kept byte-identical in consumer_analysis_pipeline/ and
+stori_backend/apps/customer/bank_statement_analysis/; a backend test
+fails when the two copies differ, so change both together.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Candidate formats, in order of preference when several fit the sample
+DATE_FORMATS = [
+    '%Y-%m-%d',           # 2023-12-31
+    '%Y-%m-%d %H:%M:%S',  # 2023-12-31 18:30:00
+    '%Y-%m-%dT%H:%M:%S',  # 2023-12-31T18:30:00
+    '%d-%m-%Y',           # 31-12-2023
+    '%d/%m/%Y',           # 31/12/2023
+    '%d-%m-%y',           # 31-12-23
+    '%d/%m/%y',           # 31/12/23
+    '%d.%m.%Y',           # 31.12.2023
+    '%d %b %Y',           # 31 Dec 2023
+    '%d-%b-%Y',           # 31-Dec-2023
+    '%d-%b-%y',           # 31-Dec-23
+    '%d %B %Y',           # 31 December 2023
+    '%d-%m-%Y %H:%M:%S',  # 31-12-2023 18:30:00
+    '%d/%m/%Y %H:%M:%S',  # 31/12/2023 18:30:00
+    '%d-%m-%Y %H:%M',     # 31-12-2023 18:30
+    '%d/%m/%Y %H:%M',     # 31/12/2023 18:30
+    '%m/%d/%Y',           # 12/31/2023
+    '%m-%d-%Y',           # 12-31-2023
+]
+
+# Leading values of a column used to infer its format
+SAMPLE_SIZE = 500
+
+# Parsed strings kept across calls (per format)
+CACHE_SIZE = 100000
+
+
+def _has_day_month_order(fmt: str) -> bool:
+    """True for day-first/month-first numeric formats (not year-first)"""
+    return '%d' in fmt and '%m' in fmt and not fmt.startswith('%Y')
+
+
+class DateParser:
+    """Unique-value, exact-format date parser with a bounded cache"""
+
+    def __init__(self, formats: List[str] = None, sample_size: int = SAMPLE_SIZE,
+                 cache_size: int = CACHE_SIZE):
+        self.formats = list(formats) if formats else list(DATE_FORMATS)
+        self.sample_size = sample_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (format, string) -> (datetime64, ambiguous)
+        self._lock = threading.Lock()
+
+    def infer_format(self, date_series: pd.Series) -> Optional[str]:
+        """
+        Format matching the most of the first sample_size values
+        (earliest candidate on ties, None if no candidate matches any)
+        """
+        sample = date_series.iloc[:self.sample_size]
+        sample = pd.Series(pd.unique(
+            sample[sample.map(lambda v: isinstance(v, str))].str.strip()
+        ), dtype=object)
+        if len(sample) == 0:
+            return None
+
+        best_format, best_count = None, 0
+        for fmt in self.formats:
+            count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+            if count > best_count:
+                best_format, best_count = fmt, count
+                if count == len(sample):
+                    break
+        return best_format
+
+    def parse(self, date_series: pd.Series, report: Optional[Dict] = None) -> pd.Series:
+        """
+        Parse a date column to datetime64[ns] (unparseable values -> NaT)
+
+        Args:
+            date_series: Raw date column (strings, datetimes or a mix)
+            report: Optional dict filled with parsing statistics: format,
+                values, unique, cache_hits, other_formats, unparsed, ambiguous
+                and fallback (strings in no known format were left to pandas'
+                inference, so their parse depends on the whole column)
+        """
+        if pd.api.types.is_datetime64_any_dtype(date_series):
+            parsed = pd.to_datetime(date_series, errors='coerce')
+            if report is not None:
+                report.update(format=None, values=int(parsed.notna().sum()), unique=0, cache_hits=0,
+                              other_formats=0, unparsed=int(parsed.isna().sum()), ambiguous=0,
+                              fallback=False)
+            return parsed
+
+        fmt = self.infer_format(date_series)
+
+        codes, uniques = pd.factorize(date_series)
+        uniques = np.asarray(uniques, dtype=object)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        values = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[ns]')
+        ambiguous = np.zeros(len(uniques), dtype=bool)
+        other_format = np.zeros(len(uniques), dtype=bool)
+
+        if pd.api.types.infer_dtype(uniques, skipna=True) == 'string':
+            is_str = np.ones(len(uniques), dtype=bool)
+        else:
+            is_str = np.fromiter((isinstance(v, str) for v in uniques), dtype=bool, count=len(uniques))
+        if not is_str.all():
+            # datetime/Timestamp objects (e.g. Excel cells) need no format
+            others = np.flatnonzero(~is_str)
+            values[others] = _to_datetime64(pd.to_datetime(pd.Series(uniques[others]), errors='coerce'))
+
+        str_positions = np.flatnonzero(is_str)
+        strings = pd.Series(uniques[str_positions], dtype=object).str.strip().to_numpy(dtype=object)
+
+        # Cache lookup (skipped for high-cardinality columns, e.g. timestamps,
+        # and for unknown layouts whose parse depends on the other values)
+        use_cache = fmt is not None and 0 < len(strings) <= self.cache_size
+        missing = np.arange(len(strings))
+        cache_hits = 0
+        if use_cache:
+            with self._lock:
+                found = [self._cache.get((fmt, s)) for s in strings]
+                hits = [i for i, entry in enumerate(found) if entry is not None]
+                for i in hits:
+                    self._cache.move_to_end((fmt, strings[i]))
+            for i in hits:
+                values[str_positions[i]], ambiguous[str_positions[i]] = found[i]
+            cache_hits = int(counts[str_positions[hits]].sum()) if hits else 0
+            missing = np.array([i for i, entry in enumerate(found) if entry is None], dtype=np.intp)
+
+        parsed, parsed_ambiguous, parsed_other = self._parse_strings(strings[missing], fmt)
+        values[str_positions[missing]] = parsed
+        ambiguous[str_positions[missing]] = parsed_ambiguous
+        other_format[str_positions[missing]] = parsed_other
+
+        if use_cache and len(missing):
+            with self._lock:
+                for s, value, is_ambiguous in zip(strings[missing], parsed, parsed_ambiguous):
+                    self._cache[(fmt, s)] = (value, is_ambiguous)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        if report is not None:
+            unparsed = np.isnat(values)
+            report.update(
+                format=fmt,
+                values=int(counts.sum()),
+                unique=len(uniques),
+                cache_hits=cache_hits,
+                other_formats=int(counts[other_format].sum()),
+                unparsed=int(counts[unparsed].sum() + (codes < 0).sum()),
+                ambiguous=int(counts[ambiguous].sum()),
+                fallback=fmt is None and len(strings) > 0,
+            )
+
+        return pd.Series(np.append(values, np.datetime64('NaT'))[codes], index=date_series.index,
+                         name=date_series.name)
+
+    def _parse_strings(self, strings: np.ndarray, fmt: Optional[str]):
+        """(datetime64 values, ambiguous flags, parsed-by-another-format flags)"""
+        values = np.full(len(strings), np.datetime64('NaT'), dtype='datetime64[ns]')
+        ambiguous = np.zeros(len(strings), dtype=bool)
+        other_format = np.zeros(len(strings), dtype=bool)
+
+        remaining = np.arange(len(strings))
+        formats = [fmt] + [f for f in self.formats if f != fmt] if fmt else self.formats
+        for f in formats:
+            if len(remaining) == 0:
+                break
+            attempt = _to_datetime64(pd.to_datetime(pd.Series(strings[remaining], dtype=object), format=f, errors='coerce'))
+            ok = ~np.isnat(attempt)
+            if not ok.any():
+                continue
+
+            matched = remaining[ok]
+            values[matched] = attempt[ok]
+            other_format[matched] = f != fmt
+
+            if _has_day_month_order(f):
+                # The swapped reading is valid and different iff day <= 12 != month
+                dates = pd.DatetimeIndex(attempt[ok])
+                ambiguous[matched] = (dates.day <= 12) & (dates.day != dates.month)
+
+            remaining = remaining[~ok]
+
+        if len(remaining) and fmt is None:
+            # Unknown layout: let pandas infer it (previous behaviour)
+            attempt = _to_datetime64(pd.to_datetime(pd.Series(strings[remaining], dtype=object), errors='coerce'))
+            values[remaining] = attempt
+            other_format[remaining] = ~np.isnat(attempt)
+
+        return values, ambiguous, other_format
+
+
+def _to_datetime64(parsed: pd.Series) -> np.ndarray:
+    """datetime64[ns] values of a to_datetime result (tz-aware -> local wall time)"""
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    if not pd.api.types.is_datetime64_dtype(parsed):
+        parsed = pd.to_datetime(parsed, errors='coerce', utc=True).dt.tz_convert(None)
+    return parsed.to_numpy(dtype='datetime64[ns]')
+
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_date_parser() -> DateParser:
+    """Process-wide DateParser (its cache is shared by all callers)"""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = DateParser()
+    return _parser
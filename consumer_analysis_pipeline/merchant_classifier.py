@@ -12,6 +12,9 @@ import pandas as pd
 from pathlib import Path
 from typing import Dict, Tuple
 
+# Columns added by TransactionClassifier.process_dataframe()
+CLASSIFICATION_COLUMNS = ['category', 'subcategory', 'is_income', 'is_expense']
+
 
 class MerchantDatabase:
     """
@@ -101,6 +104,7 @@ class TransactionClassifier:
     def __init__(self, merchant_db: MerchantDatabase = None):
         self.db = merchant_db if merchant_db else MerchantDatabase()
         self._compile_patterns()
+        self._memo = {}
     
     def _compile_patterns(self):
         """Pre-compile regex for performance"""
@@ -245,20 +249,43 @@ class TransactionClassifier:
         return ('EXPENSE', 'OTHER', False, True)
     
     def process_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add classification columns"""
+        """
+        Add classification columns
+        
+        Frames that already carry all CLASSIFICATION_COLUMNS (e.g. rows
+        classified once and cached by bank_incremental) are returned as-is.
+        """
+        if all(col in df.columns for col in CLASSIFICATION_COLUMNS):
+            return df
+        
         desc_col = 'description' if 'description' in df.columns else 'narration'
         
-        results = df.apply(
-            lambda row: self.classify(row[desc_col], row['amount'], row['type']),
-            axis=1
-        )
+        results = [
+            self.classify_cached(desc, amount, txn_type)
+            for desc, amount, txn_type in zip(df[desc_col], df['amount'], df['type'])
+        ]
         
-        df['category'] = results.apply(lambda x: x[0])
-        df['subcategory'] = results.apply(lambda x: x[1])
-        df['is_income'] = results.apply(lambda x: x[2])
-        df['is_expense'] = results.apply(lambda x: x[3])
+        df['category'] = [r[0] for r in results]
+        df['subcategory'] = [r[1] for r in results]
+        df['is_income'] = [r[2] for r in results]
+        df['is_expense'] = [r[3] for r in results]
         
         return df
+    
+    def classify_cached(self, description: str, amount: float, txn_type: str) -> Tuple[str, str, bool, bool]:
+        """
+        classify() memoized per instance
+        
+        The result only depends on the normalized description, the type
+        and whether the amount exceeds the salary one-time threshold, so
+        recurring narrations (UPI merchants, EMIs, salary) are matched once.
+        """
+        desc = str(description).upper() if description and not pd.isna(description) else ""
+        key = (desc, txn_type, amount > 75000)
+        result = self._memo.get(key)
+        if result is None:
+            result = self._memo[key] = self.classify(desc, amount, txn_type)
+        return result
 
 
 def calculate_accurate_cashflow(df: pd.DataFrame) -> Tuple[Dict[str, float], pd.DataFrame]:
@@ -15,6 +15,8 @@ from datetime import datetime, timedelta
 import re
 import warnings
 
+from identity_index import IdentityIndex, identity_fields
+
 
 class SyntheticIdentityDetector:
     """
@@ -56,7 +58,10 @@ class SyntheticIdentityDetector:
         applicant_data: Dict,
         bank_data: Optional[pd.DataFrame] = None,
         criminal_records: Optional[List[Dict]] = None,
-        cibil_data: Optional[Dict] = None
+        cibil_data: Optional[Dict] = None,
+        identity_index: Optional[IdentityIndex] = None,
+        criminal_index: Optional[IdentityIndex] = None,
+        applicant_id: Optional[str] = None
     ) -> Dict[str, Union[float, str, bool, Dict]]:
         """
         Comprehensive synthetic identity detection.
@@ -66,6 +71,11 @@ class SyntheticIdentityDetector:
             bank_data: Bank statement transactions
             criminal_records: Criminal record check results
             cibil_data: Credit bureau data
+            identity_index: Index of earlier applicants, checked for reused
+                phones/devices/PANs and near-duplicate identities
+            criminal_index: Index of criminal records, searched for the
+                applicant when criminal_records is not given
+            applicant_id: The applicant's own id in identity_index (skipped)
             
         Returns:
             Dict with synthetic identity risk score and detailed flags
@@ -81,6 +91,10 @@ class SyntheticIdentityDetector:
         risk_score = 0.0
         
         # Check 1: Criminal History Verification
+        if criminal_records is None and criminal_index is not None:
+            # Records sharing only an address with the applicant are someone else's
+            criminal_records = [match['record'] for match in criminal_index.query(applicant_data)
+                                if match['matched_on'] != ['address']]
         criminal_risk, criminal_details = self._check_criminal_history(
             applicant_data, criminal_records
         )
@@ -124,6 +138,14 @@ class SyntheticIdentityDetector:
             risk_score += bureau_risk
             results['checks']['bureau_anomalies'] = bureau_details
         
+        # Check 7: Identity Reuse Across Applicants
+        if identity_index is not None:
+            reuse_risk, reuse_details = self._check_identity_reuse(
+                applicant_data, identity_index, applicant_id
+            )
+            risk_score += reuse_risk
+            results['checks']['identity_reuse'] = reuse_details
+        
         # Cap risk score at 1.0
         results['synthetic_identity_risk_score'] = min(risk_score, 1.0)
         
@@ -588,6 +610,69 @@ class SyntheticIdentityDetector:
         
         return min(risk, 0.4), details
     
+    def _check_identity_reuse(
+        self,
+        applicant_data: Dict,
+        identity_index: IdentityIndex,
+        applicant_id: Optional[str] = None
+    ) -> Tuple[float, Dict]:
+        """
+        Check whether pieces of this identity belong to other applicants.
+
+        Red Flags:
+        - PAN/Aadhaar already used under a different name
+        - Phone or device shared with differently named applicants
+        - Same name and address as an applicant with a different PAN
+
+        Returns:
+            (risk_score, details_dict)
+        """
+        details = {
+            'matching_identities': 0,
+            'id_name_conflicts': 0,
+            'shared_phone': 0,
+            'shared_device': 0,
+            'near_duplicates': 0,
+            'matched_ids': [],
+            'flags': []
+        }
+
+        matches = identity_index.query(applicant_data, exclude=applicant_id)
+        details['matching_identities'] = len(matches)
+        details['matched_ids'] = [match['record_id'] for match in matches]
+        _, exact = identity_fields(applicant_data)
+
+        for match in matches:
+            same_name = 'name' in match['matched_on']
+            if not same_name and any(kind in match['matched_on'] for kind in ('pan', 'aadhaar')):
+                details['id_name_conflicts'] += 1
+            if not same_name and 'phone' in match['matched_on']:
+                details['shared_phone'] += 1
+            if not same_name and 'device' in match['matched_on']:
+                details['shared_device'] += 1
+            if same_name and 'address' in match['matched_on'] and exact.get('pan'):
+                other_pan = identity_fields(match['record'])[1].get('pan')
+                if other_pan and other_pan != exact['pan']:
+                    details['near_duplicates'] += 1
+
+        risk = 0.0
+        if details['id_name_conflicts']:
+            risk += 0.25
+            details['flags'].append(
+                f"PAN/Aadhaar used under {details['id_name_conflicts']} other name(s)")
+        if details['shared_phone']:
+            risk += 0.1
+            details['flags'].append(f"Phone shared with {details['shared_phone']} other applicant(s)")
+        if details['shared_device']:
+            risk += 0.1
+            details['flags'].append(f"Device shared with {details['shared_device']} other applicant(s)")
+        if details['near_duplicates']:
+            risk += 0.15
+            details['flags'].append(
+                f"Same name and address as {details['near_duplicates']} applicant(s) with a different PAN")
+
+        return min(risk, 0.4), details
+
     # Helper methods
     
     def _names_similar(self, name1: str, name2: str) -> bool:
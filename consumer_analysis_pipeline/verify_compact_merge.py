@@ -0,0 +1,167 @@
+"""
+Verifier/benchmark for the memory-bounded multi-account merge
+Loads the same accounts with load_multiple_accounts() and
+load_multiple_accounts(compact=True), each in a fresh subprocess, and
+compares their peak RSS. Checks that both modes merge the same
+transactions in date order and give identical features.
+
+Raw statements are written to a temporary directory (by another
+subprocess) and read one at a time, as they would be from disk, so peak
+RSS reflects loading and merging rather than the fixture. Both merges
+are stable (transactions with the same txn_date keep account order), so
+features are compared exactly.
+
+Measured locally (peak RSS, default -> compact; ~106 MiB of it is the
+interpreter and pandas, the same in both modes):
+
+    raw rows / accounts   overall          above imports
+    200k / 5              202 -> 132 MiB   1.5x   3.7x
+    500k / 8              253 -> 144 MiB   1.8x   3.9x
+    2M / 15               509 -> 197 MiB   2.6x   4.4x
+
+Usage:
+    python verify_compact_merge.py                       # 2M rows, 15 accounts
+    python verify_compact_merge.py --rows 200000 --accounts 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from bank_analysis import COMPACT_CATEGORICAL_COLUMNS, _peak_rss_mib, build_feature_vector, load_multiple_accounts
+from verify_incremental import synthetic_statement
+
+MONTHS = 24
+
+
+def write_fixture(directory, rows, accounts):
+    """One pickled raw statement per account; returns the file paths"""
+    paths = []
+    per_month = max(1, rows // accounts // MONTHS)
+    for i in range(accounts):
+        path = Path(directory) / f"ACCT_{i + 1}.pkl"
+        synthetic_statement(MONTHS, per_month, seed=i + 1).to_pickle(path)
+        paths.append(path)
+    return paths
+
+
+def statements(paths):
+    """Statement entries, each raw statement read only when it is reached"""
+    for path in paths:
+        yield {'account_id': path.stem, 'data': pd.read_pickle(path)}
+
+
+def run_child(*args):
+    """Run this script in a fresh interpreter (ru_maxrss is per process and
+    survives exec, so the parent must stay small); returns its last line"""
+    cmd = [sys.executable, __file__] + [str(a) for a in args]
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=Path(__file__).parent).stdout
+    return output.strip().splitlines()[-1]
+
+
+def run_mode(paths, compact, out_path):
+    """Merge in this process; report peak RSS and save the merged frame"""
+    baseline = _peak_rss_mib()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df = load_multiple_accounts(statements(paths), compact=compact)
+    seconds = time.perf_counter() - start
+    peak = _peak_rss_mib()
+    result = {
+        'rows': len(df),
+        'seconds': seconds,
+        'baseline_mib': baseline,
+        'peak_mib': peak,
+        'frame_mib': df.memory_usage(deep=True).sum() / 2 ** 20,
+    }
+    df.to_pickle(out_path)
+    print(json.dumps(result))
+
+
+def measure(paths, compact, out_path):
+    """run_mode() in a fresh interpreter"""
+    return json.loads(run_child('--child', '1' if compact else '0', '--out', out_path, *paths))
+
+
+def same_transactions(default, compact):
+    """Both merges hold the same rows in the same (date) order"""
+    strings = {col: object for col in COMPACT_CATEGORICAL_COLUMNS if col in compact.columns}
+    return default.equals(compact.astype(strings)) and compact['txn_date'].is_monotonic_increasing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--accounts', type=int, default=15)
+    parser.add_argument('--child', choices=['0', '1'], help=argparse.SUPPRESS)
+    parser.add_argument('--fixture', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    parser.add_argument('paths', nargs='*', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.fixture:
+        print(json.dumps([str(p) for p in write_fixture(args.fixture, args.rows, args.accounts)]))
+        return True
+    if args.child is not None:
+        run_mode([Path(p) for p in args.paths], args.child == '1', args.out)
+        return True
+
+    print("=" * 80)
+    print(f"MULTI-ACCOUNT MERGE: ~{args.rows} raw rows, {args.accounts} accounts, {MONTHS} months")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(p) for p in json.loads(run_child('--fixture', tmp, '--rows', args.rows,
+                                                        '--accounts', args.accounts))]
+        results = {}
+        for name, compact in [('default', False), ('compact', True)]:
+            results[name] = measure(paths, compact, Path(tmp) / f"{name}.pkl")
+            r = results[name]
+            print(f"\n{name}: {r['rows']} rows in {r['seconds']:.1f}s")
+            print(f"  merged frame:  {r['frame_mib']:8.1f} MiB")
+            print(f"  peak RSS:      {r['peak_mib']:8.1f} MiB  (interpreter + imports {r['baseline_mib']:.1f} MiB)")
+
+        default = pd.read_pickle(Path(tmp) / 'default.pkl')
+        compact = pd.read_pickle(Path(tmp) / 'compact.pkl')
+        rows_match = same_transactions(default, compact)
+        del default, compact
+
+        # Features on a smaller slice of the fixture (one process, both modes)
+        small = paths[:3]
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected = build_feature_vector(list(statements(small)))
+            features = build_feature_vector(list(statements(small)), compact=True)
+        features_match = expected.equals(features)
+
+    d, c = results['default'], results['compact']
+    growth = [(r['peak_mib'] - r['baseline_mib']) for r in (d, c)]
+    print("\n" + "-" * 80)
+    print(f"  peak RSS reduction:              {d['peak_mib'] / c['peak_mib']:.1f}x")
+    print(f"  peak RSS reduction above imports: {growth[0] / growth[1]:.1f}x")
+    print(f"  merged frame reduction:          {d['frame_mib'] / c['frame_mib']:.1f}x")
+    print(f"  same rows in the same order:     {'[OK]' if rows_match else '❌ MISMATCH'}")
+    print(f"  identical features ({len(small)} accounts): {'[OK]' if features_match else '❌ MISMATCH'}")
+    if not features_match:
+        x, y = expected.iloc[0], features.iloc[0]
+        print(pd.DataFrame({'default': x, 'compact': y})[x.ne(y)].to_string())
+
+    ok = rows_match and features_match
+    print("\n" + "=" * 80)
+    print("VERIFICATION COMPLETE" if ok else "VERIFICATION FAILED")
+    print("=" * 80)
+    return ok
+
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)
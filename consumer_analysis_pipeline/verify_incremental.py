@@ -0,0 +1,137 @@
+"""
+Verifier/benchmark for incremental bank statement re-analysis
+Checks that refresh_feature_vector() returns exactly what
+build_feature_vector() returns and times both when one month is appended.
+--scale appends one month to histories of the given lengths: the feature
+part of the refresh (per-month tallies of the new rows, combined over
+months) stays flat; the rest is vectorized per-row hashing and merging.
+
+Usage:
+    python verify_incremental.py                  # 24 months, 250 txns/month
+    python verify_incremental.py --months 60 --per-month 1000
+    python verify_incremental.py --per-month 1000 --scale 30 60 120 240
+"""
+
+import argparse
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from bank_analysis import build_feature_vector
+from bank_incremental import refresh_feature_vector
+
+NARRATIONS = [
+    'UPI-RAHUL KUMAR-9876543210@YBL-PAYMENT', 'NEFT SALARY ACME CORP', 'ATM WDL MUMBAI', 'POS AMAZON RETAIL',
+    'ACH D- HDFC LOAN EMI', 'BILLDESK ELECTRICITY MSEDCL', 'SWIGGY ORDER', 'UBER TRIP', 'IMPS P2A TRANSFER',
+    'RENT PAYMENT HOUSE', 'LIC PREMIUM', 'UPI/P2M/ZOMATO', 'INT.PD', 'REV-UPI REFUND'
+]
+CREDIT_NARRATIONS = {1, 8, 13}
+
+
+def synthetic_statement(months, per_month, seed=0, start='2023-01-01'):
+    """HDFC-style raw statement (Date/Narration/Withdrawal/Deposit/Closing Balance)"""
+    rng = np.random.default_rng(seed)
+    n = months * per_month
+    days = np.sort(rng.integers(0, months * 30, n))
+    dates = (pd.Timestamp(start) + pd.to_timedelta(days, unit='D')
+             + pd.to_timedelta(rng.integers(0, 86400, n), unit='s'))
+    picks = rng.integers(0, len(NARRATIONS), n)
+    is_credit = np.isin(picks, list(CREDIT_NARRATIONS))
+    amounts = np.round(rng.lognormal(7, 1.0, n), 2)
+    amounts[picks == 1] = 65000.0
+    amounts[picks == 4] = 12500.0
+    balances = 50000 + np.cumsum(np.where(is_credit, amounts, -amounts * 0.3))
+    formatted = [f"{a:,.2f}" for a in amounts]
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d %H:%M:%S'),
+        'Narration': [NARRATIONS[p] for p in picks],
+        'Withdrawal': np.where(is_credit, '', formatted),
+        'Deposit': np.where(is_credit, formatted, ''),
+        'Closing Balance': [f"{b:,.2f}" for b in balances],
+    })
+
+
+def timed(fn):
+    """(result, seconds) with the pipeline's progress prints suppressed"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = fn()
+    return result, time.perf_counter() - start
+
+
+def scaling(months_list, per_month):
+    """Time a one-month refresh for growing histories (True if all match)"""
+    print("=" * 80)
+    print(f"REFRESH SCALING: +{per_month} rows on histories of {', '.join(map(str, months_list))} months")
+    print("=" * 80)
+    print(f"{'history rows':>14} {'full build':>12} {'refresh':>10} {'features':>10}  identical")
+
+    all_match = True
+    for months in months_list:
+        statement = synthetic_statement(months, per_month, seed=1)
+        (_, state), _ = timed(lambda: refresh_feature_vector([{'account_id': 'HDFC_1', 'data': statement.iloc[:-per_month]}]))
+        statements = [{'account_id': 'HDFC_1', 'data': statement}]
+        (features, state), refresh_time = timed(lambda: refresh_feature_vector(statements, state))
+        expected, full_time = timed(lambda: build_feature_vector(statements))
+
+        match = features.equals(expected)
+        all_match &= match
+        print(f"{len(statement) - per_month:>14,} {full_time * 1000:>9.1f} ms {refresh_time * 1000:>7.1f} ms "
+              f"{state.last_refresh['feature_seconds'] * 1000:>7.1f} ms  {'[OK]' if match else '❌ MISMATCH'}")
+    return all_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--months', type=int, default=24)
+    parser.add_argument('--per-month', type=int, default=250)
+    parser.add_argument('--scale', type=int, nargs='+', metavar='MONTHS',
+                        help='time one-month refreshes for these history lengths instead')
+    args = parser.parse_args()
+
+    if args.scale:
+        return scaling(args.scale, args.per_month)
+
+    primary = synthetic_statement(args.months, args.per_month, seed=1)
+    secondary = synthetic_statement(args.months // 2, args.per_month // 2, seed=2)
+    month_rows = args.per_month
+
+    print("=" * 80)
+    print(f"INCREMENTAL RE-ANALYSIS: {len(primary)} + {len(secondary)} raw rows, "
+          f"{args.months} months, +{month_rows} rows per step")
+    print("=" * 80)
+
+    state = None
+    all_match = True
+    for step, end in enumerate([len(primary) - 2 * month_rows, len(primary) - month_rows, len(primary)]):
+        statements = [
+            {'account_id': 'HDFC_1', 'data': primary.iloc[:end]},
+            {'account_id': 'SBI_1', 'data': secondary},
+        ]
+        (features, state), refresh_time = timed(lambda: refresh_feature_vector(statements, state))
+        expected, full_time = timed(lambda: build_feature_vector(statements))
+
+        match = features.equals(expected)
+        all_match &= match
+        modes = ', '.join(f"{acct}={s['mode']}/{s['new_rows']} new" for acct, s in state.last_refresh['accounts'].items())
+        print(f"\nStep {step}: {end} rows in HDFC_1 ({modes})")
+        print(f"  build_feature_vector:   {full_time * 1000:8.1f} ms")
+        print(f"  refresh_feature_vector: {refresh_time * 1000:8.1f} ms  ({full_time / refresh_time:.1f}x)")
+        print(f"  identical features:     {'[OK]' if match else '❌ MISMATCH'}")
+        if not match:
+            diff = pd.concat([expected.T, features.T], axis=1, keys=['full', 'incremental'])
+            print(diff[diff['full'].ne(diff['incremental']).any(axis=1)].to_string())
+
+    print("\n" + "=" * 80)
+    print("VERIFICATION COMPLETE" if all_match else "VERIFICATION FAILED")
+    print("=" * 80)
+    return all_match
+
+
+if __name__ == '__main__':
+    raise SystemExit(0 if main() else 1)
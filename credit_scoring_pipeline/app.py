@@ -25,11 +25,14 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
+from fast_json import FastResponse
+
 # Import scoring components
 from score import (
     CreditScorer, PERSONA_WEIGHTS, DEFAULT_CATEGORY_WEIGHTS,
     compute_persona_subscore, prob_to_score
 )
+from drift_recorder import load_recorder
 
 # ============================================================================
 # CONFIGURATION
@@ -39,6 +42,9 @@ from score import (
 MODEL_PATH = os.environ.get('MODEL_PATH', 'model_artifacts/credit_scoring_model.joblib')
 PREPROCESSOR_PATH = os.environ.get('PREPROCESSOR_PATH', 'model_artifacts/preprocessor.joblib')
 CONFIG_PATH = os.environ.get('CONFIG_PATH', 'feature_config.json')
+# Live drift monitoring (enabled when training saved a drift reference)
+DRIFT_REFERENCE_PATH = os.environ.get('DRIFT_REFERENCE_PATH', 'model_artifacts/drift_reference.json')
+DRIFT_DIR = os.environ.get('DRIFT_DIR', 'model_artifacts/drift')
 
 # API configuration
 API_VERSION = "1.0.0"
@@ -240,6 +246,7 @@ class HealthResponse(BaseModel):
     model_loaded: bool
     model_version: str
     timestamp: str
+    drift: Optional[Dict] = None
 
 
 class ModelInfoResponse(BaseModel):
@@ -267,6 +274,7 @@ app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
     version=API_VERSION,
+    default_response_class=FastResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -341,7 +349,8 @@ async def startup_event():
         model_path=model_path,
         preprocessor_path=preprocessor_path,
         config_path=config_path,
-        alpha=0.7
+        alpha=0.7,
+        drift_recorder=load_recorder(DRIFT_REFERENCE_PATH, DRIFT_DIR)
     )
     
     if model_path:
@@ -353,6 +362,9 @@ async def startup_event():
     if preprocessor_path:
         print(f"Preprocessor loaded from: {preprocessor_path}")
     
+    if scorer.drift_recorder is not None:
+        print(f"Recording live drift to: {scorer.drift_recorder.store.directory}")
+    
     print("API ready to serve requests.")
 
 
@@ -360,6 +372,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("Shutting down Credit Scoring API...")
+    if scorer is not None and scorer.drift_recorder is not None:
+        scorer.drift_recorder.close()
 
 
 # ============================================================================
@@ -371,13 +385,17 @@ async def health_check():
     """
     Health check endpoint.
     
-    Returns API health status and model availability.
+    Returns API health status, model availability and, when live drift is
+    recorded, the rolling PSI of the model probability and features with
+    drift alerts.
     """
+    recorder = scorer.drift_recorder if scorer else None
     return HealthResponse(
         status="healthy",
         model_loaded=scorer is not None and scorer.model is not None,
         model_version=scorer.model_version if scorer else "unknown",
-        timestamp=datetime.utcnow().isoformat()
+        timestamp=datetime.utcnow().isoformat(),
+        drift=recorder.status() if recorder else None
     )
 
 
@@ -0,0 +1,99 @@
+"""
+Dataset cache benchmark: preparing the training data with and without DatasetCache
+
+Usage:
+    python benchmark_dataset_cache.py                     # 1M synthetic rows
+    python benchmark_dataset_cache.py --samples 200000 --cache-dir /tmp/dataset_cache
+
+The synthetic data is written to a CSV first (not timed), as train.py
+--data would read it. "uncached" is what every train.main() run did: read
+the CSV, split, preprocess and bin the LightGBM datasets. "cold" is the
+first run with --cache-dir (the same plus writing the cache entry), "warm"
+a rerun that only hashes the CSV for the key and loads the cached splits
+and binary datasets. "differs" counts validation predictions of a short
+training run that differ between uncached and warm datasets.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import lightgbm as lgb
+import numpy as np
+
+from data_prep import SyntheticDataGenerator
+from dataset_cache import DATASET_PARAMS, DatasetCache
+from train import dataset_cache_key, prepare_data
+
+TRAIN_PARAMS = {'objective': 'binary', 'verbose': -1, 'seed': 42}
+
+
+def uncached_run(data_path):
+    """(validation X, train/validation datasets) the way train.main builds them without a cache"""
+    splits, _, categorical = prepare_data(data_path)
+    (X_train, y_train), (X_val, y_val) = splits['train'], splits['val']
+    train_data = lgb.Dataset(X_train, label=y_train, categorical_feature=categorical,
+                             params=DATASET_PARAMS)
+    val_data = lgb.Dataset(X_val, label=y_val, categorical_feature=categorical, reference=train_data)
+    val_data.construct()
+    return X_val, (train_data, val_data)
+
+
+def cached_run(data_path, cache):
+    """(validation X, train/validation datasets) through the cache, as train.main --cache-dir"""
+    key = dataset_cache_key(cache, data_path, n_samples=0)
+    cached = cache.load(key)
+    if cached is not None:
+        splits, categorical = cached.splits, cached.categorical_features
+    else:
+        splits, preprocessor, categorical = prepare_data(data_path)
+        cache.save(key, splits, preprocessor, categorical)
+    (X_train, y_train), (X_val, y_val) = splits['train'], splits['val']
+    train_data, val_data = cache.lgb_datasets(key, X_train, y_train, X_val, y_val, categorical)
+    val_data.construct()
+    return X_val, (train_data, val_data)
+
+
+def timed(fn, *args):
+    """(result, seconds) with the pipeline prints suppressed"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--cache-dir', default=None, help='Cache directory (default: a temporary one)')
+    parser.add_argument('--rounds', type=int, default=20, help='Boosting rounds of the comparison run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, 'training_data.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            SyntheticDataGenerator(seed=42).generate(n_samples=args.samples, missing_rate=0.05).to_csv(
+                data_path, index=False)
+        cache = DatasetCache(args.cache_dir or os.path.join(tmp, 'cache'))
+
+        (X_val, uncached), uncached_s = timed(uncached_run, data_path)
+        uncached_pred = lgb.train(TRAIN_PARAMS, uncached[0], args.rounds).predict(X_val)
+        del uncached
+        _, cold_s = timed(cached_run, data_path, cache)
+        (X_val, warm), warm_s = timed(cached_run, data_path, cache)
+        warm_pred = lgb.train(TRAIN_PARAMS, warm[0], args.rounds).predict(X_val)
+        size_mb = sum(entry.stat().st_size for entry in os.scandir(cache.path(os.listdir(cache.cache_dir)[0])))
+        differs = int(np.sum(~np.isclose(uncached_pred, warm_pred)))
+
+    print(f"{args.samples} rows, cache entry {size_mb / 1e6:.0f} MB")
+    print(f"  uncached: {uncached_s:7.1f} s")
+    print(f"  cold:     {cold_s:7.1f} s")
+    print(f"  warm:     {warm_s:7.1f} s")
+    print(f"  speedup:  {uncached_s / warm_s:7.1f}x   differs: {differs}/{len(warm_pred)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Evaluation harness benchmark: bootstrap and cross-validation, sequential vs parallel
+
+Usage:
+    python benchmark_evaluation.py                        # 50k rows, 200 resamples, 5 folds
+    python benchmark_evaluation.py --samples 200000 --bootstrap 1000 --workers 4
+
+The data is prepared as train.py does and a model is trained on the
+training split (not timed). Bootstrap of the test predictions, overall and
+per persona:
+- "naive" resamples the rows and calls roc_auc_score/roc_curve per
+  resample and persona (on at most --naive-resamples resamples, scaled up)
+- "harness" is bootstrap_metrics() in-process and with --workers processes
+Cross-validation of train + validation is cross_validate() with 1 and
+--workers processes; "same" checks the parallel results equal the
+sequential ones.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from sklearn.metrics import brier_score_loss, roc_auc_score, roc_curve
+
+from evaluation_harness import bootstrap_metrics, cross_validate
+from train import prepare_data
+
+PARAMS = {'objective': 'binary', 'learning_rate': 0.05, 'num_leaves': 31, 'min_child_samples': 50,
+          'seed': 42, 'verbose': -1}
+ROUNDS = 100
+
+
+def naive_bootstrap(y, p, personas, n_bootstrap, seed=42):
+    """AUC, KS and Brier per resample, overall and per persona, one sklearn call at a time"""
+    rng = np.random.default_rng(seed)
+    results = []
+    for _ in range(n_bootstrap):
+        idx = rng.integers(0, len(y), len(y))
+        groups = [idx] + [idx[personas[idx] == persona] for persona in np.unique(personas)]
+        for group in groups:
+            y_b, p_b = y[group], p[group]
+            if 0 < y_b.sum() < len(y_b):
+                fpr, tpr, _ = roc_curve(y_b, p_b)
+                results.append((roc_auc_score(y_b, p_b), np.max(tpr - fpr), brier_score_loss(y_b, p_b)))
+    return results
+
+
+def timed(fn, *args, **kwargs):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=50_000)
+    parser.add_argument('--bootstrap', type=int, default=200)
+    parser.add_argument('--naive-resamples', type=int, default=50)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        splits, _, categorical = prepare_data(n_samples=args.samples)
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = splits['train'], splits['val'], splits['test']
+    segments = splits['segments']
+    train_data = lgb.Dataset(X_train, label=y_train, categorical_feature=categorical)
+    pred = lgb.train(PARAMS, train_data, ROUNDS).predict(X_test)
+    y, personas = y_test.to_numpy(dtype=float), segments['test']['persona'].to_numpy()
+
+    naive_n = min(args.naive_resamples, args.bootstrap)
+    _, naive_s = timed(naive_bootstrap, y, pred, personas, naive_n)
+    naive_s *= args.bootstrap / naive_n
+    _, seq_s = timed(bootstrap_metrics, y, pred, {'persona': personas}, args.bootstrap, n_workers=1)
+    _, par_s = timed(bootstrap_metrics, y, pred, {'persona': personas}, args.bootstrap, n_workers=args.workers)
+
+    X_cv = pd.concat([X_train, X_val], ignore_index=True)
+    y_cv = pd.concat([y_train, y_val], ignore_index=True).to_numpy()
+    cv_segments = {'persona': pd.concat([segments['train'], segments['val']])['persona'].to_numpy()}
+    cv_args = (X_cv, y_cv, PARAMS, ROUNDS, categorical, cv_segments, args.folds)
+    cv_seq, cv_seq_s = timed(cross_validate, *cv_args, n_workers=1)
+    cv_par, cv_par_s = timed(cross_validate, *cv_args, n_workers=args.workers)
+    same = np.allclose([f['auc'] for f in cv_seq['folds']], [f['auc'] for f in cv_par['folds']])
+
+    print(f"{args.samples} rows ({len(y)} test, {len(y_cv)} CV), {os.cpu_count()} CPUs, {args.workers} workers")
+    print(f"Bootstrap, {args.bootstrap} resamples x (overall + {len(np.unique(personas))} personas):")
+    print(f"  naive:             {naive_s:7.1f} s  (from {naive_n} resamples)")
+    print(f"  harness, 1 worker: {seq_s:7.1f} s  ({naive_s / seq_s:.0f}x)")
+    print(f"  harness, {args.workers} workers:{par_s:7.1f} s")
+    print(f"Cross-validation, {args.folds} folds x {ROUNDS} rounds:")
+    print(f"  1 worker:          {cv_seq_s:7.1f} s")
+    print(f"  {args.workers} workers:         {cv_par_s:7.1f} s  ({cv_seq_s / cv_par_s:.1f}x, "
+          f"fold AUCs {'same' if same else 'DIFFER'})")
+
+
+if __name__ == '__main__':
+    main()
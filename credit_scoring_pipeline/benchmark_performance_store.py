@@ -0,0 +1,76 @@
+"""
+Performance monitoring benchmark: in-memory snapshots vs the persistent store
+
+Usage:
+    python benchmark_performance_store.py                 # 1M applications over 180 days
+    python benchmark_performance_store.py --applications 5000000 --window 90
+
+Synthetic applications are scored over --days days and the outcomes of
+the first --labelled fraction arrive afterwards, in random order.
+- "log" and "join" are PerformanceStore.log_predictions() and
+  record_outcomes() (the outcome join by application ID)
+- "in-memory" is PerformanceMonitor.add_snapshot() on the labelled
+  applications of the last --window days, sliced from the full arrays
+- "store" is PerformanceStore.rolling() on the same window, from the
+  daily buckets; "auc diff" is its difference to the in-memory AUC
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from monitoring import PerformanceMonitor
+from performance_store import PerformanceStore
+
+
+def timed(fn, *args, **kwargs):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applications', type=int, default=1_000_000)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--labelled', type=float, default=0.7)
+    parser.add_argument('--window', type=int, default=90)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    n = args.applications
+    ids = np.char.add('APP-', np.arange(n).astype(str))
+    p = rng.beta(2, 8, n)
+    y = rng.binomial(1, p)
+    start = np.datetime64('2026-01-01')
+    scored_at = start + np.sort(rng.integers(0, args.days * 86400, n)).astype('timedelta64[s]')
+    labelled = rng.permutation(int(n * args.labelled))
+    end = start + np.timedelta64(args.days - 1, 'D')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PerformanceStore(os.path.join(tmp, 'performance.sqlite'))
+        _, log_s = timed(store.log_predictions, ids, p, scored_at)
+        _, join_s = timed(store.record_outcomes, ids[labelled], y[labelled])
+        size_mb = os.path.getsize(store.path) / 1e6
+
+        window_start = end - np.timedelta64(args.window - 1, 'D')
+        in_window = np.zeros(n, dtype=bool)
+        in_window[labelled] = True
+        in_window &= scored_at.astype('datetime64[D]') >= window_start
+        snapshot, memory_s = timed(PerformanceMonitor().add_snapshot, y[in_window], p[in_window])
+        metrics, store_s = timed(store.rolling, args.window, str(end))
+
+    print(f"{n} applications over {args.days} days, {len(labelled)} outcomes, {args.window}-day window")
+    print(f"  log:       {log_s:7.2f} s  {n / log_s:10,.0f} predictions/s ({size_mb:.0f} MB)")
+    print(f"  join:      {join_s:7.2f} s  {len(labelled) / join_s:10,.0f} outcomes/s")
+    print(f"  in-memory: {memory_s * 1000:7.1f} ms  AUC {snapshot.auc:.4f} ({snapshot.n_samples} outcomes)")
+    print(f"  store:     {store_s * 1000:7.1f} ms  AUC {metrics['auc']:.4f} ({metrics['n_labelled']} outcomes, "
+          f"auc diff {abs(metrics['auc'] - snapshot.auc):.1e})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Synthetic data benchmark: in-memory generation vs chunked Parquet streaming
+
+Usage:
+    python benchmark_synthetic_data.py                    # 2M rows, 1 worker
+    python benchmark_synthetic_data.py --rows 20000000 --workers 4 --chunk-rows 1048576
+
+"generate" is SyntheticDataGenerator.generate() building the whole
+DataFrame in memory; "parquet" streams the same rows to a directory of
+Parquet files, --chunk-rows at a time over --workers processes, so memory
+stays at about one chunk per worker. "check" reads back the first chunk
+and compares it with the in-memory rows.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from data_prep import SyntheticDataGenerator
+from synthetic_engine import DEFAULT_CHUNK_ROWS
+
+
+def timed(fn, *args, **kwargs):
+    """(result, seconds) with the generator prints suppressed"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(seed=42)
+    df, generate_s = timed(generator.generate, n_samples=args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic')
+        files, parquet_s = timed(generator.write_parquet, path, n_samples=args.rows,
+                                 chunk_rows=args.chunk_rows, n_workers=args.workers)
+        size_mb = sum(os.path.getsize(f) for f in files) / 1e6
+        first = pd.read_parquet(files[0])
+        matches = first.equals(df.iloc[:len(first)].reset_index(drop=True))
+
+    print(f"{args.rows} rows, {len(df.columns)} columns, chunk {args.chunk_rows} rows, {args.workers} workers")
+    print(f"  generate: {generate_s:7.1f} s  {args.rows / generate_s:12,.0f} rows/s "
+          f"({df.memory_usage(deep=True).sum() / 1e6:.0f} MB in memory)")
+    print(f"  parquet:  {parquet_s:7.1f} s  {args.rows / parquet_s:12,.0f} rows/s "
+          f"({len(files)} files, {size_mb:.0f} MB)")
+    print(f"  check:    first chunk {'matches' if matches else 'DIFFERS from'} generate()")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Tuning benchmark: current Optuna loop vs shared datasets + pruning
+
+Usage:
+    python benchmark_tuning.py                          # 20k samples, 30 trials
+    python benchmark_tuning.py --samples 50000 --trials 60 --pruner hyperband --workers 2
+
+"loop" is run_hyperparameter_tuning() as CreditScoringModel.train calls it
+(datasets rebuilt every trial, no pruning, in-memory study); "fast" bins
+the data once, prunes with --pruner and keeps the study in a journal file,
+optimized by --workers processes. "to best" is the wall-clock until a
+study first reaches the loop's best validation AUC (within --tolerance).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import optuna
+
+from data_prep import CreditScoringPreprocessor, SyntheticDataGenerator, create_splits
+from train import run_hyperparameter_tuning
+from optuna_tuning import DEFAULT_STUDY_NAME, load_study
+
+EXCLUDE_COLUMNS = ['default_90dpd', 'default_probability_true', 'application_date', 'persona']
+
+
+def tuning_data(n_samples):
+    """(X_train, y_train, X_val, y_val, categorical_features) as train.main builds them"""
+    df = SyntheticDataGenerator(seed=42).generate(n_samples=n_samples, missing_rate=0.05)
+    train_df, val_df, _ = create_splits(df, target_col='default_90dpd', timestamp_col='application_date')
+    feature_cols = [c for c in train_df.columns if c not in EXCLUDE_COLUMNS]
+    preprocessor = CreditScoringPreprocessor()
+    X_train = preprocessor.fit_transform(train_df[feature_cols]).reset_index(drop=True)
+    X_val = preprocessor.transform(val_df[feature_cols]).reset_index(drop=True)
+    categorical_features = [c for c in preprocessor._get_categorical_features() if c in X_train.columns]
+    return (X_train, train_df['default_90dpd'].reset_index(drop=True),
+            X_val, val_df['default_90dpd'].reset_index(drop=True), categorical_features)
+
+
+def timed_tuning(data, n_trials, **options):
+    """(results, seconds) with the tuning prints suppressed"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = run_hyperparameter_tuning(*data, n_trials=n_trials, **options)
+    return results, time.perf_counter() - start
+
+
+def seconds_to_reach(trials, target):
+    """Wall-clock from the first trial's start until a trial reaches target, None if none did"""
+    start = min(trial.datetime_start for trial in trials)
+    reached = [trial.datetime_complete for trial in trials
+               if trial.value is not None and trial.value >= target]
+    return (min(reached) - start).total_seconds() if reached else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--trials', type=int, default=30)
+    parser.add_argument('--pruner', choices=['median', 'hyperband'], default='median')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--tolerance', type=float, default=0.001)
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = tuning_data(args.samples)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loop_storage = os.path.join(tmp, 'loop.log')
+        fast_storage = os.path.join(tmp, 'fast.log')
+        # The loop's study is stored only to read its trial timestamps back
+        loop, loop_s = timed_tuning(data, args.trials, storage=loop_storage)
+        fast, fast_s = timed_tuning(data, args.trials, shared_datasets=True, pruner=args.pruner,
+                                    storage=fast_storage, n_workers=args.workers)
+        target = loop['best_auc'] - args.tolerance
+        loop_to_best = seconds_to_reach(load_study(loop_storage, DEFAULT_STUDY_NAME).trials, target)
+        fast_to_best = seconds_to_reach(load_study(fast_storage, DEFAULT_STUDY_NAME).trials, target)
+
+    print(f"{args.samples} samples, {args.trials} trials, pruner={args.pruner}, workers={args.workers}")
+    print(f"  loop: {loop_s:7.1f} s total, best AUC {loop['best_auc']:.4f}, to best {loop_to_best:7.1f} s")
+    fast_reached = f"{fast_to_best:7.1f} s" if fast_to_best is not None else "not reached"
+    print(f"  fast: {fast_s:7.1f} s total, best AUC {fast['best_auc']:.4f}, to best {fast_reached} "
+          f"({fast['pruned_trials']} pruned)")
+    if fast_to_best is not None:
+        print(f"  speedup to best: {loop_to_best / fast_to_best:.1f}x   total: {loop_s / fast_s:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,7 @@ import uvicorn
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 # Import config
+from fast_json import FastResponse
 from config.constants import SCORE_RANGE, CONSUMER_RISK_TIERS
 from config.feature_weights import CONSUMER_FEATURE_WEIGHTS, FEATURE_CATEGORIES
 
@@ -281,6 +282,7 @@ app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
     version=API_VERSION,
+    default_response_class=FastResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -24,9 +24,11 @@ from datetime import datetime
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.hyperparameters import DEFAULT_CONSUMER_LGB_PARAMS
 from data.synthetic_data_generator import ConsumerSyntheticDataGenerator
+from drift_sketch import DriftReference
 
 
 def prepare_data(df):
@@ -216,6 +218,15 @@ def train_consumer_model(
     }, model_path)
     print(f"\n[SUCCESS] Model saved: {model_path}")
     
+    # Save drift reference: bins of the training features and of the raw model
+    # probability, which the Django scoring view records for live drift
+    drift_path = os.path.join(output_dir, 'drift_reference.json')
+    drift_reference = DriftReference.fit(X_train).join(
+        DriftReference.fit(pd.DataFrame({'default_probability': model.predict(X_train)}))
+    )
+    drift_reference.save(drift_path)
+    print(f"[SUCCESS] Drift reference saved: {drift_path}")
+    
     # Save feature importance
     importance_path = os.path.join(output_dir, 'feature_importance.csv')
     feature_importance.to_csv(importance_path, index=False)
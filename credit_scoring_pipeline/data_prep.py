@@ -22,8 +22,10 @@ from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
 import json
 import warnings
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
+import functools
+
+from synthetic_engine import DEFAULT_CHUNK_ROWS, BlockFunction, generate_rows, write_parquet
 
 warnings.filterwarnings('ignore')
 
@@ -205,8 +207,6 @@ class SyntheticDataGenerator:
     
     def __init__(self, seed: int = 42):
         self.seed = seed
-        np.random.seed(seed)
-        random.seed(seed)
         
         # Persona distribution in synthetic data
         self.persona_distribution = {
@@ -217,48 +217,48 @@ class SyntheticDataGenerator:
             'mass_affluent': 0.10
         }
     
-    def _generate_persona_features(self, persona: str, n: int) -> Dict[str, np.ndarray]:
+    def _generate_persona_features(self, rng: np.random.Generator, persona: str, n: int) -> Dict[str, np.ndarray]:
         """Generate features based on persona characteristics"""
         features = {}
         
         if persona == 'new_to_credit':
             # NTC: Lower credit history, younger, less assets
-            features['income_base'] = np.random.lognormal(10.5, 0.6, n)  # Lower income
-            features['credit_history_months'] = np.random.uniform(0, 12, n)
-            features['age_factor'] = np.random.uniform(0.3, 0.6, n)
-            features['asset_factor'] = np.random.uniform(0.1, 0.4, n)
+            features['income_base'] = rng.lognormal(10.5, 0.6, n)  # Lower income
+            features['credit_history_months'] = rng.uniform(0, 12, n)
+            features['age_factor'] = rng.uniform(0.3, 0.6, n)
+            features['asset_factor'] = rng.uniform(0.1, 0.4, n)
             features['default_base_prob'] = 0.15
             
         elif persona == 'gig_worker':
             # Gig: Variable income, moderate history
-            features['income_base'] = np.random.lognormal(10.8, 0.8, n)  # Variable
-            features['credit_history_months'] = np.random.uniform(6, 48, n)
-            features['age_factor'] = np.random.uniform(0.4, 0.7, n)
-            features['asset_factor'] = np.random.uniform(0.2, 0.5, n)
+            features['income_base'] = rng.lognormal(10.8, 0.8, n)  # Variable
+            features['credit_history_months'] = rng.uniform(6, 48, n)
+            features['age_factor'] = rng.uniform(0.4, 0.7, n)
+            features['asset_factor'] = rng.uniform(0.2, 0.5, n)
             features['default_base_prob'] = 0.12
             
         elif persona == 'salaried_professional':
             # Salaried: Stable income, good history
-            features['income_base'] = np.random.lognormal(11.2, 0.5, n)
-            features['credit_history_months'] = np.random.uniform(24, 120, n)
-            features['age_factor'] = np.random.uniform(0.5, 0.8, n)
-            features['asset_factor'] = np.random.uniform(0.4, 0.7, n)
+            features['income_base'] = rng.lognormal(11.2, 0.5, n)
+            features['credit_history_months'] = rng.uniform(24, 120, n)
+            features['age_factor'] = rng.uniform(0.5, 0.8, n)
+            features['asset_factor'] = rng.uniform(0.4, 0.7, n)
             features['default_base_prob'] = 0.06
             
         elif persona == 'credit_experienced':
             # Experienced: Long history, multiple products
-            features['income_base'] = np.random.lognormal(11.5, 0.5, n)
-            features['credit_history_months'] = np.random.uniform(60, 240, n)
-            features['age_factor'] = np.random.uniform(0.6, 0.9, n)
-            features['asset_factor'] = np.random.uniform(0.5, 0.8, n)
+            features['income_base'] = rng.lognormal(11.5, 0.5, n)
+            features['credit_history_months'] = rng.uniform(60, 240, n)
+            features['age_factor'] = rng.uniform(0.6, 0.9, n)
+            features['asset_factor'] = rng.uniform(0.5, 0.8, n)
             features['default_base_prob'] = 0.04
             
         else:  # mass_affluent
             # Affluent: High income, significant assets
-            features['income_base'] = np.random.lognormal(12.5, 0.6, n)
-            features['credit_history_months'] = np.random.uniform(48, 180, n)
-            features['age_factor'] = np.random.uniform(0.7, 1.0, n)
-            features['asset_factor'] = np.random.uniform(0.7, 1.0, n)
+            features['income_base'] = rng.lognormal(12.5, 0.6, n)
+            features['credit_history_months'] = rng.uniform(48, 180, n)
+            features['age_factor'] = rng.uniform(0.7, 1.0, n)
+            features['asset_factor'] = rng.uniform(0.7, 1.0, n)
             features['default_base_prob'] = 0.02
             
         return features
@@ -269,6 +269,9 @@ class SyntheticDataGenerator:
         """
         Generate synthetic credit scoring dataset.
         
+        The rows are the first n_samples of the seed's chunked dataset (see
+        synthetic_engine), so they match write_parquet() output row for row.
+        
         Args:
             n_samples: Number of samples to generate
             missing_rate: Fraction of values to set as missing
@@ -279,10 +282,42 @@ class SyntheticDataGenerator:
         """
         print(f"Generating {n_samples} synthetic samples...")
         
+        df = generate_rows(self.block_function(missing_rate, include_timestamp), self.seed, 0, n_samples)
+        
+        print(f"Generated {len(df)} samples with {df['default_90dpd'].sum()} defaults ({df['default_90dpd'].mean()*100:.1f}%)")
+        
+        return df
+    
+    def write_parquet(self, path: str, n_samples: int,
+                      missing_rate: float = 0.05,
+                      include_timestamp: bool = True,
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                      n_workers: int = 1,
+                      partition_cols: Optional[List[str]] = None) -> List[str]:
+        """
+        Stream n_samples rows to a directory of Parquet files, chunk_rows at a
+        time, written by n_workers processes (see synthetic_engine.write_parquet)
+        
+        Returns:
+            Paths of the Parquet files written
+        """
+        return write_parquet(self.block_function(missing_rate, include_timestamp), n_samples, path,
+                             self.seed, chunk_rows=chunk_rows, n_workers=n_workers,
+                             partition_cols=partition_cols)
+    
+    def block_function(self, missing_rate: float = 0.05, include_timestamp: bool = True) -> BlockFunction:
+        """(rng, n) -> DataFrame of n rows, for the synthetic_engine functions"""
+        return functools.partial(self._generate_block, missing_rate=missing_rate,
+                                 include_timestamp=include_timestamp)
+    
+    def _generate_block(self, rng: np.random.Generator, n: int,
+                        missing_rate: float = 0.05,
+                        include_timestamp: bool = True) -> pd.DataFrame:
+        """Draw n rows, each feature column as one array from rng"""
         # Assign personas based on distribution
-        personas = np.random.choice(
+        personas = rng.choice(
             list(self.persona_distribution.keys()),
-            size=n_samples,
+            size=n,
             p=list(self.persona_distribution.values())
         )
         
@@ -290,152 +325,152 @@ class SyntheticDataGenerator:
         data = {'persona': personas}
         
         # Generate base factors per persona
-        all_factors = {k: np.zeros(n_samples) for k in 
+        all_factors = {k: np.zeros(n) for k in 
                       ['income_base', 'credit_history_months', 'age_factor', 'asset_factor', 'default_base_prob']}
         
         for persona in self.persona_distribution.keys():
             mask = personas == persona
             n_persona = mask.sum()
-            persona_factors = self._generate_persona_features(persona, n_persona)
+            persona_factors = self._generate_persona_features(rng, persona, n_persona)
             for k, v in persona_factors.items():
                 all_factors[k][mask] = v
         
         # ========== CATEGORY A: IDENTITY & DEMOGRAPHICS ==========
-        data['name_dob_verified'] = np.random.binomial(1, 0.95, n_samples)
-        data['phone_verified'] = np.random.binomial(1, 0.90, n_samples)
-        data['phone_age_months'] = np.clip(all_factors['age_factor'] * 120 + np.random.normal(0, 20, n_samples), 0, 240)
-        data['email_verified'] = np.random.binomial(1, 0.85, n_samples)
-        data['email_age_months'] = np.clip(all_factors['age_factor'] * 100 + np.random.normal(0, 25, n_samples), 0, 240)
-        data['location_stability_score'] = np.clip(all_factors['age_factor'] * 0.7 + np.random.normal(0.2, 0.15, n_samples), 0, 1)
-        data['location_tier'] = np.random.choice(['tier1', 'tier2', 'tier3', 'rural'], n_samples, p=[0.3, 0.35, 0.25, 0.1])
-        data['education_level'] = np.clip(np.round(all_factors['age_factor'] * 3 + np.random.normal(0.5, 1, n_samples)), 0, 5).astype(int)
-        data['employment_tenure_months'] = np.clip(all_factors['credit_history_months'] * 1.5 + np.random.normal(0, 24, n_samples), 0, 480)
+        data['name_dob_verified'] = rng.binomial(1, 0.95, n)
+        data['phone_verified'] = rng.binomial(1, 0.90, n)
+        data['phone_age_months'] = np.clip(all_factors['age_factor'] * 120 + rng.normal(0, 20, n), 0, 240)
+        data['email_verified'] = rng.binomial(1, 0.85, n)
+        data['email_age_months'] = np.clip(all_factors['age_factor'] * 100 + rng.normal(0, 25, n), 0, 240)
+        data['location_stability_score'] = np.clip(all_factors['age_factor'] * 0.7 + rng.normal(0.2, 0.15, n), 0, 1)
+        data['location_tier'] = rng.choice(['tier1', 'tier2', 'tier3', 'rural'], n, p=[0.3, 0.35, 0.25, 0.1])
+        data['education_level'] = np.clip(np.round(all_factors['age_factor'] * 3 + rng.normal(0.5, 1, n)), 0, 5).astype(int)
+        data['employment_tenure_months'] = np.clip(all_factors['credit_history_months'] * 1.5 + rng.normal(0, 24, n), 0, 480)
         data['employment_type'] = np.where(
             personas == 'gig_worker', 
-            np.random.choice(['self_employed', 'contract', 'part_time'], n_samples),
+            rng.choice(['self_employed', 'contract', 'part_time'], n),
             np.where(
                 personas == 'salaried_professional',
-                np.random.choice(['full_time', 'government'], n_samples, p=[0.85, 0.15]),
-                np.random.choice(['unemployed', 'self_employed', 'contract', 'part_time', 'full_time', 'government'], 
-                               n_samples, p=[0.05, 0.2, 0.15, 0.1, 0.4, 0.1])
+                rng.choice(['full_time', 'government'], n, p=[0.85, 0.15]),
+                rng.choice(['unemployed', 'self_employed', 'contract', 'part_time', 'full_time', 'government'], 
+                         n, p=[0.05, 0.2, 0.15, 0.1, 0.4, 0.1])
             )
         )
         
         # ========== CATEGORY B: INCOME & CASH FLOW ==========
         data['monthly_income'] = np.clip(all_factors['income_base'], 0, 5000000)
-        data['income_growth_rate'] = np.clip(np.random.normal(0.08, 0.15, n_samples), -0.5, 1.0)
-        data['avg_account_balance'] = np.clip(data['monthly_income'] * np.random.uniform(1, 6, n_samples), 0, 10000000)
-        data['min_account_balance'] = np.clip(data['avg_account_balance'] * np.random.uniform(0.1, 0.5, n_samples), 0, 10000000)
+        data['income_growth_rate'] = np.clip(rng.normal(0.08, 0.15, n), -0.5, 1.0)
+        data['avg_account_balance'] = np.clip(data['monthly_income'] * rng.uniform(1, 6, n), 0, 10000000)
+        data['min_account_balance'] = np.clip(data['avg_account_balance'] * rng.uniform(0.1, 0.5, n), 0, 10000000)
         
         # Income stability varies by persona
         income_stability_base = np.where(personas == 'gig_worker', 0.4, 
                                          np.where(personas == 'salaried_professional', 0.85, 0.65))
-        data['income_stability_score'] = np.clip(income_stability_base + np.random.normal(0, 0.15, n_samples), 0, 1)
-        data['income_variance_coefficient'] = np.clip(1 - data['income_stability_score'] + np.random.normal(0, 0.1, n_samples), 0, 2)
+        data['income_stability_score'] = np.clip(income_stability_base + rng.normal(0, 0.15, n), 0, 1)
+        data['income_variance_coefficient'] = np.clip(1 - data['income_stability_score'] + rng.normal(0, 0.1, n), 0, 2)
         
-        data['itr_filed'] = np.random.binomial(1, np.where(personas == 'salaried_professional', 0.9, 0.6), n_samples)
-        data['itr_income_declared'] = data['monthly_income'] * 12 * data['itr_filed'] * np.random.uniform(0.8, 1.0, n_samples)
-        data['employability_score'] = np.clip(all_factors['age_factor'] * 0.6 + np.random.normal(0.3, 0.15, n_samples), 0, 1)
-        data['ppf_balance'] = np.clip(all_factors['asset_factor'] * 500000 + np.random.normal(0, 100000, n_samples), 0, 5000000)
-        data['gov_schemes_enrolled'] = np.clip(np.round(all_factors['asset_factor'] * 3 + np.random.normal(0, 1, n_samples)), 0, 10).astype(int)
-        data['bank_statement_months_available'] = np.clip(np.random.choice([3, 6, 12, 24, 36], n_samples, p=[0.1, 0.3, 0.35, 0.15, 0.1]), 0, 36)
+        data['itr_filed'] = rng.binomial(1, np.where(personas == 'salaried_professional', 0.9, 0.6), n)
+        data['itr_income_declared'] = data['monthly_income'] * 12 * data['itr_filed'] * rng.uniform(0.8, 1.0, n)
+        data['employability_score'] = np.clip(all_factors['age_factor'] * 0.6 + rng.normal(0.3, 0.15, n), 0, 1)
+        data['ppf_balance'] = np.clip(all_factors['asset_factor'] * 500000 + rng.normal(0, 100000, n), 0, 5000000)
+        data['gov_schemes_enrolled'] = np.clip(np.round(all_factors['asset_factor'] * 3 + rng.normal(0, 1, n)), 0, 10).astype(int)
+        data['bank_statement_months_available'] = np.clip(rng.choice([3, 6, 12, 24, 36], n, p=[0.1, 0.3, 0.35, 0.15, 0.1]), 0, 36)
         
         # ========== CATEGORY C: ASSETS & LIABILITIES ==========
-        data['current_loan_count'] = np.clip(np.round(np.random.poisson(2, n_samples) * (1 - all_factors['asset_factor'] + 0.5)), 0, 20).astype(int)
-        data['current_loan_amount'] = np.clip(data['current_loan_count'] * data['monthly_income'] * np.random.uniform(6, 24, n_samples), 0, 50000000)
-        data['credit_card_count'] = np.clip(np.round(all_factors['age_factor'] * 3 + np.random.normal(0, 1, n_samples)), 0, 10).astype(int)
-        data['credit_card_utilization'] = np.clip(np.random.beta(2, 5, n_samples), 0, 1)
-        data['credit_card_limit'] = np.clip(data['monthly_income'] * np.random.uniform(2, 8, n_samples), 0, 10000000)
-        data['lic_policy_count'] = np.clip(np.round(all_factors['asset_factor'] * 3 + np.random.normal(0, 1, n_samples)), 0, 10).astype(int)
-        data['lic_premium_annual'] = np.clip(data['lic_policy_count'] * np.random.uniform(10000, 100000, n_samples), 0, 1000000)
-        data['fd_total_amount'] = np.clip(all_factors['asset_factor'] * 1000000 + np.random.normal(0, 200000, n_samples), 0, 50000000)
+        data['current_loan_count'] = np.clip(np.round(rng.poisson(2, n) * (1 - all_factors['asset_factor'] + 0.5)), 0, 20).astype(int)
+        data['current_loan_amount'] = np.clip(data['current_loan_count'] * data['monthly_income'] * rng.uniform(6, 24, n), 0, 50000000)
+        data['credit_card_count'] = np.clip(np.round(all_factors['age_factor'] * 3 + rng.normal(0, 1, n)), 0, 10).astype(int)
+        data['credit_card_utilization'] = np.clip(rng.beta(2, 5, n), 0, 1)
+        data['credit_card_limit'] = np.clip(data['monthly_income'] * rng.uniform(2, 8, n), 0, 10000000)
+        data['lic_policy_count'] = np.clip(np.round(all_factors['asset_factor'] * 3 + rng.normal(0, 1, n)), 0, 10).astype(int)
+        data['lic_premium_annual'] = np.clip(data['lic_policy_count'] * rng.uniform(10000, 100000, n), 0, 1000000)
+        data['fd_total_amount'] = np.clip(all_factors['asset_factor'] * 1000000 + rng.normal(0, 200000, n), 0, 50000000)
         data['total_assets_value'] = np.clip(
             data['fd_total_amount'] + data['ppf_balance'] + 
-            all_factors['asset_factor'] * 5000000 + np.random.normal(0, 500000, n_samples), 
+            all_factors['asset_factor'] * 5000000 + rng.normal(0, 500000, n), 
             0, 100000000
         )
-        data['insurance_premium_paid_ratio'] = np.clip(all_factors['age_factor'] * 0.7 + np.random.normal(0.2, 0.15, n_samples), 0, 1)
-        data['insurance_renewal_ontime_ratio'] = np.clip(all_factors['age_factor'] * 0.6 + np.random.normal(0.3, 0.15, n_samples), 0, 1)
+        data['insurance_premium_paid_ratio'] = np.clip(all_factors['age_factor'] * 0.7 + rng.normal(0.2, 0.15, n), 0, 1)
+        data['insurance_renewal_ontime_ratio'] = np.clip(all_factors['age_factor'] * 0.6 + rng.normal(0.3, 0.15, n), 0, 1)
         data['debt_to_income_ratio'] = np.clip(
-            data['current_loan_amount'] / (data['monthly_income'] * 12 + 1) + np.random.normal(0, 0.2, n_samples), 
+            data['current_loan_amount'] / (data['monthly_income'] * 12 + 1) + rng.normal(0, 0.2, n), 
             0, 5
         )
         
         # ========== CATEGORY D: SPENDING & BEHAVIORAL ==========
-        data['monthly_spending'] = np.clip(data['monthly_income'] * np.random.uniform(0.4, 0.9, n_samples), 0, 5000000)
+        data['monthly_spending'] = np.clip(data['monthly_income'] * rng.uniform(0.4, 0.9, n), 0, 5000000)
         data['spending_to_income_ratio'] = data['monthly_spending'] / (data['monthly_income'] + 1)
-        data['essential_spending_ratio'] = np.clip(np.random.beta(5, 3, n_samples), 0, 1)
+        data['essential_spending_ratio'] = np.clip(rng.beta(5, 3, n), 0, 1)
         data['discretionary_spending_ratio'] = 1 - data['essential_spending_ratio']
-        data['purchase_frequency'] = np.clip(np.random.poisson(50, n_samples), 0, 500)
+        data['purchase_frequency'] = np.clip(rng.poisson(50, n), 0, 500)
         data['avg_purchase_value'] = np.clip(data['monthly_spending'] / (data['purchase_frequency'] + 1), 0, 100000)
-        data['subscription_cancellation_count'] = np.clip(np.random.poisson(1, n_samples), 0, 20)
-        data['subscription_downgrade_count'] = np.clip(np.random.poisson(0.5, n_samples), 0, 20)
+        data['subscription_cancellation_count'] = np.clip(rng.poisson(1, n), 0, 20)
+        data['subscription_downgrade_count'] = np.clip(rng.poisson(0.5, n), 0, 20)
         
         # Behavioral scores - inversely related to default risk
-        data['impatience_score'] = np.clip(1 - all_factors['age_factor'] * 0.5 + np.random.normal(0, 0.2, n_samples), 0, 1)
-        data['impulse_buying_score'] = np.clip(1 - all_factors['age_factor'] * 0.4 + np.random.normal(0, 0.2, n_samples), 0, 1)
-        data['budgeting_score'] = np.clip(all_factors['age_factor'] * 0.6 + np.random.normal(0.2, 0.15, n_samples), 0, 1)
-        data['financial_literacy_score'] = np.clip(all_factors['age_factor'] * 0.5 + np.random.normal(0.3, 0.15, n_samples), 0, 1)
-        data['recurring_payment_habit_score'] = np.clip(all_factors['age_factor'] * 0.6 + np.random.normal(0.25, 0.15, n_samples), 0, 1)
-        data['loan_application_count_6m'] = np.clip(np.random.poisson(1.5, n_samples), 0, 20)
-        data['application_rejection_rate'] = np.clip(1 - all_factors['age_factor'] * 0.5 + np.random.normal(0, 0.2, n_samples), 0, 1)
-        data['social_media_score'] = np.clip(np.random.uniform(0.3, 0.9, n_samples), 0, 1)
-        data['email_response_time_score'] = np.clip(all_factors['age_factor'] * 0.5 + np.random.normal(0.3, 0.15, n_samples), 0, 1)
+        data['impatience_score'] = np.clip(1 - all_factors['age_factor'] * 0.5 + rng.normal(0, 0.2, n), 0, 1)
+        data['impulse_buying_score'] = np.clip(1 - all_factors['age_factor'] * 0.4 + rng.normal(0, 0.2, n), 0, 1)
+        data['budgeting_score'] = np.clip(all_factors['age_factor'] * 0.6 + rng.normal(0.2, 0.15, n), 0, 1)
+        data['financial_literacy_score'] = np.clip(all_factors['age_factor'] * 0.5 + rng.normal(0.3, 0.15, n), 0, 1)
+        data['recurring_payment_habit_score'] = np.clip(all_factors['age_factor'] * 0.6 + rng.normal(0.25, 0.15, n), 0, 1)
+        data['loan_application_count_6m'] = np.clip(rng.poisson(1.5, n), 0, 20)
+        data['application_rejection_rate'] = np.clip(1 - all_factors['age_factor'] * 0.5 + rng.normal(0, 0.2, n), 0, 1)
+        data['social_media_score'] = np.clip(rng.uniform(0.3, 0.9, n), 0, 1)
+        data['email_response_time_score'] = np.clip(all_factors['age_factor'] * 0.5 + rng.normal(0.3, 0.15, n), 0, 1)
         
         # ========== CATEGORY E: TRANSACTIONS & REPAYMENTS ==========
-        data['upi_transaction_count_monthly'] = np.clip(np.random.poisson(40, n_samples), 0, 500)
+        data['upi_transaction_count_monthly'] = np.clip(rng.poisson(40, n), 0, 500)
         data['upi_transaction_amount_monthly'] = np.clip(
-            data['monthly_spending'] * np.random.uniform(0.3, 0.7, n_samples), 0, 5000000
+            data['monthly_spending'] * rng.uniform(0.3, 0.7, n), 0, 5000000
         )
-        data['p2m_transaction_ratio'] = np.clip(np.random.uniform(0.3, 0.8, n_samples), 0, 1)
+        data['p2m_transaction_ratio'] = np.clip(rng.uniform(0.3, 0.8, n), 0, 1)
         
         # Payment behavior - key for default prediction
-        payment_discipline = all_factors['age_factor'] * 0.6 + np.random.normal(0.25, 0.15, n_samples)
+        payment_discipline = all_factors['age_factor'] * 0.6 + rng.normal(0.25, 0.15, n)
         data['utility_payment_ontime_ratio'] = np.clip(payment_discipline, 0, 1)
-        data['rent_payment_ontime_ratio'] = np.clip(payment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['phone_bill_ontime_ratio'] = np.clip(payment_discipline + np.random.normal(0.05, 0.1, n_samples), 0, 1)
-        data['internet_bill_ontime_ratio'] = np.clip(payment_discipline + np.random.normal(0.05, 0.1, n_samples), 0, 1)
-        data['repayment_ontime_ratio'] = np.clip(payment_discipline + np.random.normal(0, 0.12, n_samples), 0, 1)
+        data['rent_payment_ontime_ratio'] = np.clip(payment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['phone_bill_ontime_ratio'] = np.clip(payment_discipline + rng.normal(0.05, 0.1, n), 0, 1)
+        data['internet_bill_ontime_ratio'] = np.clip(payment_discipline + rng.normal(0.05, 0.1, n), 0, 1)
+        data['repayment_ontime_ratio'] = np.clip(payment_discipline + rng.normal(0, 0.12, n), 0, 1)
         
         # DPD - inversely related to payment discipline
-        data['max_dpd_ever'] = np.clip((1 - payment_discipline) * 60 + np.random.exponential(15, n_samples), 0, 180).astype(int)
-        data['avg_dpd'] = np.clip(data['max_dpd_ever'] * 0.3 + np.random.normal(0, 10, n_samples), 0, 90)
-        
-        data['ecommerce_transaction_count'] = np.clip(np.random.poisson(15, n_samples), 0, 200)
-        data['ecommerce_return_rate'] = np.clip(np.random.beta(1, 10, n_samples), 0, 1)
-        data['paid_subscription_count'] = np.clip(np.round(all_factors['asset_factor'] * 5 + np.random.normal(0, 2, n_samples)), 0, 20).astype(int)
-        data['sip_active_count'] = np.clip(np.round(all_factors['asset_factor'] * 3 + np.random.normal(0, 1, n_samples)), 0, 10).astype(int)
-        data['sip_monthly_amount'] = np.clip(data['sip_active_count'] * data['monthly_income'] * 0.05 + np.random.normal(0, 5000, n_samples), 0, 500000)
+        data['max_dpd_ever'] = np.clip((1 - payment_discipline) * 60 + rng.exponential(15, n), 0, 180).astype(int)
+        data['avg_dpd'] = np.clip(data['max_dpd_ever'] * 0.3 + rng.normal(0, 10, n), 0, 90)
+        
+        data['ecommerce_transaction_count'] = np.clip(rng.poisson(15, n), 0, 200)
+        data['ecommerce_return_rate'] = np.clip(rng.beta(1, 10, n), 0, 1)
+        data['paid_subscription_count'] = np.clip(np.round(all_factors['asset_factor'] * 5 + rng.normal(0, 2, n)), 0, 20).astype(int)
+        data['sip_active_count'] = np.clip(np.round(all_factors['asset_factor'] * 3 + rng.normal(0, 1, n)), 0, 10).astype(int)
+        data['sip_monthly_amount'] = np.clip(data['sip_active_count'] * data['monthly_income'] * 0.05 + rng.normal(0, 5000, n), 0, 500000)
         data['investment_portfolio_value'] = np.clip(
-            data['sip_monthly_amount'] * 24 + all_factors['asset_factor'] * 500000 + np.random.normal(0, 100000, n_samples), 
+            data['sip_monthly_amount'] * 24 + all_factors['asset_factor'] * 500000 + rng.normal(0, 100000, n), 
             0, 50000000
         )
-        data['savings_rate'] = np.clip(1 - data['spending_to_income_ratio'] + np.random.normal(0, 0.05, n_samples), 0, 1)
+        data['savings_rate'] = np.clip(1 - data['spending_to_income_ratio'] + rng.normal(0, 0.05, n), 0, 1)
         
         # ========== CATEGORY F: FRAUD & IDENTITY ==========
-        data['face_recognition_match_score'] = np.clip(np.random.beta(20, 2, n_samples), 0, 1)
-        data['name_match_score'] = np.clip(np.random.beta(15, 2, n_samples), 0, 1)
-        data['location_mismatch_flag'] = np.random.binomial(1, 0.05, n_samples)
-        data['device_anomaly_score'] = np.clip(np.random.beta(1, 15, n_samples), 0, 1)
-        data['fraud_history_flag'] = np.random.binomial(1, 0.02, n_samples)
-        data['fraud_attempt_count'] = data['fraud_history_flag'] * np.random.poisson(1, n_samples)
-        data['income_source_verified'] = np.random.binomial(1, 0.75, n_samples)
+        data['face_recognition_match_score'] = np.clip(rng.beta(20, 2, n), 0, 1)
+        data['name_match_score'] = np.clip(rng.beta(15, 2, n), 0, 1)
+        data['location_mismatch_flag'] = rng.binomial(1, 0.05, n)
+        data['device_anomaly_score'] = np.clip(rng.beta(1, 15, n), 0, 1)
+        data['fraud_history_flag'] = rng.binomial(1, 0.02, n)
+        data['fraud_attempt_count'] = data['fraud_history_flag'] * rng.poisson(1, n)
+        data['income_source_verified'] = rng.binomial(1, 0.75, n)
         
         # ========== CATEGORY G: FAMILY & NETWORK ==========
-        data['spouse_credit_available'] = np.random.binomial(1, 0.4, n_samples)
+        data['spouse_credit_available'] = rng.binomial(1, 0.4, n)
         data['spouse_credit_score'] = np.where(
             data['spouse_credit_available'] == 1,
-            np.clip(np.random.normal(680, 80, n_samples), 300, 900),
+            np.clip(rng.normal(680, 80, n), 300, 900),
             np.nan
         )
-        data['family_credit_available'] = np.random.binomial(1, 0.3, n_samples)
+        data['family_credit_available'] = rng.binomial(1, 0.3, n)
         data['family_credit_score_avg'] = np.where(
             data['family_credit_available'] == 1,
-            np.clip(np.random.normal(650, 100, n_samples), 300, 900),
+            np.clip(rng.normal(650, 100, n), 300, 900),
             np.nan
         )
-        data['family_financial_responsibility_score'] = np.clip(np.random.beta(5, 3, n_samples), 0, 1)
-        data['dependents_count'] = np.clip(np.random.poisson(1.5, n_samples), 0, 10)
+        data['family_financial_responsibility_score'] = np.clip(rng.beta(5, 3, n), 0, 1)
+        data['dependents_count'] = np.clip(rng.poisson(1.5, n), 0, 10)
         
         # ========== TARGET VARIABLE: 90 DPD DEFAULT ==========
         # Calculate default probability based on risk factors
@@ -451,23 +486,18 @@ class SyntheticDataGenerator:
             0.02 * data['application_rejection_rate'] +
             -0.08 * all_factors['asset_factor'] +
             -0.05 * data['budgeting_score'] +
-            np.random.normal(0, 0.05, n_samples)
+            rng.normal(0, 0.05, n)
         )
         
         default_prob = np.clip(risk_score, 0.01, 0.50)
-        data['default_90dpd'] = np.random.binomial(1, default_prob, n_samples)
+        data['default_90dpd'] = rng.binomial(1, default_prob, n)
         data['default_probability_true'] = default_prob  # For analysis
         
         # Add timestamp if requested
         if include_timestamp:
             base_date = datetime(2023, 1, 1)
-            data['application_date'] = [
-                base_date + timedelta(days=int(d)) 
-                for d in np.random.uniform(0, 730, n_samples)  # 2 years of data
-            ]
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
+            days = rng.uniform(0, 730, n).astype(int)  # 2 years of data
+            data['application_date'] = (np.datetime64(base_date, 'ns') + days.astype('timedelta64[D]')).astype('datetime64[ns]')
         
         # Introduce missing values (more realistic)
         missing_features = [
@@ -476,18 +506,14 @@ class SyntheticDataGenerator:
             'lic_premium_annual', 'fd_total_amount'
         ]
         
-        for feat in missing_features:
-            if feat in df.columns:
-                mask = np.random.random(n_samples) < missing_rate * 2  # Higher missing rate for these
-                df.loc[mask, feat] = np.nan
+        for col, values in data.items():
+            if values.dtype.kind in 'iuf' and col not in ['default_90dpd', 'default_probability_true']:
+                # Higher missing rate for missing_features
+                rate = missing_rate * 2 if col in missing_features else missing_rate
+                data[col] = np.where(rng.random(n) < rate, np.nan, values)
         
-        # Regular missing rate for other numeric features
-        for col in df.select_dtypes(include=[np.number]).columns:
-            if col not in missing_features and col not in ['default_90dpd', 'default_probability_true']:
-                mask = np.random.random(n_samples) < missing_rate
-                df.loc[mask, col] = np.nan
-        
-        print(f"Generated {len(df)} samples with {df['default_90dpd'].sum()} defaults ({df['default_90dpd'].mean()*100:.1f}%)")
+        # Create DataFrame
+        df = pd.DataFrame(data)
         
         return df
 
@@ -0,0 +1,220 @@
+"""
+Dataset cache for repeated training runs
+========================================
+
+Every training run used to re-read the CSV (or regenerate the synthetic
+data), re-run the preprocessor and re-bin the features for LightGBM, even
+when only the hyperparameters changed. DatasetCache keeps, per cache key:
+
+- the preprocessed (X, y) splits and the fitted preprocessor
+- LightGBM binary files of the training/validation datasets, so later runs
+  load the bins instead of recomputing them (feature_pre_filter is off, as
+  for the shared tuning datasets, so the bins fit any min_child_samples)
+
+The key hashes the source data (file contents, a DataFrame, or generator
+settings), the preprocessor (class source, feature schema and config), the
+feature list and any split settings. Changing any of them gives a new key,
+so stale entries are never loaded; only the max_entries most recently used
+entries are kept on disk.
+
+Usage:
+    cache = DatasetCache('.dataset_cache')
+    key = cache.key('data.csv', preprocessor, feature_cols, test_size=0.15)
+    cached = cache.load(key)
+    if cached is None:
+        ...  # split and preprocess
+        cache.save(key, splits, preprocessor, categorical_features)
+    train_data, val_data = cache.lgb_datasets(key, X_train, y_train, X_val, y_val, cats)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import lightgbm as lgb
+import pandas as pd
+
+# Bump when the on-disk layout changes
+CACHE_VERSION = 3
+DEFAULT_MAX_ENTRIES = 3
+
+DATASET_PARAMS = {'feature_pre_filter': False, 'verbose': -1}
+
+_READ_CHUNK = 1 << 20
+
+# {'train'|'val'|'test': (X, y)}, plus any extra pickleable entries such as 'segments'
+Splits = Dict[str, Any]
+
+
+def code_fingerprint(obj: Any) -> str:
+    """sha256 of the source of a class or function (its name if the source is unavailable)"""
+    try:
+        source = inspect.getsource(obj)
+    except (OSError, TypeError):
+        source = f'{obj.__module__}.{obj.__qualname__}'
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def hash_source(source: Any) -> str:
+    """
+    sha256 of the training data: the contents of a file path, the values,
+    index, columns and dtypes of a DataFrame, or the JSON of anything else
+    (e.g. the settings a synthetic dataset is generated from)
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(_READ_CHUNK), b''):
+                digest.update(chunk)
+    elif isinstance(source, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(source, index=True).values.tobytes())
+        digest.update(json.dumps([list(map(str, source.columns)), list(map(str, source.dtypes))]).encode())
+    else:
+        digest.update(json.dumps(source, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def preprocessor_fingerprint(preprocessor: Any) -> str:
+    """sha256 of the preprocessor's class source, feature schema and config"""
+    state = {
+        'code': code_fingerprint(type(preprocessor)),
+        'schema': repr(getattr(preprocessor, 'feature_schema', None)),
+        'config': getattr(preprocessor, 'config', None),
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CachedDatasets:
+    """Splits, fitted preprocessor and categorical features loaded from one cache entry"""
+
+    def __init__(self, path: str, splits: Splits, preprocessor: Any, categorical_features: List[str]):
+        self.path = path
+        self.splits = splits
+        self.preprocessor = preprocessor
+        self.categorical_features = categorical_features
+
+
+class DatasetCache:
+    """On-disk cache of preprocessed splits and LightGBM binary datasets"""
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(source: Any, preprocessor: Any, feature_cols: List[str], **settings) -> str:
+        """
+        Cache key for a training dataset
+
+        Args:
+            source: Data file path, DataFrame, or generator settings (see hash_source)
+            preprocessor: Unfitted preprocessor the splits are transformed with
+            feature_cols: Columns passed to the preprocessor, in order
+            settings: Anything else the splits depend on (split sizes, target, ...)
+        """
+        state = {
+            'version': CACHE_VERSION,
+            'source': hash_source(source),
+            'preprocessor': preprocessor_fingerprint(preprocessor),
+            'features': list(feature_cols),
+            'settings': settings,
+        }
+        return hashlib.sha256(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self.path(key), 'meta.json'))
+
+    def load(self, key: str) -> Optional[CachedDatasets]:
+        """The cached entry for key, or None on a miss"""
+        if key not in self:
+            return None
+        path = self.path(key)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        splits = {name: pd.read_pickle(os.path.join(path, f'{name}.pkl')) for name in meta['splits']}
+        preprocessor = joblib.load(os.path.join(path, 'preprocessor.joblib'))
+        # Marks the entry as recently used for eviction
+        os.utime(path)
+        return CachedDatasets(path, splits, preprocessor, meta['categorical_features'])
+
+    def save(self, key: str, splits: Splits, preprocessor: Any,
+             categorical_features: List[str]) -> str:
+        """
+        Store the preprocessed splits and fitted preprocessor under key
+
+        Returns:
+            Path of the cache entry
+        """
+        path = self.path(key)
+        tmp_path = f'{path}.tmp-{os.getpid()}'
+        os.makedirs(tmp_path, exist_ok=True)
+        for name, split in splits.items():
+            pd.to_pickle(split, os.path.join(tmp_path, f'{name}.pkl'))
+        joblib.dump(preprocessor, os.path.join(tmp_path, 'preprocessor.joblib'))
+        meta = {
+            'version': CACHE_VERSION,
+            'splits': list(splits),
+            'categorical_features': list(categorical_features),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.exists(path):
+            # Written meanwhile by another run with the same key
+            shutil.rmtree(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        self._evict(keep=key)
+        return path
+
+    def lgb_datasets(self, key: str,
+                     X_train: pd.DataFrame, y_train: pd.Series,
+                     X_val: pd.DataFrame, y_val: pd.Series,
+                     categorical_features: List[str]) -> Tuple[lgb.Dataset, lgb.Dataset]:
+        """
+        (train, validation) LightGBM datasets for the entry under key,
+        loaded from its binary files, or binned from the given frames and
+        saved there on the first call
+        """
+        os.makedirs(self.path(key), exist_ok=True)
+        train_path = os.path.join(self.path(key), 'train.bin')
+        val_path = os.path.join(self.path(key), 'val.bin')
+        if os.path.exists(train_path) and os.path.exists(val_path):
+            train_data = lgb.Dataset(train_path, params=DATASET_PARAMS)
+            val_data = lgb.Dataset(val_path, reference=train_data)
+            return train_data, val_data
+
+        train_data = lgb.Dataset(
+            X_train, label=y_train,
+            categorical_feature=categorical_features,
+            feature_name=list(X_train.columns),
+            params=DATASET_PARAMS
+        )
+        val_data = lgb.Dataset(
+            X_val, label=y_val,
+            categorical_feature=categorical_features,
+            reference=train_data
+        )
+        for data, data_path in ((train_data, train_path), (val_data, val_path)):
+            tmp_path = f'{data_path}.tmp-{os.getpid()}'
+            data.construct().save_binary(tmp_path)
+            os.replace(tmp_path, data_path)
+        return train_data, val_data
+
+    def _evict(self, keep: str) -> None:
+        """Remove all but the max_entries most recently used entries"""
+        entries = [name for name in os.listdir(self.cache_dir)
+                   if name != keep and os.path.exists(os.path.join(self.cache_dir, name, 'meta.json'))]
+        entries.sort(key=lambda name: os.path.getmtime(self.path(name)), reverse=True)
+        for name in entries[max(self.max_entries - 1, 0):]:
+            shutil.rmtree(self.path(name), ignore_errors=True)
@@ -0,0 +1,201 @@
+"""
+Online drift recorder
+=====================
+
+Records the features and scores of live scoring requests into the per-day
+histogram sketches of a SketchStore (drift_sketch.py), so the health
+endpoints can report rolling PSI and drift alerts without an offline job.
+
+record() runs on the scoring path, so it only appends the request to a
+bounded deque (appends are thread-safe without a lock). A daemon thread
+drains the deque every flush_interval seconds, bins the records as one
+batch and merges them into this process's sketch file of the day. Every
+process writes its own files, so API workers share a store without
+locking. When the flusher falls behind, the oldest buffered requests are
+dropped rather than slowing scoring down.
+
+status() merges every sketch file of the rolling window, and health
+probes call it constantly. The files only change on a flush, so the
+window's PSI is kept for one flush interval (or until this process
+flushes) and probes in between do not touch the disk.
+
+Usage:
+    recorder = load_recorder('model_artifacts/drift_reference.json', 'model_artifacts/drift')
+    recorder.record(features, {'persona': persona, 'model_probability': p})
+    recorder.status()    # rolling PSI, alerts
+"""
+
+import atexit
+import os
+import socket
+import threading
+import time
+import warnings
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from drift_sketch import DriftReference, SketchStore
+
+DEFAULT_FLUSH_INTERVAL = 10.0
+DEFAULT_MAX_BUFFER = 100_000
+DEFAULT_WINDOW_DAYS = 7
+
+PSI_WARNING = 0.10
+PSI_CRITICAL = 0.25
+# Fewer records in the window: PSI is reported but raises no alert
+MIN_ALERT_RECORDS = 500
+
+
+class DriftRecorder:
+    """In-process recorder of the live feature and score distribution"""
+
+    def __init__(self, store: SketchStore, score_columns: List[str] = ('model_probability',),
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_buffer: int = DEFAULT_MAX_BUFFER,
+                 window_days: int = DEFAULT_WINDOW_DAYS,
+                 psi_warning: float = PSI_WARNING, psi_critical: float = PSI_CRITICAL,
+                 writer: Optional[str] = None, start: bool = True):
+        """
+        Args:
+            store: Store the sketches are merged into
+            score_columns: Recorded scores, reported apart from the features
+            flush_interval: Seconds between background flushes
+            max_buffer: Requests buffered between flushes at most
+            window_days: Days of the rolling window of status()
+            psi_warning: PSI raising a warning
+            psi_critical: PSI raising a critical alert
+            writer: Name of this process's sketch files (default: host-pid)
+            start: Start the background flusher
+        """
+        self.store = store
+        self.score_columns = list(score_columns)
+        self.flush_interval = flush_interval
+        self.window_days = window_days
+        self.psi_warning = psi_warning
+        self.psi_critical = psi_critical
+        self.writer = writer or f'{socket.gethostname()}-{os.getpid()}'
+        self.buffer = deque(maxlen=max_buffer)
+        self.flushed = 0
+        self.last_flush: Optional[datetime] = None
+        # window_days -> (time.monotonic() it was read, PSI, records)
+        self._window_cache: Dict[int, tuple] = {}
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self.start()
+
+    def record(self, features: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record one scoring request: its raw features and extra values such
+        as the persona and model probability (the dicts are read at flush
+        time, so they must not be modified afterwards)
+        """
+        self.buffer.append((time.time(), features, extra))
+
+    def flush(self) -> int:
+        """Bin the buffered requests into the store; returns the number flushed"""
+        with self._flush_lock:
+            records = []
+            try:
+                while True:
+                    records.append(self.buffer.popleft())
+            except IndexError:
+                pass
+            if not records:
+                return 0
+
+            rows_by_day: Dict[date, List[Dict]] = {}
+            for timestamp, features, extra in records:
+                row = {**features, **extra} if extra else features
+                rows_by_day.setdefault(date.fromtimestamp(timestamp), []).append(row)
+            for day, rows in rows_by_day.items():
+                sketch = self.store.reference.new_sketch().update(pd.DataFrame.from_records(rows))
+                self.store.add(sketch, day, writer=self.writer)
+
+            self.flushed += len(records)
+            self.last_flush = datetime.utcnow()
+            self._window_cache.clear()
+            return len(records)
+
+    def start(self) -> None:
+        """Start the background flusher (flushes once more at exit)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='drift-recorder', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Stop the background flusher and flush what is left"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.close)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                warnings.warn(f'Drift recorder flush failed: {e}')
+
+    def status(self, window_days: Optional[int] = None) -> Dict:
+        """Rolling PSI of the scores and features, and alerts, for the health endpoints"""
+        window_days = window_days or self.window_days
+        psi, n = self._window_psi(window_days)
+
+        alerts = []
+        if n >= MIN_ALERT_RECORDS:
+            for feature, value in sorted(psi.items(), key=lambda item: -item[1]):
+                if value >= self.psi_warning:
+                    level = 'CRITICAL' if value >= self.psi_critical else 'WARNING'
+                    alerts.append({'feature': feature, 'psi': round(value, 4), 'level': level})
+        if n < MIN_ALERT_RECORDS:
+            status = 'INSUFFICIENT_DATA'
+        elif any(alert['level'] == 'CRITICAL' for alert in alerts):
+            status = 'CRITICAL'
+        else:
+            status = 'WARNING' if alerts else 'STABLE'
+
+        features = {k: v for k, v in psi.items() if k not in self.score_columns}
+        return {
+            'status': status,
+            'window_days': window_days,
+            'records': n,
+            'pending': len(self.buffer),
+            'last_flush': self.last_flush.isoformat() if self.last_flush else None,
+            'score_psi': {col: round(psi[col], 4) for col in self.score_columns if col in psi},
+            'max_feature_psi': round(max(features.values()), 4) if features else None,
+            'thresholds': {'warning': self.psi_warning, 'critical': self.psi_critical},
+            'alerts': alerts,
+        }
+
+
+    def _window_psi(self, window_days: int) -> tuple:
+        """(PSI by column, records) of the rolling window, read from the store at most once per flush interval"""
+        cached = self._window_cache.get(window_days)
+        now = time.monotonic()
+        if cached is None or now - cached[0] >= self.flush_interval:
+            window = self.store.rolling(window_days)
+            cached = (now, window.psi(), window.n)
+            self._window_cache[window_days] = cached
+        return cached[1], cached[2]
+
+
+def load_recorder(reference_path: str, store_dir: str, **kwargs) -> Optional[DriftRecorder]:
+    """
+    Recorder on the drift reference saved by training (None if there is
+    none); sketches go to store_dir/<reference id>, so a retrained model
+    starts a new store
+    """
+    if not os.path.exists(reference_path):
+        return None
+    reference = DriftReference.load(reference_path)
+    return DriftRecorder(SketchStore(os.path.join(store_dir, reference.reference_id), reference), **kwargs)
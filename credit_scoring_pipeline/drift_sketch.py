@@ -0,0 +1,366 @@
+"""
+Streaming drift sketches
+========================
+
+calculate_feature_psi() needs the whole baseline and current windows in
+memory and recomputes the baseline quantile bins on every call. This
+module splits PSI into pieces that stream:
+
+- DriftReference: bin edges frozen once per feature from the baseline
+  (the same quantile bins as calculate_psi; categories for categorical
+  features, plus an "other" bin) and the baseline counts per bin
+- HistogramSketch: counts per bin and feature of the scored population,
+  updated from DataFrame batches or single records. Sketches on the same
+  reference merge by adding counts, so per-day sketches add up to any window
+- PSI/CSI of a sketch against the reference from the counts alone, O(bins)
+- SketchStore: one JSON sketch per day (and writer), merged into arbitrary
+  windows
+
+Missing values are counted apart from the value bins: PSI is computed over
+the non-missing values, as calculate_feature_psi does, and missing rates
+are reported separately.
+
+Usage:
+    reference = DriftReference.fit(train_df, n_bins=10)
+    store = SketchStore('drift_sketches/', reference)
+    sketch = reference.new_sketch()
+    sketch.update(scored_batch_df)           # or sketch.update_record(features)
+    store.add(sketch, day=date.today())
+    psi = store.window(start, end).psi()     # {feature: PSI}
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_N_BINS = 10
+PSI_EPSILON = 1e-6
+
+Day = Union[date, str]
+
+
+def psi_from_counts(expected_counts: np.ndarray, actual_counts: np.ndarray,
+                    epsilon: float = PSI_EPSILON) -> float:
+    """PSI of two count vectors over the same bins (NaN when either is empty)"""
+    expected_total, actual_total = expected_counts.sum(), actual_counts.sum()
+    if expected_total == 0 or actual_total == 0:
+        return float('nan')
+    expected_pct = expected_counts / expected_total + epsilon
+    actual_pct = actual_counts / actual_total + epsilon
+    return float(np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct)))
+
+
+def quantile_edges(values: np.ndarray, n_bins: int = DEFAULT_N_BINS) -> np.ndarray:
+    """Unique quantile bin edges of values with open outer bins, as calculate_psi bins"""
+    edges = np.percentile(values, np.linspace(0, 100, n_bins + 1))
+    edges[0], edges[-1] = -np.inf, np.inf
+    return np.unique(edges)
+
+
+class DriftReference:
+    """Frozen bins and baseline counts of the monitored features"""
+
+    def __init__(self, edges: Dict[str, List[float]], categories: Dict[str, List[str]],
+                 counts: Optional[Dict[str, List[int]]] = None):
+        """
+        Args:
+            edges: {numeric feature: bin edges, -inf and inf at the ends}
+            categories: {categorical feature: known categories}
+            counts: {feature: baseline counts per bin, missing last}
+        """
+        self.edges = {name: np.asarray(e, dtype=float) for name, e in edges.items()}
+        self.categories = {name: [str(c) for c in cats] for name, cats in categories.items()}
+        self.features = list(self.edges) + list(self.categories)
+        # Value bins per feature (categorical: categories + "other"); each feature
+        # also has a missing-value slot, so its counts are n_bins[name] + 1 long
+        self.n_bins = {name: len(e) - 1 for name, e in self.edges.items()}
+        self.n_bins.update({name: len(cats) + 1 for name, cats in self.categories.items()})
+        self.offsets = dict(zip(self.features, np.cumsum([0] + [self.n_bins[f] + 1 for f in self.features]).tolist()))
+        self.size = sum(self.n_bins[f] + 1 for f in self.features)
+        self._inner_edges = {name: e[1:-1] for name, e in self.edges.items()}
+        self._category_index = {name: pd.Index(cats) for name, cats in self.categories.items()}
+        # Plain Python lookups for single records (bisect/dict beat numpy on scalars)
+        self._edge_lists = {name: e.tolist() for name, e in self._inner_edges.items()}
+        self._category_slots = {name: {c: i for i, c in enumerate(cats)} for name, cats in self.categories.items()}
+        state = {'edges': {k: v.tolist() for k, v in self.edges.items()}, 'categories': self.categories}
+        self.reference_id = hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
+        self.counts = None
+        if counts is not None:
+            self.counts = self.new_sketch()
+            for name, values in counts.items():
+                self.counts.feature_counts(name)[:] = values
+
+    @classmethod
+    def fit(cls, baseline_df: pd.DataFrame, feature_columns: Optional[List[str]] = None,
+            categorical_columns: Optional[List[str]] = None,
+            n_bins: int = DEFAULT_N_BINS) -> 'DriftReference':
+        """
+        Freeze the bins of the baseline data and count it
+
+        Args:
+            baseline_df: Baseline (training) data
+            feature_columns: Numeric columns to monitor (default: all numeric)
+            categorical_columns: Categorical columns to monitor
+            n_bins: Quantile bins per numeric feature
+        """
+        categorical_columns = list(categorical_columns or [])
+        if feature_columns is None:
+            feature_columns = baseline_df.select_dtypes(include=[np.number]).columns.tolist()
+        edges = {}
+        for col in feature_columns:
+            if col in categorical_columns:
+                continue
+            values = baseline_df[col].dropna().to_numpy(dtype=float)
+            if len(values):
+                edges[col] = quantile_edges(values, n_bins)
+        categories = {col: sorted(baseline_df[col].dropna().astype(str).unique())
+                      for col in categorical_columns}
+        reference = cls(edges, categories)
+        reference.counts = reference.new_sketch()
+        reference.counts.update(baseline_df)
+        return reference
+
+    def join(self, other: 'DriftReference') -> 'DriftReference':
+        """Reference monitoring the features of both, e.g. raw features and the model score"""
+        state, other_state = self.to_dict(), other.to_dict()
+        counts = None
+        if state['counts'] is not None and other_state['counts'] is not None:
+            counts = {**state['counts'], **other_state['counts']}
+        return DriftReference({**state['edges'], **other_state['edges']},
+                              {**state['categories'], **other_state['categories']}, counts)
+
+    def new_sketch(self) -> 'HistogramSketch':
+        """An empty sketch on these bins"""
+        return HistogramSketch(self)
+
+    def bin_index(self, name: str, value: Any) -> int:
+        """Slot of one value in the feature's counts (missing: the last slot)"""
+        if name in self.edges:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return self.n_bins[name]
+            if math.isnan(value):
+                return self.n_bins[name]
+            return bisect.bisect_right(self._edge_lists[name], value)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return self.n_bins[name]
+        return self._category_slots[name].get(str(value), len(self.categories[name]))
+
+    def bin_indices(self, name: str, values: Any) -> np.ndarray:
+        """Slot of each value in the feature's counts (missing: the last slot)"""
+        values = pd.Series(values)
+        missing = values.isna().to_numpy()
+        if name in self.edges:
+            numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+            missing |= np.isnan(numeric)
+            index = np.searchsorted(self._inner_edges[name], numeric, side='right')
+        else:
+            index = self._category_index[name].get_indexer(values.astype(str))
+            index[index < 0] = len(self.categories[name])  # "other"
+        index[missing] = self.n_bins[name]
+        return index
+
+    def to_dict(self) -> Dict:
+        return {
+            'edges': {name: e.tolist() for name, e in self.edges.items()},
+            'categories': self.categories,
+            'counts': self.counts.to_dict()['counts'] if self.counts is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> 'DriftReference':
+        return cls(state['edges'], state['categories'], state.get('counts'))
+
+    def save(self, path: str) -> None:
+        _write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> 'DriftReference':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class HistogramSketch:
+    """Mergeable per-feature bin counts of a scored population"""
+
+    def __init__(self, reference: DriftReference, counts: Optional[np.ndarray] = None):
+        self.reference = reference
+        self.counts = np.zeros(reference.size, dtype=np.int64) if counts is None else counts
+
+    @property
+    def n(self) -> int:
+        """Records counted (rows of the first feature)"""
+        if not self.reference.features:
+            return 0
+        return int(self.feature_counts(self.reference.features[0]).sum())
+
+    def feature_counts(self, name: str) -> np.ndarray:
+        """View of the counts of one feature: value bins, then missing"""
+        start = self.reference.offsets[name]
+        return self.counts[start:start + self.reference.n_bins[name] + 1]
+
+    def update(self, df: pd.DataFrame) -> 'HistogramSketch':
+        """Count a batch of records (monitored columns absent from df count as missing)"""
+        for name in self.reference.features:
+            counts = self.feature_counts(name)
+            if name in df.columns:
+                counts += np.bincount(self.reference.bin_indices(name, df[name]), minlength=len(counts))
+            else:
+                counts[-1] += len(df)
+        return self
+
+    def update_record(self, record: Dict[str, Any]) -> 'HistogramSketch':
+        """Count one record, e.g. the features of a scoring request"""
+        for name in self.reference.features:
+            self.counts[self.reference.offsets[name] + self.reference.bin_index(name, record.get(name))] += 1
+        return self
+
+    def merge(self, other: 'HistogramSketch') -> 'HistogramSketch':
+        """Add the counts of a sketch on the same reference"""
+        if other.reference.reference_id != self.reference.reference_id:
+            raise ValueError('Sketches on different drift references cannot be merged')
+        self.counts += other.counts
+        return self
+
+    def __add__(self, other: 'HistogramSketch') -> 'HistogramSketch':
+        return HistogramSketch(self.reference, self.counts.copy()).merge(other)
+
+    def psi(self, baseline: Optional['HistogramSketch'] = None,
+            epsilon: float = PSI_EPSILON) -> Dict[str, float]:
+        """
+        PSI (CSI for categorical features) of each feature against baseline
+        (default: the reference counts); features with no values are left out
+        """
+        baseline = baseline if baseline is not None else self.reference.counts
+        if baseline is None:
+            raise ValueError('The drift reference has no baseline counts')
+        results = {}
+        for name in self.reference.features:
+            psi = psi_from_counts(baseline.feature_counts(name)[:-1], self.feature_counts(name)[:-1], epsilon)
+            if not np.isnan(psi):
+                results[name] = psi
+        return results
+
+    def missing_rates(self) -> Dict[str, float]:
+        """Share of missing values of each feature"""
+        rates = {}
+        for name in self.reference.features:
+            counts = self.feature_counts(name)
+            rates[name] = float(counts[-1] / counts.sum()) if counts.sum() else float('nan')
+        return rates
+
+    def to_dict(self) -> Dict:
+        return {
+            'reference_id': self.reference.reference_id,
+            'n': self.n,
+            'counts': {name: self.feature_counts(name).tolist() for name in self.reference.features},
+        }
+
+    @classmethod
+    def from_dict(cls, reference: DriftReference, state: Dict) -> 'HistogramSketch':
+        if state['reference_id'] != reference.reference_id:
+            raise ValueError('Sketch was counted on a different drift reference')
+        sketch = cls(reference)
+        for name, values in state['counts'].items():
+            sketch.feature_counts(name)[:] = values
+        return sketch
+
+
+class SketchStore:
+    """
+    Directory of per-day sketches on one drift reference (reference.json)
+
+    Each writer (e.g. each API worker process) merges into its own file per
+    day, <day>.<writer>.json, so writers never need a lock; reading a day
+    merges the files of all writers.
+    """
+
+    def __init__(self, directory: str, reference: Optional[DriftReference] = None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'reference.json')
+        if reference is None:
+            reference = DriftReference.load(path)
+        elif not os.path.exists(path):
+            reference.save(path)
+        elif DriftReference.load(path).reference_id != reference.reference_id:
+            raise ValueError(f'{directory} holds sketches of a different drift reference')
+        self.reference = reference
+
+    def path(self, day: Day, writer: Optional[str] = None) -> str:
+        name = _day(day).isoformat() if writer is None else f'{_day(day).isoformat()}.{writer}'
+        return os.path.join(self.directory, f'{name}.json')
+
+    def _files(self) -> Dict[date, List[str]]:
+        """{day: sketch files of all writers}"""
+        files = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                day = date.fromisoformat(name.split('.')[0])
+            except ValueError:
+                continue
+            files.setdefault(day, []).append(os.path.join(self.directory, name))
+        return files
+
+    def _read(self, path: str) -> HistogramSketch:
+        with open(path) as f:
+            return HistogramSketch.from_dict(self.reference, json.load(f))
+
+    def days(self) -> List[date]:
+        """Days with a sketch, in order"""
+        return sorted(self._files())
+
+    def load(self, day: Day) -> HistogramSketch:
+        """The sketch of day, all writers merged (empty if none)"""
+        merged = self.reference.new_sketch()
+        for path in self._files().get(_day(day), []):
+            merged.merge(self._read(path))
+        return merged
+
+    def add(self, sketch: HistogramSketch, day: Optional[Day] = None,
+            writer: Optional[str] = None) -> HistogramSketch:
+        """Merge sketch into writer's sketch of day (default: today); returns that sketch"""
+        path = self.path(day or date.today(), writer)
+        merged = self._read(path) if os.path.exists(path) else self.reference.new_sketch()
+        merged.merge(sketch)
+        _write_json(path, merged.to_dict())
+        return merged
+
+    def window(self, start: Optional[Day] = None, end: Optional[Day] = None) -> HistogramSketch:
+        """Merged sketch of the days from start to end, inclusive (default: all days)"""
+        start, end = _day(start) if start else None, _day(end) if end else None
+        merged = self.reference.new_sketch()
+        for day, paths in self._files().items():
+            if (start is None or day >= start) and (end is None or day <= end):
+                for path in paths:
+                    merged.merge(self._read(path))
+        return merged
+
+    def rolling(self, days: int, end: Optional[Day] = None) -> HistogramSketch:
+        """Merged sketch of the last days days up to end (default: today)"""
+        end = _day(end or date.today())
+        return self.window(end - timedelta(days=days - 1), end)
+
+
+def _day(day: Day) -> date:
+    if isinstance(day, str):
+        return date.fromisoformat(day)
+    return day.date() if isinstance(day, datetime) else day
+
+
+def _write_json(path: str, state: Dict) -> None:
+    """Write atomically, so readers never see a partial file"""
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
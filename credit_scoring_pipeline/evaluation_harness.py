@@ -0,0 +1,437 @@
+"""
+Cross-validation and bootstrap evaluation harness
+=================================================
+
+evaluate_model() computes each metric once, on one test split. This
+harness adds the sampling distributions of the metrics:
+
+- bootstrap_metrics(): B bootstrap resamples of the test predictions. A
+  resample is a row of multinomial weights over the predictions, which are
+  sorted once, so AUC, KS, Gini, Brier score, calibration error (ECE) and
+  default rate of a whole batch of resamples are a few array operations
+  instead of B sorts. The same weights give every segment's metrics.
+- cross_validate(): stratified k-fold training of the LightGBM model, with
+  per-fold, out-of-fold and per-segment metrics
+- run_evaluation(): both of the above in one consolidated JSON report
+
+Bootstrap batches and folds run in a pool of n_workers processes that
+attach to the arrays (features, labels, predictions, segment codes) in
+shared memory instead of receiving pickled copies. Batch b and fold k
+draw from their own seeds, so results do not depend on n_workers.
+
+Usage:
+    report = run_evaluation(y_test, test_pred, segments_test={'persona': personas},
+                            X_cv=X, y_cv=y, params=params, num_boost_round=300,
+                            n_bootstrap=1000, n_folds=5, n_workers=4,
+                            output_path='evaluation/evaluation_report.json')
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+METRICS = ('auc', 'gini', 'ks', 'brier', 'ece', 'default_rate')
+QUANTILES = (0.025, 0.05, 0.25, 0.5, 0.75, 0.95, 0.975)
+CALIBRATION_BINS = 10
+
+# Parameters cross_validate() sets itself
+NON_FOLD_PARAMS = ('n_estimators', 'num_iterations', 'num_boost_round', 'early_stopping_rounds',
+                   'early_stopping_round', 'n_jobs', 'num_threads')
+
+# Weight matrix elements per bootstrap batch (float64: 8 bytes each)
+MAX_BATCH_ELEMENTS = 2_000_000
+
+# Arrays of the current task: attached shared memory in a worker,
+# the caller's arrays when running in-process
+_ARRAYS: Dict[str, np.ndarray] = {}
+_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+# ============================================================================
+# WEIGHTED METRICS
+# ============================================================================
+
+def tie_starts(sorted_values: np.ndarray) -> np.ndarray:
+    """Start positions of the runs of equal values in a sorted array"""
+    return np.flatnonzero(np.r_[True, np.diff(sorted_values) != 0])
+
+
+def weighted_metrics(w: np.ndarray, y: np.ndarray, p: np.ndarray,
+                     starts: Optional[np.ndarray] = None,
+                     n_bins: int = CALIBRATION_BINS) -> Dict[str, np.ndarray]:
+    """
+    Metrics under each row of sample weights w (rows: resamples, columns:
+    rows of y/p, which must be sorted by p)
+
+    Tied predictions count half in AUC, as in roc_auc_score. Metrics that
+    are undefined for a resample (e.g. AUC without defaults) are NaN.
+    """
+    w = np.atleast_2d(w).astype(float)
+    if starts is None:
+        starts = tie_starts(p)
+    if len(y) == 0:
+        return {name: np.full(len(w), np.nan) for name in METRICS}
+
+    positives = w * y
+    pos = np.add.reduceat(positives, starts, axis=1)
+    neg = np.add.reduceat(w - positives, starts, axis=1)
+    n_pos, n_neg = pos.sum(axis=1), neg.sum(axis=1)
+    total = n_pos + n_neg
+    cum_neg = np.cumsum(neg, axis=1)
+
+    # Equal-width probability bins are contiguous runs of the sorted predictions
+    bins = np.minimum((p * n_bins).astype(int), n_bins - 1)
+    bin_starts = tie_starts(bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        auc = (pos * (cum_neg - 0.5 * neg)).sum(axis=1) / (n_pos * n_neg)
+        ks = np.abs(np.cumsum(pos, axis=1) / n_pos[:, None] - cum_neg / n_neg[:, None]).max(axis=1)
+        brier = w @ (p - y) ** 2 / total
+        # Expected calibration error: |defaults - predicted defaults| summed over bins
+        observed = np.add.reduceat(positives, bin_starts, axis=1)
+        expected = np.add.reduceat(w * p, bin_starts, axis=1)
+        ece = np.abs(observed - expected).sum(axis=1) / total
+        default_rate = n_pos / total
+    return {'auc': auc, 'gini': 2 * auc - 1, 'ks': ks, 'brier': brier, 'ece': ece,
+            'default_rate': default_rate}
+
+
+def point_metrics(y: np.ndarray, p: np.ndarray) -> Dict[str, float]:
+    """Metrics of predictions p (any order)"""
+    order = np.argsort(p, kind='stable')
+    metrics = weighted_metrics(np.ones((1, len(y))), y[order], p[order])
+    return {name: float(values[0]) for name, values in metrics.items()}
+
+
+def calibration_table(y: np.ndarray, p: np.ndarray, n_bins: int = CALIBRATION_BINS) -> List[Dict]:
+    """Count, mean prediction and observed default rate per probability bin"""
+    bins = np.minimum((p * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=p, minlength=n_bins)
+    observed = np.bincount(bins, weights=y, minlength=n_bins)
+    return [
+        {'bin': f"{b / n_bins:.1f}-{(b + 1) / n_bins:.1f}", 'count': int(counts[b]),
+         'mean_predicted': float(predicted[b] / counts[b]), 'observed_rate': float(observed[b] / counts[b])}
+        for b in range(n_bins) if counts[b]
+    ]
+
+
+def summarize(values: np.ndarray, estimate: Optional[float] = None) -> Dict[str, Any]:
+    """Point estimate, mean, std, 95% percentile interval and quantiles of a metric distribution"""
+    values = np.asarray(values, dtype=float)
+    defined = values[~np.isnan(values)]
+    summary = {'estimate': estimate, 'n_defined': int(len(defined))}
+    if len(defined):
+        quantiles = np.quantile(defined, QUANTILES)
+        summary.update({
+            'mean': float(defined.mean()),
+            'std': float(defined.std(ddof=1)) if len(defined) > 1 else 0.0,
+            'ci_lower': float(quantiles[0]),
+            'ci_upper': float(quantiles[-1]),
+            'quantiles': {f"{q:g}": float(v) for q, v in zip(QUANTILES, quantiles)},
+        })
+    return summary
+
+
+# ============================================================================
+# SHARED MEMORY
+# ============================================================================
+
+class SharedArrays:
+    """Numpy arrays copied once into shared memory, attached by workers through spec"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.blocks = []
+        self.spec = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _attach(spec: Dict[str, tuple]) -> None:
+    """Pool initializer: map the shared arrays into this worker"""
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _BLOCKS.append(block)
+        _ARRAYS[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def _run(task, args_list: List[tuple], arrays: Dict[str, np.ndarray], n_workers: int) -> List[Any]:
+    """task(*args) for every args, in-process or in n_workers processes sharing arrays"""
+    if n_workers <= 1:
+        _ARRAYS.update(arrays)
+        try:
+            return [task(*args) for args in args_list]
+        finally:
+            _ARRAYS.clear()
+    with SharedArrays(arrays) as shared:
+        # spawn: forking a process that may hold BLAS/OpenMP threads is not safe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context,
+                                 initializer=_attach, initargs=(shared.spec,)) as executor:
+            return list(executor.map(task, *zip(*args_list)))
+
+
+# ============================================================================
+# BOOTSTRAP
+# ============================================================================
+
+def _segment_arrays(segments: Optional[Dict[str, np.ndarray]], order: np.ndarray) -> tuple:
+    """({'seg:<name>': codes in order}, {name: labels}) of the segment columns"""
+    arrays, labels = {}, {}
+    for name, values in (segments or {}).items():
+        codes, uniques = pd.factorize(pd.Series(np.asarray(values)), sort=True)
+        arrays[f'seg:{name}'] = codes[order]
+        labels[name] = [str(u) for u in uniques]
+    return arrays, labels
+
+
+def _bootstrap_batch(seed: int, batch: int, size: int, segment_labels: Dict[str, List[str]]) -> Dict:
+    """Metric arrays of bootstrap batch number batch (size resamples)"""
+    y, p = _ARRAYS['y'], _ARRAYS['p']
+    n = len(y)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(batch,)))
+    draws = rng.integers(0, n, size=(size, n))
+    w = np.bincount((draws + n * np.arange(size)[:, None]).ravel(), minlength=size * n).reshape(size, n)
+
+    result = {'overall': weighted_metrics(w, y, p, _ARRAYS['starts']), 'segments': {}}
+    for name, labels in segment_labels.items():
+        codes = _ARRAYS[f'seg:{name}']
+        result['segments'][name] = {}
+        for code, label in enumerate(labels):
+            mask = codes == code
+            result['segments'][name][label] = weighted_metrics(w[:, mask], y[mask], p[mask])
+    return result
+
+
+def bootstrap_metrics(y_true: np.ndarray, y_pred: np.ndarray,
+                      segments: Optional[Dict[str, np.ndarray]] = None,
+                      n_bootstrap: int = 1000, n_workers: int = 1,
+                      seed: int = 42, batch_size: int = 50) -> Dict:
+    """
+    Bootstrap distributions of the test metrics, overall and per segment
+
+    Args:
+        y_true: Test labels
+        y_pred: Predicted default probabilities
+        segments: {name: labels per row}, e.g. {'persona': ...}
+        n_bootstrap: Number of resamples
+        n_workers: Processes evaluating batches of resamples
+        seed: Seed of the resamples
+        batch_size: Resamples per batch (capped by MAX_BATCH_ELEMENTS)
+
+    Returns:
+        {'overall': {metric: summary}, 'segments': {name: {label: {'n', 'metrics'}}}}
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    order = np.argsort(y_pred, kind='stable')
+    y_sorted, p_sorted = y_true[order], y_pred[order]
+    segment_arrays, segment_labels = _segment_arrays(segments, order)
+    arrays = {'y': y_sorted, 'p': p_sorted, 'starts': tie_starts(p_sorted), **segment_arrays}
+
+    batch_size = max(1, min(batch_size, MAX_BATCH_ELEMENTS // max(len(y_true), 1)))
+    sizes = [min(batch_size, n_bootstrap - start) for start in range(0, n_bootstrap, batch_size)]
+    batches = _run(_bootstrap_batch, [(seed, b, size, segment_labels) for b, size in enumerate(sizes)],
+                   arrays, n_workers)
+
+    def collect(get):
+        return {name: np.concatenate([get(batch)[name] for batch in batches]) for name in METRICS}
+
+    estimates = point_metrics(y_true, y_pred)
+    report = {
+        'n_bootstrap': n_bootstrap,
+        'overall': {name: summarize(values, estimates[name])
+                    for name, values in collect(lambda b: b['overall']).items()},
+        'segments': {},
+    }
+    for name, labels in segment_labels.items():
+        codes = segment_arrays[f'seg:{name}']
+        report['segments'][name] = {}
+        for code, label in enumerate(labels):
+            mask = codes == code
+            seg_estimates = point_metrics(y_sorted[mask], p_sorted[mask])
+            distributions = collect(lambda b: b['segments'][name][label])
+            report['segments'][name][label] = {
+                'n': int(mask.sum()),
+                'metrics': {metric: summarize(values, seg_estimates[metric])
+                            for metric, values in distributions.items()},
+            }
+    return report
+
+
+# ============================================================================
+# CROSS-VALIDATION
+# ============================================================================
+
+def _cv_fold(fold: int, n_folds: int, seed: int, columns: List[str], dtypes: List[str],
+             categorical_features: List[str], params: Dict, num_boost_round: int,
+             segment_labels: Dict[str, List[str]]) -> Dict:
+    """Train on all folds but fold and evaluate on it"""
+    X = pd.DataFrame(_ARRAYS['X'], columns=columns).astype(dict(zip(columns, dtypes)))
+    y = _ARRAYS['y']
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    train_idx, test_idx = list(folds.split(np.zeros(len(y)), y))[fold]
+
+    train_data = lgb.Dataset(X.iloc[train_idx], label=y[train_idx],
+                             categorical_feature=categorical_features, params={'verbose': -1})
+    booster = lgb.train(params, train_data, num_boost_round=num_boost_round)
+    pred = booster.predict(X.iloc[test_idx])
+
+    result = {'fold': fold, 'test_idx': test_idx, 'pred': pred,
+              'metrics': point_metrics(y[test_idx], pred), 'segments': {}}
+    for name, labels in segment_labels.items():
+        codes = _ARRAYS[f'seg:{name}'][test_idx]
+        result['segments'][name] = {
+            label: point_metrics(y[test_idx][codes == code], pred[codes == code])
+            for code, label in enumerate(labels)
+        }
+    return result
+
+
+def cross_validate(X: pd.DataFrame, y: np.ndarray, params: Dict, num_boost_round: int,
+                   categorical_features: Optional[List[str]] = None,
+                   segments: Optional[Dict[str, np.ndarray]] = None,
+                   n_folds: int = 5, n_workers: int = 1, seed: int = 42) -> Dict:
+    """
+    Stratified k-fold training and evaluation of a LightGBM model
+
+    Args:
+        X: Preprocessed features
+        y: Labels
+        params: LightGBM parameters
+        num_boost_round: Boosting rounds per fold (e.g. the model's best iteration)
+        categorical_features: Categorical columns of X
+        segments: {name: labels per row of X}, e.g. {'persona': ...}
+        n_folds: Number of folds
+        n_workers: Processes training folds (LightGBM threads are split among them)
+        seed: Seed of the fold assignment
+
+    Returns:
+        {'folds': [...], 'summary': {metric: summary}, 'out_of_fold': {metric: value},
+         'segments': {name: {label: {metric: summary over folds}}}}
+    """
+    y = np.asarray(y, dtype=float)
+    segment_arrays, segment_labels = _segment_arrays(segments, np.arange(len(y)))
+    arrays = {'X': X.to_numpy(dtype=float), 'y': y, **segment_arrays}
+
+    # Rounds come from num_boost_round, threads are split among the workers
+    fold_params = {k: v for k, v in params.items() if k not in NON_FOLD_PARAMS}
+    fold_params['verbose'] = -1
+    fold_params['num_threads'] = max(1, (os.cpu_count() or 1) // max(n_workers, 1))
+    args = (n_folds, seed, list(X.columns), [str(d) for d in X.dtypes],
+            list(categorical_features or []), fold_params, num_boost_round, segment_labels)
+    folds = _run(_cv_fold, [(fold, *args) for fold in range(n_folds)], arrays, n_workers)
+
+    oof = np.empty(len(y))
+    for result in folds:
+        oof[result['test_idx']] = result['pred']
+    fold_metrics = [dict(fold=result['fold'], n=len(result['test_idx']), **result['metrics'])
+                    for result in folds]
+    return {
+        'n_folds': n_folds,
+        'num_boost_round': num_boost_round,
+        'folds': fold_metrics,
+        'summary': {name: summarize([m[name] for m in fold_metrics]) for name in METRICS},
+        'out_of_fold': point_metrics(y, oof),
+        'segments': {
+            name: {label: {metric: summarize([r['segments'][name][label][metric] for r in folds])
+                           for metric in METRICS}
+                   for label in labels}
+            for name, labels in segment_labels.items()
+        },
+    }
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def run_evaluation(y_test: np.ndarray, test_pred: np.ndarray,
+                   segments_test: Optional[Dict[str, np.ndarray]] = None,
+                   X_cv: Optional[pd.DataFrame] = None, y_cv: Optional[np.ndarray] = None,
+                   params: Optional[Dict] = None, num_boost_round: Optional[int] = None,
+                   categorical_features: Optional[List[str]] = None,
+                   segments_cv: Optional[Dict[str, np.ndarray]] = None,
+                   n_bootstrap: int = 1000, n_folds: int = 5, n_workers: int = 1,
+                   seed: int = 42, output_path: Optional[str] = None) -> Dict:
+    """
+    Bootstrap the test metrics and (when X_cv is given and n_folds > 1)
+    cross-validate the model, into one report
+
+    Returns:
+        The report, also written as JSON to output_path when given
+    """
+    y_test = np.asarray(y_test, dtype=float)
+    test_pred = np.asarray(test_pred, dtype=float)
+    report = {
+        'settings': {'n_bootstrap': n_bootstrap, 'n_folds': n_folds, 'n_workers': n_workers,
+                     'seed': seed, 'test_samples': len(y_test)},
+        'test': point_metrics(y_test, test_pred),
+        'calibration': calibration_table(y_test, test_pred),
+        'timing': {},
+    }
+    if n_bootstrap > 0:
+        start = time.perf_counter()
+        report['bootstrap'] = bootstrap_metrics(y_test, test_pred, segments_test, n_bootstrap,
+                                                n_workers=n_workers, seed=seed)
+        report['timing']['bootstrap_s'] = time.perf_counter() - start
+    if X_cv is not None and n_folds > 1:
+        start = time.perf_counter()
+        report['cross_validation'] = cross_validate(X_cv, y_cv, params, num_boost_round,
+                                                    categorical_features, segments_cv,
+                                                    n_folds=n_folds, n_workers=n_workers, seed=seed)
+        report['timing']['cross_validation_s'] = time.perf_counter() - start
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2, default=float)
+    return report
+
+
+def print_report(report: Dict, metrics: tuple = ('auc', 'gini', 'ks')) -> None:
+    """Print the confidence intervals and cross-validation summary of a report"""
+    if 'bootstrap' in report:
+        bootstrap = report['bootstrap']
+        print(f"\nBootstrap 95% intervals ({bootstrap['n_bootstrap']} resamples):")
+        for name in metrics:
+            summary = bootstrap['overall'][name]
+            print(f"  {name.upper():<5} {summary['estimate']:.4f}  "
+                  f"[{summary.get('ci_lower', np.nan):.4f}, {summary.get('ci_upper', np.nan):.4f}]")
+        for segment, groups in bootstrap['segments'].items():
+            print(f"  AUC by {segment}:")
+            for label, group in groups.items():
+                summary = group['metrics']['auc']
+                print(f"    {label:<24} n={group['n']:<7} {summary['estimate']:.4f}  "
+                      f"[{summary.get('ci_lower', np.nan):.4f}, {summary.get('ci_upper', np.nan):.4f}]")
+    if 'cross_validation' in report:
+        cv = report['cross_validation']
+        print(f"\n{cv['n_folds']}-fold cross-validation ({cv['num_boost_round']} rounds):")
+        for name in metrics:
+            summary = cv['summary'][name]
+            print(f"  {name.upper():<5} {summary['mean']:.4f} ± {summary['std']:.4f}  "
+                  f"(out-of-fold {cv['out_of_fold'][name]:.4f})")
@@ -0,0 +1,374 @@
+"""
+Fairness engine
+===============
+
+demographic_parity_check() and equal_opportunity_check() filter one
+attribute's groups out of the full arrays, one group at a time. This
+module audits many attributes and their intersections in one pass over
+chunks of scored applications:
+
+- FairnessAccumulator: counts per cell, i.e. per combination of all
+  audited attributes, and outcome type (label: good / default /
+  unlabelled, declined at the threshold, probability bin), with the sums
+  of the probability and score. Chunks are grouped into this table and
+  added, so memory stays at one chunk plus the table, and accumulators of
+  separate chunks or days merge by adding
+- fairness_report(): every group of every grouping (single attributes and
+  their intersections) is a sum of cells, so parity (approval rate, mean
+  score), equal opportunity (TPR, FPR) and calibration by group (mean
+  predicted vs observed default rate, ECE) all come from the table
+- Bootstrap intervals by the Poisson bootstrap: each application gets a
+  Poisson(1) weight per replicate, and the weights of the c applications
+  of a cell and type sum to a Poisson(c) draw. Replicates are drawn per
+  table row, never per application; counts are exact, and probability and
+  score sums take the row mean (their intervals ignore the spread within
+  a probability bin). Disparities (highest minus lowest group) are
+  biased upward under resampling, so with many small groups their
+  interval can sit above the point estimate
+
+Usage:
+    accumulator = FairnessAccumulator(['location_tier', 'employment_type'])
+    for chunk in read_chunks('scored/2026-Q3/', columns=accumulator.columns):
+        accumulator.update(chunk)
+    report = fairness_report(accumulator, n_bootstrap=200)
+"""
+
+import warnings
+from itertools import combinations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_PROB_BINS = 100
+CALIBRATION_BINS = 10
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Label codes of the outcome types
+GOOD, DEFAULT, UNLABELLED = 0, 1, 2
+MISSING_GROUP = 'missing'
+GROUP_SEPARATOR = ' | '
+
+# Group metrics and the disparity checks on them
+METRICS = ('approval_rate', 'mean_probability', 'mean_score', 'default_rate', 'tpr', 'fpr',
+           'calibration_gap', 'ece')
+DISPARITY_METRICS = ('approval_rate', 'mean_score', 'tpr', 'fpr', 'calibration_gap')
+
+# Bootstrap replicates x table rows per batch
+MAX_BATCH_ELEMENTS = 4_000_000
+
+TYPE_COLUMNS = ['label', 'declined', 'prob_bin']
+
+
+class FairnessAccumulator:
+    """Mergeable counts of scored applications per attribute cell and outcome type"""
+
+    def __init__(self, attributes: Sequence[str], threshold: float = DEFAULT_THRESHOLD,
+                 probability_col: str = 'model_probability', label_col: Optional[str] = 'default_90dpd',
+                 score_col: Optional[str] = None, n_prob_bins: int = DEFAULT_PROB_BINS):
+        """
+        Args:
+            attributes: Protected attribute columns
+            threshold: Default probability from which an application is declined
+            probability_col: Predicted default probability column
+            label_col: Observed default column (missing or NaN: not yet observed)
+            score_col: Credit score column, for mean score parity
+            n_prob_bins: Probability bins of the outcome types (a multiple of CALIBRATION_BINS)
+        """
+        self.attributes = list(attributes)
+        self.threshold = threshold
+        self.probability_col = probability_col
+        self.label_col = label_col
+        self.score_col = score_col
+        self.n_prob_bins = n_prob_bins
+        self.table: Optional[pd.DataFrame] = None
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns update() reads"""
+        return self.attributes + [c for c in (self.probability_col, self.label_col, self.score_col) if c]
+
+    @property
+    def n(self) -> int:
+        return int(self.table['count'].sum()) if self.table is not None else 0
+
+    def update(self, chunk: pd.DataFrame) -> 'FairnessAccumulator':
+        """Add a chunk of scored applications"""
+        p = chunk[self.probability_col].to_numpy(dtype=float)
+        if self.label_col and self.label_col in chunk:
+            y = chunk[self.label_col].to_numpy(dtype=float)
+            label = np.where(np.isnan(y), UNLABELLED, (y > 0).astype(int))
+        else:
+            label = np.full(len(p), UNLABELLED)
+        frame = pd.DataFrame({
+            **{attr: chunk[attr].astype(str).where(chunk[attr].notna(), MISSING_GROUP).to_numpy()
+               for attr in self.attributes},
+            'label': label,
+            'declined': p >= self.threshold,
+            'prob_bin': np.minimum((p * self.n_prob_bins).astype(int), self.n_prob_bins - 1),
+            'count': 1,
+            'sum_p': p,
+            'sum_score': chunk[self.score_col].to_numpy(dtype=float) if self.score_col else 0.0,
+        })
+        counts = frame.groupby(self.attributes + TYPE_COLUMNS, sort=False).sum()
+        return self._add(counts)
+
+    def merge(self, other: 'FairnessAccumulator') -> 'FairnessAccumulator':
+        """Add the counts of an accumulator with the same settings"""
+        if (other.attributes, other.threshold, other.n_prob_bins) != (
+                self.attributes, self.threshold, self.n_prob_bins):
+            raise ValueError('Fairness accumulators differ in attributes, threshold or bins')
+        return self._add(other.table) if other.table is not None else self
+
+    def _add(self, counts: pd.DataFrame) -> 'FairnessAccumulator':
+        self.table = counts if self.table is None else self.table.add(counts, fill_value=0)
+        return self
+
+
+def read_chunks(path: str, columns: Optional[List[str]] = None,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Chunks of a CSV file or a Parquet file or directory, chunk_rows rows at a time"""
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+        return
+    import pyarrow.dataset as ds
+    for batch in ds.dataset(path, format='parquet').to_batches(columns=columns, batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def audit_chunks(chunks: Iterable[pd.DataFrame], attributes: Sequence[str],
+                 accumulator_kwargs: Optional[Dict] = None, **report_kwargs) -> Dict[str, Any]:
+    """Fairness report of a stream of scored chunks"""
+    accumulator = FairnessAccumulator(attributes, **(accumulator_kwargs or {}))
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return fairness_report(accumulator, **report_kwargs)
+
+
+def _indicator(codes: np.ndarray, n_groups: int) -> sparse.csr_matrix:
+    """Groups x table rows indicator, so group sums are one sparse product"""
+    return sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                             shape=(n_groups, len(codes)))
+
+
+def _group_sums(row_stats: Dict[str, np.ndarray], groups: sparse.csr_matrix,
+                calibration_groups: sparse.csr_matrix) -> Dict[str, np.ndarray]:
+    """Stats summed per group (rows: table rows, optionally x replicates)"""
+    sums = {name: groups @ values for name, values in row_stats.items()}
+    # ECE: labelled-weighted |mean predicted - observed| per calibration bin = sum |sum_p - defaults| / labelled
+    gaps = np.abs(calibration_groups @ (row_stats['sum_p_labelled'] - row_stats['defaults']))
+    sums['abs_gap'] = gaps.reshape((groups.shape[0], CALIBRATION_BINS) + gaps.shape[1:]).sum(axis=1)
+    return sums
+
+
+def _group_metrics(sums: Dict[str, np.ndarray], has_score: bool) -> Dict[str, np.ndarray]:
+    """Group metrics from group sums (NaN where undefined)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n, labelled, defaults = sums['count'], sums['labelled'], sums['defaults']
+        goods = labelled - defaults
+        default_rate = defaults / labelled
+        return {
+            'approval_rate': 1 - sums['declined'] / n,
+            'mean_probability': sums['sum_p'] / n,
+            'mean_score': sums['sum_score'] / n if has_score else np.full(n.shape, np.nan),
+            'default_rate': default_rate,
+            'tpr': sums['true_positives'] / defaults,
+            'fpr': sums['false_positives'] / goods,
+            'calibration_gap': sums['sum_p_labelled'] / labelled - default_rate,
+            'ece': sums['abs_gap'] / labelled,
+        }
+
+
+def _interval(values: np.ndarray, ci: float) -> tuple:
+    """Percentile interval along the last axis, ignoring undefined replicates"""
+    if values.shape[-1] == 0:
+        nan = np.full(values.shape[:-1], np.nan)
+        return nan, nan
+    alpha = (1 - ci) / 2
+    with warnings.catch_warnings():
+        # All-NaN rows are expected for groups without outcomes
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanquantile(values, alpha, axis=-1), np.nanquantile(values, 1 - alpha, axis=-1)
+
+
+def _value(estimate: float, lower: float, upper: float) -> Dict[str, Optional[float]]:
+    def clean(v):
+        return None if v is None or np.isnan(v) else float(v)
+    return {'estimate': clean(estimate), 'ci_lower': clean(lower), 'ci_upper': clean(upper)}
+
+
+def _spread(values: np.ndarray, eligible: np.ndarray) -> tuple:
+    """Max - min and min / max over the eligible groups (rows), per column"""
+    values = np.where(eligible.reshape((-1,) + (1,) * (values.ndim - 1)), values, np.nan)
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        high, low = np.nanmax(values, axis=0), np.nanmin(values, axis=0)
+        return high - low, low / high
+
+
+def fairness_report(accumulator: FairnessAccumulator,
+                    groupings: Optional[List[Sequence[str]]] = None,
+                    max_order: int = 2,
+                    n_bootstrap: int = 200,
+                    ci: float = 0.95,
+                    seed: int = 42,
+                    min_group_size: int = 30,
+                    parity_ratio: float = 0.8,
+                    opportunity_threshold: float = 0.05,
+                    calibration_threshold: float = 0.05) -> Dict[str, Any]:
+    """
+    Parity, equal opportunity and calibration by group, with bootstrap intervals
+
+    Args:
+        accumulator: Accumulated scored applications
+        groupings: Attribute combinations to audit (default: every
+            combination of up to max_order attributes)
+        max_order: Largest intersection of the default groupings
+        n_bootstrap: Poisson bootstrap replicates (0: point estimates only)
+        ci: Interval coverage
+        seed: Random seed of the replicates
+        min_group_size: Groups smaller than this are reported but left out of the checks
+        parity_ratio: Minimum ratio of the lowest to the highest approval rate (four-fifths rule)
+        opportunity_threshold: Maximum TPR (and FPR) difference between groups
+        calibration_threshold: Maximum calibration gap difference between groups
+
+    Returns:
+        Report per grouping: group metrics, disparities with intervals and
+        check results, plus the list of violated checks
+    """
+    table = accumulator.table
+    if table is None:
+        raise ValueError('No scored applications accumulated')
+    attributes = accumulator.attributes
+    if groupings is None:
+        groupings = [list(c) for order in range(1, max_order + 1) for c in combinations(attributes, order)]
+    has_score = accumulator.score_col is not None
+
+    types = table.index.to_frame(index=False)
+    count = table['count'].to_numpy(dtype=float)
+    label = types['label'].to_numpy()
+    declined = types['declined'].to_numpy(dtype=float)
+    is_labelled = (label != UNLABELLED).astype(float)
+    is_default = (label == DEFAULT).astype(float)
+    mean_p = table['sum_p'].to_numpy(dtype=float) / count
+    mean_score = table['sum_score'].to_numpy(dtype=float) / count
+    calibration_bin = types['prob_bin'].to_numpy() * CALIBRATION_BINS // accumulator.n_prob_bins
+
+    def row_stats(weights: np.ndarray) -> Dict[str, np.ndarray]:
+        """Stats per table row for application counts weights (rows, or rows x replicates)"""
+        def scale(v):
+            return v.reshape((-1,) + (1,) * (weights.ndim - 1))
+        return {
+            'count': weights,
+            'declined': weights * scale(declined),
+            'labelled': weights * scale(is_labelled),
+            'defaults': weights * scale(is_default),
+            'true_positives': weights * scale(is_default * declined),
+            'false_positives': weights * scale((label == GOOD) * declined),
+            'sum_p': weights * scale(mean_p),
+            'sum_p_labelled': weights * scale(mean_p * is_labelled),
+            'sum_score': weights * scale(mean_score),
+        }
+
+    # Group codes of every table row, per grouping
+    encoded = []
+    for grouping in groupings:
+        keys = types[grouping[0]]
+        for attr in grouping[1:]:
+            keys = keys + GROUP_SEPARATOR + types[attr]
+        codes, names = pd.factorize(keys, sort=True)
+        encoded.append((list(grouping), list(names), _indicator(codes, len(names)),
+                        _indicator(codes * CALIBRATION_BINS + calibration_bin, len(names) * CALIBRATION_BINS)))
+
+    point_stats = row_stats(count)
+    point = []
+    for grouping, names, groups, calibration_groups in encoded:
+        sums = _group_sums(point_stats, groups, calibration_groups)
+        point.append((sums, _group_metrics(sums, has_score)))
+
+    # Bootstrap metrics per grouping: {metric: groups x replicates}
+    replicates = [{m: [] for m in METRICS} for _ in encoded]
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(n_bootstrap, MAX_BATCH_ELEMENTS // max(len(count), 1)))
+    for start in range(0, n_bootstrap, batch):
+        size = min(batch, n_bootstrap - start)
+        weights = rng.poisson(count[:, None], (len(count), size)).astype(float)
+        stats = row_stats(weights)
+        for (grouping, names, groups, calibration_groups), metrics in zip(encoded, replicates):
+            group_metrics = _group_metrics(_group_sums(stats, groups, calibration_groups), has_score)
+            for metric in METRICS:
+                metrics[metric].append(group_metrics[metric])
+
+    report = {
+        'n_applications': accumulator.n,
+        'n_labelled': int(point_stats['labelled'].sum()),
+        'threshold': accumulator.threshold,
+        'n_bootstrap': n_bootstrap,
+        'ci': ci,
+        'min_group_size': min_group_size,
+        'groupings': {},
+        'violations': [],
+    }
+    limits = {'approval_rate': None, 'tpr': opportunity_threshold, 'fpr': opportunity_threshold,
+              'calibration_gap': calibration_threshold, 'mean_score': None}
+
+    for (grouping, names, _, _), (sums, metrics), boot in zip(encoded, point, replicates):
+        boot = {m: np.concatenate(v, axis=1) if v else np.empty((len(names), 0)) for m, v in boot.items()}
+        eligible = sums['count'] >= min_group_size
+        intervals = {m: _interval(boot[m], ci) for m in METRICS}
+
+        groups = {}
+        for g, name in enumerate(names):
+            groups[name] = {
+                'count': int(sums['count'][g]),
+                'labelled': int(sums['labelled'][g]),
+                'checked': bool(eligible[g]),
+                **{m: _value(metrics[m][g], intervals[m][0][g], intervals[m][1][g])
+                   for m in METRICS if has_score or m != 'mean_score'},
+            }
+
+        disparities, checks = {}, {}
+        for metric in DISPARITY_METRICS:
+            if metric == 'mean_score' and not has_score:
+                continue
+            values = np.where(eligible, metrics[metric], np.nan)
+            if np.sum(~np.isnan(values)) < 2:
+                continue
+            difference, ratio = _spread(metrics[metric], eligible)
+            boot_difference, boot_ratio = _spread(boot[metric], eligible)
+            disparity = {
+                'difference': _value(difference, *_interval(boot_difference, ci)),
+                'highest': names[int(np.nanargmax(values))],
+                'lowest': names[int(np.nanargmin(values))],
+            }
+            if metric == 'approval_rate':
+                disparity['ratio'] = _value(ratio, *_interval(boot_ratio, ci))
+                checks['parity_satisfied'] = bool(ratio >= parity_ratio)
+                if ratio < parity_ratio:
+                    report['violations'].append({'grouping': ' x '.join(grouping), 'check': 'parity',
+                                                 'metric': metric, 'value': float(ratio),
+                                                 'threshold': parity_ratio})
+            elif limits[metric] is not None:
+                check = 'calibration_satisfied' if metric == 'calibration_gap' else 'equal_opportunity_satisfied'
+                satisfied = bool(difference <= limits[metric])
+                checks[check] = checks.get(check, True) and satisfied
+                if not satisfied:
+                    report['violations'].append({
+                        'grouping': ' x '.join(grouping),
+                        'check': check.replace('_satisfied', ''),
+                        'metric': metric, 'value': float(difference), 'threshold': limits[metric]})
+            disparities[metric] = disparity
+
+        report['groupings'][' x '.join(grouping)] = {
+            'attributes': grouping,
+            'n_groups': len(names),
+            'groups': groups,
+            'disparities': disparities,
+            **checks,
+        }
+
+    report['recommendation'] = ('Investigate group disparities' if report['violations']
+                                else 'No action required')
+    return report
@@ -0,0 +1,68 @@
+"""
+Fast JSON responses for the FastAPI apps
+========================================
+
+FastResponse renders with orjson and serializes numpy arrays/scalars and
+pandas values (DataFrames as records) natively. Without orjson the stdlib
+json module is used with the same conversions.
+
+It is the app-wide default_response_class, but FastAPI passes a route's
+return value through jsonable_encoder before render(), and that step
+fails on numpy values and walks every record of large payloads. Routes
+returning model outputs or frames therefore return FastResponse(content)
+themselves, which skips the encoder:
+
+    return FastResponse({'grid': grid_df, 'total': limits.sum()})
+
+For every other route the default only replaces the final json.dumps.
+"""
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def default(obj: Any) -> Any:
+    """Serialize values orjson does not handle natively (NaN/NaT -> null)"""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'tolist'):  # Series, Index, object ndarrays
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    class FastResponse(JSONResponse):
+        """JSONResponse rendered by orjson with numpy/pandas support"""
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(
+                content, default=default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+else:  # pragma: no cover
+    class FastResponse(JSONResponse):
+        """Stdlib fallback with the same numpy/pandas handling"""
+
+        def render(self, content: Any) -> bytes:
+            return json.dumps(content, default=default, separators=(',', ':')).encode('utf-8')
@@ -22,6 +22,10 @@ from dataclasses import dataclass
 import json
 import warnings
 
+from drift_sketch import HistogramSketch, psi_from_counts, quantile_edges
+from fairness_engine import FairnessAccumulator, fairness_report
+from performance_store import PerformanceStore
+
 warnings.filterwarnings('ignore')
 
 
@@ -49,24 +53,13 @@ def calculate_psi(expected: np.ndarray, actual: np.ndarray,
         PSI value
     """
     # Create bins based on expected distribution
-    breakpoints = np.percentile(expected, np.linspace(0, 100, n_bins + 1))
-    breakpoints[0] = -np.inf
-    breakpoints[-1] = np.inf
-    
-    # Make breakpoints unique
-    breakpoints = np.unique(breakpoints)
+    breakpoints = quantile_edges(expected, n_bins)
     
-    # Calculate proportions in each bin
+    # Calculate PSI from the counts in each bin
     expected_counts = np.histogram(expected, bins=breakpoints)[0]
     actual_counts = np.histogram(actual, bins=breakpoints)[0]
     
-    expected_pct = expected_counts / len(expected) + epsilon
-    actual_pct = actual_counts / len(actual) + epsilon
-    
-    # Calculate PSI
-    psi = np.sum((actual_pct - expected_pct) * np.log(actual_pct / expected_pct))
-    
-    return float(psi)
+    return psi_from_counts(expected_counts, actual_counts, epsilon)
 
 
 def calculate_feature_psi(baseline_df: pd.DataFrame, 
@@ -265,13 +258,54 @@ class PerformanceSnapshot:
 class PerformanceMonitor:
     """
     Track model performance over time and detect degradation.
+    
+    Without a store, snapshots are computed from the predictions and
+    outcomes passed to add_snapshot() and kept in memory. With a
+    PerformanceStore, predictions and late outcomes are logged to it and
+    degradation and trends are read from its rolling windows, so they
+    survive restarts and never rescan the history. The baseline AUC is
+    kept in the store too: a baseline_auc passed in replaces the stored
+    one, otherwise the stored one is used.
     """
     
     def __init__(self, baseline_auc: float = None, 
-                 degradation_threshold: float = 0.02):
+                 degradation_threshold: float = 0.02,
+                 store: Optional[PerformanceStore] = None,
+                 window_days: int = 90):
         self.baseline_auc = baseline_auc
         self.degradation_threshold = degradation_threshold
+        self.store = store
+        self.window_days = window_days
         self.history: List[PerformanceSnapshot] = []
+        
+        if store is not None:
+            if baseline_auc is None:
+                self.baseline_auc = store.baseline_auc()
+            else:
+                store.set_baseline_auc(baseline_auc)
+    
+    def log_predictions(self, application_ids, probabilities, timestamps=None,
+                        segments=None) -> int:
+        """Log scored applications to the store"""
+        return self.store.log_predictions(application_ids, probabilities, timestamps, segments)
+    
+    def record_outcomes(self, application_ids, outcomes) -> Dict[str, int]:
+        """Join observed outcomes to the logged applications by ID"""
+        return self.store.record_outcomes(application_ids, outcomes)
+    
+    def window_snapshot(self, window_days: int = None, end=None,
+                        segment: str = None) -> Optional[PerformanceSnapshot]:
+        """Snapshot of the applications scored in the rolling window (None without outcomes of both kinds)"""
+        window_days = window_days or self.window_days
+        metrics = self.store.rolling(window_days, end, segment)
+        if metrics['auc'] is None:
+            return None
+        
+        snapshot = _snapshot_from_metrics(metrics, datetime.utcnow())
+        if self.baseline_auc is None:
+            self.baseline_auc = snapshot.auc
+            self.store.set_baseline_auc(snapshot.auc)
+        return snapshot
     
     def add_snapshot(self, y_true: np.ndarray, y_pred: np.ndarray,
                      timestamp: datetime = None) -> PerformanceSnapshot:
@@ -311,11 +345,12 @@ class PerformanceMonitor:
         return snapshot
     
     def check_degradation(self) -> Dict:
-        """Check for performance degradation"""
-        if not self.history or self.baseline_auc is None:
+        """Check for performance degradation (over the rolling window, with a store)"""
+        latest = self.window_snapshot() if self.store is not None else (
+            self.history[-1] if self.history else None)
+        if latest is None or self.baseline_auc is None:
             return {'status': 'UNKNOWN', 'message': 'Insufficient history'}
         
-        latest = self.history[-1]
         auc_drop = self.baseline_auc - latest.auc
         
         if auc_drop > self.degradation_threshold:
@@ -338,12 +373,16 @@ class PerformanceMonitor:
         }
     
     def get_trend(self, window_days: int = 30) -> Dict:
-        """Get performance trend over time"""
-        if len(self.history) < 2:
-            return {'trend': 'INSUFFICIENT_DATA', 'snapshots': len(self.history)}
-        
-        cutoff = datetime.utcnow() - timedelta(days=window_days)
-        recent = [s for s in self.history if s.timestamp >= cutoff]
+        """Get performance trend over time (of the daily cohorts, with a store)"""
+        if self.store is not None:
+            start = datetime.utcnow().date() - timedelta(days=window_days - 1)
+            recent = [
+                _snapshot_from_metrics(m, datetime.fromisoformat(m['day']))
+                for m in self.store.daily(start) if m['auc'] is not None
+            ]
+        else:
+            cutoff = datetime.utcnow() - timedelta(days=window_days)
+            recent = [s for s in self.history if s.timestamp >= cutoff]
         
         if len(recent) < 2:
             return {'trend': 'INSUFFICIENT_DATA', 'snapshots': len(recent)}
@@ -369,6 +408,19 @@ class PerformanceMonitor:
         }
 
 
+def _snapshot_from_metrics(metrics: Dict, timestamp: datetime) -> PerformanceSnapshot:
+    """PerformanceSnapshot of PerformanceStore metrics"""
+    return PerformanceSnapshot(
+        timestamp=timestamp,
+        auc=metrics['auc'],
+        gini=metrics['gini'],
+        ks_statistic=metrics['ks_statistic'],
+        brier_score=metrics['brier_score'],
+        n_samples=metrics['n_labelled'],
+        default_rate=metrics['default_rate']
+    )
+
+
 # ============================================================================
 # FAIRNESS MONITORING
 # ============================================================================
@@ -553,7 +605,11 @@ def generate_monitoring_report(
     baseline_calibration: Dict = None,
     current_calibration: Dict = None,
     days_since_training: int = None,
-    output_path: str = None
+    output_path: str = None,
+    current_sketch: Optional[HistogramSketch] = None,
+    performance_store: Optional[PerformanceStore] = None,
+    performance_window_days: int = 90,
+    fairness: Optional[FairnessAccumulator] = None
 ) -> Dict:
     """
     Generate comprehensive monitoring report.
@@ -567,6 +623,15 @@ def generate_monitoring_report(
         current_calibration: Current calibration metrics
         days_since_training: Days since model was trained
         output_path: Path to save report JSON
+        current_sketch: Histogram sketch of the current window (drift_sketch);
+            PSI then comes from its counts against its drift reference
+            instead of from baseline_data/current_data
+        performance_store: Store of logged predictions and outcomes; without
+            y_true/y_pred, performance and current calibration come from
+            its last performance_window_days days
+        performance_window_days: Rolling window read from performance_store
+        fairness: Accumulated scored applications (fairness_engine) to audit
+            by protected attribute and their intersections
         
     Returns:
         Comprehensive monitoring report
@@ -577,14 +642,25 @@ def generate_monitoring_report(
         'psi_analysis': None,
         'calibration_analysis': None,
         'performance_analysis': None,
+        'fairness_analysis': None,
         'retraining_recommendation': None
     }
     
     # PSI Analysis
-    if baseline_data is not None and current_data is not None:
+    if current_sketch is not None:
+        report['psi_analysis'] = psi_report(current_sketch.psi())
+    elif baseline_data is not None and current_data is not None:
         psi_values = calculate_feature_psi(baseline_data, current_data)
         report['psi_analysis'] = psi_report(psi_values)
     
+    window_metrics = None
+    if performance_store is not None and y_true is None:
+        window_metrics = performance_store.rolling(performance_window_days)
+        if window_metrics['auc'] is None:
+            window_metrics = None
+        elif current_calibration is None:
+            current_calibration = window_metrics['calibration']
+    
     # Calibration Analysis
     if baseline_calibration is not None and current_calibration is not None:
         report['calibration_analysis'] = calibration_drift_check(
@@ -603,6 +679,17 @@ def generate_monitoring_report(
             'n_samples': snapshot.n_samples,
             'default_rate': snapshot.default_rate
         }
+    elif window_metrics is not None:
+        report['performance_analysis'] = {
+            key: window_metrics[key]
+            for key in ('auc', 'gini', 'ks_statistic', 'brier_score', 'default_rate',
+                        'start', 'end', 'confusion', 'rank_order')
+        }
+        report['performance_analysis']['n_samples'] = window_metrics['n_labelled']
+    
+    # Fairness Analysis
+    if fairness is not None:
+        report['fairness_analysis'] = fairness_report(fairness)
     
     # Retraining Recommendation
     recommendation = get_retraining_recommendation(
@@ -622,9 +709,10 @@ def generate_monitoring_report(
     # Summary
     report['summary'] = {
         'overall_status': recommendation.urgency,
-        'psi_status': report.get('psi_analysis', {}).get('summary', {}).get('overall_status', 'UNKNOWN'),
-        'calibration_drift': report.get('calibration_analysis', {}).get('drift_detected', False),
+        'psi_status': (report['psi_analysis'] or {}).get('summary', {}).get('overall_status', 'UNKNOWN'),
+        'calibration_drift': (report['calibration_analysis'] or {}).get('drift_detected', False),
         'retraining_required': recommendation.should_retrain,
+        'fairness_violations': len((report['fairness_analysis'] or {}).get('violations', [])),
         'days_since_training': days_since_training
     }
     
@@ -14,9 +14,10 @@ Version: 1.0.0
 """
 
 import os
+import sys
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Annotated, Dict, List, Optional, Any, Union
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,10 +25,15 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, ConfigDict
 import uvicorn
 
+# Shared pipeline modules (fast_json, drift_recorder) live in the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fast_json import FastResponse
 from score import (
     MSMECreditScorer, BUSINESS_SEGMENT_WEIGHTS, DEFAULT_MSME_CATEGORY_WEIGHTS,
     compute_msme_segment_subscore, msme_prob_to_score
 )
+from drift_recorder import load_recorder
 
 
 # ============================================================================
@@ -37,6 +43,9 @@ from score import (
 MODEL_PATH = os.environ.get('MODEL_PATH', 'msme_model_artifacts/msme_credit_scoring_model.joblib')
 PREPROCESSOR_PATH = os.environ.get('PREPROCESSOR_PATH', 'msme_model_artifacts/msme_preprocessor.joblib')
 CONFIG_PATH = os.environ.get('CONFIG_PATH', 'feature_config.json')
+# Live drift monitoring (enabled when training saved a drift reference)
+DRIFT_REFERENCE_PATH = os.environ.get('DRIFT_REFERENCE_PATH', 'msme_model_artifacts/drift_reference.json')
+DRIFT_DIR = os.environ.get('DRIFT_DIR', 'msme_model_artifacts/drift')
 
 API_VERSION = "1.0.0"
 API_TITLE = "MSME Credit Scoring API"
@@ -211,6 +220,7 @@ class HealthResponse(BaseModel):
     model_loaded: bool
     model_version: str
     timestamp: str
+    drift: Optional[Dict] = None
 
 
 # ============================================================================
@@ -237,7 +247,8 @@ async def lifespan(app: FastAPI):
         model_path=model_path,
         preprocessor_path=preprocessor_path,
         config_path=config_path,
-        alpha=0.7
+        alpha=0.7,
+        drift_recorder=load_recorder(DRIFT_REFERENCE_PATH, DRIFT_DIR)
     )
     
     if model_path:
@@ -251,12 +262,15 @@ async def lifespan(app: FastAPI):
     yield
     
     print("Shutting down MSME API...")
+    if scorer.drift_recorder is not None:
+        scorer.drift_recorder.close()
 
 
 app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
     version=API_VERSION,
+    default_response_class=FastResponse,
     lifespan=lifespan
 )
 
@@ -295,12 +309,14 @@ async def verify_token(authorization: str = Header(None)) -> Dict:
 
 @app.get("/api/health", response_model=HealthResponse, tags=["System"])
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (with rolling drift PSI and alerts when recorded)"""
+    recorder = scorer.drift_recorder if scorer else None
     return HealthResponse(
         status="healthy",
         model_loaded=scorer is not None and scorer.model is not None,
         model_version=scorer.model_version if scorer else "unknown",
-        timestamp=datetime.utcnow().isoformat()
+        timestamp=datetime.utcnow().isoformat(),
+        drift=recorder.status() if recorder else None
     )
 
 
@@ -416,7 +432,7 @@ async def explain_score(
         
         explanation = result.get('explanation', {})
         
-        return {
+        return FastResponse({
             "score": result['score'],
             "risk_category": result['risk_category'],
             "recommended_decision": result['recommended_decision'],
@@ -428,7 +444,7 @@ async def explain_score(
                 "weights": BUSINESS_SEGMENT_WEIGHTS.get(request.business_segment, {}).get('category_weights', {})
             },
             "timestamp": datetime.utcnow().isoformat()
-        }
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Explanation error: {str(e)}")
@@ -553,6 +569,26 @@ class QuickOverdraftEstimate(BaseModel):
     msme_category: str = Field("micro")
 
 
+# Largest what-if grid (tenures x rates x amounts) and portfolio per request
+MAX_WHAT_IF_POINTS = 100_000
+MAX_BATCH_BUSINESSES = 50_000
+
+
+class OverdraftWhatIfRequest(OverdraftRequest):
+    """What-if grid for one business: every tenure x rate x requested amount"""
+    tenures: List[Annotated[int, Field(ge=1)]] = Field([6, 12, 18, 24, 36], min_length=1,
+                                                       description="Tenures in months")
+    interest_rates: Optional[List[Annotated[float, Field(ge=0)]]] = Field(
+        None, description="Annual rates % (default: priced rate)")
+    requested_amounts: Optional[List[Annotated[float, Field(gt=0)]]] = Field(
+        None, description="Requested amounts (default: adjusted limit)")
+
+
+class OverdraftBatchRequest(BaseModel):
+    """Portfolio of businesses for a limit review"""
+    businesses: List[OverdraftRequest] = Field(..., min_length=1, max_length=MAX_BATCH_BUSINESSES)
+
+
 @app.post("/api/overdraft/calculate", response_model=OverdraftResponse, tags=["Overdraft"])
 async def calculate_overdraft(
     request: OverdraftRequest,
@@ -664,6 +700,66 @@ async def quick_overdraft_estimate(
     return estimate
 
 
+@app.post("/api/overdraft/what-if", tags=["Overdraft"])
+async def overdraft_what_if(
+    request: OverdraftWhatIfRequest,
+    auth: Dict = Depends(verify_token)
+):
+    """
+    Evaluate a grid of tenures, interest rates and requested amounts for one business.
+    
+    Each grid point goes through the same debt constraints and MSME category
+    limits as /api/overdraft/calculate, in one vectorized call, so limit
+    sliders can show the approved limit, EMI and DSCR of every combination.
+    """
+    from overdraft_engine import OverdraftRecommendationEngine
+    
+    n_points = (len(request.tenures) * len(request.interest_rates or [None])
+                * len(request.requested_amounts or [None]))
+    if n_points > MAX_WHAT_IF_POINTS:
+        raise HTTPException(status_code=400, detail=f"Grid of {n_points} points exceeds {MAX_WHAT_IF_POINTS}")
+    
+    business = request.model_dump(exclude={'tenures', 'interest_rates', 'requested_amounts'})
+    try:
+        grid = OverdraftRecommendationEngine().what_if(
+            request.tenures, request.interest_rates, request.requested_amounts, **business
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    # Returned as a response so orjson serializes the frame without jsonable_encoder
+    return FastResponse({
+        'n_points': len(grid),
+        'grid': grid,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
+@app.post("/api/overdraft/batch", tags=["Overdraft"])
+async def overdraft_batch(
+    request: OverdraftBatchRequest,
+    auth: Dict = Depends(verify_token)
+):
+    """
+    Overdraft recommendations for a portfolio of businesses in one vectorized call.
+    
+    Returns the limits, pricing and risk metrics of /api/overdraft/calculate
+    per business, with the debt constraints that capped each limit.
+    """
+    import pandas as pd
+    from overdraft_engine import OverdraftRecommendationEngine
+    
+    businesses = pd.DataFrame([b.model_dump() for b in request.businesses])
+    recommendations = OverdraftRecommendationEngine().calculate_batch(businesses)
+    
+    return FastResponse({
+        'n_businesses': len(recommendations),
+        'total_recommended_limit': recommendations['recommended_limit'].sum(),
+        'recommendations': recommendations,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
 @app.post("/api/score-with-overdraft", tags=["Scoring", "Overdraft"])
 async def score_with_overdraft_limit(
     request: MSMEScoreRequest,
@@ -0,0 +1,84 @@
+"""
+Overdraft engine benchmark: per-business recommendations vs the batch engine
+
+Usage:
+    python benchmark_overdraft.py                         # 100k businesses
+    python benchmark_overdraft.py --businesses 1000000 --grid 40
+
+"scalar" calls calculate_recommendation() once per business (on at most
+--scalar-businesses businesses, scaled up) and "batch" is calculate_batch()
+on the whole portfolio; "check" compares both on the scalar sample.
+"what-if" evaluates a --grid x --grid x --grid grid of tenures, rates and
+requested amounts for one business with what_if().
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from overdraft_engine import INDUSTRY_RISK_ADJUSTMENTS, OverdraftRecommendationEngine
+
+NUMERIC_FIELDS = ['recommended_limit', 'turnover_based_limit', 'cash_flow_based_limit', 'mpbf_based_limit',
+                  'interest_rate', 'processing_fee_amount', 'tenure_months', 'collateral_value_required', 'dscr',
+                  'debt_to_turnover', 'emi_coverage_ratio']
+
+
+def synthetic_portfolio(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'credit_score': rng.integers(300, 901, n),
+        'business_age_years': rng.uniform(0, 15, n).round(1),
+        'industry': rng.choice(list(INDUSTRY_RISK_ADJUSTMENTS), n),
+        'msme_category': rng.choice(['micro', 'small', 'medium', 'not_registered'], n),
+        'monthly_gtv': rng.lognormal(13, 1, n),
+        'existing_debt': rng.choice([0, 1], n) * rng.lognormal(13, 1.5, n),
+        'existing_emi': rng.choice([0, 1], n) * rng.lognormal(10, 1, n),
+        'inventory_value': rng.choice([0, 1], n) * rng.lognormal(13, 1, n),
+        'receivables_value': rng.choice([0, 1], n) * rng.lognormal(13, 1, n),
+        'cash_flow_health_score': rng.uniform(0, 1, n),
+        'payment_discipline_score': rng.uniform(0.5, 1, n),
+    })
+
+
+def timed(fn, *args, **kwargs):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--businesses', type=int, default=100_000)
+    parser.add_argument('--scalar-businesses', type=int, default=10_000)
+    parser.add_argument('--grid', type=int, default=25)
+    args = parser.parse_args()
+
+    engine = OverdraftRecommendationEngine()
+    portfolio = synthetic_portfolio(args.businesses)
+    sample = portfolio.iloc[:min(args.scalar_businesses, args.businesses)]
+
+    scalar, scalar_s = timed(lambda: [engine.calculate_recommendation(**row) for row in sample.to_dict('records')])
+    scalar_s *= len(portfolio) / len(sample)
+    batch, batch_s = timed(engine.calculate_batch, portfolio)
+
+    expected = pd.DataFrame([{f: getattr(r, f) for f in NUMERIC_FIELDS} for r in scalar])
+    same = np.allclose(expected.to_numpy(dtype=float), batch[NUMERIC_FIELDS].iloc[:len(sample)].to_numpy(dtype=float))
+
+    business = dict(credit_score=720, business_age_years=4, industry='trading', msme_category='small',
+                    monthly_gtv=2_500_000, existing_debt=500_000, existing_emi=40_000)
+    axis = args.grid
+    grid, grid_s = timed(engine.what_if, np.linspace(6, 60, axis).round(), np.linspace(10, 26, axis),
+                         np.linspace(1e5, 1e7, axis), **business)
+
+    print(f"{len(portfolio)} businesses ({len(sample)} scalar)")
+    print(f"  scalar:  {scalar_s:8.2f} s  (from {len(sample)} businesses)")
+    print(f"  batch:   {batch_s:8.2f} s  ({scalar_s / batch_s:.0f}x)")
+    print(f"  check:   batch {'matches' if same else 'DIFFERS from'} calculate_recommendation()")
+    print(f"  what-if: {grid_s * 1000:8.1f} ms  ({len(grid)} grid points)")
+
+
+if __name__ == '__main__':
+    main()
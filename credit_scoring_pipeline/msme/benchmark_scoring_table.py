@@ -0,0 +1,108 @@
+"""
+Parameter scoring benchmark: per-business scalar scoring vs the compiled table
+
+Usage:
+    python benchmark_scoring_table.py                     # 1, 1k and 1M businesses
+    python benchmark_scoring_table.py --sizes 1000 100000 --scalar-businesses 2000
+    python benchmark_scoring_table.py --category          # category dtype columns
+
+Synthetic raw values are drawn for every parameter with a transform
+(unknown categories, missing values and values on the breakpoints
+included); --category stores the categorical parameters as pandas
+category columns, which score() factorizes without hashing strings.
+- "scalar" is segment_subscore() and score_parameter() per business (on at
+  most --scalar-businesses businesses, scaled up)
+- "table" is ScoringTable.score() and subscore(), after one compile
+- "identical" compares both bit for bit on the scalar sample
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from algorithms import PARAMETER_WEIGHTS, ScoringTable, parameter_transform, score_parameter, segment_subscore
+
+
+def transform_knots(transform: dict) -> list:
+    """Values where a numeric transform changes behaviour (breakpoints, bounds, centre)"""
+    kind = transform['type']
+    if kind == 'piecewise':
+        return [x for x, _ in transform['breakpoints']]
+    if kind == 'normalize':
+        return [transform['min'], transform['max']]
+    if kind == 'sigmoid':
+        center, scale = transform.get('center', 0), transform.get('scale', 1)
+        return [center - 4 * scale, center, center + 4 * scale]
+    return [transform['optimal'] - 4 * transform['std_dev'], transform['optimal'],
+            transform['optimal'] + 4 * transform['std_dev']]
+
+
+def synthetic_parameters(table: ScoringTable, n: int, category: bool = False, seed: int = 42,
+                         parameters: dict = PARAMETER_WEIGHTS) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, kind in zip(table.names, table.kinds):
+        transform = parameter_transform(parameters[name])
+        if kind == 'categorical':
+            values = rng.choice(list(transform['scores']) + ['unknown'], n).astype(object)
+            values[rng.random(n) < 0.05] = None
+            if category:
+                values = pd.Categorical(values)
+        else:
+            knots = transform_knots(transform)
+            lo, hi = min(knots), max(knots)
+            width = (hi - lo) or 1.0
+            values = rng.uniform(lo - 0.1 * width, hi + 0.1 * width, n)
+            on_knot = rng.random(n) < 0.1
+            values[on_knot] = rng.choice(knots, on_knot.sum())
+            values[rng.random(n) < 0.05] = np.nan
+        columns[name] = values
+    return pd.DataFrame(columns)
+
+
+def scalar_scores(table: ScoringTable, rows: list, parameters: dict = PARAMETER_WEIGHTS) -> tuple:
+    scores = np.array([[score_parameter(name, row[name], parameters) for name in table.names] for row in rows])
+    return scores, np.array([segment_subscore(row, parameters) for row in rows])
+
+
+def timed(fn, *args, **kwargs):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 1_000, 1_000_000])
+    parser.add_argument('--scalar-businesses', type=int, default=10_000)
+    parser.add_argument('--category', action='store_true')
+    args = parser.parse_args()
+
+    table, compile_s = timed(ScoringTable)
+    print(f"{len(table.names)} compiled parameters (compile {compile_s * 1000:.2f} ms)")
+    table.subscore(table.score(synthetic_parameters(table, 1, args.category)))  # warm-up
+    for n in args.sizes:
+        data = synthetic_parameters(table, n, args.category)
+        rows = data.iloc[:min(n, args.scalar_businesses)].to_dict('records')
+
+        (scores, subscores), scalar_s = timed(scalar_scores, table, rows)
+        scalar_s *= n / len(rows)
+        def compiled():
+            matrix = table.score(data)
+            return matrix, table.subscore(matrix)
+        (matrix, subscore), table_s = timed(compiled)
+
+        sample = matrix[:len(rows)]
+        identical = (np.array_equal(sample, scores, equal_nan=True)
+                     and np.array_equal(subscore[:len(rows)], subscores))
+        print(f"{n} businesses ({len(rows)} scalar)")
+        print(f"  scalar:    {scalar_s:9.4f} s  {n / scalar_s:12,.0f} businesses/s")
+        print(f"  table:     {table_s:9.4f} s  {n / table_s:12,.0f} businesses/s  ({scalar_s / table_s:.1f}x)")
+        print(f"  identical: {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,10 +20,16 @@ from dataclasses import dataclass
 from sklearn.preprocessing import StandardScaler, RobustScaler, LabelEncoder
 from sklearn.impute import SimpleImputer
 from sklearn.model_selection import train_test_split
+import functools
 import json
+import os
+import sys
 import warnings
-from datetime import datetime, timedelta
-import random
+
+# Shared pipeline modules (synthetic_engine) live in the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_engine import DEFAULT_CHUNK_ROWS, BlockFunction, generate_rows, write_parquet
 
 warnings.filterwarnings('ignore')
 
@@ -218,10 +224,11 @@ class MSMESyntheticDataGenerator:
     - Default probability is influenced by multiple risk factors
     """
     
+    EDGE_CASE_TYPES = ['perfect', 'terrible', 'new_business', 'high_growth_startup',
+                       'declining', 'seasonal']
+    
     def __init__(self, seed: int = 42):
         self.seed = seed
-        np.random.seed(seed)
-        random.seed(seed)
         
         # Business segment distribution
         self.segment_distribution = {
@@ -261,7 +268,7 @@ class MSMESyntheticDataGenerator:
             'agriculture': 0.40
         }
     
-    def _generate_segment_features(self, segment: str, n: int) -> Dict[str, np.ndarray]:
+    def _generate_segment_features(self, rng: np.random.Generator, segment: str, n: int) -> Dict[str, np.ndarray]:
         """
         Generate base features based on business segment.
         
@@ -276,52 +283,52 @@ class MSMESyntheticDataGenerator:
         features = {}
         
         if segment == 'micro_new':
-            features['gtv_base'] = np.random.lognormal(12, 1.0, n)  # Lower GTV
-            features['age_factor'] = np.random.uniform(0.1, 0.4, n)  # Young businesses
-            features['formality_factor'] = np.random.uniform(0.2, 0.5, n)
-            features['cashflow_health'] = np.random.uniform(0.3, 0.6, n)
+            features['gtv_base'] = rng.lognormal(12, 1.0, n)  # Lower GTV
+            features['age_factor'] = rng.uniform(0.1, 0.4, n)  # Young businesses
+            features['formality_factor'] = rng.uniform(0.2, 0.5, n)
+            features['cashflow_health'] = rng.uniform(0.3, 0.6, n)
             features['default_base_prob'] = 0.12  # REDUCED from 0.25
             
         elif segment == 'micro_established':
-            features['gtv_base'] = np.random.lognormal(13, 0.9, n)
-            features['age_factor'] = np.random.uniform(0.4, 0.7, n)
-            features['formality_factor'] = np.random.uniform(0.4, 0.7, n)
-            features['cashflow_health'] = np.random.uniform(0.4, 0.7, n)
+            features['gtv_base'] = rng.lognormal(13, 0.9, n)
+            features['age_factor'] = rng.uniform(0.4, 0.7, n)
+            features['formality_factor'] = rng.uniform(0.4, 0.7, n)
+            features['cashflow_health'] = rng.uniform(0.4, 0.7, n)
             features['default_base_prob'] = 0.06  # REDUCED from 0.15
             
         elif segment == 'small_trading':
-            features['gtv_base'] = np.random.lognormal(14, 0.8, n)
-            features['age_factor'] = np.random.uniform(0.5, 0.8, n)
-            features['formality_factor'] = np.random.uniform(0.5, 0.8, n)
-            features['cashflow_health'] = np.random.uniform(0.5, 0.75, n)
+            features['gtv_base'] = rng.lognormal(14, 0.8, n)
+            features['age_factor'] = rng.uniform(0.5, 0.8, n)
+            features['formality_factor'] = rng.uniform(0.5, 0.8, n)
+            features['cashflow_health'] = rng.uniform(0.5, 0.75, n)
             features['default_base_prob'] = 0.05  # REDUCED from 0.12
             
         elif segment == 'small_manufacturing':
-            features['gtv_base'] = np.random.lognormal(14.5, 0.7, n)
-            features['age_factor'] = np.random.uniform(0.5, 0.85, n)
-            features['formality_factor'] = np.random.uniform(0.6, 0.85, n)
-            features['cashflow_health'] = np.random.uniform(0.45, 0.7, n)
+            features['gtv_base'] = rng.lognormal(14.5, 0.7, n)
+            features['age_factor'] = rng.uniform(0.5, 0.85, n)
+            features['formality_factor'] = rng.uniform(0.6, 0.85, n)
+            features['cashflow_health'] = rng.uniform(0.45, 0.7, n)
             features['default_base_prob'] = 0.04  # REDUCED from 0.10
             
         elif segment == 'small_services':
-            features['gtv_base'] = np.random.lognormal(13.5, 0.9, n)
-            features['age_factor'] = np.random.uniform(0.4, 0.75, n)
-            features['formality_factor'] = np.random.uniform(0.5, 0.8, n)
-            features['cashflow_health'] = np.random.uniform(0.5, 0.8, n)
+            features['gtv_base'] = rng.lognormal(13.5, 0.9, n)
+            features['age_factor'] = rng.uniform(0.4, 0.75, n)
+            features['formality_factor'] = rng.uniform(0.5, 0.8, n)
+            features['cashflow_health'] = rng.uniform(0.5, 0.8, n)
             features['default_base_prob'] = 0.05  # REDUCED from 0.11
             
         else:  # medium_enterprise
-            features['gtv_base'] = np.random.lognormal(15.5, 0.6, n)
-            features['age_factor'] = np.random.uniform(0.6, 0.95, n)
-            features['formality_factor'] = np.random.uniform(0.7, 0.95, n)
-            features['cashflow_health'] = np.random.uniform(0.6, 0.85, n)
+            features['gtv_base'] = rng.lognormal(15.5, 0.6, n)
+            features['age_factor'] = rng.uniform(0.6, 0.95, n)
+            features['formality_factor'] = rng.uniform(0.7, 0.95, n)
+            features['cashflow_health'] = rng.uniform(0.6, 0.85, n)
             features['default_base_prob'] = 0.02  # REDUCED from 0.06
             
         return features
     
-    def _generate_edge_cases(self, n_each: int = 50) -> pd.DataFrame:
+    def _generate_edge_case(self, rng: np.random.Generator, kind: str, n: int) -> pd.DataFrame:
         """
-        Generate edge case scenarios for comprehensive model coverage.
+        Generate n rows of one edge case scenario (see EDGE_CASE_TYPES).
         
         Edge cases:
         1. Perfect business - should have ~0-1% default risk, score 800+
@@ -331,586 +338,571 @@ class MSMESyntheticDataGenerator:
         5. Declining business - increasing risk, score 400-500
         6. Seasonal business - variable cash flow, score 450-550
         """
-        edge_cases = []
-        
-        # 1. PERFECT BUSINESS (n_each samples)
-        for _ in range(n_each):
-            perfect = {
+        # 1. PERFECT BUSINESS
+        if kind == 'perfect':
+            case = {
                 'business_segment': 'medium_enterprise',
                 'industry_code': 'technology',
                 'legal_entity_type': 'private_limited',
-                'business_age_years': np.random.uniform(10, 20),
+                'business_age_years': rng.uniform(10, 20, n),
                 'business_address_verified': 1,
                 'geolocation_verified': 1,
                 'industry_risk_score': 0.15,
-                'num_business_locations': np.random.randint(3, 10),
-                'employees_count': np.random.randint(30, 100),
+                'num_business_locations': rng.integers(3, 10, n),
+                'employees_count': rng.integers(30, 100, n),
                 'gstin_verified': 1,
                 'pan_verified': 1,
                 'msme_registered': 1,
                 'msme_category': 'medium',
                 'business_structure': 'office',
-                'licenses_certificates_score': np.random.uniform(0.9, 1.0),
-                'weekly_gtv': np.random.uniform(3000000, 10000000),
-                'monthly_gtv': np.random.uniform(12000000, 40000000),
-                'transaction_count_daily': np.random.randint(200, 500),
-                'avg_transaction_value': np.random.uniform(500, 1500),
-                'revenue_concentration_score': np.random.uniform(0.2, 0.4),
-                'peak_day_dependency': np.random.uniform(0.05, 0.15),
-                'revenue_growth_rate_mom': np.random.uniform(0.05, 0.15),
-                'revenue_growth_rate_qoq': np.random.uniform(0.15, 0.30),
-                'profit_margin': np.random.uniform(0.15, 0.25),
-                'profit_margin_trend': np.random.uniform(0.02, 0.08),
-                'inventory_turnover_ratio': np.random.uniform(4, 8),
-                'total_assets_value': np.random.uniform(20000000, 100000000),
-                'operational_leverage_ratio': np.random.uniform(1.2, 1.8),
-                'avg_bank_balance': np.random.uniform(3000000, 10000000),
-                'bank_balance_trend': np.random.uniform(0.05, 0.15),
-                'weekly_inflow_outflow_ratio': np.random.uniform(1.3, 1.8),
+                'licenses_certificates_score': rng.uniform(0.9, 1.0, n),
+                'weekly_gtv': rng.uniform(3000000, 10000000, n),
+                'monthly_gtv': rng.uniform(12000000, 40000000, n),
+                'transaction_count_daily': rng.integers(200, 500, n),
+                'avg_transaction_value': rng.uniform(500, 1500, n),
+                'revenue_concentration_score': rng.uniform(0.2, 0.4, n),
+                'peak_day_dependency': rng.uniform(0.05, 0.15, n),
+                'revenue_growth_rate_mom': rng.uniform(0.05, 0.15, n),
+                'revenue_growth_rate_qoq': rng.uniform(0.15, 0.30, n),
+                'profit_margin': rng.uniform(0.15, 0.25, n),
+                'profit_margin_trend': rng.uniform(0.02, 0.08, n),
+                'inventory_turnover_ratio': rng.uniform(4, 8, n),
+                'total_assets_value': rng.uniform(20000000, 100000000, n),
+                'operational_leverage_ratio': rng.uniform(1.2, 1.8, n),
+                'avg_bank_balance': rng.uniform(3000000, 10000000, n),
+                'bank_balance_trend': rng.uniform(0.05, 0.15, n),
+                'weekly_inflow_outflow_ratio': rng.uniform(1.3, 1.8, n),
                 'overdraft_days_count': 0,
                 'overdraft_amount_avg': 0,
-                'cash_buffer_days': np.random.uniform(60, 120),
-                'avg_daily_closing_balance': np.random.uniform(2500000, 8000000),
-                'cash_balance_std_dev': np.random.uniform(100000, 500000),
+                'cash_buffer_days': rng.uniform(60, 120, n),
+                'avg_daily_closing_balance': rng.uniform(2500000, 8000000, n),
+                'cash_balance_std_dev': rng.uniform(100000, 500000, n),
                 'negative_balance_days': 0,
-                'daily_min_balance_pattern': np.random.uniform(1500000, 5000000),
-                'consistent_deposits_score': np.random.uniform(0.9, 1.0),
-                'cashflow_regularity_score': np.random.uniform(0.9, 1.0),
-                'receivables_aging_days': np.random.uniform(10, 25),
-                'payables_aging_days': np.random.uniform(15, 30),
+                'daily_min_balance_pattern': rng.uniform(1500000, 5000000, n),
+                'consistent_deposits_score': rng.uniform(0.9, 1.0, n),
+                'cashflow_regularity_score': rng.uniform(0.9, 1.0, n),
+                'receivables_aging_days': rng.uniform(10, 25, n),
+                'payables_aging_days': rng.uniform(15, 30, n),
                 'bounced_cheques_count': 0,
                 'bounced_cheques_rate': 0.0,
-                'historical_loan_utilization': np.random.uniform(0.3, 0.5),
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.95, 1.0),
+                'historical_loan_utilization': rng.uniform(0.3, 0.5, n),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.95, 1.0, n),
                 'previous_defaults_count': 0,
                 'previous_writeoffs_count': 0,
-                'current_loans_outstanding': np.random.randint(0, 2),
-                'total_debt_amount': np.random.uniform(500000, 2000000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'utility_payment_days_before_due': np.random.uniform(3, 10),
-                'mobile_recharge_regularity': np.random.uniform(0.9, 1.0),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'rent_payment_regularity': np.random.uniform(0.95, 1.0),
-                'rent_payment_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'supplier_payment_regularity': np.random.uniform(0.9, 1.0),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'gst_filing_regularity': np.random.uniform(0.95, 1.0),
-                'gst_filing_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.0, 0.05),
-                'outstanding_taxes_amount': np.random.uniform(0, 50000),
+                'current_loans_outstanding': rng.integers(0, 2, n),
+                'total_debt_amount': rng.uniform(500000, 2000000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'utility_payment_days_before_due': rng.uniform(3, 10, n),
+                'mobile_recharge_regularity': rng.uniform(0.9, 1.0, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'rent_payment_regularity': rng.uniform(0.95, 1.0, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'supplier_payment_regularity': rng.uniform(0.9, 1.0, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'gst_filing_regularity': rng.uniform(0.95, 1.0, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.0, 0.05, n),
+                'outstanding_taxes_amount': rng.uniform(0, 50000, n),
                 'outstanding_dues_flag': 0,
                 'itr_filed': 1,
-                'itr_income_declared': np.random.uniform(3000000, 10000000),
+                'itr_income_declared': rng.uniform(3000000, 10000000, n),
                 'gst_r1_vs_itr_mismatch': 0.0,
-                'tax_payment_regularity': np.random.uniform(0.95, 1.0),
-                'tax_payment_ontime_ratio': np.random.uniform(0.95, 1.0),
-                'refund_chargeback_rate': np.random.uniform(0.0, 0.02),
-                'kyc_completion_score': np.random.uniform(0.95, 1.0),
+                'tax_payment_regularity': rng.uniform(0.95, 1.0, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.95, 1.0, n),
+                'refund_chargeback_rate': rng.uniform(0.0, 0.02, n),
+                'kyc_completion_score': rng.uniform(0.95, 1.0, n),
                 'kyc_attempts_count': 1,
-                'device_consistency_score': np.random.uniform(0.95, 1.0),
-                'ip_stability_score': np.random.uniform(0.9, 1.0),
+                'device_consistency_score': rng.uniform(0.95, 1.0, n),
+                'ip_stability_score': rng.uniform(0.9, 1.0, n),
                 'pan_address_bank_mismatch': 0,
                 'image_ocr_verified': 1,
                 'shop_image_verified': 1,
-                'reporting_error_rate': np.random.uniform(0.0, 0.01),
-                'incoming_funds_verified': np.random.uniform(0.95, 1.0),
-                'insurance_coverage_score': np.random.uniform(0.8, 1.0),
-                'insurance_premium_paid_ratio': np.random.uniform(0.95, 1.0),
-                'local_economic_health_score': np.random.uniform(0.7, 0.9),
-                'customer_concentration_risk': np.random.uniform(0.1, 0.3),
+                'reporting_error_rate': rng.uniform(0.0, 0.01, n),
+                'incoming_funds_verified': rng.uniform(0.95, 1.0, n),
+                'insurance_coverage_score': rng.uniform(0.8, 1.0, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.95, 1.0, n),
+                'local_economic_health_score': rng.uniform(0.7, 0.9, n),
+                'customer_concentration_risk': rng.uniform(0.1, 0.3, n),
                 'legal_proceedings_flag': 0,
                 'legal_disputes_count': 0,
-                'social_media_presence_score': np.random.uniform(0.7, 0.9),
-                'social_media_sentiment_score': np.random.uniform(0.8, 0.95),
-                'online_reviews_score': np.random.uniform(4.2, 5.0),
+                'social_media_presence_score': rng.uniform(0.7, 0.9, n),
+                'social_media_sentiment_score': rng.uniform(0.8, 0.95, n),
+                'online_reviews_score': rng.uniform(4.2, 5.0, n),
                 'default_90dpd': 0,  # Perfect business should NOT default
-                'default_probability_true': np.random.uniform(0.005, 0.02),
+                'default_probability_true': rng.uniform(0.005, 0.02, n),
             }
-            edge_cases.append(perfect)
         
-        # 2. TERRIBLE BUSINESS (n_each samples)
-        for _ in range(n_each):
-            terrible = {
+        # 2. TERRIBLE BUSINESS
+        elif kind == 'terrible':
+            case = {
                 'business_segment': 'micro_new',
                 'industry_code': 'construction',
                 'legal_entity_type': 'proprietorship',
-                'business_age_years': np.random.uniform(0.5, 2),
+                'business_age_years': rng.uniform(0.5, 2, n),
                 'business_address_verified': 0,
                 'geolocation_verified': 0,
-                'industry_risk_score': np.random.uniform(0.35, 0.45),
+                'industry_risk_score': rng.uniform(0.35, 0.45, n),
                 'num_business_locations': 1,
-                'employees_count': np.random.randint(1, 3),
+                'employees_count': rng.integers(1, 3, n),
                 'gstin_verified': 0,
                 'pan_verified': 0,
                 'msme_registered': 0,
                 'msme_category': 'not_registered',
                 'business_structure': 'home_based',
-                'licenses_certificates_score': np.random.uniform(0.1, 0.3),
-                'weekly_gtv': np.random.uniform(10000, 50000),
-                'monthly_gtv': np.random.uniform(40000, 200000),
-                'transaction_count_daily': np.random.randint(2, 10),
-                'avg_transaction_value': np.random.uniform(50, 200),
-                'revenue_concentration_score': np.random.uniform(0.7, 0.95),
-                'peak_day_dependency': np.random.uniform(0.4, 0.6),
-                'revenue_growth_rate_mom': np.random.uniform(-0.3, -0.1),
-                'revenue_growth_rate_qoq': np.random.uniform(-0.4, -0.1),
-                'profit_margin': np.random.uniform(-0.1, 0.05),
-                'profit_margin_trend': np.random.uniform(-0.2, -0.05),
-                'inventory_turnover_ratio': np.random.uniform(0.5, 1.5),
-                'total_assets_value': np.random.uniform(50000, 200000),
-                'operational_leverage_ratio': np.random.uniform(2.5, 4.0),
-                'avg_bank_balance': np.random.uniform(5000, 30000),
-                'bank_balance_trend': np.random.uniform(-0.3, -0.1),
-                'weekly_inflow_outflow_ratio': np.random.uniform(0.5, 0.8),
-                'overdraft_days_count': np.random.randint(30, 60),
-                'overdraft_amount_avg': np.random.uniform(20000, 100000),
-                'cash_buffer_days': np.random.uniform(0, 10),
-                'avg_daily_closing_balance': np.random.uniform(2000, 20000),
-                'cash_balance_std_dev': np.random.uniform(50000, 200000),
-                'negative_balance_days': np.random.randint(15, 30),
-                'daily_min_balance_pattern': np.random.uniform(0, 5000),
-                'consistent_deposits_score': np.random.uniform(0.1, 0.3),
-                'cashflow_regularity_score': np.random.uniform(0.1, 0.3),
-                'receivables_aging_days': np.random.uniform(60, 120),
-                'payables_aging_days': np.random.uniform(90, 150),
-                'bounced_cheques_count': np.random.randint(5, 15),
-                'bounced_cheques_rate': np.random.uniform(0.15, 0.30),
-                'historical_loan_utilization': np.random.uniform(0.8, 1.0),
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.2, 0.4),
-                'previous_defaults_count': np.random.randint(1, 4),
-                'previous_writeoffs_count': np.random.randint(0, 2),
-                'current_loans_outstanding': np.random.randint(3, 8),
-                'total_debt_amount': np.random.uniform(500000, 2000000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.3, 0.5),
-                'utility_payment_days_before_due': np.random.uniform(-20, -10),
-                'mobile_recharge_regularity': np.random.uniform(0.3, 0.5),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.3, 0.5),
-                'rent_payment_regularity': np.random.uniform(0.3, 0.5),
-                'rent_payment_ontime_ratio': np.random.uniform(0.3, 0.5),
-                'supplier_payment_regularity': np.random.uniform(0.3, 0.5),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.3, 0.5),
-                'gst_filing_regularity': np.random.uniform(0.2, 0.4),
-                'gst_filing_ontime_ratio': np.random.uniform(0.2, 0.4),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.3, 0.5),
-                'outstanding_taxes_amount': np.random.uniform(100000, 500000),
+                'licenses_certificates_score': rng.uniform(0.1, 0.3, n),
+                'weekly_gtv': rng.uniform(10000, 50000, n),
+                'monthly_gtv': rng.uniform(40000, 200000, n),
+                'transaction_count_daily': rng.integers(2, 10, n),
+                'avg_transaction_value': rng.uniform(50, 200, n),
+                'revenue_concentration_score': rng.uniform(0.7, 0.95, n),
+                'peak_day_dependency': rng.uniform(0.4, 0.6, n),
+                'revenue_growth_rate_mom': rng.uniform(-0.3, -0.1, n),
+                'revenue_growth_rate_qoq': rng.uniform(-0.4, -0.1, n),
+                'profit_margin': rng.uniform(-0.1, 0.05, n),
+                'profit_margin_trend': rng.uniform(-0.2, -0.05, n),
+                'inventory_turnover_ratio': rng.uniform(0.5, 1.5, n),
+                'total_assets_value': rng.uniform(50000, 200000, n),
+                'operational_leverage_ratio': rng.uniform(2.5, 4.0, n),
+                'avg_bank_balance': rng.uniform(5000, 30000, n),
+                'bank_balance_trend': rng.uniform(-0.3, -0.1, n),
+                'weekly_inflow_outflow_ratio': rng.uniform(0.5, 0.8, n),
+                'overdraft_days_count': rng.integers(30, 60, n),
+                'overdraft_amount_avg': rng.uniform(20000, 100000, n),
+                'cash_buffer_days': rng.uniform(0, 10, n),
+                'avg_daily_closing_balance': rng.uniform(2000, 20000, n),
+                'cash_balance_std_dev': rng.uniform(50000, 200000, n),
+                'negative_balance_days': rng.integers(15, 30, n),
+                'daily_min_balance_pattern': rng.uniform(0, 5000, n),
+                'consistent_deposits_score': rng.uniform(0.1, 0.3, n),
+                'cashflow_regularity_score': rng.uniform(0.1, 0.3, n),
+                'receivables_aging_days': rng.uniform(60, 120, n),
+                'payables_aging_days': rng.uniform(90, 150, n),
+                'bounced_cheques_count': rng.integers(5, 15, n),
+                'bounced_cheques_rate': rng.uniform(0.15, 0.30, n),
+                'historical_loan_utilization': rng.uniform(0.8, 1.0, n),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.2, 0.4, n),
+                'previous_defaults_count': rng.integers(1, 4, n),
+                'previous_writeoffs_count': rng.integers(0, 2, n),
+                'current_loans_outstanding': rng.integers(3, 8, n),
+                'total_debt_amount': rng.uniform(500000, 2000000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.3, 0.5, n),
+                'utility_payment_days_before_due': rng.uniform(-20, -10, n),
+                'mobile_recharge_regularity': rng.uniform(0.3, 0.5, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.3, 0.5, n),
+                'rent_payment_regularity': rng.uniform(0.3, 0.5, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.3, 0.5, n),
+                'supplier_payment_regularity': rng.uniform(0.3, 0.5, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.3, 0.5, n),
+                'gst_filing_regularity': rng.uniform(0.2, 0.4, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.2, 0.4, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.3, 0.5, n),
+                'outstanding_taxes_amount': rng.uniform(100000, 500000, n),
                 'outstanding_dues_flag': 1,
                 'itr_filed': 0,
                 'itr_income_declared': 0,
-                'gst_r1_vs_itr_mismatch': np.random.uniform(0.3, 0.5),
-                'tax_payment_regularity': np.random.uniform(0.2, 0.4),
-                'tax_payment_ontime_ratio': np.random.uniform(0.2, 0.4),
-                'refund_chargeback_rate': np.random.uniform(0.15, 0.25),
-                'kyc_completion_score': np.random.uniform(0.3, 0.5),
-                'kyc_attempts_count': np.random.randint(3, 6),
-                'device_consistency_score': np.random.uniform(0.3, 0.5),
-                'ip_stability_score': np.random.uniform(0.3, 0.5),
+                'gst_r1_vs_itr_mismatch': rng.uniform(0.3, 0.5, n),
+                'tax_payment_regularity': rng.uniform(0.2, 0.4, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.2, 0.4, n),
+                'refund_chargeback_rate': rng.uniform(0.15, 0.25, n),
+                'kyc_completion_score': rng.uniform(0.3, 0.5, n),
+                'kyc_attempts_count': rng.integers(3, 6, n),
+                'device_consistency_score': rng.uniform(0.3, 0.5, n),
+                'ip_stability_score': rng.uniform(0.3, 0.5, n),
                 'pan_address_bank_mismatch': 1,
                 'image_ocr_verified': 0,
                 'shop_image_verified': 0,
-                'reporting_error_rate': np.random.uniform(0.1, 0.2),
-                'incoming_funds_verified': np.random.uniform(0.3, 0.5),
-                'insurance_coverage_score': np.random.uniform(0.0, 0.2),
-                'insurance_premium_paid_ratio': np.random.uniform(0.0, 0.3),
-                'local_economic_health_score': np.random.uniform(0.3, 0.5),
-                'customer_concentration_risk': np.random.uniform(0.7, 0.95),
+                'reporting_error_rate': rng.uniform(0.1, 0.2, n),
+                'incoming_funds_verified': rng.uniform(0.3, 0.5, n),
+                'insurance_coverage_score': rng.uniform(0.0, 0.2, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.0, 0.3, n),
+                'local_economic_health_score': rng.uniform(0.3, 0.5, n),
+                'customer_concentration_risk': rng.uniform(0.7, 0.95, n),
                 'legal_proceedings_flag': 1,
-                'legal_disputes_count': np.random.randint(1, 4),
-                'social_media_presence_score': np.random.uniform(0.1, 0.3),
-                'social_media_sentiment_score': np.random.uniform(0.2, 0.4),
-                'online_reviews_score': np.random.uniform(1.0, 2.5),
-                'default_90dpd': np.random.choice([0, 1], p=[0.6, 0.4]),  # 40% default
-                'default_probability_true': np.random.uniform(0.30, 0.40),
+                'legal_disputes_count': rng.integers(1, 4, n),
+                'social_media_presence_score': rng.uniform(0.1, 0.3, n),
+                'social_media_sentiment_score': rng.uniform(0.2, 0.4, n),
+                'online_reviews_score': rng.uniform(1.0, 2.5, n),
+                'default_90dpd': rng.choice([0, 1], n, p=[0.6, 0.4]),  # 40% default
+                'default_probability_true': rng.uniform(0.30, 0.40, n),
             }
-            edge_cases.append(terrible)
         
-        # 3. NEW BUSINESS WITH NO HISTORY (n_each samples)
-        for _ in range(n_each):
-            new_biz = {
+        # 3. NEW BUSINESS WITH NO HISTORY
+        elif kind == 'new_business':
+            case = {
                 'business_segment': 'micro_new',
-                'industry_code': np.random.choice(['retail', 'services', 'trading']),
+                'industry_code': rng.choice(['retail', 'services', 'trading'], n),
                 'legal_entity_type': 'proprietorship',
-                'business_age_years': np.random.uniform(0.1, 0.5),
+                'business_age_years': rng.uniform(0.1, 0.5, n),
                 'business_address_verified': 1,
                 'geolocation_verified': 1,
-                'industry_risk_score': np.random.uniform(0.2, 0.35),
+                'industry_risk_score': rng.uniform(0.2, 0.35, n),
                 'num_business_locations': 1,
-                'employees_count': np.random.randint(1, 5),
-                'gstin_verified': np.random.choice([0, 1]),
+                'employees_count': rng.integers(1, 5, n),
+                'gstin_verified': rng.choice([0, 1], n),
                 'pan_verified': 1,
                 'msme_registered': 0,
                 'msme_category': 'not_registered',
-                'business_structure': np.random.choice(['home_based', 'shop']),
-                'licenses_certificates_score': np.random.uniform(0.3, 0.6),
-                'weekly_gtv': np.random.uniform(30000, 150000),
-                'monthly_gtv': np.random.uniform(120000, 600000),
-                'transaction_count_daily': np.random.randint(5, 30),
-                'avg_transaction_value': np.random.uniform(100, 400),
-                'revenue_concentration_score': np.random.uniform(0.5, 0.7),
-                'peak_day_dependency': np.random.uniform(0.2, 0.4),
-                'revenue_growth_rate_mom': np.random.uniform(0.1, 0.5),  # High growth (new)
-                'revenue_growth_rate_qoq': np.random.uniform(0.2, 0.8),
-                'profit_margin': np.random.uniform(0.05, 0.15),
-                'profit_margin_trend': np.random.uniform(0.0, 0.1),
-                'inventory_turnover_ratio': np.random.uniform(1.5, 4),
-                'total_assets_value': np.random.uniform(100000, 500000),
-                'operational_leverage_ratio': np.random.uniform(1.0, 2.0),
-                'avg_bank_balance': np.random.uniform(30000, 150000),
-                'bank_balance_trend': np.random.uniform(0.0, 0.2),
-                'weekly_inflow_outflow_ratio': np.random.uniform(0.9, 1.2),
-                'overdraft_days_count': np.random.randint(0, 10),
-                'overdraft_amount_avg': np.random.uniform(0, 30000),
-                'cash_buffer_days': np.random.uniform(10, 40),
-                'avg_daily_closing_balance': np.random.uniform(20000, 100000),
-                'cash_balance_std_dev': np.random.uniform(20000, 80000),
-                'negative_balance_days': np.random.randint(0, 5),
-                'daily_min_balance_pattern': np.random.uniform(10000, 50000),
-                'consistent_deposits_score': np.random.uniform(0.5, 0.7),
-                'cashflow_regularity_score': np.random.uniform(0.4, 0.7),
-                'receivables_aging_days': np.random.uniform(20, 45),
-                'payables_aging_days': np.random.uniform(25, 50),
-                'bounced_cheques_count': np.random.randint(0, 2),
-                'bounced_cheques_rate': np.random.uniform(0.0, 0.05),
+                'business_structure': rng.choice(['home_based', 'shop'], n),
+                'licenses_certificates_score': rng.uniform(0.3, 0.6, n),
+                'weekly_gtv': rng.uniform(30000, 150000, n),
+                'monthly_gtv': rng.uniform(120000, 600000, n),
+                'transaction_count_daily': rng.integers(5, 30, n),
+                'avg_transaction_value': rng.uniform(100, 400, n),
+                'revenue_concentration_score': rng.uniform(0.5, 0.7, n),
+                'peak_day_dependency': rng.uniform(0.2, 0.4, n),
+                'revenue_growth_rate_mom': rng.uniform(0.1, 0.5, n),  # High growth (new)
+                'revenue_growth_rate_qoq': rng.uniform(0.2, 0.8, n),
+                'profit_margin': rng.uniform(0.05, 0.15, n),
+                'profit_margin_trend': rng.uniform(0.0, 0.1, n),
+                'inventory_turnover_ratio': rng.uniform(1.5, 4, n),
+                'total_assets_value': rng.uniform(100000, 500000, n),
+                'operational_leverage_ratio': rng.uniform(1.0, 2.0, n),
+                'avg_bank_balance': rng.uniform(30000, 150000, n),
+                'bank_balance_trend': rng.uniform(0.0, 0.2, n),
+                'weekly_inflow_outflow_ratio': rng.uniform(0.9, 1.2, n),
+                'overdraft_days_count': rng.integers(0, 10, n),
+                'overdraft_amount_avg': rng.uniform(0, 30000, n),
+                'cash_buffer_days': rng.uniform(10, 40, n),
+                'avg_daily_closing_balance': rng.uniform(20000, 100000, n),
+                'cash_balance_std_dev': rng.uniform(20000, 80000, n),
+                'negative_balance_days': rng.integers(0, 5, n),
+                'daily_min_balance_pattern': rng.uniform(10000, 50000, n),
+                'consistent_deposits_score': rng.uniform(0.5, 0.7, n),
+                'cashflow_regularity_score': rng.uniform(0.4, 0.7, n),
+                'receivables_aging_days': rng.uniform(20, 45, n),
+                'payables_aging_days': rng.uniform(25, 50, n),
+                'bounced_cheques_count': rng.integers(0, 2, n),
+                'bounced_cheques_rate': rng.uniform(0.0, 0.05, n),
                 'historical_loan_utilization': 0.0,  # No history
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.7, 0.9),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.7, 0.9, n),
                 'previous_defaults_count': 0,  # No history
                 'previous_writeoffs_count': 0,
                 'current_loans_outstanding': 0,
-                'total_debt_amount': np.random.uniform(0, 100000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.7, 0.9),
-                'utility_payment_days_before_due': np.random.uniform(-5, 5),
-                'mobile_recharge_regularity': np.random.uniform(0.7, 0.9),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.7, 0.9),
-                'rent_payment_regularity': np.random.uniform(0.7, 0.9),
-                'rent_payment_ontime_ratio': np.random.uniform(0.7, 0.9),
-                'supplier_payment_regularity': np.random.uniform(0.6, 0.8),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.6, 0.8),
-                'gst_filing_regularity': np.random.uniform(0.5, 0.8),
-                'gst_filing_ontime_ratio': np.random.uniform(0.5, 0.8),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.05, 0.15),
-                'outstanding_taxes_amount': np.random.uniform(0, 30000),
+                'total_debt_amount': rng.uniform(0, 100000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.7, 0.9, n),
+                'utility_payment_days_before_due': rng.uniform(-5, 5, n),
+                'mobile_recharge_regularity': rng.uniform(0.7, 0.9, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.7, 0.9, n),
+                'rent_payment_regularity': rng.uniform(0.7, 0.9, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.7, 0.9, n),
+                'supplier_payment_regularity': rng.uniform(0.6, 0.8, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.6, 0.8, n),
+                'gst_filing_regularity': rng.uniform(0.5, 0.8, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.5, 0.8, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.05, 0.15, n),
+                'outstanding_taxes_amount': rng.uniform(0, 30000, n),
                 'outstanding_dues_flag': 0,
                 'itr_filed': 0,  # New business
                 'itr_income_declared': 0,
                 'gst_r1_vs_itr_mismatch': 0.0,
-                'tax_payment_regularity': np.random.uniform(0.6, 0.8),
-                'tax_payment_ontime_ratio': np.random.uniform(0.6, 0.8),
-                'refund_chargeback_rate': np.random.uniform(0.02, 0.08),
-                'kyc_completion_score': np.random.uniform(0.7, 0.9),
-                'kyc_attempts_count': np.random.randint(1, 3),
-                'device_consistency_score': np.random.uniform(0.8, 0.95),
-                'ip_stability_score': np.random.uniform(0.7, 0.9),
+                'tax_payment_regularity': rng.uniform(0.6, 0.8, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.6, 0.8, n),
+                'refund_chargeback_rate': rng.uniform(0.02, 0.08, n),
+                'kyc_completion_score': rng.uniform(0.7, 0.9, n),
+                'kyc_attempts_count': rng.integers(1, 3, n),
+                'device_consistency_score': rng.uniform(0.8, 0.95, n),
+                'ip_stability_score': rng.uniform(0.7, 0.9, n),
                 'pan_address_bank_mismatch': 0,
                 'image_ocr_verified': 1,
-                'shop_image_verified': np.random.choice([0, 1]),
-                'reporting_error_rate': np.random.uniform(0.02, 0.06),
-                'incoming_funds_verified': np.random.uniform(0.6, 0.8),
-                'insurance_coverage_score': np.random.uniform(0.2, 0.5),
-                'insurance_premium_paid_ratio': np.random.uniform(0.5, 0.8),
-                'local_economic_health_score': np.random.uniform(0.5, 0.7),
-                'customer_concentration_risk': np.random.uniform(0.4, 0.6),
+                'shop_image_verified': rng.choice([0, 1], n),
+                'reporting_error_rate': rng.uniform(0.02, 0.06, n),
+                'incoming_funds_verified': rng.uniform(0.6, 0.8, n),
+                'insurance_coverage_score': rng.uniform(0.2, 0.5, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.5, 0.8, n),
+                'local_economic_health_score': rng.uniform(0.5, 0.7, n),
+                'customer_concentration_risk': rng.uniform(0.4, 0.6, n),
                 'legal_proceedings_flag': 0,
                 'legal_disputes_count': 0,
-                'social_media_presence_score': np.random.uniform(0.4, 0.7),
-                'social_media_sentiment_score': np.random.uniform(0.6, 0.8),
-                'online_reviews_score': np.random.uniform(3.0, 4.5),
-                'default_90dpd': np.random.choice([0, 1], p=[0.88, 0.12]),  # 12% default
-                'default_probability_true': np.random.uniform(0.08, 0.15),
+                'social_media_presence_score': rng.uniform(0.4, 0.7, n),
+                'social_media_sentiment_score': rng.uniform(0.6, 0.8, n),
+                'online_reviews_score': rng.uniform(3.0, 4.5, n),
+                'default_90dpd': rng.choice([0, 1], n, p=[0.88, 0.12]),  # 12% default
+                'default_probability_true': rng.uniform(0.08, 0.15, n),
             }
-            edge_cases.append(new_biz)
         
-        # 4. HIGH GROWTH STARTUP (n_each samples)
-        for _ in range(n_each):
-            startup = {
+        # 4. HIGH GROWTH STARTUP
+        elif kind == 'high_growth_startup':
+            case = {
                 'business_segment': 'small_services',
                 'industry_code': 'technology',
-                'legal_entity_type': np.random.choice(['private_limited', 'llp']),
-                'business_age_years': np.random.uniform(1, 3),
+                'legal_entity_type': rng.choice(['private_limited', 'llp'], n),
+                'business_age_years': rng.uniform(1, 3, n),
                 'business_address_verified': 1,
                 'geolocation_verified': 1,
-                'industry_risk_score': np.random.uniform(0.15, 0.25),
-                'num_business_locations': np.random.randint(1, 3),
-                'employees_count': np.random.randint(5, 20),
+                'industry_risk_score': rng.uniform(0.15, 0.25, n),
+                'num_business_locations': rng.integers(1, 3, n),
+                'employees_count': rng.integers(5, 20, n),
                 'gstin_verified': 1,
                 'pan_verified': 1,
                 'msme_registered': 1,
                 'msme_category': 'small',
                 'business_structure': 'office',
-                'licenses_certificates_score': np.random.uniform(0.7, 0.9),
-                'weekly_gtv': np.random.uniform(200000, 800000),
-                'monthly_gtv': np.random.uniform(800000, 3200000),
-                'transaction_count_daily': np.random.randint(30, 100),
-                'avg_transaction_value': np.random.uniform(200, 600),
-                'revenue_concentration_score': np.random.uniform(0.4, 0.6),
-                'peak_day_dependency': np.random.uniform(0.1, 0.25),
-                'revenue_growth_rate_mom': np.random.uniform(0.15, 0.40),  # HIGH growth
-                'revenue_growth_rate_qoq': np.random.uniform(0.40, 0.80),
-                'profit_margin': np.random.uniform(0.10, 0.20),
-                'profit_margin_trend': np.random.uniform(0.03, 0.10),
-                'inventory_turnover_ratio': np.random.uniform(3, 6),
-                'total_assets_value': np.random.uniform(1000000, 5000000),
-                'operational_leverage_ratio': np.random.uniform(1.2, 1.8),
-                'avg_bank_balance': np.random.uniform(300000, 1000000),
-                'bank_balance_trend': np.random.uniform(0.05, 0.20),
-                'weekly_inflow_outflow_ratio': np.random.uniform(1.1, 1.4),
-                'overdraft_days_count': np.random.randint(0, 8),
-                'overdraft_amount_avg': np.random.uniform(0, 50000),
-                'cash_buffer_days': np.random.uniform(25, 50),
-                'avg_daily_closing_balance': np.random.uniform(200000, 800000),
-                'cash_balance_std_dev': np.random.uniform(50000, 200000),
-                'negative_balance_days': np.random.randint(0, 3),
-                'daily_min_balance_pattern': np.random.uniform(100000, 400000),
-                'consistent_deposits_score': np.random.uniform(0.7, 0.9),
-                'cashflow_regularity_score': np.random.uniform(0.6, 0.85),
-                'receivables_aging_days': np.random.uniform(20, 40),
-                'payables_aging_days': np.random.uniform(25, 45),
-                'bounced_cheques_count': np.random.randint(0, 2),
-                'bounced_cheques_rate': np.random.uniform(0.0, 0.03),
-                'historical_loan_utilization': np.random.uniform(0.3, 0.6),
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.85, 0.98),
+                'licenses_certificates_score': rng.uniform(0.7, 0.9, n),
+                'weekly_gtv': rng.uniform(200000, 800000, n),
+                'monthly_gtv': rng.uniform(800000, 3200000, n),
+                'transaction_count_daily': rng.integers(30, 100, n),
+                'avg_transaction_value': rng.uniform(200, 600, n),
+                'revenue_concentration_score': rng.uniform(0.4, 0.6, n),
+                'peak_day_dependency': rng.uniform(0.1, 0.25, n),
+                'revenue_growth_rate_mom': rng.uniform(0.15, 0.40, n),  # HIGH growth
+                'revenue_growth_rate_qoq': rng.uniform(0.40, 0.80, n),
+                'profit_margin': rng.uniform(0.10, 0.20, n),
+                'profit_margin_trend': rng.uniform(0.03, 0.10, n),
+                'inventory_turnover_ratio': rng.uniform(3, 6, n),
+                'total_assets_value': rng.uniform(1000000, 5000000, n),
+                'operational_leverage_ratio': rng.uniform(1.2, 1.8, n),
+                'avg_bank_balance': rng.uniform(300000, 1000000, n),
+                'bank_balance_trend': rng.uniform(0.05, 0.20, n),
+                'weekly_inflow_outflow_ratio': rng.uniform(1.1, 1.4, n),
+                'overdraft_days_count': rng.integers(0, 8, n),
+                'overdraft_amount_avg': rng.uniform(0, 50000, n),
+                'cash_buffer_days': rng.uniform(25, 50, n),
+                'avg_daily_closing_balance': rng.uniform(200000, 800000, n),
+                'cash_balance_std_dev': rng.uniform(50000, 200000, n),
+                'negative_balance_days': rng.integers(0, 3, n),
+                'daily_min_balance_pattern': rng.uniform(100000, 400000, n),
+                'consistent_deposits_score': rng.uniform(0.7, 0.9, n),
+                'cashflow_regularity_score': rng.uniform(0.6, 0.85, n),
+                'receivables_aging_days': rng.uniform(20, 40, n),
+                'payables_aging_days': rng.uniform(25, 45, n),
+                'bounced_cheques_count': rng.integers(0, 2, n),
+                'bounced_cheques_rate': rng.uniform(0.0, 0.03, n),
+                'historical_loan_utilization': rng.uniform(0.3, 0.6, n),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.85, 0.98, n),
                 'previous_defaults_count': 0,
                 'previous_writeoffs_count': 0,
-                'current_loans_outstanding': np.random.randint(0, 2),
-                'total_debt_amount': np.random.uniform(200000, 1000000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.85, 0.98),
-                'utility_payment_days_before_due': np.random.uniform(0, 8),
-                'mobile_recharge_regularity': np.random.uniform(0.85, 0.98),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.85, 0.98),
-                'rent_payment_regularity': np.random.uniform(0.85, 0.98),
-                'rent_payment_ontime_ratio': np.random.uniform(0.85, 0.98),
-                'supplier_payment_regularity': np.random.uniform(0.8, 0.95),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.8, 0.95),
-                'gst_filing_regularity': np.random.uniform(0.85, 0.98),
-                'gst_filing_ontime_ratio': np.random.uniform(0.85, 0.98),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.02, 0.08),
-                'outstanding_taxes_amount': np.random.uniform(0, 50000),
+                'current_loans_outstanding': rng.integers(0, 2, n),
+                'total_debt_amount': rng.uniform(200000, 1000000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.85, 0.98, n),
+                'utility_payment_days_before_due': rng.uniform(0, 8, n),
+                'mobile_recharge_regularity': rng.uniform(0.85, 0.98, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.85, 0.98, n),
+                'rent_payment_regularity': rng.uniform(0.85, 0.98, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.85, 0.98, n),
+                'supplier_payment_regularity': rng.uniform(0.8, 0.95, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.8, 0.95, n),
+                'gst_filing_regularity': rng.uniform(0.85, 0.98, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.85, 0.98, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.02, 0.08, n),
+                'outstanding_taxes_amount': rng.uniform(0, 50000, n),
                 'outstanding_dues_flag': 0,
                 'itr_filed': 1,
-                'itr_income_declared': np.random.uniform(500000, 2000000),
-                'gst_r1_vs_itr_mismatch': np.random.uniform(0.0, 0.05),
-                'tax_payment_regularity': np.random.uniform(0.85, 0.98),
-                'tax_payment_ontime_ratio': np.random.uniform(0.85, 0.98),
-                'refund_chargeback_rate': np.random.uniform(0.01, 0.04),
-                'kyc_completion_score': np.random.uniform(0.85, 0.98),
+                'itr_income_declared': rng.uniform(500000, 2000000, n),
+                'gst_r1_vs_itr_mismatch': rng.uniform(0.0, 0.05, n),
+                'tax_payment_regularity': rng.uniform(0.85, 0.98, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.85, 0.98, n),
+                'refund_chargeback_rate': rng.uniform(0.01, 0.04, n),
+                'kyc_completion_score': rng.uniform(0.85, 0.98, n),
                 'kyc_attempts_count': 1,
-                'device_consistency_score': np.random.uniform(0.9, 0.98),
-                'ip_stability_score': np.random.uniform(0.85, 0.95),
+                'device_consistency_score': rng.uniform(0.9, 0.98, n),
+                'ip_stability_score': rng.uniform(0.85, 0.95, n),
                 'pan_address_bank_mismatch': 0,
                 'image_ocr_verified': 1,
                 'shop_image_verified': 1,
-                'reporting_error_rate': np.random.uniform(0.01, 0.03),
-                'incoming_funds_verified': np.random.uniform(0.85, 0.95),
-                'insurance_coverage_score': np.random.uniform(0.5, 0.8),
-                'insurance_premium_paid_ratio': np.random.uniform(0.8, 0.95),
-                'local_economic_health_score': np.random.uniform(0.6, 0.8),
-                'customer_concentration_risk': np.random.uniform(0.3, 0.5),
+                'reporting_error_rate': rng.uniform(0.01, 0.03, n),
+                'incoming_funds_verified': rng.uniform(0.85, 0.95, n),
+                'insurance_coverage_score': rng.uniform(0.5, 0.8, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.8, 0.95, n),
+                'local_economic_health_score': rng.uniform(0.6, 0.8, n),
+                'customer_concentration_risk': rng.uniform(0.3, 0.5, n),
                 'legal_proceedings_flag': 0,
                 'legal_disputes_count': 0,
-                'social_media_presence_score': np.random.uniform(0.7, 0.9),
-                'social_media_sentiment_score': np.random.uniform(0.75, 0.9),
-                'online_reviews_score': np.random.uniform(4.0, 4.8),
-                'default_90dpd': np.random.choice([0, 1], p=[0.94, 0.06]),  # 6% default
-                'default_probability_true': np.random.uniform(0.04, 0.08),
+                'social_media_presence_score': rng.uniform(0.7, 0.9, n),
+                'social_media_sentiment_score': rng.uniform(0.75, 0.9, n),
+                'online_reviews_score': rng.uniform(4.0, 4.8, n),
+                'default_90dpd': rng.choice([0, 1], n, p=[0.94, 0.06]),  # 6% default
+                'default_probability_true': rng.uniform(0.04, 0.08, n),
             }
-            edge_cases.append(startup)
         
-        # 5. DECLINING BUSINESS (n_each samples)
-        for _ in range(n_each):
-            declining = {
+        # 5. DECLINING BUSINESS
+        elif kind == 'declining':
+            case = {
                 'business_segment': 'small_trading',
                 'industry_code': 'retail',
                 'legal_entity_type': 'proprietorship',
-                'business_age_years': np.random.uniform(5, 12),
+                'business_age_years': rng.uniform(5, 12, n),
                 'business_address_verified': 1,
                 'geolocation_verified': 1,
-                'industry_risk_score': np.random.uniform(0.25, 0.35),
-                'num_business_locations': np.random.randint(1, 3),
-                'employees_count': np.random.randint(2, 8),
+                'industry_risk_score': rng.uniform(0.25, 0.35, n),
+                'num_business_locations': rng.integers(1, 3, n),
+                'employees_count': rng.integers(2, 8, n),
                 'gstin_verified': 1,
                 'pan_verified': 1,
                 'msme_registered': 1,
                 'msme_category': 'small',
                 'business_structure': 'shop',
-                'licenses_certificates_score': np.random.uniform(0.5, 0.7),
-                'weekly_gtv': np.random.uniform(100000, 300000),
-                'monthly_gtv': np.random.uniform(400000, 1200000),
-                'transaction_count_daily': np.random.randint(15, 50),
-                'avg_transaction_value': np.random.uniform(150, 400),
-                'revenue_concentration_score': np.random.uniform(0.5, 0.7),
-                'peak_day_dependency': np.random.uniform(0.2, 0.35),
-                'revenue_growth_rate_mom': np.random.uniform(-0.15, -0.03),  # DECLINING
-                'revenue_growth_rate_qoq': np.random.uniform(-0.25, -0.05),
-                'profit_margin': np.random.uniform(0.02, 0.08),
-                'profit_margin_trend': np.random.uniform(-0.08, -0.02),
-                'inventory_turnover_ratio': np.random.uniform(1.5, 3),
-                'total_assets_value': np.random.uniform(500000, 2000000),
-                'operational_leverage_ratio': np.random.uniform(1.5, 2.5),
-                'avg_bank_balance': np.random.uniform(50000, 200000),
-                'bank_balance_trend': np.random.uniform(-0.15, -0.03),
-                'weekly_inflow_outflow_ratio': np.random.uniform(0.85, 1.0),
-                'overdraft_days_count': np.random.randint(10, 25),
-                'overdraft_amount_avg': np.random.uniform(30000, 100000),
-                'cash_buffer_days': np.random.uniform(15, 35),
-                'avg_daily_closing_balance': np.random.uniform(40000, 150000),
-                'cash_balance_std_dev': np.random.uniform(30000, 100000),
-                'negative_balance_days': np.random.randint(3, 10),
-                'daily_min_balance_pattern': np.random.uniform(20000, 80000),
-                'consistent_deposits_score': np.random.uniform(0.5, 0.7),
-                'cashflow_regularity_score': np.random.uniform(0.4, 0.65),
-                'receivables_aging_days': np.random.uniform(35, 60),
-                'payables_aging_days': np.random.uniform(45, 75),
-                'bounced_cheques_count': np.random.randint(1, 5),
-                'bounced_cheques_rate': np.random.uniform(0.04, 0.10),
-                'historical_loan_utilization': np.random.uniform(0.6, 0.85),
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.6, 0.8),
-                'previous_defaults_count': np.random.randint(0, 2),
+                'licenses_certificates_score': rng.uniform(0.5, 0.7, n),
+                'weekly_gtv': rng.uniform(100000, 300000, n),
+                'monthly_gtv': rng.uniform(400000, 1200000, n),
+                'transaction_count_daily': rng.integers(15, 50, n),
+                'avg_transaction_value': rng.uniform(150, 400, n),
+                'revenue_concentration_score': rng.uniform(0.5, 0.7, n),
+                'peak_day_dependency': rng.uniform(0.2, 0.35, n),
+                'revenue_growth_rate_mom': rng.uniform(-0.15, -0.03, n),  # DECLINING
+                'revenue_growth_rate_qoq': rng.uniform(-0.25, -0.05, n),
+                'profit_margin': rng.uniform(0.02, 0.08, n),
+                'profit_margin_trend': rng.uniform(-0.08, -0.02, n),
+                'inventory_turnover_ratio': rng.uniform(1.5, 3, n),
+                'total_assets_value': rng.uniform(500000, 2000000, n),
+                'operational_leverage_ratio': rng.uniform(1.5, 2.5, n),
+                'avg_bank_balance': rng.uniform(50000, 200000, n),
+                'bank_balance_trend': rng.uniform(-0.15, -0.03, n),
+                'weekly_inflow_outflow_ratio': rng.uniform(0.85, 1.0, n),
+                'overdraft_days_count': rng.integers(10, 25, n),
+                'overdraft_amount_avg': rng.uniform(30000, 100000, n),
+                'cash_buffer_days': rng.uniform(15, 35, n),
+                'avg_daily_closing_balance': rng.uniform(40000, 150000, n),
+                'cash_balance_std_dev': rng.uniform(30000, 100000, n),
+                'negative_balance_days': rng.integers(3, 10, n),
+                'daily_min_balance_pattern': rng.uniform(20000, 80000, n),
+                'consistent_deposits_score': rng.uniform(0.5, 0.7, n),
+                'cashflow_regularity_score': rng.uniform(0.4, 0.65, n),
+                'receivables_aging_days': rng.uniform(35, 60, n),
+                'payables_aging_days': rng.uniform(45, 75, n),
+                'bounced_cheques_count': rng.integers(1, 5, n),
+                'bounced_cheques_rate': rng.uniform(0.04, 0.10, n),
+                'historical_loan_utilization': rng.uniform(0.6, 0.85, n),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.6, 0.8, n),
+                'previous_defaults_count': rng.integers(0, 2, n),
                 'previous_writeoffs_count': 0,
-                'current_loans_outstanding': np.random.randint(1, 4),
-                'total_debt_amount': np.random.uniform(300000, 1000000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.6, 0.8),
-                'utility_payment_days_before_due': np.random.uniform(-8, 2),
-                'mobile_recharge_regularity': np.random.uniform(0.6, 0.8),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.6, 0.8),
-                'rent_payment_regularity': np.random.uniform(0.6, 0.8),
-                'rent_payment_ontime_ratio': np.random.uniform(0.55, 0.75),
-                'supplier_payment_regularity': np.random.uniform(0.55, 0.75),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.5, 0.7),
-                'gst_filing_regularity': np.random.uniform(0.6, 0.8),
-                'gst_filing_ontime_ratio': np.random.uniform(0.55, 0.75),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.08, 0.18),
-                'outstanding_taxes_amount': np.random.uniform(30000, 150000),
-                'outstanding_dues_flag': np.random.choice([0, 1]),
+                'current_loans_outstanding': rng.integers(1, 4, n),
+                'total_debt_amount': rng.uniform(300000, 1000000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.6, 0.8, n),
+                'utility_payment_days_before_due': rng.uniform(-8, 2, n),
+                'mobile_recharge_regularity': rng.uniform(0.6, 0.8, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.6, 0.8, n),
+                'rent_payment_regularity': rng.uniform(0.6, 0.8, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.55, 0.75, n),
+                'supplier_payment_regularity': rng.uniform(0.55, 0.75, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.5, 0.7, n),
+                'gst_filing_regularity': rng.uniform(0.6, 0.8, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.55, 0.75, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.08, 0.18, n),
+                'outstanding_taxes_amount': rng.uniform(30000, 150000, n),
+                'outstanding_dues_flag': rng.choice([0, 1], n),
                 'itr_filed': 1,
-                'itr_income_declared': np.random.uniform(200000, 600000),
-                'gst_r1_vs_itr_mismatch': np.random.uniform(0.05, 0.15),
-                'tax_payment_regularity': np.random.uniform(0.55, 0.75),
-                'tax_payment_ontime_ratio': np.random.uniform(0.5, 0.7),
-                'refund_chargeback_rate': np.random.uniform(0.05, 0.12),
-                'kyc_completion_score': np.random.uniform(0.65, 0.85),
-                'kyc_attempts_count': np.random.randint(1, 3),
-                'device_consistency_score': np.random.uniform(0.7, 0.85),
-                'ip_stability_score': np.random.uniform(0.65, 0.8),
+                'itr_income_declared': rng.uniform(200000, 600000, n),
+                'gst_r1_vs_itr_mismatch': rng.uniform(0.05, 0.15, n),
+                'tax_payment_regularity': rng.uniform(0.55, 0.75, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.5, 0.7, n),
+                'refund_chargeback_rate': rng.uniform(0.05, 0.12, n),
+                'kyc_completion_score': rng.uniform(0.65, 0.85, n),
+                'kyc_attempts_count': rng.integers(1, 3, n),
+                'device_consistency_score': rng.uniform(0.7, 0.85, n),
+                'ip_stability_score': rng.uniform(0.65, 0.8, n),
                 'pan_address_bank_mismatch': 0,
                 'image_ocr_verified': 1,
                 'shop_image_verified': 1,
-                'reporting_error_rate': np.random.uniform(0.03, 0.08),
-                'incoming_funds_verified': np.random.uniform(0.6, 0.8),
-                'insurance_coverage_score': np.random.uniform(0.4, 0.6),
-                'insurance_premium_paid_ratio': np.random.uniform(0.5, 0.7),
-                'local_economic_health_score': np.random.uniform(0.4, 0.6),
-                'customer_concentration_risk': np.random.uniform(0.5, 0.7),
+                'reporting_error_rate': rng.uniform(0.03, 0.08, n),
+                'incoming_funds_verified': rng.uniform(0.6, 0.8, n),
+                'insurance_coverage_score': rng.uniform(0.4, 0.6, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.5, 0.7, n),
+                'local_economic_health_score': rng.uniform(0.4, 0.6, n),
+                'customer_concentration_risk': rng.uniform(0.5, 0.7, n),
                 'legal_proceedings_flag': 0,
                 'legal_disputes_count': 0,
-                'social_media_presence_score': np.random.uniform(0.4, 0.6),
-                'social_media_sentiment_score': np.random.uniform(0.5, 0.7),
-                'online_reviews_score': np.random.uniform(3.0, 3.8),
-                'default_90dpd': np.random.choice([0, 1], p=[0.85, 0.15]),  # 15% default
-                'default_probability_true': np.random.uniform(0.12, 0.20),
+                'social_media_presence_score': rng.uniform(0.4, 0.6, n),
+                'social_media_sentiment_score': rng.uniform(0.5, 0.7, n),
+                'online_reviews_score': rng.uniform(3.0, 3.8, n),
+                'default_90dpd': rng.choice([0, 1], n, p=[0.85, 0.15]),  # 15% default
+                'default_probability_true': rng.uniform(0.12, 0.20, n),
             }
-            edge_cases.append(declining)
         
-        # 6. SEASONAL BUSINESS (n_each samples)
-        for _ in range(n_each):
-            seasonal = {
+        # 6. SEASONAL BUSINESS
+        else:  # seasonal
+            case = {
                 'business_segment': 'small_trading',
-                'industry_code': np.random.choice(['retail', 'hospitality', 'agriculture']),
-                'legal_entity_type': np.random.choice(['proprietorship', 'partnership']),
-                'business_age_years': np.random.uniform(3, 10),
+                'industry_code': rng.choice(['retail', 'hospitality', 'agriculture'], n),
+                'legal_entity_type': rng.choice(['proprietorship', 'partnership'], n),
+                'business_age_years': rng.uniform(3, 10, n),
                 'business_address_verified': 1,
                 'geolocation_verified': 1,
-                'industry_risk_score': np.random.uniform(0.25, 0.35),
-                'num_business_locations': np.random.randint(1, 3),
-                'employees_count': np.random.randint(3, 12),
+                'industry_risk_score': rng.uniform(0.25, 0.35, n),
+                'num_business_locations': rng.integers(1, 3, n),
+                'employees_count': rng.integers(3, 12, n),
                 'gstin_verified': 1,
                 'pan_verified': 1,
                 'msme_registered': 1,
                 'msme_category': 'small',
-                'business_structure': np.random.choice(['shop', 'warehouse']),
-                'licenses_certificates_score': np.random.uniform(0.6, 0.8),
-                'weekly_gtv': np.random.uniform(150000, 500000),
-                'monthly_gtv': np.random.uniform(600000, 2000000),
-                'transaction_count_daily': np.random.randint(20, 80),
-                'avg_transaction_value': np.random.uniform(150, 450),
-                'revenue_concentration_score': np.random.uniform(0.4, 0.6),
-                'peak_day_dependency': np.random.uniform(0.35, 0.55),  # HIGH peak dependency
-                'revenue_growth_rate_mom': np.random.uniform(-0.3, 0.4),  # VARIABLE
-                'revenue_growth_rate_qoq': np.random.uniform(-0.2, 0.5),
-                'profit_margin': np.random.uniform(0.08, 0.18),
-                'profit_margin_trend': np.random.uniform(-0.05, 0.05),
-                'inventory_turnover_ratio': np.random.uniform(2, 5),
-                'total_assets_value': np.random.uniform(800000, 3000000),
-                'operational_leverage_ratio': np.random.uniform(1.3, 2.2),
-                'avg_bank_balance': np.random.uniform(80000, 350000),
-                'bank_balance_trend': np.random.uniform(-0.1, 0.1),  # Variable
-                'weekly_inflow_outflow_ratio': np.random.uniform(0.8, 1.3),
-                'overdraft_days_count': np.random.randint(5, 20),
-                'overdraft_amount_avg': np.random.uniform(20000, 80000),
-                'cash_buffer_days': np.random.uniform(20, 45),
-                'avg_daily_closing_balance': np.random.uniform(60000, 280000),
-                'cash_balance_std_dev': np.random.uniform(80000, 250000),  # HIGH variance
-                'negative_balance_days': np.random.randint(2, 8),
-                'daily_min_balance_pattern': np.random.uniform(30000, 120000),
-                'consistent_deposits_score': np.random.uniform(0.5, 0.7),  # Lower due to seasonality
-                'cashflow_regularity_score': np.random.uniform(0.45, 0.65),
-                'receivables_aging_days': np.random.uniform(25, 50),
-                'payables_aging_days': np.random.uniform(30, 55),
-                'bounced_cheques_count': np.random.randint(0, 3),
-                'bounced_cheques_rate': np.random.uniform(0.02, 0.07),
-                'historical_loan_utilization': np.random.uniform(0.4, 0.7),
-                'overdraft_repayment_ontime_ratio': np.random.uniform(0.7, 0.88),
-                'previous_defaults_count': np.random.randint(0, 1),
+                'business_structure': rng.choice(['shop', 'warehouse'], n),
+                'licenses_certificates_score': rng.uniform(0.6, 0.8, n),
+                'weekly_gtv': rng.uniform(150000, 500000, n),
+                'monthly_gtv': rng.uniform(600000, 2000000, n),
+                'transaction_count_daily': rng.integers(20, 80, n),
+                'avg_transaction_value': rng.uniform(150, 450, n),
+                'revenue_concentration_score': rng.uniform(0.4, 0.6, n),
+                'peak_day_dependency': rng.uniform(0.35, 0.55, n),  # HIGH peak dependency
+                'revenue_growth_rate_mom': rng.uniform(-0.3, 0.4, n),  # VARIABLE
+                'revenue_growth_rate_qoq': rng.uniform(-0.2, 0.5, n),
+                'profit_margin': rng.uniform(0.08, 0.18, n),
+                'profit_margin_trend': rng.uniform(-0.05, 0.05, n),
+                'inventory_turnover_ratio': rng.uniform(2, 5, n),
+                'total_assets_value': rng.uniform(800000, 3000000, n),
+                'operational_leverage_ratio': rng.uniform(1.3, 2.2, n),
+                'avg_bank_balance': rng.uniform(80000, 350000, n),
+                'bank_balance_trend': rng.uniform(-0.1, 0.1, n),  # Variable
+                'weekly_inflow_outflow_ratio': rng.uniform(0.8, 1.3, n),
+                'overdraft_days_count': rng.integers(5, 20, n),
+                'overdraft_amount_avg': rng.uniform(20000, 80000, n),
+                'cash_buffer_days': rng.uniform(20, 45, n),
+                'avg_daily_closing_balance': rng.uniform(60000, 280000, n),
+                'cash_balance_std_dev': rng.uniform(80000, 250000, n),  # HIGH variance
+                'negative_balance_days': rng.integers(2, 8, n),
+                'daily_min_balance_pattern': rng.uniform(30000, 120000, n),
+                'consistent_deposits_score': rng.uniform(0.5, 0.7, n),  # Lower due to seasonality
+                'cashflow_regularity_score': rng.uniform(0.45, 0.65, n),
+                'receivables_aging_days': rng.uniform(25, 50, n),
+                'payables_aging_days': rng.uniform(30, 55, n),
+                'bounced_cheques_count': rng.integers(0, 3, n),
+                'bounced_cheques_rate': rng.uniform(0.02, 0.07, n),
+                'historical_loan_utilization': rng.uniform(0.4, 0.7, n),
+                'overdraft_repayment_ontime_ratio': rng.uniform(0.7, 0.88, n),
+                'previous_defaults_count': rng.integers(0, 1, n),
                 'previous_writeoffs_count': 0,
-                'current_loans_outstanding': np.random.randint(0, 3),
-                'total_debt_amount': np.random.uniform(200000, 800000),
-                'utility_payment_ontime_ratio': np.random.uniform(0.7, 0.88),
-                'utility_payment_days_before_due': np.random.uniform(-5, 5),
-                'mobile_recharge_regularity': np.random.uniform(0.7, 0.88),
-                'mobile_recharge_ontime_ratio': np.random.uniform(0.7, 0.88),
-                'rent_payment_regularity': np.random.uniform(0.75, 0.9),
-                'rent_payment_ontime_ratio': np.random.uniform(0.7, 0.85),
-                'supplier_payment_regularity': np.random.uniform(0.65, 0.82),
-                'supplier_payment_ontime_ratio': np.random.uniform(0.65, 0.8),
-                'gst_filing_regularity': np.random.uniform(0.7, 0.88),
-                'gst_filing_ontime_ratio': np.random.uniform(0.7, 0.85),
-                'gst_vs_platform_sales_mismatch': np.random.uniform(0.05, 0.12),
-                'outstanding_taxes_amount': np.random.uniform(10000, 80000),
+                'current_loans_outstanding': rng.integers(0, 3, n),
+                'total_debt_amount': rng.uniform(200000, 800000, n),
+                'utility_payment_ontime_ratio': rng.uniform(0.7, 0.88, n),
+                'utility_payment_days_before_due': rng.uniform(-5, 5, n),
+                'mobile_recharge_regularity': rng.uniform(0.7, 0.88, n),
+                'mobile_recharge_ontime_ratio': rng.uniform(0.7, 0.88, n),
+                'rent_payment_regularity': rng.uniform(0.75, 0.9, n),
+                'rent_payment_ontime_ratio': rng.uniform(0.7, 0.85, n),
+                'supplier_payment_regularity': rng.uniform(0.65, 0.82, n),
+                'supplier_payment_ontime_ratio': rng.uniform(0.65, 0.8, n),
+                'gst_filing_regularity': rng.uniform(0.7, 0.88, n),
+                'gst_filing_ontime_ratio': rng.uniform(0.7, 0.85, n),
+                'gst_vs_platform_sales_mismatch': rng.uniform(0.05, 0.12, n),
+                'outstanding_taxes_amount': rng.uniform(10000, 80000, n),
                 'outstanding_dues_flag': 0,
                 'itr_filed': 1,
-                'itr_income_declared': np.random.uniform(400000, 1500000),
-                'gst_r1_vs_itr_mismatch': np.random.uniform(0.03, 0.10),
-                'tax_payment_regularity': np.random.uniform(0.7, 0.85),
-                'tax_payment_ontime_ratio': np.random.uniform(0.65, 0.82),
-                'refund_chargeback_rate': np.random.uniform(0.03, 0.08),
-                'kyc_completion_score': np.random.uniform(0.75, 0.9),
-                'kyc_attempts_count': np.random.randint(1, 2),
-                'device_consistency_score': np.random.uniform(0.8, 0.92),
-                'ip_stability_score': np.random.uniform(0.7, 0.85),
+                'itr_income_declared': rng.uniform(400000, 1500000, n),
+                'gst_r1_vs_itr_mismatch': rng.uniform(0.03, 0.10, n),
+                'tax_payment_regularity': rng.uniform(0.7, 0.85, n),
+                'tax_payment_ontime_ratio': rng.uniform(0.65, 0.82, n),
+                'refund_chargeback_rate': rng.uniform(0.03, 0.08, n),
+                'kyc_completion_score': rng.uniform(0.75, 0.9, n),
+                'kyc_attempts_count': rng.integers(1, 2, n),
+                'device_consistency_score': rng.uniform(0.8, 0.92, n),
+                'ip_stability_score': rng.uniform(0.7, 0.85, n),
                 'pan_address_bank_mismatch': 0,
                 'image_ocr_verified': 1,
                 'shop_image_verified': 1,
-                'reporting_error_rate': np.random.uniform(0.02, 0.05),
-                'incoming_funds_verified': np.random.uniform(0.7, 0.85),
-                'insurance_coverage_score': np.random.uniform(0.5, 0.7),
-                'insurance_premium_paid_ratio': np.random.uniform(0.65, 0.85),
-                'local_economic_health_score': np.random.uniform(0.5, 0.7),
-                'customer_concentration_risk': np.random.uniform(0.35, 0.55),
+                'reporting_error_rate': rng.uniform(0.02, 0.05, n),
+                'incoming_funds_verified': rng.uniform(0.7, 0.85, n),
+                'insurance_coverage_score': rng.uniform(0.5, 0.7, n),
+                'insurance_premium_paid_ratio': rng.uniform(0.65, 0.85, n),
+                'local_economic_health_score': rng.uniform(0.5, 0.7, n),
+                'customer_concentration_risk': rng.uniform(0.35, 0.55, n),
                 'legal_proceedings_flag': 0,
                 'legal_disputes_count': 0,
-                'social_media_presence_score': np.random.uniform(0.5, 0.7),
-                'social_media_sentiment_score': np.random.uniform(0.6, 0.8),
-                'online_reviews_score': np.random.uniform(3.5, 4.3),
-                'default_90dpd': np.random.choice([0, 1], p=[0.92, 0.08]),  # 8% default
-                'default_probability_true': np.random.uniform(0.06, 0.10),
+                'social_media_presence_score': rng.uniform(0.5, 0.7, n),
+                'social_media_sentiment_score': rng.uniform(0.6, 0.8, n),
+                'online_reviews_score': rng.uniform(3.5, 4.3, n),
+                'default_90dpd': rng.choice([0, 1], n, p=[0.92, 0.08]),  # 8% default
+                'default_probability_true': rng.uniform(0.06, 0.10, n),
             }
-            edge_cases.append(seasonal)
-        
-        # Create DataFrame and add timestamps
-        edge_df = pd.DataFrame(edge_cases)
-        edge_df['application_date'] = [
-            datetime(2023, 1, 1) + timedelta(days=int(d))
-            for d in np.random.uniform(0, 730, len(edge_df))
-        ]
         
-        return edge_df
+        return pd.DataFrame(case, index=range(n))
     
     def generate(self, n_samples: int = 10000,
                  missing_rate: float = 0.05,
@@ -918,20 +910,102 @@ class MSMESyntheticDataGenerator:
         """
         Generate synthetic MSME credit scoring dataset.
         
+        Rows are drawn in seeded blocks (see synthetic_engine), so they are
+        the same rows write_parquet() writes for the same settings.
+        
         Args:
-            n_samples: Number of samples to generate
+            n_samples: Number of main samples to generate
             missing_rate: Fraction of values to set as missing
             include_timestamp: Whether to include application timestamp
             
         Returns:
-            DataFrame with all features and target variable
+            DataFrame with all features and target variable: n_samples rows
+            plus n_edge_each per edge case type, edge cases spread at random
         """
         print(f"Generating {n_samples} synthetic MSME samples...")
         
+        n_edge_each = self.n_edge_cases(n_samples)
+        n_rows = n_samples + n_edge_each * len(self.EDGE_CASE_TYPES)
+        df = generate_rows(self.block_function(n_samples, missing_rate, include_timestamp),
+                           self.seed, 0, n_rows)
+        
+        print(f"Generated {len(df)} MSME samples with {df['default_90dpd'].sum()} defaults ({df['default_90dpd'].mean()*100:.1f}%)")
+        print(f"  - Main samples: ~{n_samples}")
+        print(f"  - Edge cases: ~{n_rows - n_samples} (~{n_edge_each} each x {len(self.EDGE_CASE_TYPES)} types)")
+        
+        return df
+    
+    def write_parquet(self, path: str, n_samples: int = 10000,
+                      missing_rate: float = 0.05,
+                      include_timestamp: bool = True,
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                      n_workers: int = 1,
+                      partition_cols: Optional[List[str]] = None) -> List[str]:
+        """
+        Stream the dataset generate() returns to a directory of Parquet files,
+        chunk_rows rows at a time, so datasets larger than memory can be written.
+        
+        Args:
+            path: Output directory (must not exist or be empty)
+            n_samples: Number of main samples (edge cases are added as in generate())
+            missing_rate: Fraction of values to set as missing
+            include_timestamp: Whether to include application timestamp
+            chunk_rows: Rows per Parquet file
+            n_workers: Processes generating chunks in parallel
+            partition_cols: Columns to partition the files by (e.g. ['business_segment'])
+            
+        Returns:
+            Paths of the Parquet files written
+        """
+        n_rows = n_samples + self.n_edge_cases(n_samples) * len(self.EDGE_CASE_TYPES)
+        return write_parquet(self.block_function(n_samples, missing_rate, include_timestamp),
+                             n_rows, path, self.seed, chunk_rows=chunk_rows,
+                             n_workers=n_workers, partition_cols=partition_cols)
+    
+    @staticmethod
+    def n_edge_cases(n_samples: int) -> int:
+        """Rows per edge case type: ~1% of the main samples, at least 50"""
+        return max(50, n_samples // 100)
+    
+    def block_function(self, n_samples: int, missing_rate: float = 0.05,
+                       include_timestamp: bool = True) -> BlockFunction:
+        """Block function (rng, n) -> DataFrame of the dataset for synthetic_engine"""
+        edge_share = self.n_edge_cases(n_samples) / (
+            n_samples + self.n_edge_cases(n_samples) * len(self.EDGE_CASE_TYPES))
+        return functools.partial(self._generate_block, edge_share=edge_share,
+                                 missing_rate=missing_rate, include_timestamp=include_timestamp)
+    
+    def _generate_block(self, rng: np.random.Generator, n: int, edge_share: float,
+                        missing_rate: float, include_timestamp: bool) -> pd.DataFrame:
+        """
+        Generate n rows: each row is a main sample or, with probability
+        edge_share per type, an edge case (edge cases get no missing values)
+        """
+        n_types = len(self.EDGE_CASE_TYPES)
+        kinds = rng.choice(n_types + 1, size=n, p=[1 - n_types * edge_share] + [edge_share] * n_types)
+        
+        frames = [self._generate_main_rows(rng, int((kinds == 0).sum()), missing_rate)]
+        for i, kind in enumerate(self.EDGE_CASE_TYPES, start=1):
+            frames.append(self._generate_edge_case(rng, kind, int((kinds == i).sum())))
+        
+        # Put each frame's rows back at the positions of their kind
+        positions = np.concatenate([np.flatnonzero(kinds == i) for i in range(n_types + 1)])
+        df = pd.concat(frames, ignore_index=True).iloc[np.argsort(positions)].reset_index(drop=True)
+        
+        # Add timestamp
+        if include_timestamp:
+            days = rng.integers(0, 730, n)
+            df['application_date'] = (np.datetime64('2023-01-01', 'ns')
+                                      + days.astype('timedelta64[D]')).astype('datetime64[ns]')
+        
+        return df
+    
+    def _generate_main_rows(self, rng: np.random.Generator, n: int, missing_rate: float) -> pd.DataFrame:
+        """Generate n main samples with correlated features and default labels"""
         # Assign segments
-        segments = np.random.choice(
+        segments = rng.choice(
             list(self.segment_distribution.keys()),
-            size=n_samples,
+            size=n,
             p=list(self.segment_distribution.values())
         )
         
@@ -939,20 +1013,20 @@ class MSMESyntheticDataGenerator:
         data = {'business_segment': segments}
         
         # Generate base factors per segment
-        all_factors = {k: np.zeros(n_samples) for k in 
+        all_factors = {k: np.zeros(n) for k in 
                       ['gtv_base', 'age_factor', 'formality_factor', 'cashflow_health', 'default_base_prob']}
         
         for segment in self.segment_distribution.keys():
             mask = segments == segment
             n_seg = mask.sum()
-            seg_factors = self._generate_segment_features(segment, n_seg)
+            seg_factors = self._generate_segment_features(rng, segment, n_seg)
             for k, v in seg_factors.items():
                 all_factors[k][mask] = v
         
         # Assign industries
-        industries = np.random.choice(
+        industries = rng.choice(
             list(self.industry_distribution.keys()),
-            size=n_samples,
+            size=n,
             p=list(self.industry_distribution.values())
         )
         data['industry_code'] = industries
@@ -960,122 +1034,122 @@ class MSMESyntheticDataGenerator:
         # ========== CATEGORY A: BUSINESS IDENTITY ==========
         data['legal_entity_type'] = np.where(
             all_factors['formality_factor'] > 0.7,
-            np.random.choice(['private_limited', 'llp'], n_samples, p=[0.7, 0.3]),
+            rng.choice(['private_limited', 'llp'], n, p=[0.7, 0.3]),
             np.where(
                 all_factors['formality_factor'] > 0.4,
-                np.random.choice(['partnership', 'proprietorship'], n_samples, p=[0.4, 0.6]),
+                rng.choice(['partnership', 'proprietorship'], n, p=[0.4, 0.6]),
                 'proprietorship'
             )
         )
         
-        data['business_age_years'] = np.clip(all_factors['age_factor'] * 15 + np.random.normal(0, 2, n_samples), 0.5, 50)
-        data['business_address_verified'] = np.random.binomial(1, all_factors['formality_factor'] * 0.95, n_samples)
-        data['geolocation_verified'] = np.random.binomial(1, all_factors['formality_factor'] * 0.9, n_samples)
-        data['industry_risk_score'] = np.array([self.industry_risk[ind] for ind in industries]) + np.random.normal(0, 0.05, n_samples)
+        data['business_age_years'] = np.clip(all_factors['age_factor'] * 15 + rng.normal(0, 2, n), 0.5, 50)
+        data['business_address_verified'] = rng.binomial(1, all_factors['formality_factor'] * 0.95, n)
+        data['geolocation_verified'] = rng.binomial(1, all_factors['formality_factor'] * 0.9, n)
+        data['industry_risk_score'] = pd.Series(industries).map(self.industry_risk).to_numpy() + rng.normal(0, 0.05, n)
         data['industry_risk_score'] = np.clip(data['industry_risk_score'], 0, 1)
-        data['num_business_locations'] = np.clip(1 + np.random.poisson(all_factors['gtv_base'] / 1e6, n_samples), 1, 100).astype(int)
-        data['employees_count'] = np.clip(np.round(all_factors['gtv_base'] / 500000 + np.random.normal(0, 5, n_samples)), 1, 500).astype(int)
-        data['gstin_verified'] = np.random.binomial(1, all_factors['formality_factor'], n_samples)
-        data['pan_verified'] = np.random.binomial(1, np.minimum(all_factors['formality_factor'] + 0.2, 1), n_samples)
-        data['msme_registered'] = np.random.binomial(1, all_factors['formality_factor'] * 0.8, n_samples)
+        data['num_business_locations'] = np.clip(1 + rng.poisson(all_factors['gtv_base'] / 1e6, n), 1, 100).astype(int)
+        data['employees_count'] = np.clip(np.round(all_factors['gtv_base'] / 500000 + rng.normal(0, 5, n)), 1, 500).astype(int)
+        data['gstin_verified'] = rng.binomial(1, all_factors['formality_factor'], n)
+        data['pan_verified'] = rng.binomial(1, np.minimum(all_factors['formality_factor'] + 0.2, 1), n)
+        data['msme_registered'] = rng.binomial(1, all_factors['formality_factor'] * 0.8, n)
         data['msme_category'] = np.where(
             data['msme_registered'] == 0, 'not_registered',
             np.where(all_factors['gtv_base'] < 1e6, 'micro',
                     np.where(all_factors['gtv_base'] < 1e7, 'small', 'medium'))
         )
-        data['business_structure'] = np.random.choice(
+        data['business_structure'] = rng.choice(
             ['home_based', 'shop', 'warehouse', 'office', 'factory', 'multiple'],
-            n_samples,
+            n,
             p=[0.15, 0.35, 0.15, 0.20, 0.10, 0.05]
         )
-        data['licenses_certificates_score'] = np.clip(all_factors['formality_factor'] + np.random.normal(0, 0.1, n_samples), 0, 1)
+        data['licenses_certificates_score'] = np.clip(all_factors['formality_factor'] + rng.normal(0, 0.1, n), 0, 1)
         
         # ========== CATEGORY B: REVENUE & PERFORMANCE ==========
         data['weekly_gtv'] = np.clip(all_factors['gtv_base'] / 4, 0, 100000000)
         data['monthly_gtv'] = np.clip(all_factors['gtv_base'], 0, 500000000)
-        data['transaction_count_daily'] = np.clip(np.round(data['weekly_gtv'] / (7 * 500) + np.random.normal(0, 20, n_samples)), 1, 10000).astype(int)
+        data['transaction_count_daily'] = np.clip(np.round(data['weekly_gtv'] / (7 * 500) + rng.normal(0, 20, n)), 1, 10000).astype(int)
         data['avg_transaction_value'] = data['weekly_gtv'] / (data['transaction_count_daily'] * 7 + 1)
-        data['revenue_concentration_score'] = np.clip(1 - all_factors['cashflow_health'] * 0.5 + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['peak_day_dependency'] = np.clip(np.random.beta(2, 5, n_samples), 0, 1)
-        data['revenue_growth_rate_mom'] = np.clip(np.random.normal(0.05, 0.15, n_samples), -0.5, 1)
-        data['revenue_growth_rate_qoq'] = np.clip(np.random.normal(0.15, 0.25, n_samples), -0.5, 2)
-        data['profit_margin'] = np.clip(np.random.normal(0.15, 0.12, n_samples), -0.3, 0.6)
-        data['profit_margin_trend'] = np.clip(np.random.normal(0.02, 0.1, n_samples), -0.5, 0.5)
-        data['inventory_turnover_ratio'] = np.clip(np.random.lognormal(1.5, 0.8, n_samples), 0.5, 50)
-        data['total_assets_value'] = np.clip(all_factors['gtv_base'] * np.random.uniform(2, 10, n_samples), 0, 500000000)
-        data['operational_leverage_ratio'] = np.clip(np.random.lognormal(0.3, 0.5, n_samples), 0.5, 5)
+        data['revenue_concentration_score'] = np.clip(1 - all_factors['cashflow_health'] * 0.5 + rng.normal(0, 0.1, n), 0, 1)
+        data['peak_day_dependency'] = np.clip(rng.beta(2, 5, n), 0, 1)
+        data['revenue_growth_rate_mom'] = np.clip(rng.normal(0.05, 0.15, n), -0.5, 1)
+        data['revenue_growth_rate_qoq'] = np.clip(rng.normal(0.15, 0.25, n), -0.5, 2)
+        data['profit_margin'] = np.clip(rng.normal(0.15, 0.12, n), -0.3, 0.6)
+        data['profit_margin_trend'] = np.clip(rng.normal(0.02, 0.1, n), -0.5, 0.5)
+        data['inventory_turnover_ratio'] = np.clip(rng.lognormal(1.5, 0.8, n), 0.5, 50)
+        data['total_assets_value'] = np.clip(all_factors['gtv_base'] * rng.uniform(2, 10, n), 0, 500000000)
+        data['operational_leverage_ratio'] = np.clip(rng.lognormal(0.3, 0.5, n), 0.5, 5)
         
         # ========== CATEGORY C: CASH FLOW & BANKING ==========
-        data['avg_bank_balance'] = np.clip(data['monthly_gtv'] * np.random.uniform(0.1, 0.4, n_samples), 0, 100000000)
-        data['bank_balance_trend'] = np.clip(np.random.normal(0.05, 0.2, n_samples), -0.5, 0.5)
-        data['weekly_inflow_outflow_ratio'] = np.clip(1 + all_factors['cashflow_health'] * 0.3 + np.random.normal(0, 0.2, n_samples), 0.5, 3)
-        data['overdraft_days_count'] = np.clip(np.round((1 - all_factors['cashflow_health']) * 30 + np.random.exponential(5, n_samples)), 0, 90).astype(int)
+        data['avg_bank_balance'] = np.clip(data['monthly_gtv'] * rng.uniform(0.1, 0.4, n), 0, 100000000)
+        data['bank_balance_trend'] = np.clip(rng.normal(0.05, 0.2, n), -0.5, 0.5)
+        data['weekly_inflow_outflow_ratio'] = np.clip(1 + all_factors['cashflow_health'] * 0.3 + rng.normal(0, 0.2, n), 0.5, 3)
+        data['overdraft_days_count'] = np.clip(np.round((1 - all_factors['cashflow_health']) * 30 + rng.exponential(5, n)), 0, 90).astype(int)
         data['overdraft_amount_avg'] = np.where(data['overdraft_days_count'] > 0, 
-                                                np.clip(data['monthly_gtv'] * 0.1 * np.random.uniform(0.1, 0.5, n_samples), 0, 10000000), 0)
-        data['cash_buffer_days'] = np.clip(all_factors['cashflow_health'] * 60 + np.random.normal(0, 15, n_samples), 0, 180)
-        data['avg_daily_closing_balance'] = data['avg_bank_balance'] * np.random.uniform(0.8, 1.2, n_samples)
-        data['cash_balance_std_dev'] = np.clip(data['avg_bank_balance'] * np.random.uniform(0.1, 0.5, n_samples), 0, 10000000)
-        data['negative_balance_days'] = np.clip(data['overdraft_days_count'] * np.random.uniform(0, 0.5, n_samples), 0, 90).astype(int)
-        data['daily_min_balance_pattern'] = np.clip(data['avg_bank_balance'] * np.random.uniform(0.1, 0.5, n_samples), 0, 10000000)
-        data['consistent_deposits_score'] = np.clip(all_factors['cashflow_health'] + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['cashflow_regularity_score'] = np.clip(all_factors['cashflow_health'] + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['receivables_aging_days'] = np.clip(np.random.exponential(30, n_samples), 0, 180)
-        data['payables_aging_days'] = np.clip(np.random.exponential(25, n_samples), 0, 180)
+                                                np.clip(data['monthly_gtv'] * 0.1 * rng.uniform(0.1, 0.5, n), 0, 10000000), 0)
+        data['cash_buffer_days'] = np.clip(all_factors['cashflow_health'] * 60 + rng.normal(0, 15, n), 0, 180)
+        data['avg_daily_closing_balance'] = data['avg_bank_balance'] * rng.uniform(0.8, 1.2, n)
+        data['cash_balance_std_dev'] = np.clip(data['avg_bank_balance'] * rng.uniform(0.1, 0.5, n), 0, 10000000)
+        data['negative_balance_days'] = np.clip(data['overdraft_days_count'] * rng.uniform(0, 0.5, n), 0, 90).astype(int)
+        data['daily_min_balance_pattern'] = np.clip(data['avg_bank_balance'] * rng.uniform(0.1, 0.5, n), 0, 10000000)
+        data['consistent_deposits_score'] = np.clip(all_factors['cashflow_health'] + rng.normal(0, 0.1, n), 0, 1)
+        data['cashflow_regularity_score'] = np.clip(all_factors['cashflow_health'] + rng.normal(0, 0.1, n), 0, 1)
+        data['receivables_aging_days'] = np.clip(rng.exponential(30, n), 0, 180)
+        data['payables_aging_days'] = np.clip(rng.exponential(25, n), 0, 180)
         
         # ========== CATEGORY D: CREDIT & REPAYMENT ==========
         repayment_discipline = all_factors['cashflow_health'] * 0.6 + all_factors['formality_factor'] * 0.4
         
-        data['bounced_cheques_count'] = np.clip(np.round((1 - repayment_discipline) * 5 + np.random.poisson(1, n_samples)), 0, 50).astype(int)
-        data['bounced_cheques_rate'] = np.clip((1 - repayment_discipline) * 0.1 + np.random.normal(0, 0.03, n_samples), 0, 1)
-        data['historical_loan_utilization'] = np.clip(np.random.beta(3, 4, n_samples), 0, 1)
-        data['overdraft_repayment_ontime_ratio'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['previous_defaults_count'] = np.clip(np.round((1 - repayment_discipline) * 2 + np.random.poisson(0.3, n_samples)), 0, 10).astype(int)
-        data['previous_writeoffs_count'] = np.clip(np.round((1 - repayment_discipline) * 1 + np.random.poisson(0.1, n_samples)), 0, 10).astype(int)
-        data['current_loans_outstanding'] = np.clip(np.round(np.random.poisson(1.5, n_samples)), 0, 20).astype(int)
-        data['total_debt_amount'] = np.clip(data['monthly_gtv'] * np.random.uniform(0, 0.5, n_samples), 0, 100000000)
-        data['utility_payment_ontime_ratio'] = np.clip(repayment_discipline + np.random.normal(0, 0.08, n_samples), 0, 1)
-        data['utility_payment_days_before_due'] = np.clip(repayment_discipline * 10 + np.random.normal(-5, 8, n_samples), -30, 30)
-        data['mobile_recharge_regularity'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['mobile_recharge_ontime_ratio'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['rent_payment_regularity'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['rent_payment_ontime_ratio'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['supplier_payment_regularity'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['supplier_payment_ontime_ratio'] = np.clip(repayment_discipline + np.random.normal(0, 0.1, n_samples), 0, 1)
+        data['bounced_cheques_count'] = np.clip(np.round((1 - repayment_discipline) * 5 + rng.poisson(1, n)), 0, 50).astype(int)
+        data['bounced_cheques_rate'] = np.clip((1 - repayment_discipline) * 0.1 + rng.normal(0, 0.03, n), 0, 1)
+        data['historical_loan_utilization'] = np.clip(rng.beta(3, 4, n), 0, 1)
+        data['overdraft_repayment_ontime_ratio'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['previous_defaults_count'] = np.clip(np.round((1 - repayment_discipline) * 2 + rng.poisson(0.3, n)), 0, 10).astype(int)
+        data['previous_writeoffs_count'] = np.clip(np.round((1 - repayment_discipline) * 1 + rng.poisson(0.1, n)), 0, 10).astype(int)
+        data['current_loans_outstanding'] = np.clip(np.round(rng.poisson(1.5, n)), 0, 20).astype(int)
+        data['total_debt_amount'] = np.clip(data['monthly_gtv'] * rng.uniform(0, 0.5, n), 0, 100000000)
+        data['utility_payment_ontime_ratio'] = np.clip(repayment_discipline + rng.normal(0, 0.08, n), 0, 1)
+        data['utility_payment_days_before_due'] = np.clip(repayment_discipline * 10 + rng.normal(-5, 8, n), -30, 30)
+        data['mobile_recharge_regularity'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['mobile_recharge_ontime_ratio'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['rent_payment_regularity'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['rent_payment_ontime_ratio'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['supplier_payment_regularity'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
+        data['supplier_payment_ontime_ratio'] = np.clip(repayment_discipline + rng.normal(0, 0.1, n), 0, 1)
         
         # ========== CATEGORY E: COMPLIANCE & TAXATION ==========
-        data['gst_filing_regularity'] = np.clip(all_factors['formality_factor'] + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['gst_filing_ontime_ratio'] = np.clip(data['gst_filing_regularity'] * 0.9 + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['gst_vs_platform_sales_mismatch'] = np.clip((1 - all_factors['formality_factor']) * 0.3 + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['outstanding_taxes_amount'] = np.clip((1 - all_factors['formality_factor']) * data['monthly_gtv'] * 0.05 + np.random.exponential(10000, n_samples), 0, 10000000)
-        data['outstanding_dues_flag'] = np.random.binomial(1, (1 - all_factors['formality_factor']) * 0.3, n_samples)
-        data['itr_filed'] = np.random.binomial(1, all_factors['formality_factor'] * 0.9, n_samples)
-        data['itr_income_declared'] = data['monthly_gtv'] * 12 * data['profit_margin'] * data['itr_filed'] * np.random.uniform(0.7, 1.0, n_samples)
-        data['gst_r1_vs_itr_mismatch'] = np.clip((1 - all_factors['formality_factor']) * 0.2 + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['tax_payment_regularity'] = np.clip(all_factors['formality_factor'] + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['tax_payment_ontime_ratio'] = np.clip(data['tax_payment_regularity'] * 0.9 + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['refund_chargeback_rate'] = np.clip(np.random.beta(1, 15, n_samples), 0, 0.3)
+        data['gst_filing_regularity'] = np.clip(all_factors['formality_factor'] + rng.normal(0, 0.1, n), 0, 1)
+        data['gst_filing_ontime_ratio'] = np.clip(data['gst_filing_regularity'] * 0.9 + rng.normal(0, 0.1, n), 0, 1)
+        data['gst_vs_platform_sales_mismatch'] = np.clip((1 - all_factors['formality_factor']) * 0.3 + rng.normal(0, 0.1, n), 0, 1)
+        data['outstanding_taxes_amount'] = np.clip((1 - all_factors['formality_factor']) * data['monthly_gtv'] * 0.05 + rng.exponential(10000, n), 0, 10000000)
+        data['outstanding_dues_flag'] = rng.binomial(1, (1 - all_factors['formality_factor']) * 0.3, n)
+        data['itr_filed'] = rng.binomial(1, all_factors['formality_factor'] * 0.9, n)
+        data['itr_income_declared'] = data['monthly_gtv'] * 12 * data['profit_margin'] * data['itr_filed'] * rng.uniform(0.7, 1.0, n)
+        data['gst_r1_vs_itr_mismatch'] = np.clip((1 - all_factors['formality_factor']) * 0.2 + rng.normal(0, 0.1, n), 0, 1)
+        data['tax_payment_regularity'] = np.clip(all_factors['formality_factor'] + rng.normal(0, 0.1, n), 0, 1)
+        data['tax_payment_ontime_ratio'] = np.clip(data['tax_payment_regularity'] * 0.9 + rng.normal(0, 0.1, n), 0, 1)
+        data['refund_chargeback_rate'] = np.clip(rng.beta(1, 15, n), 0, 0.3)
         
         # ========== CATEGORY F: FRAUD & VERIFICATION ==========
-        data['kyc_completion_score'] = np.clip(all_factors['formality_factor'] * 0.9 + np.random.normal(0.1, 0.1, n_samples), 0, 1)
-        data['kyc_attempts_count'] = np.clip(1 + np.round((1 - all_factors['formality_factor']) * 3 + np.random.poisson(0.5, n_samples)), 1, 10).astype(int)
-        data['device_consistency_score'] = np.clip(np.random.beta(8, 2, n_samples), 0, 1)
-        data['ip_stability_score'] = np.clip(np.random.beta(7, 2, n_samples), 0, 1)
-        data['pan_address_bank_mismatch'] = np.random.binomial(1, 0.05 + (1 - all_factors['formality_factor']) * 0.1, n_samples)
-        data['image_ocr_verified'] = np.random.binomial(1, all_factors['formality_factor'] * 0.95, n_samples)
-        data['shop_image_verified'] = np.random.binomial(1, all_factors['formality_factor'] * 0.9, n_samples)
-        data['reporting_error_rate'] = np.clip((1 - all_factors['formality_factor']) * 0.1 + np.random.normal(0, 0.03, n_samples), 0, 0.5)
-        data['incoming_funds_verified'] = np.clip(all_factors['formality_factor'] + np.random.normal(0, 0.1, n_samples), 0, 1)
-        data['insurance_coverage_score'] = np.clip(all_factors['formality_factor'] * 0.7 + np.random.normal(0, 0.15, n_samples), 0, 1)
-        data['insurance_premium_paid_ratio'] = np.clip(data['insurance_coverage_score'] * 0.9 + np.random.normal(0, 0.1, n_samples), 0, 1)
+        data['kyc_completion_score'] = np.clip(all_factors['formality_factor'] * 0.9 + rng.normal(0.1, 0.1, n), 0, 1)
+        data['kyc_attempts_count'] = np.clip(1 + np.round((1 - all_factors['formality_factor']) * 3 + rng.poisson(0.5, n)), 1, 10).astype(int)
+        data['device_consistency_score'] = np.clip(rng.beta(8, 2, n), 0, 1)
+        data['ip_stability_score'] = np.clip(rng.beta(7, 2, n), 0, 1)
+        data['pan_address_bank_mismatch'] = rng.binomial(1, 0.05 + (1 - all_factors['formality_factor']) * 0.1, n)
+        data['image_ocr_verified'] = rng.binomial(1, all_factors['formality_factor'] * 0.95, n)
+        data['shop_image_verified'] = rng.binomial(1, all_factors['formality_factor'] * 0.9, n)
+        data['reporting_error_rate'] = np.clip((1 - all_factors['formality_factor']) * 0.1 + rng.normal(0, 0.03, n), 0, 0.5)
+        data['incoming_funds_verified'] = np.clip(all_factors['formality_factor'] + rng.normal(0, 0.1, n), 0, 1)
+        data['insurance_coverage_score'] = np.clip(all_factors['formality_factor'] * 0.7 + rng.normal(0, 0.15, n), 0, 1)
+        data['insurance_premium_paid_ratio'] = np.clip(data['insurance_coverage_score'] * 0.9 + rng.normal(0, 0.1, n), 0, 1)
         
         # ========== CATEGORY G: EXTERNAL SIGNALS ==========
-        data['local_economic_health_score'] = np.clip(np.random.beta(5, 3, n_samples), 0, 1)
-        data['customer_concentration_risk'] = np.clip(np.random.beta(2, 5, n_samples), 0, 1)
-        data['legal_proceedings_flag'] = np.random.binomial(1, 0.03 + (1 - all_factors['formality_factor']) * 0.05, n_samples)
-        data['legal_disputes_count'] = data['legal_proceedings_flag'] * np.clip(np.random.poisson(1, n_samples), 0, 10)
-        data['social_media_presence_score'] = np.clip(np.random.beta(3, 4, n_samples), 0, 1)
-        data['social_media_sentiment_score'] = np.clip(np.random.beta(5, 2, n_samples), 0, 1)
-        data['online_reviews_score'] = np.clip(np.random.normal(3.5, 1, n_samples), 0, 5)
+        data['local_economic_health_score'] = np.clip(rng.beta(5, 3, n), 0, 1)
+        data['customer_concentration_risk'] = np.clip(rng.beta(2, 5, n), 0, 1)
+        data['legal_proceedings_flag'] = rng.binomial(1, 0.03 + (1 - all_factors['formality_factor']) * 0.05, n)
+        data['legal_disputes_count'] = data['legal_proceedings_flag'] * np.clip(rng.poisson(1, n), 0, 10)
+        data['social_media_presence_score'] = np.clip(rng.beta(3, 4, n), 0, 1)
+        data['social_media_sentiment_score'] = np.clip(rng.beta(5, 2, n), 0, 1)
+        data['online_reviews_score'] = np.clip(rng.normal(3.5, 1, n), 0, 5)
         
         # ========== TARGET VARIABLE: 90 DPD DEFAULT ==========
         # IMPROVED: Proper correlations - good features CLEARLY reduce default probability
@@ -1084,7 +1158,7 @@ class MSMESyntheticDataGenerator:
         base_risk = all_factors['default_base_prob'].copy()
         
         # 2. RISK INCREASING factors (poor behavior increases default probability)
-        risk_increase = np.zeros(n_samples)
+        risk_increase = np.zeros(n)
         
         # Poor repayment behavior (MAJOR risk factor - weight 20%)
         risk_increase += 0.20 * (1 - data['overdraft_repayment_ontime_ratio'])
@@ -1112,7 +1186,7 @@ class MSMESyntheticDataGenerator:
         risk_increase += 0.04 * data['legal_proceedings_flag']
         
         # 3. RISK REDUCING factors (good behavior CLEARLY reduces default probability)
-        risk_reduction = np.zeros(n_samples)
+        risk_reduction = np.zeros(n)
         
         # Strong cash position (MAJOR protector - weight 15%)
         risk_reduction += 0.15 * all_factors['cashflow_health']
@@ -1148,59 +1222,28 @@ class MSMESyntheticDataGenerator:
         risk_score = base_risk + risk_increase - risk_reduction
         
         # Add small noise for realism
-        risk_score += np.random.normal(0, 0.015, n_samples)
+        risk_score += rng.normal(0, 0.015, n)
         
         # Clip to realistic range (0.5% to 35%)
         default_prob = np.clip(risk_score, 0.005, 0.35)
         
         # Generate default labels
-        data['default_90dpd'] = np.random.binomial(1, default_prob, n_samples)
+        data['default_90dpd'] = rng.binomial(1, default_prob, n)
         data['default_probability_true'] = default_prob
         
-        # Add timestamp
-        if include_timestamp:
-            base_date = datetime(2023, 1, 1)
-            data['application_date'] = [
-                base_date + timedelta(days=int(d))
-                for d in np.random.uniform(0, 730, n_samples)
-            ]
-        
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
         # Introduce missing values
         missing_features = [
             'itr_income_declared', 'total_assets_value', 'insurance_coverage_score',
             'inventory_turnover_ratio', 'profit_margin', 'social_media_presence_score'
         ]
         
-        for feat in missing_features:
-            if feat in df.columns:
-                mask = np.random.random(n_samples) < missing_rate * 2
-                df.loc[mask, feat] = np.nan
-        
-        # Regular missing rate
-        for col in df.select_dtypes(include=[np.number]).columns:
-            if col not in missing_features and col not in ['default_90dpd', 'default_probability_true']:
-                mask = np.random.random(n_samples) < missing_rate
-                df.loc[mask, col] = np.nan
-        
-        # ========== ADD EDGE CASES ==========
-        # Add edge case scenarios for comprehensive model coverage
-        n_edge_each = max(50, n_samples // 100)  # ~1% of total samples per edge case type
-        edge_df = self._generate_edge_cases(n_each=n_edge_each)
+        for col, values in data.items():
+            if values.dtype.kind in 'iuf' and col not in ['default_90dpd', 'default_probability_true']:
+                # Higher missing rate for missing_features
+                rate = missing_rate * 2 if col in missing_features else missing_rate
+                data[col] = np.where(rng.random(n) < rate, np.nan, values)
         
-        # Combine main data with edge cases
-        df = pd.concat([df, edge_df], ignore_index=True)
-        
-        # Shuffle the combined dataset
-        df = df.sample(frac=1, random_state=self.seed).reset_index(drop=True)
-        
-        print(f"Generated {len(df)} MSME samples with {df['default_90dpd'].sum()} defaults ({df['default_90dpd'].mean()*100:.1f}%)")
-        print(f"  - Main samples: {n_samples}")
-        print(f"  - Edge cases: {len(edge_df)} ({n_edge_each} each × 6 types)")
-        
-        return df
+        return pd.DataFrame(data)
 
 
 # ============================================================================
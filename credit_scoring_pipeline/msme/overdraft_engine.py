@@ -23,7 +23,8 @@ Version: 1.0.0
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
@@ -495,6 +496,195 @@ def apply_msme_category_limits(
     return np.clip(limit, category_limits['min_limit'], category_limits['max_limit'])
 
 
+# ============================================================================
+# VECTORIZED CALCULATIONS
+# ============================================================================
+#
+# The same steps as calculate_recommendation() over arrays: one element per
+# business (calculate_batch) or per what-if grid point of one business
+# (what_if). Inputs broadcast, so business arrays of shape (n,) and grid
+# arrays of shape (T, 1, 1), (1, R, 1), (1, 1, A) mix freely.
+
+# Tiers in ascending score order, so searchsorted on the cutoffs indexes them
+TIER_ORDER = [RiskTier.HIGH_RISK, RiskTier.SUBPRIME, RiskTier.STANDARD, RiskTier.NEAR_PRIME, RiskTier.PRIME]
+TIER_CUTOFFS = np.array([450, 550, 650, 750])
+TIER_ARRAYS = {
+    key: np.array([SCORE_TIERS[tier][key] for tier in TIER_ORDER])
+    for key in ('max_turnover_multiplier', 'interest_rate_base', 'processing_fee_pct', 'collateral_required',
+                'personal_guarantee', 'max_tenure_months', 'renewal_frequency_months', 'dscr_min', 'ltv_max')
+}
+TIER_ELIGIBILITY = np.array([SCORE_TIERS[tier]['eligibility'].value for tier in TIER_ORDER])
+TIER_NAMES = np.array([tier.value for tier in TIER_ORDER])
+
+VINTAGE_ORDER = ['less_than_1_year', '1_to_2_years', '2_to_3_years', '3_to_5_years', '5_to_10_years',
+                 'more_than_10_years']
+VINTAGE_CUTOFFS = np.array([1, 2, 3, 5, 10])
+
+# calculate_recommendation() arguments: defaults of the optional ones (None: derived)
+BUSINESS_DEFAULTS = {
+    'annual_turnover': None,
+    'avg_bank_balance': 0.0,
+    'monthly_cash_inflow': None,
+    'monthly_cash_outflow': None,
+    'total_assets': 0.0,
+    'current_assets': 0.0,
+    'current_liabilities': 0.0,
+    'inventory_value': 0.0,
+    'receivables_value': 0.0,
+    'existing_debt': 0.0,
+    'existing_emi': 0.0,
+    'cash_flow_health_score': 0.5,
+    'payment_discipline_score': 0.5,
+}
+BUSINESS_REQUIRED = ['credit_score', 'business_age_years', 'industry', 'msme_category', 'monthly_gtv']
+
+
+def calculate_emi_vectorized(principal: np.ndarray, annual_rate: np.ndarray,
+                             tenure_months: np.ndarray) -> np.ndarray:
+    """calculate_emi() over arrays (0 where the tenure or principal is not positive)"""
+    principal, annual_rate, tenure_months = np.broadcast_arrays(principal, annual_rate, tenure_months)
+    monthly_rate = annual_rate / 100 / 12
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        growth = (1 + monthly_rate) ** tenure_months
+        emi = np.where(monthly_rate == 0, principal / tenure_months,
+                       principal * monthly_rate * growth / (growth - 1))
+    return np.where((tenure_months <= 0) | (principal <= 0), 0.0, emi)
+
+
+def principal_for_emi(emi: np.ndarray, annual_rate: np.ndarray, tenure_months: np.ndarray) -> np.ndarray:
+    """Principal an EMI repays over the tenure (inverse of calculate_emi, positive rates)"""
+    monthly_rate = annual_rate / 100 / 12
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        growth = (1 + monthly_rate) ** tenure_months
+        return emi * (growth - 1) / (monthly_rate * growth)
+
+
+def _table_lookup(keys: np.ndarray, table: Dict[str, Dict], field: str, default: Any) -> np.ndarray:
+    """table[key.lower()][field] per key, default for unknown keys"""
+    values = {name: params[field] for name, params in table.items()}
+    return pd.Series(keys, dtype=object).astype(str).str.lower().map(values).fillna(default).to_numpy(dtype=float)
+
+
+def business_arrays(businesses: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Inputs of calculate_recommendation() as arrays, with its defaults filled in"""
+    missing = [c for c in BUSINESS_REQUIRED if c not in businesses]
+    if missing:
+        raise ValueError(f"Missing business columns: {missing}")
+
+    x = {c: businesses[c].to_numpy() for c in ('industry', 'msme_category')}
+    for column in ['credit_score', 'business_age_years', 'monthly_gtv'] + list(BUSINESS_DEFAULTS):
+        default = BUSINESS_DEFAULTS.get(column)
+        values = businesses[column].to_numpy(dtype=float) if column in businesses \
+            else np.full(len(businesses), np.nan)
+        x[column] = np.where(np.isnan(values), default, values) if default is not None else values
+
+    gtv = x['monthly_gtv']
+    x['annual_turnover'] = np.where(np.isnan(x['annual_turnover']), gtv * 12, x['annual_turnover'])
+    x['monthly_cash_inflow'] = np.where(np.isnan(x['monthly_cash_inflow']), gtv * 1.1, x['monthly_cash_inflow'])
+    x['monthly_cash_outflow'] = np.where(np.isnan(x['monthly_cash_outflow']), gtv * 0.85,
+                                         x['monthly_cash_outflow'])
+    return x
+
+
+def recommend_arrays(x: Dict[str, np.ndarray], tenure_months: Optional[np.ndarray] = None,
+                     interest_rate: Optional[np.ndarray] = None,
+                     requested_amount: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Limits, pricing and risk metrics of calculate_recommendation() over arrays
+
+    Args:
+        x: business_arrays() of the businesses
+        tenure_months: Tenure instead of the tier maximum (what-if)
+        interest_rate: Annual rate instead of the priced rate (what-if)
+        requested_amount: Amount requested (what-if); caps the adjusted limit
+            before the debt constraints and the final limit after the MSME
+            category limits. Below the category minimum it is not approvable
+            (final limit 0)
+
+    Returns:
+        Dict of arrays, broadcast over the inputs
+    """
+    turnover = x['annual_turnover']
+    inflow, outflow = x['monthly_cash_inflow'], x['monthly_cash_outflow']
+    existing_debt, existing_emi = x['existing_debt'], x['existing_emi']
+    monthly_surplus = inflow - outflow - existing_emi
+    current_assets = np.where(x['current_assets'] == 0, turnover * 0.25, x['current_assets'])
+    current_liabilities = np.where(x['current_liabilities'] == 0, turnover * 0.15, x['current_liabilities'])
+
+    tier = np.searchsorted(TIER_CUTOFFS, x['credit_score'], side='right')
+    params = {key: values[tier] for key, values in TIER_ARRAYS.items()}
+    eligible = tier != TIER_ORDER.index(RiskTier.HIGH_RISK)
+
+    # Step 1: limit methods, the most conservative positive one wins
+    turnover_limit = np.maximum(0, turnover * params['max_turnover_multiplier'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cash_flow_limit = np.where(monthly_surplus > 0,
+                                   np.maximum(0, monthly_surplus / params['dscr_min'] / 0.03), 0.0)
+    working_capital_gap = current_assets - current_liabilities
+    mpbf_limit = np.maximum(0, np.minimum(
+        working_capital_gap * 0.75 - existing_debt,
+        (x['inventory_value'] * 0.60 + x['receivables_value'] * 0.75) - existing_debt))
+    base_limit = np.minimum(turnover_limit, np.minimum(np.where(cash_flow_limit > 0, cash_flow_limit, np.inf),
+                                                       np.where(mpbf_limit > 0, mpbf_limit, np.inf)))
+
+    # Step 2: adjustments
+    vintage = np.searchsorted(VINTAGE_CUTOFFS, x['business_age_years'], side='right')
+    vintage_multiplier = np.array([VINTAGE_ADJUSTMENTS[v]['limit_multiplier'] for v in VINTAGE_ORDER])[vintage]
+    vintage_rate = np.array([VINTAGE_ADJUSTMENTS[v]['rate_adjustment'] for v in VINTAGE_ORDER])[vintage]
+    industry_multiplier = _table_lookup(x['industry'], INDUSTRY_RISK_ADJUSTMENTS, 'limit_multiplier', 1.0)
+    industry_rate = _table_lookup(x['industry'], INDUSTRY_RISK_ADJUSTMENTS, 'rate_adjustment', 0.0)
+    adjusted_limit = (base_limit * vintage_multiplier * industry_multiplier
+                      * (0.7 + x['cash_flow_health_score'] * 0.4)
+                      * (0.8 + x['payment_discipline_score'] * 0.3))
+
+    # Step 3: pricing
+    discipline = x['payment_discipline_score']
+    discipline_rate = np.select([discipline >= 0.95, discipline >= 0.90, discipline < 0.70], [-1.0, -0.5, 1.0], 0.0)
+    priced_rate = np.clip(params['interest_rate_base'] + vintage_rate + industry_rate + discipline_rate, 10.0, 26.0)
+    rate = priced_rate if interest_rate is None else interest_rate
+    tenure = params['max_tenure_months'] if tenure_months is None else tenure_months
+    limit = adjusted_limit if requested_amount is None else np.minimum(requested_amount, adjusted_limit)
+
+    # Step 4: debt constraints
+    debt_to_turnover_capped = (existing_debt + limit) / (turnover + 1) > DEBT_CONSTRAINTS['max_debt_to_turnover_ratio']
+    limit = np.where(debt_to_turnover_capped, np.minimum(limit, np.maximum(
+        0, turnover * DEBT_CONSTRAINTS['max_debt_to_turnover_ratio'] - existing_debt)), limit)
+    emi_to_surplus = calculate_emi_vectorized(limit, rate, tenure) / (monthly_surplus + 1)
+    emi_capped = (limit > 0) & (tenure > 0) & (emi_to_surplus > DEBT_CONSTRAINTS['max_emi_to_cash_surplus_ratio'])
+    max_principal = principal_for_emi(monthly_surplus * DEBT_CONSTRAINTS['max_emi_to_cash_surplus_ratio'],
+                                      rate, tenure)
+    limit = np.where(emi_capped & (rate > 0), np.minimum(limit, max_principal), limit)
+    exposure_capped = (existing_debt + limit) / (turnover + 1) > DEBT_CONSTRAINTS['max_total_exposure']
+    limit = np.where(exposure_capped, np.minimum(limit, np.maximum(
+        0, turnover * DEBT_CONSTRAINTS['max_total_exposure'] - existing_debt)), limit)
+
+    # Step 5: MSME category limits, rounded to 10,000
+    min_limit = _table_lookup(x['msme_category'], MSME_LIMITS, 'min_limit', MSME_LIMITS['not_registered']['min_limit'])
+    max_limit = _table_lookup(x['msme_category'], MSME_LIMITS, 'max_limit', MSME_LIMITS['not_registered']['max_limit'])
+    final_limit = np.round(np.clip(limit, min_limit, max_limit) / 10000) * 10000
+    if requested_amount is not None:
+        # The category minimum must not lift the limit above what was asked
+        final_limit = np.where(requested_amount < min_limit, 0.0, np.minimum(final_limit, requested_amount))
+
+    # Steps 6-7: EMI, DSCR, collateral
+    emi = calculate_emi_vectorized(final_limit, rate, tenure)
+    debt_service = emi + existing_emi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dscr = np.where(debt_service <= 0, 999.0, (inflow - outflow) / debt_service)
+    collateral_value = np.where(params['collateral_required'], final_limit / params['ltv_max'], 0.0)
+
+    return {
+        'eligible': eligible, 'tier': tier, 'params': params,
+        'turnover_limit': turnover_limit, 'cash_flow_limit': cash_flow_limit, 'mpbf_limit': mpbf_limit,
+        'adjusted_limit': adjusted_limit, 'final_limit': final_limit,
+        'min_limit': min_limit, 'max_limit': max_limit,
+        'interest_rate': rate, 'priced_rate': priced_rate, 'tenure_months': tenure,
+        'emi': emi, 'dscr': dscr, 'monthly_surplus': monthly_surplus, 'collateral_value': collateral_value,
+        'debt_to_turnover_capped': debt_to_turnover_capped, 'emi_capped': emi_capped,
+        'exposure_capped': exposure_capped,
+    }
+
+
 # ============================================================================
 # MAIN RECOMMENDATION ENGINE
 # ============================================================================
@@ -793,6 +983,124 @@ class OverdraftRecommendationEngine:
             recommendations=recommendations
         )
     
+    def calculate_batch(self, businesses: pd.DataFrame) -> pd.DataFrame:
+        """
+        calculate_recommendation() for a DataFrame of businesses at once.
+        
+        Args:
+            businesses: One row per business, columns named as the
+                calculate_recommendation() arguments; optional columns may be
+                missing or NaN (their defaults apply)
+            
+        Returns:
+            DataFrame (same index) with the numeric OverdraftRecommendation
+            fields, None EMIs as NaN, and the debt constraints that capped
+            each limit instead of the condition texts
+        """
+        x = business_arrays(businesses)
+        r = recommend_arrays(x)
+        params, eligible, emi = r['params'], r['eligible'], r['emi']
+        turnover, final_limit = x['annual_turnover'], r['final_limit']
+        
+        def when_eligible(values, ineligible=0):
+            return np.where(eligible, values, ineligible)
+        
+        return pd.DataFrame({
+            'eligibility': TIER_ELIGIBILITY[r['tier']],
+            'risk_tier': TIER_NAMES[r['tier']],
+            'credit_score': x['credit_score'].astype(int),
+            'recommended_limit': when_eligible(final_limit),
+            'min_limit': when_eligible(r['min_limit']),
+            'max_limit': when_eligible(r['max_limit']),
+            'turnover_based_limit': when_eligible(np.round(r['turnover_limit'])),
+            'cash_flow_based_limit': when_eligible(np.round(r['cash_flow_limit'])),
+            'mpbf_based_limit': when_eligible(np.round(r['mpbf_limit'])),
+            'final_adjusted_limit': when_eligible(np.round(final_limit)),
+            'interest_rate': when_eligible(np.round(r['interest_rate'], 2), params['interest_rate_base']),
+            'processing_fee_pct': params['processing_fee_pct'],
+            'processing_fee_amount': when_eligible(np.round(final_limit * params['processing_fee_pct'] / 100)),
+            'tenure_months': when_eligible(params['max_tenure_months']),
+            'renewal_frequency_months': when_eligible(params['renewal_frequency_months']),
+            'emi_amount': np.where(eligible & (emi > 0), np.round(emi), np.nan),
+            'collateral_required': when_eligible(params['collateral_required'], True),
+            'collateral_value_required': when_eligible(np.round(r['collateral_value'])),
+            'personal_guarantee_required': when_eligible(params['personal_guarantee'], True),
+            'dscr': when_eligible(np.round(r['dscr'], 2)),
+            'debt_to_turnover': when_eligible(np.round((x['existing_debt'] + final_limit) / (turnover + 1), 2)),
+            'emi_coverage_ratio': when_eligible(
+                np.where(emi > 0, np.round(r['monthly_surplus'] / (emi + 1), 2), 999)),
+            'debt_to_turnover_capped': eligible & r['debt_to_turnover_capped'],
+            'emi_to_surplus_capped': eligible & r['emi_capped'],
+            'exposure_capped': eligible & r['exposure_capped'],
+        }, index=businesses.index)
+    
+    def what_if(
+        self,
+        tenures: Sequence[int],
+        interest_rates: Optional[Sequence[float]] = None,
+        requested_amounts: Optional[Sequence[float]] = None,
+        **business
+    ) -> pd.DataFrame:
+        """
+        Evaluate a grid of tenures, interest rates and requested amounts for one business.
+        
+        Every grid point goes through the debt constraints and MSME category
+        limits of calculate_recommendation(); the EMI constraint depends on
+        the tenure and rate, so the approvable limit varies across the grid.
+        
+        Args:
+            tenures: Tenures in months (>= 1)
+            interest_rates: Annual rates in % (>= 0, default: the priced rate)
+            requested_amounts: Requested amounts (> 0, default: none, i.e.
+                the recommended limit). No point approves more than its
+                amount; amounts below the category minimum get an approved
+                limit of 0
+            **business: calculate_recommendation() arguments of the business
+            
+        Returns:
+            DataFrame with one row per (tenure, rate, amount; NaN when none
+            was requested): approved limit, EMI, DSCR, total interest, fee,
+            capping constraints and whether the point is within the tier's
+            tenure and DSCR terms
+        """
+        x = business_arrays(pd.DataFrame([business]))
+        base = recommend_arrays(x)
+        if not base['eligible'][0]:
+            raise ValueError("Credit score below minimum threshold (450): not eligible for an overdraft")
+        
+        tenure = np.asarray(tenures, dtype=float).reshape(-1, 1, 1)
+        rate = np.asarray(interest_rates if interest_rates is not None else base['priced_rate'],
+                          dtype=float).reshape(1, -1, 1)
+        requested = np.asarray(requested_amounts if requested_amounts is not None else np.nan,
+                               dtype=float).reshape(1, 1, -1)
+        # A tenure of 0 would give a zero EMI and skip the EMI constraint
+        if not (tenure >= 1).all():
+            raise ValueError("Tenures must be at least 1 month")
+        if not (rate >= 0).all():
+            raise ValueError("Interest rates must not be negative")
+        if requested_amounts is not None and not (requested > 0).all():
+            raise ValueError("Requested amounts must be positive")
+        r = recommend_arrays(x, tenure_months=tenure, interest_rate=rate,
+                             requested_amount=requested if requested_amounts is not None else None)
+        params = base['params']
+        
+        shape = np.broadcast_shapes(tenure.shape, rate.shape, requested.shape)
+        grid = {name: np.broadcast_to(values, shape).ravel() for name, values in {
+            'tenure_months': tenure, 'interest_rate': rate, 'requested_amount': requested,
+            'approved_limit': r['final_limit'], 'emi': r['emi'], 'dscr': r['dscr'],
+            'debt_to_turnover_capped': r['debt_to_turnover_capped'], 'emi_to_surplus_capped': r['emi_capped'],
+            'exposure_capped': r['exposure_capped'],
+        }.items()}
+        result = pd.DataFrame(grid)
+        result['tenure_months'] = result['tenure_months'].astype(int)
+        result['emi'] = result['emi'].round()
+        result['dscr'] = result['dscr'].round(2)
+        result['total_interest'] = (r['emi'] * tenure - r['final_limit']).ravel().round()
+        result['processing_fee_amount'] = (result['approved_limit'] * params['processing_fee_pct'][0] / 100).round()
+        result['within_tier_tenure'] = result['tenure_months'] <= params['max_tenure_months'][0]
+        result['meets_dscr'] = result['dscr'] >= params['dscr_min'][0]
+        return result
+    
     def _create_ineligible_response(
         self, 
         credit_score: int, 
@@ -5,7 +5,7 @@ MSME Credit Scoring Model - Retrain with Comprehensive Data
 This script retrains the MSME credit scoring model using the 
 comprehensive synthetic dataset with all risk levels and edge cases.
 
-Usage: python retrain_model.py
+Usage: python retrain_model.py [--cache-dir .dataset_cache]
 
 Author: ML Engineering Team
 """
@@ -19,24 +19,18 @@ warnings.filterwarnings('ignore')
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Shared pipeline modules (dataset_cache, ...) live in the parent directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_prep import MSMEPreprocessor, create_msme_splits
+from dataset_cache import DatasetCache, code_fingerprint
 from model import MSMECreditScorerTrainer
 
-def main():
-    print("=" * 70)
-    print("MSME CREDIT SCORING MODEL - RETRAINING")
-    print("=" * 70)
-    print()
-    
-    # Load the comprehensive training data
-    data_path = os.path.join(os.path.dirname(__file__), 'msme_comprehensive_training_data.csv')
-    
-    if not os.path.exists(data_path):
-        print(f"ERROR: Training data not found at {data_path}")
-        print("Please run generate_comprehensive_data.py first.")
-        return
-    
+EXCLUDE_COLUMNS = ['default_90dpd', 'default_probability_true', 'application_date']
+
+
+def prepare_splits(data_path):
+    """Split and preprocess the training data: ({split: (X, y)}, fitted preprocessor)"""
     print(f"Loading data from: {data_path}")
     df = pd.read_csv(data_path)
     print(f"Loaded {len(df)} samples with {len(df.columns)} features")
@@ -69,6 +63,48 @@ def main():
     print(f"Val shape: {val_processed.shape}")
     print(f"Test shape: {test_processed.shape}")
     
+    # Prepare features (categoricals are already encoded by the preprocessor)
+    feature_cols = [c for c in train_processed.columns if c not in EXCLUDE_COLUMNS]
+    splits = {
+        name: (processed[feature_cols], processed['default_90dpd'])
+        for name, processed in (('train', train_processed), ('val', val_processed), ('test', test_processed))
+    }
+    return splits, preprocessor
+
+
+def main(cache_dir=None):
+    print("=" * 70)
+    print("MSME CREDIT SCORING MODEL - RETRAINING")
+    print("=" * 70)
+    print()
+    
+    # Load the comprehensive training data
+    data_path = os.path.join(os.path.dirname(__file__), 'msme_comprehensive_training_data.csv')
+    
+    if not os.path.exists(data_path):
+        print(f"ERROR: Training data not found at {data_path}")
+        print("Please run generate_comprehensive_data.py first.")
+        return
+    
+    # Reuse the preprocessed splits while the data and preprocessor are unchanged
+    cache = DatasetCache(cache_dir) if cache_dir else None
+    cached = None
+    if cache is not None:
+        columns = pd.read_csv(data_path, nrows=0).columns
+        cache_key = cache.key(data_path, MSMEPreprocessor(), list(columns), exclude=EXCLUDE_COLUMNS,
+                              test_size=0.15, val_size=0.15, split=code_fingerprint(create_msme_splits))
+        cached = cache.load(cache_key)
+    if cached is not None:
+        print(f"Loaded preprocessed splits from dataset cache {cached.path}")
+        splits, preprocessor = cached.splits, cached.preprocessor
+    else:
+        splits, preprocessor = prepare_splits(data_path)
+        if cache is not None:
+            cache.save(cache_key, splits, preprocessor, categorical_features=[])
+    
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = splits['train'], splits['val'], splits['test']
+    feature_cols = list(X_train.columns)
+    
     # Train model
     print("\n" + "-" * 50)
     print("TRAINING MODEL")
@@ -79,27 +115,6 @@ def main():
         early_stopping_rounds=30
     )
     
-    # Prepare features
-    exclude_cols = ['default_90dpd', 'default_probability_true', 'application_date']
-    feature_cols = [c for c in train_processed.columns if c not in exclude_cols]
-    
-    # Handle categorical columns
-    categorical_cols = ['business_segment', 'industry_code', 'legal_entity_type', 
-                       'msme_category', 'business_structure']
-    for col in categorical_cols:
-        if col in train_processed.columns:
-            # These should already be encoded by preprocessor
-            pass
-    
-    X_train = train_processed[feature_cols]
-    y_train = train_processed['default_90dpd']
-    
-    X_val = val_processed[feature_cols]
-    y_val = val_processed['default_90dpd']
-    
-    X_test = test_processed[feature_cols]
-    y_test = test_processed['default_90dpd']
-    
     print(f"\nFeatures used: {len(feature_cols)}")
     print(f"Training samples: {len(X_train)}")
     print(f"Validation samples: {len(X_val)}")
@@ -181,7 +196,12 @@ def main():
     print("=" * 70)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Retrain the MSME model on the comprehensive dataset')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Reuse the preprocessed splits across runs')
+    main(cache_dir=parser.parse_args().cache_dir)
 
 
 
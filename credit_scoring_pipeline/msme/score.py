@@ -687,12 +687,15 @@ class MSMECreditScorer:
     def __init__(self, model_path: str = None, 
                  preprocessor_path: str = None,
                  config_path: str = None,
-                 alpha: float = 0.7):
+                 alpha: float = 0.7,
+                 drift_recorder=None):
+        """drift_recorder: DriftRecorder recording every scored business (optional)"""
         self.model = None
         self.preprocessor = None
         self.config = None
         self.alpha = alpha
         self.model_version = "unknown"
+        self.drift_recorder = drift_recorder
         
         if model_path and os.path.exists(model_path):
             self._load_model(model_path)
@@ -753,6 +756,9 @@ class MSMECreditScorer:
             gbm_prob = 1 - segment_subscore
             explanation = None
         
+        if self.drift_recorder is not None:
+            self.drift_recorder.record(features, {'business_segment': segment, 'model_probability': gbm_prob})
+        
         # Blend
         final_prob = blend_msme_scores(gbm_prob, segment_subscore, alpha)
         
@@ -0,0 +1,182 @@
+"""
+MSME Credit Scoring - Unit Tests
+================================
+
+Run with: pytest tests.py -v (from this directory)
+"""
+
+import asyncio
+import dataclasses
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algorithms import PARAMETER_WEIGHTS, TRANSFORM_TYPES, ScoringTable
+from benchmark_overdraft import synthetic_portfolio
+from benchmark_scoring_table import scalar_scores, synthetic_parameters
+from overdraft_engine import MSME_LIMITS, OverdraftRecommendationEngine
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return OverdraftRecommendationEngine()
+
+
+@pytest.fixture(scope='module')
+def portfolio():
+    return synthetic_portfolio(3000, seed=7)
+
+
+@pytest.fixture
+def business():
+    return dict(credit_score=720, business_age_years=4, industry='trading', msme_category='small',
+                monthly_gtv=2_500_000, existing_debt=500_000, existing_emi=40_000)
+
+
+class TestOverdraftBatch:
+    """calculate_batch() against calculate_recommendation()"""
+
+    def test_matches_scalar_recommendation(self, engine, portfolio):
+        batch = engine.calculate_batch(portfolio)
+        recommendations = [engine.calculate_recommendation(**row) for row in portfolio.to_dict('records')]
+
+        fields = [f.name for f in dataclasses.fields(recommendations[0]) if f.name in batch.columns]
+        assert len(fields) == 22
+        for field in fields:
+            expected = pd.Series([getattr(r, field) for r in recommendations], index=batch.index)
+            if field == 'emi_amount':
+                expected = expected.astype(float)
+            pd.testing.assert_series_equal(batch[field], expected, check_dtype=False, check_names=False,
+                                           check_exact=True, obj=field)
+
+
+class TestOverdraftWhatIf:
+    """what_if() grids"""
+
+    def test_default_point_is_the_recommendation(self, engine, portfolio):
+        eligible = portfolio[portfolio['credit_score'] >= 450].iloc[:100]
+        for row in eligible.to_dict('records'):
+            rec = engine.calculate_recommendation(**row)
+            point = engine.what_if([rec.tenure_months], **row).iloc[0]
+
+            assert point['approved_limit'] == rec.recommended_limit
+            assert point['interest_rate'] == pytest.approx(rec.interest_rate, abs=0.005)
+            assert point['emi'] == (rec.emi_amount or 0)
+            assert point['dscr'] == rec.dscr
+            assert point['processing_fee_amount'] == rec.processing_fee_amount
+
+    def test_never_approves_more_than_requested(self, engine, business):
+        min_limit = MSME_LIMITS['small']['min_limit']
+        amounts = [0.01, min_limit / 2, min_limit, 126_000, 3e5, 1e9]
+        grid = engine.what_if([6, 12, 24, 36], [12.0, 16.0], amounts, **business)
+
+        assert (grid['approved_limit'] <= grid['requested_amount']).all()
+        below_minimum = grid['requested_amount'] < min_limit
+        assert (grid.loc[below_minimum, 'approved_limit'] == 0).all()
+        assert (grid.loc[~below_minimum, 'approved_limit'] >= min_limit).all()
+
+    @pytest.mark.parametrize('grid', [
+        {'tenures': [0]},
+        {'tenures': [12], 'interest_rates': [-1.0]},
+        {'tenures': [12], 'requested_amounts': [0.0]},
+    ])
+    def test_rejects_invalid_grid(self, engine, business, grid):
+        with pytest.raises(ValueError):
+            engine.what_if(**grid, **business)
+
+
+# Every transform type and its edge cases, on top of the production parameters
+EDGE_PARAMETERS = {
+    **PARAMETER_WEIGHTS,
+    'sigmoid_default_range': {'weight': 1.5, 'transform': {'type': 'sigmoid', 'center': 0.05, 'scale': 0.10}},
+    'sigmoid_bounded': {'weight': 0.7, 'transform': {'type': 'sigmoid', 'center': 10, 'scale': 2.5,
+                                                     'min_val': 0.2, 'max_val': 0.9}},
+    'gaussian': {'weight': 1.0, 'transform': {'type': 'gaussian', 'optimal': 1.2, 'std_dev': 0.3}},
+    'zero_span': {'weight': 0.5, 'bounds': {'min': 3, 'max': 3}},
+    'zero_span_lower_better': {'weight': 0.5, 'bounds': {'min': 0, 'max': 0, 'lower_is_better': True}},
+    'unsorted_piecewise': {'weight': 1.0, 'transform': {'type': 'piecewise', 'breakpoints': [
+        (13, 0.24), (16, 0.92), (20, 0.91), (4, 0.62), (14, 0.91), (21, 0.29)]}},
+    'repeated_knot': {'weight': 0.8, 'transform': {'type': 'piecewise', 'breakpoints': [
+        (0, 0.0), (5, 0.5), (5, 0.8), (10, 1.0)]}},
+}
+
+
+@pytest.fixture(scope='module')
+def table():
+    return ScoringTable(EDGE_PARAMETERS)
+
+
+class TestScoringTable:
+    """ScoringTable against score_parameter() and segment_subscore(), bit for bit"""
+
+    def test_covers_every_transform_type(self, table):
+        assert set(table.kinds) == set(TRANSFORM_TYPES)
+
+    @pytest.mark.parametrize('category', [False, True])
+    def test_identical_to_scalar_scoring(self, table, category):
+        data = synthetic_parameters(table, 5000, category=category, seed=3, parameters=EDGE_PARAMETERS)
+        if category:
+            assert (data.dtypes[table.kinds == 'categorical'] == 'category').all()
+
+        expected, expected_subscores = scalar_scores(table, data.to_dict('records'), EDGE_PARAMETERS)
+        scores = table.score(data)
+
+        for j, name in enumerate(table.names):
+            assert np.array_equal(scores[:, j], expected[:, j], equal_nan=True), name
+        assert (table.subscore(scores) == expected_subscores).all()
+
+
+def call_route(app, method: str, path: str, body=None, token: str = 'msme_test_token_abcde'):
+    """Run one request through the ASGI app (routing, validation and response class)"""
+    payload = json.dumps(body).encode() if body is not None else b''
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'root_path': '', 'client': ('test', 0), 'server': ('test', 80),
+        'headers': [(b'content-type', b'application/json'), (b'authorization', f'Bearer {token}'.encode())],
+    }
+    messages = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status = next(m['status'] for m in sent if m['type'] == 'http.response.start')
+    return status, json.loads(b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body'))
+
+
+@pytest.fixture(scope='module')
+def app():
+    from app import app
+    return app
+
+
+class TestOverdraftRoutes:
+    """Grid and portfolio endpoints, end to end through FastAPI (numpy values in the response)"""
+
+    def test_what_if_returns_the_engine_grid(self, app, engine, business):
+        request = {**business, 'tenures': [6, 12, 24], 'interest_rates': [12.5, 18], 'requested_amounts': [2e5, 9e6]}
+        status, body = call_route(app, 'POST', '/api/overdraft/what-if', request)
+
+        assert status == 200
+        expected = engine.what_if([6, 12, 24], [12.5, 18], [2e5, 9e6], **business)
+        assert body['n_points'] == len(expected) == 12
+        pd.testing.assert_frame_equal(pd.DataFrame(body['grid'])[list(expected.columns)], expected,
+                                      check_dtype=False)
+
+    def test_batch_returns_every_business(self, app, engine, portfolio):
+        businesses = portfolio.iloc[:50].to_dict('records')
+        status, body = call_route(app, 'POST', '/api/overdraft/batch', {'businesses': businesses})
+
+        assert status == 200
+        expected = engine.calculate_batch(pd.DataFrame(businesses))
+        assert body['n_businesses'] == 50
+        assert body['total_recommended_limit'] == expected['recommended_limit'].sum()
+        returned = pd.DataFrame(body['recommendations'])
+        np.testing.assert_array_equal(returned['recommended_limit'], expected['recommended_limit'])
@@ -12,11 +12,14 @@ import numpy as np
 import pandas as pd
 import lightgbm as lgb
 import optuna
-from optuna.samplers import TPESampler
 from sklearn.metrics import roc_auc_score
-from typing import Dict, List
+from optuna.trial import TrialState
+from typing import Dict, List, Optional
 
 from ..config.hyperparameters import OPTUNA_CONFIG, OPTUNA_SEARCH_SPACE
+from ..optuna_tuning import (
+    DEFAULT_STUDY_NAME, LightGBMPruningCallback, build_shared_datasets, finished_trials, run_study
+)
 
 
 class MSMEOptunaObjective:
@@ -24,7 +27,9 @@ class MSMEOptunaObjective:
     
     def __init__(self, X_train: pd.DataFrame, y_train: pd.Series,
                  X_val: pd.DataFrame, y_val: pd.Series,
-                 categorical_features: List[str]):
+                 categorical_features: List[str],
+                 shared_datasets: bool = False,
+                 pruning: bool = False):
         """
         Initialize objective function.
         
@@ -34,12 +39,43 @@ class MSMEOptunaObjective:
             X_val: Validation features
             y_val: Validation labels
             categorical_features: List of categorical feature names
+            shared_datasets: Bin the data once and reuse it in every trial
+            pruning: Report the validation AUC so the pruner can stop trials
         """
         self.X_train = X_train
         self.y_train = y_train
         self.X_val = X_val
         self.y_val = y_val
         self.categorical_features = categorical_features
+        self.shared_datasets = shared_datasets
+        self.pruning = pruning
+        self.num_threads = -1
+        self._datasets = None
+
+    def __getstate__(self):
+        # Tuning workers rebuild the datasets in their own process
+        state = self.__dict__.copy()
+        state['_datasets'] = None
+        return state
+
+    def datasets(self):
+        """(train, validation) lgb.Dataset pair for a trial"""
+        if not self.shared_datasets:
+            train_data = lgb.Dataset(
+                self.X_train, label=self.y_train,
+                categorical_feature=self.categorical_features
+            )
+            val_data = lgb.Dataset(
+                self.X_val, label=self.y_val,
+                categorical_feature=self.categorical_features,
+                reference=train_data
+            )
+            return train_data, val_data
+        if self._datasets is None:
+            self._datasets = build_shared_datasets(
+                self.X_train, self.y_train, self.X_val, self.y_val, self.categorical_features
+            )
+        return self._datasets
     
     def __call__(self, trial: optuna.Trial) -> float:
         """
@@ -85,27 +121,22 @@ class MSMEOptunaObjective:
                                                    OPTUNA_SEARCH_SPACE['reg_lambda']['high']),
             'verbose': -1,
             'random_state': 42,
-            'n_jobs': -1,
+            'n_jobs': self.num_threads,
             'is_unbalance': True
         }
         
         # Create datasets
-        train_data = lgb.Dataset(
-            self.X_train, label=self.y_train,
-            categorical_feature=self.categorical_features
-        )
-        val_data = lgb.Dataset(
-            self.X_val, label=self.y_val,
-            categorical_feature=self.categorical_features,
-            reference=train_data
-        )
+        train_data, val_data = self.datasets()
+        callbacks = [lgb.early_stopping(100, verbose=False)]
+        if self.pruning:
+            callbacks.append(LightGBMPruningCallback(trial, 'auc'))
         
         # Train model
         model = lgb.train(
             params, train_data,
             num_boost_round=1000,
             valid_sets=[val_data],
-            callbacks=[lgb.early_stopping(100, verbose=False)]
+            callbacks=callbacks
         )
         
         # Evaluate
@@ -119,7 +150,12 @@ def run_msme_hyperparameter_tuning(
     X_train: pd.DataFrame, y_train: pd.Series,
     X_val: pd.DataFrame, y_val: pd.Series,
     categorical_features: List[str],
-    n_trials: int = 50
+    n_trials: int = 50,
+    shared_datasets: bool = False,
+    pruner: Optional[str] = None,
+    storage: Optional[str] = None,
+    study_name: str = DEFAULT_STUDY_NAME,
+    n_workers: int = 1
 ) -> Dict:
     """
     Run hyperparameter tuning for MSME model.
@@ -130,7 +166,13 @@ def run_msme_hyperparameter_tuning(
         X_val: Validation features
         y_val: Validation labels
         categorical_features: List of categorical feature names
-        n_trials: Number of Optuna trials
+        n_trials: Finished trials the study should hold (trials already in
+            storage count, so a crashed run resumes)
+        shared_datasets: Bin the data once and share it across trials
+        pruner: 'median' or 'hyperband' to stop losing trials early
+        storage: SQLite (*.db) or journal file keeping the study on disk
+        study_name: Study to create or resume in storage
+        n_workers: Worker processes optimizing the study (needs storage)
         
     Returns:
         Dictionary with best params and AUC
@@ -138,12 +180,11 @@ def run_msme_hyperparameter_tuning(
     print(f"Starting MSME hyperparameter tuning with {n_trials} trials...")
     
     objective = MSMEOptunaObjective(
-        X_train, y_train, X_val, y_val, categorical_features
+        X_train, y_train, X_val, y_val, categorical_features,
+        shared_datasets=shared_datasets, pruning=pruner is not None
     )
-    
-    sampler = TPESampler(seed=42)
-    study = optuna.create_study(direction='maximize', sampler=sampler)
-    study.optimize(objective, n_trials=n_trials, show_progress_bar=True)
+    study = run_study(objective, n_trials, storage=storage, study_name=study_name, pruner=pruner,
+                      n_workers=n_workers, seed=42, show_progress_bar=n_workers <= 1)
     
     print(f"\nBest trial: AUC={study.best_trial.value:.4f}")
     print(f"Best params: {study.best_trial.params}")
@@ -151,7 +192,8 @@ def run_msme_hyperparameter_tuning(
     return {
         'best_params': study.best_trial.params,
         'best_auc': study.best_trial.value,
-        'n_trials': n_trials
+        'n_trials': finished_trials(study),
+        'pruned_trials': len(study.get_trials(deepcopy=False, states=(TrialState.PRUNED,)))
     }
 
 
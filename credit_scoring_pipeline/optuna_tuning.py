@@ -0,0 +1,196 @@
+"""
+Optuna tuning helpers for the LightGBM objectives
+=================================================
+
+The tuning loops used to rebuild (and re-bin) both lgb.Dataset objects in
+every trial, ran every trial to early stopping however far behind it was,
+and kept the study in memory. This module provides what the objectives
+need to avoid that:
+
+- build_shared_datasets(): training/validation datasets binned once and
+  reused by every trial (feature_pre_filter is off so trials may vary
+  min_child_samples on the same bins)
+- LightGBMPruningCallback: reports the validation AUC to the trial while
+  boosting and stops the trial when the pruner ('median' or 'hyperband')
+  says it cannot catch up
+- run_study(): a study kept in a local SQLite file (*.db, *.sqlite,
+  *.sqlite3) or an Optuna journal file (any other path) that resumes where
+  a crashed run stopped, optionally optimized by several worker processes
+  on the same study
+
+Usage:
+    objective = OptunaObjective(X_train, y_train, X_val, y_val, cats,
+                                shared_datasets=True, pruning=True)
+    study = run_study(objective, n_trials=100, storage='tuning.log',
+                      pruner='median', n_workers=4)
+"""
+
+import multiprocessing
+import os
+from typing import Any, List, Optional, Tuple
+
+import lightgbm as lgb
+import optuna
+import pandas as pd
+from optuna.samplers import TPESampler
+from optuna.trial import TrialState
+
+DEFAULT_STUDY_NAME = 'lgb_tuning'
+
+# Boosting rounds between two reports to the pruner
+PRUNING_INTERVAL = 10
+# Rounds every trial runs before it can be pruned
+PRUNING_WARMUP_ROUNDS = 50
+
+PRUNERS = ('median', 'hyperband')
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+
+
+def build_shared_datasets(
+    X_train: pd.DataFrame, y_train: pd.Series,
+    X_val: pd.DataFrame, y_val: pd.Series,
+    categorical_features: List[str]
+) -> Tuple[lgb.Dataset, lgb.Dataset]:
+    """(train, validation) datasets, binned once for reuse across trials"""
+    train_data = lgb.Dataset(
+        X_train, label=y_train,
+        categorical_feature=categorical_features,
+        params={'feature_pre_filter': False, 'verbose': -1},
+        free_raw_data=False
+    )
+    val_data = lgb.Dataset(
+        X_val, label=y_val,
+        categorical_feature=categorical_features,
+        reference=train_data,
+        free_raw_data=False
+    )
+    train_data.construct()
+    val_data.construct()
+    return train_data, val_data
+
+
+class LightGBMPruningCallback:
+    """
+    lgb.train callback reporting a validation metric to an Optuna trial
+    every PRUNING_INTERVAL rounds; raises optuna.TrialPruned when the
+    study's pruner decides the trial is not worth finishing
+    """
+
+    def __init__(self, trial: optuna.Trial, metric: str = 'auc',
+                 valid_name: str = 'valid_0', interval: int = PRUNING_INTERVAL):
+        self.trial = trial
+        self.metric = metric
+        self.valid_name = valid_name
+        self.interval = interval
+
+    def __call__(self, env: lgb.callback.CallbackEnv) -> None:
+        step = env.iteration + 1
+        if step % self.interval:
+            return
+        for valid_name, metric, value, _ in env.evaluation_result_list:
+            if valid_name == self.valid_name and metric == self.metric:
+                self.trial.report(value, step=step)
+                if self.trial.should_prune():
+                    raise optuna.TrialPruned(f'Pruned at round {step} ({metric}={value:.4f})')
+                return
+        raise ValueError(f'Metric {self.metric!r} of {self.valid_name!r} is not evaluated; '
+                         f'add it to the params and valid_sets')
+
+
+def make_pruner(name: Optional[str]) -> optuna.pruners.BasePruner:
+    """'median', 'hyperband' or None (no pruning)"""
+    if name is None:
+        return optuna.pruners.NopPruner()
+    if name == 'median':
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=PRUNING_WARMUP_ROUNDS)
+    if name == 'hyperband':
+        return optuna.pruners.HyperbandPruner(min_resource=PRUNING_WARMUP_ROUNDS, reduction_factor=3)
+    raise ValueError(f'Unknown pruner {name!r}; expected one of {PRUNERS} or None')
+
+
+def study_storage(path: Optional[str]) -> Any:
+    """
+    Optuna storage for a local path: SQLite for *.db/*.sqlite/*.sqlite3,
+    a journal file otherwise (safer with several writer processes).
+    None keeps the study in memory; database URLs are passed through.
+    """
+    if path is None or '://' in path:
+        return path
+    if path.endswith(SQLITE_SUFFIXES):
+        return f'sqlite:///{os.path.abspath(path)}'
+    return optuna.storages.JournalStorage(optuna.storages.JournalFileStorage(path))
+
+
+def load_study(storage: Optional[str] = None, study_name: str = DEFAULT_STUDY_NAME,
+               pruner: Optional[str] = None, seed: int = 42) -> optuna.Study:
+    """Create the study, or load it if the storage already holds it"""
+    return optuna.create_study(
+        study_name=study_name,
+        storage=study_storage(storage),
+        sampler=TPESampler(seed=seed),
+        pruner=make_pruner(pruner),
+        direction='maximize',
+        load_if_exists=True
+    )
+
+
+def finished_trials(study: optuna.Study) -> int:
+    return len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+
+
+def _optimize(objective, n_trials: int, storage: Optional[str], study_name: str,
+              pruner: Optional[str], seed: int, num_threads: Optional[int] = None,
+              show_progress_bar: bool = False) -> optuna.Study:
+    """Run trials until the study holds n_trials finished ones"""
+    if num_threads is not None:
+        objective.num_threads = num_threads
+    study = load_study(storage, study_name, pruner, seed)
+    remaining = n_trials - finished_trials(study)
+    if remaining > 0:
+        study.optimize(
+            objective, n_trials=remaining, show_progress_bar=show_progress_bar,
+            callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=FINISHED_STATES)]
+        )
+    return study
+
+
+def run_study(objective, n_trials: int, storage: Optional[str] = None,
+              study_name: str = DEFAULT_STUDY_NAME, pruner: Optional[str] = None,
+              n_workers: int = 1, seed: int = 42, show_progress_bar: bool = False) -> optuna.Study:
+    """
+    Optimize objective until the study holds n_trials finished trials
+
+    Trials already in storage count, so re-running after a crash only runs
+    the missing ones. With n_workers > 1 the trials are spread over that
+    many processes (each with seed + worker as sampler seed and its share
+    of the CPU threads), which needs a storage path they can all open.
+
+    Returns:
+        The study, loaded from storage after all workers finished
+    """
+    if n_workers <= 1:
+        return _optimize(objective, n_trials, storage, study_name, pruner, seed,
+                         show_progress_bar=show_progress_bar)
+    if storage is None:
+        raise ValueError('n_workers > 1 needs a storage path shared by the workers')
+
+    # Created here so the workers do not race to create it
+    load_study(storage, study_name, pruner, seed)
+    num_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    # spawn: LightGBM's OpenMP thread pool does not survive fork
+    context = multiprocessing.get_context('spawn')
+    workers = [
+        context.Process(target=_optimize,
+                        args=(objective, n_trials, storage, study_name, pruner, seed + worker, num_threads))
+        for worker in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    failed = [worker.exitcode for worker in workers if worker.exitcode]
+    if failed:
+        raise RuntimeError(f'{len(failed)} tuning worker(s) failed (exit codes {failed})')
+    return load_study(storage, study_name, pruner, seed)
@@ -0,0 +1,365 @@
+"""
+Persistent performance store
+============================
+
+PerformanceMonitor.add_snapshot() needs every prediction and outcome of a
+window in memory and recomputes the metrics from scratch. This module
+keeps them on disk, in one SQLite file, and pre-aggregates them so window
+metrics never rescan the log:
+
+- predictions: one row per application ID (probability, score bin, day,
+  segment, outcome once known). The primary key makes joining outcomes
+  that arrive months later an indexed lookup per application
+- buckets: per day (of scoring), segment and score bin of width 1/n_bins,
+  the number of predictions and, for the labelled ones, the number of
+  defaults and the sums of p, p^2 and p over defaults. Logging predictions
+  and recording outcomes update the buckets in the same transaction;
+  an outcome is counted in the day the application was scored, and a
+  corrected outcome replaces the old one
+- AUC, KS, Brier, calibration, confusion cells and rank ordering of any
+  window (and segment) from the summed buckets, O(days x bins)
+- meta: the store's n_bins and the baseline AUC PerformanceMonitor
+  measures degradation against, so it survives restarts
+
+AUC and KS treat the scores of a bin as ties, so they differ from the
+exact values by at most the pairs falling in the same bin (< 1e-3 at the
+default 1000 bins). Confusion cells are exact for thresholds on the bin
+grid.
+
+Usage:
+    store = PerformanceStore('model_artifacts/performance.sqlite')
+    store.log_predictions(application_ids, probabilities, segments=personas)
+    ...
+    store.record_outcomes(application_ids, defaulted)   # any time later
+    store.rolling(days=90)                # {'auc': ..., 'ks_statistic': ...}
+    store.daily(start, end)               # [{'day': ..., 'auc': ...}, ...]
+"""
+
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_N_BINS = 1000
+CALIBRATION_BINS = 10
+RANK_GROUPS = 10
+
+Day = Union[date, str]
+
+BUCKET_COLUMNS = ['n', 'labelled', 'positives', 'sum_p', 'sum_p2', 'sum_p_pos']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS predictions (
+    application_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    scored_at TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    probability REAL NOT NULL,
+    bin INTEGER NOT NULL,
+    outcome INTEGER,
+    outcome_at TEXT
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    day TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    labelled INTEGER NOT NULL DEFAULT 0,
+    positives INTEGER NOT NULL DEFAULT 0,
+    sum_p REAL NOT NULL DEFAULT 0,
+    sum_p2 REAL NOT NULL DEFAULT 0,
+    sum_p_pos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, segment, bin)
+) WITHOUT ROWID;
+"""
+
+
+def metrics_from_buckets(buckets: pd.DataFrame, n_bins: int = DEFAULT_N_BINS,
+                         threshold: float = 0.5) -> Dict[str, Any]:
+    """
+    Performance metrics from buckets summed per score bin
+
+    Args:
+        buckets: Rows of BUCKET_COLUMNS indexed by score bin
+        n_bins: Score bins of the store
+        threshold: Probability from which an application is predicted to default
+
+    Returns:
+        Dict with the counts, AUC, Gini, KS, Brier score, calibration (as
+        calibration_metrics), confusion cells and rank ordering; the
+        metrics are None without both outcomes in the window
+    """
+    counts = buckets.reindex(range(n_bins), fill_value=0)
+    labelled = counts['labelled'].to_numpy(dtype=float)
+    pos = counts['positives'].to_numpy(dtype=float)
+    neg = labelled - pos
+    n_pos, n_neg, n_labelled = pos.sum(), neg.sum(), labelled.sum()
+
+    metrics = {
+        'n_predictions': int(counts['n'].sum()),
+        'n_labelled': int(n_labelled),
+        'n_defaults': int(n_pos),
+        'default_rate': float(n_pos / n_labelled) if n_labelled else None,
+        'auc': None, 'gini': None, 'ks_statistic': None, 'brier_score': None,
+        'calibration': None, 'confusion': None, 'rank_order': None,
+    }
+    if n_pos == 0 or n_neg == 0:
+        return metrics
+
+    # Scores rise with the bin: a default outranks the non-defaults of lower bins, ties count half
+    neg_below = np.cumsum(neg) - neg
+    auc = float(np.sum(pos * (neg_below + 0.5 * neg)) / (n_pos * n_neg))
+    ks = float(np.max(np.abs(np.cumsum(pos) / n_pos - np.cumsum(neg) / n_neg)))
+    sum_p, sum_p2, sum_p_pos = (counts[c].to_numpy(dtype=float) for c in ('sum_p', 'sum_p2', 'sum_p_pos'))
+    brier = float((sum_p2.sum() - 2 * sum_p_pos.sum() + n_pos) / n_labelled)
+
+    # Calibration over equal-width probability bins, as calibration_metrics
+    group = np.arange(n_bins) * CALIBRATION_BINS // n_bins
+    group_labelled = np.bincount(group, labelled, CALIBRATION_BINS)
+    group_pos = np.bincount(group, pos, CALIBRATION_BINS)
+    group_p = np.bincount(group, sum_p, CALIBRATION_BINS)
+    filled = group_labelled > 0
+    prob_true = group_pos[filled] / group_labelled[filled]
+    prob_pred = group_p[filled] / group_labelled[filled]
+    ece = float(np.sum(group_labelled[filled] / n_labelled * np.abs(prob_true - prob_pred)))
+
+    cut = min(int(np.ceil(threshold * n_bins)), n_bins)
+    tp, fp = pos[cut:].sum(), neg[cut:].sum()
+
+    # Default rate per score decile (highest scores first), whole bins assigned by their midpoint
+    midpoint = (np.cumsum(labelled) - labelled / 2) / n_labelled
+    decile = RANK_GROUPS - 1 - np.minimum((midpoint * RANK_GROUPS).astype(int), RANK_GROUPS - 1)
+    decile_labelled = np.bincount(decile, labelled, RANK_GROUPS)
+    decile_pos = np.bincount(decile, pos, RANK_GROUPS)
+    rates = [float(p / n) if n else None for p, n in zip(decile_pos, decile_labelled)]
+    filled_rates = [r for r in rates if r is not None]
+
+    metrics.update({
+        'auc': auc,
+        'gini': 2 * auc - 1,
+        'ks_statistic': ks,
+        'brier_score': brier,
+        'calibration': {
+            'brier_score': brier,
+            'expected_calibration_error': ece,
+            'calibration_curve': {'prob_true': prob_true.tolist(), 'prob_pred': prob_pred.tolist()},
+            'n_samples': int(n_labelled),
+        },
+        'confusion': {
+            'threshold': cut / n_bins,
+            'tp': int(tp), 'fp': int(fp), 'fn': int(n_pos - tp), 'tn': int(n_neg - fp),
+        },
+        'rank_order': {
+            'decile_default_rates': rates,
+            'decile_counts': decile_labelled.astype(int).tolist(),
+            'monotonic': all(a >= b for a, b in zip(filled_rates, filled_rates[1:])),
+        },
+    })
+    return metrics
+
+
+class PerformanceStore:
+    """Predictions, late outcomes and daily metric buckets in one SQLite file"""
+
+    def __init__(self, path: str, n_bins: int = DEFAULT_N_BINS):
+        """
+        Args:
+            path: SQLite file (created with its directory if missing)
+            n_bins: Score bins of a new store; an existing store keeps its own
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('n_bins', ?)", (str(n_bins),))
+            self.n_bins = int(conn.execute("SELECT value FROM meta WHERE key = 'n_bins'").fetchone()[0])
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection in one transaction; WAL lets readers and one writer share the file"""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA cache_size=-65536')
+            with conn:
+                yield conn
+
+    def log_predictions(self, application_ids, probabilities, timestamps=None,
+                        segments=None) -> int:
+        """
+        Log scored applications and count them in their day's buckets
+
+        Args:
+            application_ids: Application IDs
+            probabilities: Predicted default probabilities
+            timestamps: Scoring times (default: now, UTC)
+            segments: Segment (e.g. persona) per application
+
+        Returns:
+            Number of predictions logged; an application already logged
+            keeps its first prediction
+        """
+        p = np.clip(np.asarray(probabilities, dtype=float), 0.0, 1.0)
+        if timestamps is None:
+            scored_at = np.full(len(p), np.datetime64(datetime.utcnow(), 's'))
+        else:
+            scored_at = pd.DatetimeIndex(pd.to_datetime(timestamps)).to_numpy().astype('datetime64[s]')
+        staged = pd.DataFrame({
+            'application_id': pd.Series(application_ids).astype(str).to_numpy(),
+            'day': scored_at.astype('datetime64[D]').astype(str),
+            'scored_at': scored_at.astype(str),
+            'segment': '' if segments is None else pd.Series(segments).astype(str).to_numpy(),
+            'probability': p,
+            'bin': np.minimum((p * self.n_bins).astype(int), self.n_bins - 1),
+        }).drop_duplicates('application_id')
+
+        with self._transaction() as conn:
+            conn.execute('CREATE TEMP TABLE staged (application_id TEXT PRIMARY KEY, day TEXT, '
+                         'scored_at TEXT, segment TEXT, probability REAL, bin INTEGER)')
+            conn.executemany('INSERT INTO staged VALUES (?, ?, ?, ?, ?, ?)',
+                             staged.itertuples(index=False, name=None))
+            conn.execute('DELETE FROM staged WHERE application_id IN '
+                         '(SELECT application_id FROM predictions)')
+            conn.execute('INSERT INTO predictions (application_id, day, scored_at, segment, probability, bin) '
+                         'SELECT * FROM staged')
+            conn.execute("""
+                INSERT INTO buckets (day, segment, bin, n)
+                SELECT day, segment, bin, COUNT(*) FROM staged WHERE true GROUP BY day, segment, bin
+                ON CONFLICT (day, segment, bin) DO UPDATE SET n = n + excluded.n
+            """)
+            logged = conn.execute('SELECT COUNT(*) FROM staged').fetchone()[0]
+            conn.execute('DROP TABLE staged')
+        return logged
+
+    def record_outcomes(self, application_ids, outcomes, timestamp=None) -> Dict[str, int]:
+        """
+        Join outcomes (1 = default) to the logged predictions by application ID
+
+        Outcomes are counted in the buckets of the day the application was
+        scored; recording an outcome again replaces the previous one.
+
+        Returns:
+            {'matched': applications found, 'unmatched': IDs never logged}
+        """
+        staged = pd.DataFrame({
+            'application_id': pd.Series(application_ids).astype(str).to_numpy(),
+            'outcome': np.asarray(outcomes, dtype=int),
+        }).drop_duplicates('application_id', keep='last')
+        outcome_at = (timestamp or datetime.utcnow()).strftime('%Y-%m-%dT%H:%M:%S')
+
+        with self._transaction() as conn:
+            conn.execute('CREATE TEMP TABLE staged (application_id TEXT PRIMARY KEY, outcome INTEGER)')
+            conn.executemany('INSERT INTO staged VALUES (?, ?)', staged.itertuples(index=False, name=None))
+            # Differences to the buckets: new labels count once, corrections swap the outcome.
+            # CROSS JOIN keeps the batch as the outer loop: one primary key lookup per outcome
+            conn.execute("""
+                INSERT INTO buckets (day, segment, bin, labelled, positives, sum_p, sum_p2, sum_p_pos)
+                SELECT p.day, p.segment, p.bin,
+                       SUM(p.outcome IS NULL),
+                       SUM(s.outcome - COALESCE(p.outcome, 0)),
+                       SUM(CASE WHEN p.outcome IS NULL THEN p.probability ELSE 0 END),
+                       SUM(CASE WHEN p.outcome IS NULL THEN p.probability * p.probability ELSE 0 END),
+                       SUM(p.probability * (s.outcome - COALESCE(p.outcome, 0)))
+                FROM staged s CROSS JOIN predictions p ON p.application_id = s.application_id
+                WHERE true GROUP BY p.day, p.segment, p.bin
+                ON CONFLICT (day, segment, bin) DO UPDATE SET
+                    labelled = labelled + excluded.labelled,
+                    positives = positives + excluded.positives,
+                    sum_p = sum_p + excluded.sum_p,
+                    sum_p2 = sum_p2 + excluded.sum_p2,
+                    sum_p_pos = sum_p_pos + excluded.sum_p_pos
+            """)
+            matched = conn.execute("""
+                UPDATE predictions SET outcome = s.outcome, outcome_at = ?
+                FROM staged s WHERE predictions.application_id = s.application_id
+            """, (outcome_at,)).rowcount
+            conn.execute('DROP TABLE staged')
+        return {'matched': matched, 'unmatched': len(staged) - matched}
+
+    def buckets(self, start: Optional[Day] = None, end: Optional[Day] = None,
+                segment: Optional[str] = None, by_day: bool = False) -> pd.DataFrame:
+        """Buckets of the days from start to end, inclusive, summed per bin (and day)"""
+        where, params = _window_filter(start, end, segment)
+        keys = 'day, bin' if by_day else 'bin'
+        sums = ', '.join(f'SUM({c}) AS {c}' for c in BUCKET_COLUMNS)
+        with self._transaction() as conn:
+            df = pd.read_sql_query(f'SELECT {keys}, {sums} FROM buckets {where} GROUP BY {keys}',
+                                   conn, params=params)
+        return df.set_index(['day', 'bin'] if by_day else 'bin')
+
+    def metrics(self, start: Optional[Day] = None, end: Optional[Day] = None,
+                segment: Optional[str] = None, threshold: float = 0.5) -> Dict[str, Any]:
+        """Metrics of the applications scored from start to end, inclusive (default: all)"""
+        metrics = metrics_from_buckets(self.buckets(start, end, segment), self.n_bins, threshold)
+        metrics.update({'start': _iso(start), 'end': _iso(end), 'segment': segment})
+        return metrics
+
+    def rolling(self, days: int, end: Optional[Day] = None, segment: Optional[str] = None,
+                threshold: float = 0.5) -> Dict[str, Any]:
+        """Metrics of the applications scored in the last days days up to end (default: today)"""
+        end = _day(end or datetime.utcnow().date())
+        return self.metrics(end - timedelta(days=days - 1), end, segment, threshold)
+
+    def daily(self, start: Optional[Day] = None, end: Optional[Day] = None,
+              segment: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Metrics per scoring day from start to end, in one query"""
+        buckets = self.buckets(start, end, segment, by_day=True)
+        return [
+            {'day': day, **metrics_from_buckets(day_buckets.droplevel('day'), self.n_bins)}
+            for day, day_buckets in buckets.groupby(level='day', sort=True)
+        ]
+
+    def segments(self) -> List[str]:
+        """Segments with logged predictions"""
+        with self._transaction() as conn:
+            return [row[0] for row in conn.execute('SELECT DISTINCT segment FROM buckets ORDER BY segment')]
+
+    def baseline_auc(self) -> Optional[float]:
+        """AUC that degradation is measured against (None until one is set)"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'baseline_auc'").fetchone()
+        return float(row[0]) if row else None
+
+    def set_baseline_auc(self, auc: float) -> None:
+        """Store the baseline AUC (replacing any previous one)"""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('baseline_auc', ?)", (repr(float(auc)),))
+
+    def pending_outcomes(self, scored_before: Optional[Day] = None) -> int:
+        """Logged applications still without an outcome (scored before a day, if given)"""
+        query, params = 'SELECT COUNT(*) FROM predictions WHERE outcome IS NULL', ()
+        if scored_before is not None:
+            query, params = query + ' AND day < ?', (_iso(scored_before),)
+        with self._transaction() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+
+def _window_filter(start: Optional[Day], end: Optional[Day], segment: Optional[str]):
+    """WHERE clause and parameters of a bucket window"""
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('day >= ?')
+        params.append(_iso(start))
+    if end is not None:
+        clauses.append('day <= ?')
+        params.append(_iso(end))
+    if segment is not None:
+        clauses.append('segment = ?')
+        params.append(segment)
+    return ('WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _day(day: Day) -> date:
+    if isinstance(day, str):
+        return date.fromisoformat(day)
+    return day.date() if isinstance(day, datetime) else day
+
+
+def _iso(day: Optional[Day]) -> Optional[str]:
+    return _day(day).isoformat() if day is not None else None
@@ -812,7 +812,8 @@ class CreditScorer:
     def __init__(self, model_path: str = None, 
                  preprocessor_path: str = None,
                  config_path: str = None,
-                 alpha: float = 0.7):
+                 alpha: float = 0.7,
+                 drift_recorder=None):
         """
         Initialize the scorer.
         
@@ -821,12 +822,15 @@ class CreditScorer:
             preprocessor_path: Path to fitted preprocessor
             config_path: Path to feature_config.json
             alpha: GBM weight in blending (default 0.7)
+            drift_recorder: DriftRecorder recording the features and model
+                probability of every scored user (optional)
         """
         self.model = None
         self.preprocessor = None
         self.config = None
         self.alpha = alpha
         self.model_version = "unknown"
+        self.drift_recorder = drift_recorder
         
         if model_path and os.path.exists(model_path):
             self._load_model(model_path)
@@ -918,6 +922,9 @@ class CreditScorer:
             gbm_prob = 1 - persona_subscore
             explanation = None
         
+        if self.drift_recorder is not None:
+            self.drift_recorder.record(features, {'persona': persona, 'model_probability': gbm_prob})
+        
         # Step 3: Blend scores
         final_prob = blend_scores(gbm_prob, persona_subscore, alpha)
         
@@ -0,0 +1,113 @@
+"""
+Chunked synthetic data engine
+=============================
+
+The synthetic generators draw each feature column of a block of rows as
+whole numpy arrays (block functions: (rng, n_rows) -> DataFrame). This
+module turns a block function into datasets of any size:
+
+- rows are generated in blocks of BLOCK_ROWS, block b from its own
+  generator seeded with (seed, b), so every row depends only on the seed
+  and its position: the data is the same for any chunk size, worker count
+  or row range, and n rows are the first n rows of any larger dataset
+- write_parquet() streams chunk_rows rows at a time into one Parquet file
+  per chunk (optionally hive-partitioned by columns), spread over n_workers
+  processes, so memory stays at about one chunk per worker
+
+Usage:
+    df = generate_rows(block_fn, seed=42, start=0, stop=100_000)
+    write_parquet(block_fn, 50_000_000, 'synthetic_data/', seed=42, n_workers=4)
+"""
+
+import glob
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BLOCK_ROWS = 16384
+DEFAULT_CHUNK_ROWS = 1_048_576  # 64 blocks
+
+BlockFunction = Callable[[np.random.Generator, int], pd.DataFrame]
+
+
+def block_rng(seed: int, block: int) -> np.random.Generator:
+    """Independent generator of block number block"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def generate_rows(block_fn: BlockFunction, seed: int, start: int, stop: int) -> pd.DataFrame:
+    """Rows [start, stop) of the dataset block_fn generates from seed, indexed by position"""
+    first, last = start // BLOCK_ROWS, max(stop - 1, start) // BLOCK_ROWS
+    frames = []
+    for block in range(first, last + 1):
+        offset = block * BLOCK_ROWS
+        frame = block_fn(block_rng(seed, block), BLOCK_ROWS)
+        frames.append(frame.iloc[max(start - offset, 0):max(min(stop - offset, BLOCK_ROWS), 0)])
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def chunk_bounds(n_rows: int, chunk_rows: int) -> List[tuple]:
+    """(start, stop) of each chunk"""
+    if chunk_rows <= 0:
+        raise ValueError('chunk_rows must be positive')
+    return [(start, min(start + chunk_rows, n_rows)) for start in range(0, n_rows, chunk_rows)]
+
+
+def iter_chunks(block_fn: BlockFunction, n_rows: int, seed: int,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """The dataset in chunks of chunk_rows rows (a multiple of BLOCK_ROWS avoids re-drawing boundary blocks)"""
+    for start, stop in chunk_bounds(n_rows, chunk_rows):
+        yield generate_rows(block_fn, seed, start, stop)
+
+
+def _write_chunk(block_fn: BlockFunction, seed: int, start: int, stop: int, path: str,
+                 index: int, partition_cols: Optional[List[str]]) -> None:
+    df = generate_rows(block_fn, seed, start, stop)
+    if partition_cols:
+        df.to_parquet(path, index=False, partition_cols=partition_cols,
+                      basename_template=f'part-{index:05d}-{{i}}.parquet',
+                      existing_data_behavior='overwrite_or_ignore')
+    else:
+        df.to_parquet(os.path.join(path, f'part-{index:05d}.parquet'), index=False)
+
+
+def write_parquet(block_fn: BlockFunction, n_rows: int, path: str, seed: int,
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS, n_workers: int = 1,
+                  partition_cols: Optional[List[str]] = None) -> List[str]:
+    """
+    Write the dataset as a directory of Parquet files, one per chunk
+
+    Args:
+        block_fn: Block function of the generator (must pickle for n_workers > 1)
+        n_rows: Rows to write
+        path: Output directory (must not exist or be empty); pd.read_parquet(path)
+            reads the whole dataset
+        seed: Dataset seed
+        chunk_rows: Rows per chunk, i.e. per file and in memory per worker
+        n_workers: Processes writing chunks in parallel
+        partition_cols: Columns to hive-partition by (col=value/ directories)
+
+    Returns:
+        Paths of the Parquet files written
+    """
+    if os.path.isdir(path) and os.listdir(path):
+        raise FileExistsError(f'{path} is not empty; stale chunks would mix into the dataset')
+    os.makedirs(path, exist_ok=True)
+
+    tasks = [(block_fn, seed, start, stop, path, index, partition_cols)
+             for index, (start, stop) in enumerate(chunk_bounds(n_rows, chunk_rows))]
+    if n_workers <= 1:
+        for task in tasks:
+            _write_chunk(*task)
+    else:
+        # spawn: forking a process that may hold BLAS/OpenMP threads is not safe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+            list(executor.map(_write_chunk, *zip(*tasks)))
+    return sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True))
@@ -20,6 +20,8 @@ import pandas as pd
 import json
 import os
 import tempfile
+import time
+from unittest import mock
 from datetime import datetime
 
 # Import modules to test
@@ -131,7 +133,39 @@ class TestSyntheticDataGenerator:
         df2 = gen2.generate(n_samples=100)
         
         assert df1['monthly_income'].sum() == df2['monthly_income'].sum()
-    
+
+    def test_generator_rows_independent_of_chunk_size(self):
+        """Test that chunked generation gives the same rows for any chunk size"""
+        from synthetic_engine import iter_chunks
+        generator = SyntheticDataGenerator(seed=42)
+        df = generator.generate(n_samples=20000)
+        block_fn = generator.block_function(missing_rate=0.05, include_timestamp=True)
+
+        for chunk_rows in (5000, 16384, 30000):
+            chunked = pd.concat(iter_chunks(block_fn, 20000, seed=42, chunk_rows=chunk_rows))
+            pd.testing.assert_frame_equal(chunked, df)
+        # A smaller dataset is a prefix of a larger one
+        pd.testing.assert_frame_equal(generator.generate(n_samples=300), df.iloc[:300])
+
+    def test_generator_write_parquet(self, tmp_path):
+        """Test that the Parquet dataset matches generate(), also partitioned"""
+        pytest.importorskip('pyarrow')
+        generator = SyntheticDataGenerator(seed=42)
+        df = generator.generate(n_samples=20000)
+
+        files = generator.write_parquet(str(tmp_path / 'flat'), n_samples=20000, chunk_rows=8192)
+        assert len(files) == 3
+        pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'flat'), df.reset_index(drop=True))
+
+        generator.write_parquet(str(tmp_path / 'by_persona'), n_samples=20000, chunk_rows=8192,
+                                partition_cols=['persona'])
+        partitioned = pd.read_parquet(tmp_path / 'by_persona')
+        assert len(partitioned) == 20000
+        assert partitioned['persona'].astype(str).value_counts().to_dict() == df['persona'].value_counts().to_dict()
+
+        with pytest.raises(FileExistsError):
+            generator.write_parquet(str(tmp_path / 'flat'), n_samples=100)
+
     def test_generator_includes_timestamp(self):
         """Test timestamp generation"""
         generator = SyntheticDataGenerator(seed=42)
@@ -396,6 +430,120 @@ class TestPSI:
         assert report['summary']['warning_count'] == 1
         assert report['summary']['critical_count'] == 1
 
+    def test_sketch_psi_matches_batch_psi(self, synthetic_data):
+        """Test PSI from sketch counts equals PSI recomputed from the data"""
+        from drift_sketch import DriftReference
+
+        baseline, current = synthetic_data.iloc[:600], synthetic_data.iloc[600:]
+        reference = DriftReference.fit(baseline, categorical_columns=['persona'])
+        sketch = reference.new_sketch().update(current.iloc[:200])
+        for record in current.iloc[200:].to_dict('records'):
+            sketch.update_record(record)
+
+        expected = calculate_feature_psi(baseline, current)
+        psi = sketch.psi()
+        assert sketch.n == len(current)
+        assert psi.keys() - expected.keys() == {'persona'}
+        for feature, value in expected.items():
+            assert psi[feature] == pytest.approx(value)
+
+    def test_sketch_store_merges_days_into_windows(self, synthetic_data, tmp_path):
+        """Test per-day sketches persist and add up to window sketches"""
+        from drift_sketch import DriftReference, SketchStore
+
+        reference = DriftReference.fit(synthetic_data, ['monthly_income'], ['persona'])
+        store = SketchStore(str(tmp_path), reference)
+        days = ['2024-01-01', '2024-01-02', '2024-01-03']
+        for day, batch in zip(days, np.array_split(synthetic_data, 3)):
+            store.add(reference.new_sketch().update(batch), day=day)
+
+        reopened = SketchStore(str(tmp_path))
+        assert [d.isoformat() for d in reopened.days()] == days
+        window = reopened.window('2024-01-02', '2024-01-03')
+        assert window.n == len(synthetic_data) - len(np.array_split(synthetic_data, 3)[0])
+        np.testing.assert_array_equal(reopened.window().counts, reference.counts.counts)
+        assert all(psi < 1e-9 for psi in reopened.window().psi().values())
+        with pytest.raises(ValueError):
+            SketchStore(str(tmp_path), DriftReference.fit(synthetic_data, ['avg_account_balance']))
+
+
+class TestDriftRecorder:
+    """Tests for the online drift recorder"""
+
+    @pytest.fixture
+    def store(self, synthetic_data, tmp_path):
+        from drift_sketch import DriftReference, SketchStore
+
+        reference = DriftReference.fit(synthetic_data, ['monthly_income', 'avg_account_balance'], ['persona'])
+        scores = pd.DataFrame({'model_probability': np.linspace(0.01, 0.5, len(synthetic_data))})
+        return SketchStore(str(tmp_path), reference.join(DriftReference.fit(scores)))
+
+    def test_flush_bins_recorded_requests(self, synthetic_data, store):
+        from drift_recorder import DriftRecorder
+
+        recorder = DriftRecorder(store, start=False)
+        records = synthetic_data.to_dict('records')
+        for record in records:
+            recorder.record(record, {'model_probability': 0.9})
+        assert recorder.flush() == len(records)
+        assert recorder.flush() == 0
+
+        window = store.rolling(1)
+        assert window.n == len(records)
+        expected = store.reference.new_sketch().update(synthetic_data.assign(model_probability=0.9))
+        np.testing.assert_array_equal(window.counts, expected.counts)
+
+        status = recorder.status()
+        assert status['records'] == len(records)
+        assert status['status'] == 'CRITICAL'
+        assert status['alerts'][0]['feature'] == 'model_probability'
+        assert status['max_feature_psi'] < 0.01
+
+    def test_writers_share_a_store(self, synthetic_data, store):
+        from drift_recorder import DriftRecorder
+
+        recorders = [DriftRecorder(store, writer=f'worker-{i}', start=False) for i in range(2)]
+        for i, record in enumerate(synthetic_data.head(100).to_dict('records')):
+            recorders[i % 2].record(record)
+        for recorder in recorders:
+            recorder.flush()
+        assert len(os.listdir(store.directory)) == 3  # reference + one file per writer
+        assert store.rolling(1).n == 100
+        assert recorders[0].status()['status'] == 'INSUFFICIENT_DATA'
+
+    def test_status_reads_the_store_once_per_flush_interval(self, synthetic_data, store):
+        from drift_recorder import DriftRecorder
+
+        recorder = DriftRecorder(store, flush_interval=60, start=False)
+        other = DriftRecorder(store, writer='other-worker', start=False)
+        records = synthetic_data.head(100).to_dict('records')
+        with mock.patch.object(store, 'rolling', wraps=store.rolling) as rolling:
+            assert recorder.status()['records'] == 0
+            for record in records:
+                other.record(record)
+            other.flush()
+            assert recorder.status()['records'] == 0  # probes within the interval are cached
+            assert rolling.call_count == 1
+
+            for record in records:
+                recorder.record(record)
+            recorder.flush()
+            assert recorder.status()['records'] == 200  # own flush invalidates
+            with mock.patch('drift_recorder.time.monotonic', return_value=time.monotonic() + 61):
+                recorder.status()
+            assert rolling.call_count == 3
+
+    def test_scorer_records_requests(self, sample_features, store):
+        from drift_recorder import DriftRecorder
+
+        recorder = DriftRecorder(store, start=False)
+        scorer = CreditScorer(drift_recorder=recorder)
+        scorer.score_batch([sample_features] * 3, personas='gig_worker')
+        assert len(recorder.buffer) == 3
+        features, extra = recorder.buffer[0][1:]
+        assert features is sample_features
+        assert extra['persona'] == 'gig_worker' and 0 <= extra['model_probability'] <= 1
+
 
 class TestCalibration:
     """Tests for calibration monitoring"""
@@ -442,6 +590,371 @@ class TestPerformanceMonitor:
         
         assert status['status'] in ['HEALTHY', 'DEGRADED']
 
+    def test_store_metrics_match_batch_metrics(self, tmp_path):
+        """Metrics from the daily buckets match sklearn on the raw predictions"""
+        from sklearn.metrics import roc_auc_score, brier_score_loss
+        from performance_store import PerformanceStore
+        
+        rng = np.random.default_rng(42)
+        n = 5000
+        y_pred = rng.beta(2, 8, n)
+        y_true = rng.binomial(1, y_pred)
+        days = np.datetime64('2026-01-01') + rng.integers(0, 30, n).astype('timedelta64[D]')
+        
+        store = PerformanceStore(str(tmp_path / 'performance.sqlite'))
+        assert store.log_predictions(np.arange(n), y_pred, days) == n
+        assert store.record_outcomes(np.arange(n), y_true) == {'matched': n, 'unmatched': 0}
+        metrics = store.metrics()
+        
+        assert abs(metrics['auc'] - roc_auc_score(y_true, y_pred)) < 1e-3
+        assert metrics['brier_score'] == pytest.approx(brier_score_loss(y_true, y_pred))
+        assert metrics['calibration']['expected_calibration_error'] == pytest.approx(
+            calibration_metrics(y_true, y_pred)['expected_calibration_error'])
+        assert metrics['confusion']['tp'] == int(((y_pred >= 0.5) & (y_true == 1)).sum())
+        
+        window = store.metrics('2026-01-10', '2026-01-19')
+        in_window = (days >= np.datetime64('2026-01-10')) & (days <= np.datetime64('2026-01-19'))
+        assert window['n_labelled'] == in_window.sum()
+        assert abs(window['auc'] - roc_auc_score(y_true[in_window], y_pred[in_window])) < 1e-3
+    
+    def test_late_outcomes_join_by_application_id(self, tmp_path):
+        """Outcomes join later by ID, corrections replace them and the store survives reopening"""
+        from performance_store import PerformanceStore
+        
+        path = str(tmp_path / 'performance.sqlite')
+        rng = np.random.default_rng(0)
+        ids = [f'APP-{i}' for i in range(2000)]
+        y_pred = rng.uniform(0, 1, 2000)
+        y_true = rng.binomial(1, y_pred)
+        
+        monitor = PerformanceMonitor(store=PerformanceStore(path), window_days=30)
+        monitor.log_predictions(ids, y_pred, segments=np.where(np.arange(2000) % 2, 'A', 'B'))
+        assert monitor.log_predictions(ids[:10], y_pred[:10]) == 0
+        assert monitor.check_degradation()['status'] == 'UNKNOWN'
+        
+        assert monitor.record_outcomes(ids[:1000] + ['APP-missing'], np.r_[y_true[:1000], 1]) == {
+            'matched': 1000, 'unmatched': 1}
+        monitor.record_outcomes(ids[:1], [1 - y_true[0]])
+        
+        assert monitor.check_degradation()['status'] == 'HEALTHY'
+        
+        reopened = PerformanceMonitor(store=PerformanceStore(path), window_days=30)
+        metrics = reopened.store.rolling(30)
+        assert metrics['n_predictions'] == 2000
+        assert metrics['n_labelled'] == 1000
+        assert metrics['n_defaults'] == y_true[:1000].sum() + 1 - 2 * y_true[0]
+        assert reopened.store.pending_outcomes() == 1000
+        assert reopened.store.metrics(segment='A')['n_labelled'] == 500
+        
+        # The baseline survives the restart: degradation after it is still detected
+        assert reopened.baseline_auc == monitor.baseline_auc
+        reopened.record_outcomes(ids[1000:], 1 - y_true[1000:])
+        assert reopened.check_degradation()['status'] == 'DEGRADED'
+        assert reopened.baseline_auc == monitor.baseline_auc
+        
+        assert PerformanceMonitor(baseline_auc=0.9, store=PerformanceStore(path)).baseline_auc == 0.9
+        assert PerformanceMonitor(store=PerformanceStore(path)).baseline_auc == 0.9
+
+
+class TestFairnessEngine:
+    """Tests for the grouped, chunked fairness audit"""
+    
+    @pytest.fixture
+    def scored(self):
+        rng = np.random.default_rng(7)
+        n = 20000
+        df = pd.DataFrame({
+            'location_tier': rng.choice(['tier1', 'tier2', 'tier3', 'rural'], n),
+            'employment_type': rng.choice(['full_time', 'contract', 'self_employed'], n),
+        })
+        # Rural applicants get inflated default probabilities
+        df['model_probability'] = np.clip(rng.beta(2, 6, n) + 0.3 * (df['location_tier'] == 'rural'), 0, 1)
+        labels = rng.binomial(1, df['model_probability']).astype(float)
+        labels[rng.random(n) < 0.2] = np.nan
+        df['default_90dpd'] = labels
+        df['credit_score'] = 900 - 600 * df['model_probability']
+        return df
+    
+    def test_chunked_audit_matches_per_group_checks(self, scored, tmp_path):
+        """Chunked Parquet input gives the same group metrics as the per-group checks"""
+        from fairness_engine import FairnessAccumulator, fairness_report, read_chunks
+        from monitoring import demographic_parity_check, equal_opportunity_check
+        
+        scored.to_parquet(tmp_path / 'scored.parquet')
+        accumulator = FairnessAccumulator(['location_tier', 'employment_type'], score_col='credit_score')
+        for chunk in read_chunks(str(tmp_path / 'scored.parquet'), accumulator.columns, chunk_rows=3000):
+            accumulator.update(chunk)
+        assert accumulator.n == len(scored)
+        report = fairness_report(accumulator, n_bootstrap=0)
+        
+        groups = report['groupings']['location_tier']['groups']
+        labelled = scored['default_90dpd'].notna().to_numpy()
+        opportunity = equal_opportunity_check(
+            scored['default_90dpd'].to_numpy()[labelled], scored['model_probability'].to_numpy()[labelled],
+            scored['location_tier'].to_numpy()[labelled])
+        parity = demographic_parity_check(scored['credit_score'].to_numpy(), scored['location_tier'].to_numpy())
+        for tier, stats in opportunity['group_tpr'].items():
+            assert groups[tier]['tpr']['estimate'] == pytest.approx(stats['tpr'])
+            assert groups[tier]['mean_score']['estimate'] == pytest.approx(
+                parity['group_statistics'][tier]['mean_score'])
+        
+        rural = (scored['location_tier'] == 'rural') & (scored['employment_type'] == 'contract')
+        intersection = report['groupings']['location_tier x employment_type']['groups']['rural | contract']
+        assert intersection['count'] == rural.sum()
+        assert intersection['approval_rate']['estimate'] == pytest.approx(
+            (scored.loc[rural, 'model_probability'] < 0.5).mean())
+    
+    def test_bootstrap_intervals_and_violations(self, scored):
+        """Intervals bracket the estimates, merged accumulators add up and the biased group is flagged"""
+        from fairness_engine import FairnessAccumulator, fairness_report
+        
+        half = len(scored) // 2
+        accumulator = FairnessAccumulator(['location_tier', 'employment_type']).update(scored.iloc[:half])
+        accumulator.merge(FairnessAccumulator(['location_tier', 'employment_type']).update(scored.iloc[half:]))
+        report = fairness_report(accumulator, n_bootstrap=100)
+        
+        tier = report['groupings']['location_tier']
+        for stats in tier['groups'].values():
+            rate = stats['approval_rate']
+            assert rate['ci_lower'] <= rate['estimate'] <= rate['ci_upper']
+        assert tier['disparities']['approval_rate']['lowest'] == 'rural'
+        assert not tier['parity_satisfied']
+        assert {'grouping': 'location_tier', 'check': 'parity'}.items() <= report['violations'][0].items()
+        assert report['groupings']['employment_type']['parity_satisfied']
+
+
+# ============================================================================
+# HYPERPARAMETER TUNING TESTS
+# ============================================================================
+
+class TestHyperparameterTuning:
+    """Tests for the Optuna tuning mode (shared datasets, pruning, resume)"""
+
+    @pytest.fixture
+    def tuning_data(self, synthetic_data):
+        train_df, val_df, _ = create_splits(synthetic_data, target_col='default_90dpd',
+                                            timestamp_col='application_date')
+        exclude = ['default_90dpd', 'default_probability_true', 'application_date', 'persona']
+        feature_cols = [c for c in train_df.columns if c not in exclude]
+        preprocessor = CreditScoringPreprocessor()
+        X_train = preprocessor.fit_transform(train_df[feature_cols]).reset_index(drop=True)
+        X_val = preprocessor.transform(val_df[feature_cols]).reset_index(drop=True)
+        categorical = [c for c in preprocessor._get_categorical_features() if c in X_train.columns]
+        return (X_train, train_df['default_90dpd'].reset_index(drop=True),
+                X_val, val_df['default_90dpd'].reset_index(drop=True), categorical)
+
+    def test_shared_datasets_reused_across_trials(self, tuning_data):
+        import optuna
+        from train import OptunaObjective
+
+        trial = optuna.trial.FixedTrial({
+            'num_leaves': 31, 'max_depth': 6, 'learning_rate': 0.1, 'feature_fraction': 0.8,
+            'bagging_fraction': 0.8, 'bagging_freq': 5, 'min_child_samples': 20,
+            'reg_alpha': 0.1, 'reg_lambda': 0.1
+        })
+        shared = OptunaObjective(*tuning_data, shared_datasets=True)
+
+        auc = shared(trial)
+        first_datasets = shared.datasets()
+        assert 0.5 < auc <= 1.0
+        assert shared(trial) == auc
+        # Different min_child_samples on the same bins (needs feature_pre_filter off)
+        trial.params['min_child_samples'] = 80
+        shared(trial)
+        assert shared.datasets() is first_datasets
+
+    def test_pruning_callback_stops_losing_trial(self):
+        import optuna
+        from optuna_tuning import LightGBMPruningCallback
+
+        class Env:
+            iteration = 9
+            evaluation_result_list = [('valid_0', 'auc', 0.5, True)]
+
+        study = optuna.create_study(direction='maximize',
+                                    pruner=optuna.pruners.ThresholdPruner(lower=0.6))
+        trial = study.ask()
+
+        with pytest.raises(optuna.TrialPruned):
+            LightGBMPruningCallback(trial, 'auc')(Env())
+        assert trial.storage.get_trial(trial._trial_id).intermediate_values == {10: 0.5}
+
+    def test_study_resumes_from_storage(self, tuning_data, tmp_path):
+        from train import run_hyperparameter_tuning
+
+        storage = str(tmp_path / 'tuning.log')
+        first = run_hyperparameter_tuning(*tuning_data, n_trials=2, shared_datasets=True,
+                                          pruner='median', storage=storage)
+        resumed = run_hyperparameter_tuning(*tuning_data, n_trials=3, shared_datasets=True,
+                                            pruner='median', storage=storage)
+
+        assert (first['n_trials'], resumed['n_trials']) == (2, 3)
+        assert resumed['best_auc'] >= first['best_auc']
+
+
+# ============================================================================
+# DATASET CACHE TESTS
+# ============================================================================
+
+class TestDatasetCache:
+    """Tests for the preprocessed split / LightGBM binary dataset cache"""
+
+    def test_key_changes_with_data_preprocessor_and_features(self, synthetic_data, tmp_path):
+        from dataset_cache import DatasetCache
+
+        features = list(FEATURE_SCHEMA)
+        key = DatasetCache.key(synthetic_data, CreditScoringPreprocessor(), features, test_size=0.15)
+        assert DatasetCache.key(synthetic_data.copy(), CreditScoringPreprocessor(), features,
+                                test_size=0.15) == key
+
+        changed = synthetic_data.copy()
+        changed.loc[0, 'monthly_income'] += 1
+        configured = CreditScoringPreprocessor()
+        configured.config = {'clip_pct': [2, 98]}
+        csv_path = tmp_path / 'data.csv'
+        synthetic_data.to_csv(csv_path, index=False)
+        csv_key = DatasetCache.key(str(csv_path), CreditScoringPreprocessor(), features)
+
+        others = [
+            DatasetCache.key(changed, CreditScoringPreprocessor(), features, test_size=0.15),
+            DatasetCache.key(synthetic_data, configured, features, test_size=0.15),
+            DatasetCache.key(synthetic_data, CreditScoringPreprocessor(), features[1:], test_size=0.15),
+            DatasetCache.key(synthetic_data, CreditScoringPreprocessor(), features, test_size=0.2),
+        ]
+        assert len({key, *others}) == 5
+        with open(csv_path, 'a') as f:
+            f.write('\n')
+        assert DatasetCache.key(str(csv_path), CreditScoringPreprocessor(), features) != csv_key
+
+    def test_cached_splits_and_binary_datasets_train_same_model(self, tmp_path):
+        import lightgbm as lgb
+        from dataset_cache import DatasetCache
+        from train import prepare_data
+
+        cache = DatasetCache(str(tmp_path))
+        splits, preprocessor, categorical = prepare_data(n_samples=1000)
+        cache.save('k', splits, preprocessor, categorical)
+        (X_train, y_train), (X_val, y_val) = splits['train'], splits['val']
+        built = cache.lgb_datasets('k', X_train, y_train, X_val, y_val, categorical)
+
+        cached = cache.load('k')
+        pd.testing.assert_frame_equal(cached.splits['test'][0], splits['test'][0])
+        assert cached.categorical_features == categorical
+        assert cached.preprocessor.fitted
+        loaded = cache.lgb_datasets('k', None, None, None, None, categorical)
+        assert cache.load('missing') is None
+
+        params = {'objective': 'binary', 'verbose': -1, 'min_child_samples': 40, 'seed': 1}
+        predictions = [lgb.train(params, train_data, 30, valid_sets=[val_data]).predict(X_val)
+                       for train_data, val_data in (built, loaded)]
+        np.testing.assert_allclose(*predictions)
+
+    def test_keeps_most_recently_used_entries(self, tmp_path):
+        from dataset_cache import DatasetCache
+
+        cache = DatasetCache(str(tmp_path), max_entries=2)
+        split = {'train': (pd.DataFrame({'x': [1.0]}), pd.Series([0]))}
+        for key in ('a', 'b'):
+            cache.save(key, split, CreditScoringPreprocessor(), [])
+        os.utime(cache.path('a'), (0, 0))
+        cache.load('a')
+        cache.save('c', split, CreditScoringPreprocessor(), [])
+
+        assert ('a' in cache, 'b' in cache, 'c' in cache) == (True, False, True)
+
+
+# ============================================================================
+# API RESPONSE TESTS
+# ============================================================================
+
+class TestEvaluationHarness:
+    """Tests for the bootstrap and cross-validation harness"""
+
+    @pytest.fixture
+    def predictions(self):
+        rng = np.random.default_rng(0)
+        p = np.round(rng.random(600), 2)  # rounded: ties
+        y = rng.binomial(1, p).astype(float)
+        segments = np.where(rng.random(600) < 0.3, 'gig_worker', 'salaried_professional')
+        return y, p, segments
+
+    def test_point_metrics_match_sklearn(self, predictions):
+        from sklearn.metrics import brier_score_loss, roc_auc_score
+        from evaluation_harness import point_metrics
+
+        y, p, _ = predictions
+        metrics = point_metrics(y, p)
+        assert metrics['auc'] == pytest.approx(roc_auc_score(y, p))
+        assert metrics['gini'] == pytest.approx(2 * roc_auc_score(y, p) - 1)
+        assert metrics['brier'] == pytest.approx(brier_score_loss(y, p))
+        assert metrics['default_rate'] == pytest.approx(y.mean())
+
+    def test_bootstrap_weights_equal_resampled_metrics(self, predictions):
+        from sklearn.metrics import roc_auc_score
+        from evaluation_harness import weighted_metrics
+
+        y, p, _ = predictions
+        order = np.argsort(p, kind='stable')
+        idx = np.random.default_rng(1).integers(0, len(y), len(y))
+        # Weight of each sorted row: how often the resample drew it
+        w = np.bincount(np.argsort(order)[idx], minlength=len(y))
+        metrics = weighted_metrics(w, y[order], p[order])
+        assert metrics['auc'][0] == pytest.approx(roc_auc_score(y[idx], p[idx]))
+
+    def test_bootstrap_reproducible_with_segments(self, predictions):
+        from evaluation_harness import bootstrap_metrics
+
+        y, p, segments = predictions
+        first = bootstrap_metrics(y, p, {'persona': segments}, n_bootstrap=120, batch_size=50, seed=3)
+        second = bootstrap_metrics(y, p, {'persona': segments}, n_bootstrap=120, batch_size=50, seed=3)
+        assert first == second
+        auc = first['overall']['auc']
+        assert auc['n_defined'] == 120
+        assert auc['ci_lower'] < auc['estimate'] < auc['ci_upper']
+        groups = first['segments']['persona']
+        assert set(groups) == {'gig_worker', 'salaried_professional'}
+        assert sum(group['n'] for group in groups.values()) == len(y)
+
+    def test_cross_validation_report(self, synthetic_data, tmp_path):
+        from evaluation_harness import run_evaluation
+
+        X = synthetic_data[['monthly_income', 'avg_account_balance', 'income_stability_score']].fillna(0)
+        y = synthetic_data['default_90dpd'].to_numpy()
+        params = {'objective': 'binary', 'num_leaves': 7, 'n_estimators': 500, 'seed': 1}
+        path = tmp_path / 'evaluation_report.json'
+        report = run_evaluation(y, np.full(len(y), y.mean()), n_bootstrap=20, X_cv=X, y_cv=y,
+                                params=params, num_boost_round=10, n_folds=3,
+                                segments_cv={'persona': synthetic_data['persona'].to_numpy()},
+                                output_path=str(path))
+
+        cv = report['cross_validation']
+        assert len(cv['folds']) == 3 and sum(fold['n'] for fold in cv['folds']) == len(y)
+        assert 0.5 < cv['out_of_fold']['auc'] <= 1
+        assert set(cv['segments']['persona']) == set(synthetic_data['persona'])
+        assert json.loads(path.read_text())['bootstrap']['n_bootstrap'] == 20
+
+
+class TestFastResponse:
+    """Tests for the default FastAPI response class"""
+
+    def test_numpy_and_pandas_values(self):
+        from fast_json import FastResponse
+
+        response = FastResponse({
+            'score': np.int64(712),
+            'probability': np.float32(0.25),
+            'shap': np.array([0.5, -0.25]),
+            'missing': np.nan,
+            'as_of': pd.Timestamp('2024-01-31'),
+            'history': pd.Series([1.0, 2.0]),
+        })
+
+        assert json.loads(response.body) == {
+            'score': 712, 'probability': 0.25, 'shap': [0.5, -0.25], 'missing': None,
+            'as_of': '2024-01-31T00:00:00', 'history': [1.0, 2.0]
+        }
+        assert response.media_type == 'application/json'
+
 
 # ============================================================================
 # INTEGRATION TESTS
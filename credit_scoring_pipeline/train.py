@@ -17,7 +17,7 @@ import numpy as np
 import pandas as pd
 import lightgbm as lgb
 import optuna
-from optuna.samplers import TPESampler
+from optuna.trial import TrialState
 import shap
 import joblib
 import json
@@ -37,6 +37,13 @@ from data_prep import (
     SyntheticDataGenerator, CreditScoringPreprocessor, 
     create_splits, FEATURE_SCHEMA, FEATURE_CATEGORY_MAPPING
 )
+from optuna_tuning import (
+    DEFAULT_STUDY_NAME, LightGBMPruningCallback, build_shared_datasets, finished_trials, run_study
+)
+from dataset_cache import DatasetCache, code_fingerprint
+from evaluation_harness import print_report, run_evaluation
+from drift_sketch import DriftReference
+import synthetic_engine
 
 warnings.filterwarnings('ignore')
 
@@ -157,16 +164,52 @@ def compute_precision_at_k(y_true: np.ndarray, y_pred: np.ndarray, k_pcts: List[
 # ============================================================================
 
 class OptunaObjective:
-    """Optuna objective for LightGBM hyperparameter tuning"""
+    """
+    Optuna objective for LightGBM hyperparameter tuning
+
+    shared_datasets bins the training/validation data once (on the first
+    trial) instead of in every trial; pruning reports the validation AUC
+    while boosting so the study's pruner can stop losing trials early.
+    """
     
     def __init__(self, X_train: pd.DataFrame, y_train: pd.Series,
                  X_val: pd.DataFrame, y_val: pd.Series,
-                 categorical_features: List[str]):
+                 categorical_features: List[str],
+                 shared_datasets: bool = False,
+                 pruning: bool = False):
         self.X_train = X_train
         self.y_train = y_train
         self.X_val = X_val
         self.y_val = y_val
         self.categorical_features = categorical_features
+        self.shared_datasets = shared_datasets
+        self.pruning = pruning
+        self.num_threads = -1
+        self._datasets = None
+
+    def __getstate__(self):
+        # Tuning workers rebuild the datasets in their own process
+        state = self.__dict__.copy()
+        state['_datasets'] = None
+        return state
+
+    def datasets(self) -> Tuple[lgb.Dataset, lgb.Dataset]:
+        if not self.shared_datasets:
+            train_data = lgb.Dataset(
+                self.X_train, label=self.y_train,
+                categorical_feature=self.categorical_features
+            )
+            val_data = lgb.Dataset(
+                self.X_val, label=self.y_val,
+                categorical_feature=self.categorical_features,
+                reference=train_data
+            )
+            return train_data, val_data
+        if self._datasets is None:
+            self._datasets = build_shared_datasets(
+                self.X_train, self.y_train, self.X_val, self.y_val, self.categorical_features
+            )
+        return self._datasets
     
     def __call__(self, trial: optuna.Trial) -> float:
         params = {
@@ -184,25 +227,20 @@ class OptunaObjective:
             'reg_lambda': trial.suggest_float('reg_lambda', 1e-4, 10.0, log=True),
             'verbose': -1,
             'random_state': 42,
-            'n_jobs': -1
+            'n_jobs': self.num_threads
         }
         
-        train_data = lgb.Dataset(
-            self.X_train, label=self.y_train,
-            categorical_feature=self.categorical_features
-        )
-        val_data = lgb.Dataset(
-            self.X_val, label=self.y_val,
-            categorical_feature=self.categorical_features,
-            reference=train_data
-        )
+        train_data, val_data = self.datasets()
+        callbacks = [lgb.early_stopping(50, verbose=False)]
+        if self.pruning:
+            callbacks.append(LightGBMPruningCallback(trial, 'auc'))
         
         model = lgb.train(
             params,
             train_data,
             num_boost_round=500,
             valid_sets=[val_data],
-            callbacks=[lgb.early_stopping(50, verbose=False)]
+            callbacks=callbacks
         )
         
         y_pred = model.predict(self.X_val)
@@ -214,21 +252,33 @@ class OptunaObjective:
 def run_hyperparameter_tuning(X_train: pd.DataFrame, y_train: pd.Series,
                                X_val: pd.DataFrame, y_val: pd.Series,
                                categorical_features: List[str],
-                               n_trials: int = 50) -> Dict:
+                               n_trials: int = 50,
+                               shared_datasets: bool = False,
+                               pruner: Optional[str] = None,
+                               storage: Optional[str] = None,
+                               study_name: str = DEFAULT_STUDY_NAME,
+                               n_workers: int = 1) -> Dict:
     """
     Run Optuna hyperparameter search.
+
+    Args:
+        n_trials: Finished trials the study should hold (trials already in
+            storage count, so a crashed run resumes)
+        shared_datasets: Bin the data once and share it across trials
+        pruner: 'median' or 'hyperband' to stop losing trials early
+        storage: SQLite (*.db) or journal file keeping the study on disk
+        study_name: Study to create or resume in storage
+        n_workers: Worker processes optimizing the study (needs storage)
     
     Returns:
         Dict with best parameters and study results
     """
     print(f"Starting hyperparameter tuning with {n_trials} trials...")
     
-    objective = OptunaObjective(X_train, y_train, X_val, y_val, categorical_features)
-    
-    sampler = TPESampler(seed=42)
-    study = optuna.create_study(direction='maximize', sampler=sampler)
-    
-    study.optimize(objective, n_trials=n_trials, show_progress_bar=True)
+    objective = OptunaObjective(X_train, y_train, X_val, y_val, categorical_features,
+                                shared_datasets=shared_datasets, pruning=pruner is not None)
+    study = run_study(objective, n_trials, storage=storage, study_name=study_name, pruner=pruner,
+                      n_workers=n_workers, seed=42, show_progress_bar=n_workers <= 1)
     
     print(f"\nBest trial:")
     print(f"  AUC: {study.best_trial.value:.4f}")
@@ -237,7 +287,8 @@ def run_hyperparameter_tuning(X_train: pd.DataFrame, y_train: pd.Series,
     return {
         'best_params': study.best_trial.params,
         'best_auc': study.best_trial.value,
-        'n_trials': n_trials
+        'n_trials': finished_trials(study),
+        'pruned_trials': len(study.get_trials(deepcopy=False, states=(TrialState.PRUNED,)))
     }
 
 
@@ -264,7 +315,9 @@ class CreditScoringModel:
               X_val: pd.DataFrame, y_val: pd.Series,
               categorical_features: List[str] = None,
               tune_hyperparams: bool = False,
-              n_tuning_trials: int = 30) -> 'CreditScoringModel':
+              n_tuning_trials: int = 30,
+              tuning_options: Optional[Dict] = None,
+              datasets: Optional[Tuple[lgb.Dataset, lgb.Dataset]] = None) -> 'CreditScoringModel':
         """
         Train the LightGBM model.
         
@@ -276,6 +329,10 @@ class CreditScoringModel:
             categorical_features: List of categorical column names
             tune_hyperparams: Whether to run hyperparameter tuning
             n_tuning_trials: Number of Optuna trials
+            tuning_options: Extra run_hyperparameter_tuning arguments
+                (shared_datasets, pruner, storage, study_name, n_workers)
+            datasets: Prebuilt (train, validation) lgb.Datasets of X_train/X_val,
+                e.g. from DatasetCache.lgb_datasets(); built here when None
             
         Returns:
             self
@@ -297,22 +354,26 @@ class CreditScoringModel:
         if tune_hyperparams:
             tuning_results = run_hyperparameter_tuning(
                 X_train, y_train, X_val, y_val,
-                self.categorical_features, n_tuning_trials
+                self.categorical_features, n_tuning_trials,
+                **(tuning_options or {})
             )
             self.params.update(tuning_results['best_params'])
             self.training_metrics['tuning'] = tuning_results
         
         # Prepare datasets
-        train_data = lgb.Dataset(
-            X_train, label=y_train,
-            categorical_feature=self.categorical_features,
-            feature_name=self.feature_names
-        )
-        val_data = lgb.Dataset(
-            X_val, label=y_val,
-            categorical_feature=self.categorical_features,
-            reference=train_data
-        )
+        if datasets is not None:
+            train_data, val_data = datasets
+        else:
+            train_data = lgb.Dataset(
+                X_train, label=y_train,
+                categorical_feature=self.categorical_features,
+                feature_name=self.feature_names
+            )
+            val_data = lgb.Dataset(
+                X_val, label=y_val,
+                categorical_feature=self.categorical_features,
+                reference=train_data
+            )
         
         # Train model
         print("\nTraining LightGBM model...")
@@ -673,29 +734,40 @@ def evaluate_model(model: CreditScoringModel,
 # MAIN TRAINING SCRIPT
 # ============================================================================
 
-def main(data_path: str = None,
-         output_dir: str = "model_artifacts",
-         n_samples: int = 20000,
-         tune_hyperparams: bool = True,
-         n_tuning_trials: int = 30):
+EXCLUDE_COLUMNS = ['default_90dpd', 'default_probability_true', 'application_date', 'persona']
+
+# Label columns the evaluation report breaks metrics down by
+SEGMENT_COLUMNS = ['persona']
+
+
+def dataset_cache_key(cache: DatasetCache, data_path: Optional[str], n_samples: int) -> str:
     """
-    Main training script.
-    
-    Args:
-        data_path: Path to data file (optional, uses synthetic if not provided)
-        output_dir: Directory for saving model artifacts
-        n_samples: Number of synthetic samples if no data provided
-        tune_hyperparams: Whether to run hyperparameter tuning
-        n_tuning_trials: Number of Optuna trials
+    Cache key of the splits main() trains on: the data file's contents, or
+    the synthetic generator's code and settings when no file is given
     """
-    os.makedirs(output_dir, exist_ok=True)
-    
-    print("=" * 60)
-    print("CREDIT SCORING MODEL TRAINING PIPELINE")
-    print("=" * 60)
-    print(f"Output directory: {output_dir}")
-    print(f"Hyperparameter tuning: {tune_hyperparams}")
+    if data_path and os.path.exists(data_path):
+        source = data_path
+        columns = pd.read_csv(data_path, nrows=0).columns
+    else:
+        source = {'generator': code_fingerprint(SyntheticDataGenerator), 'engine': code_fingerprint(synthetic_engine),
+                  'seed': 42, 'n_samples': n_samples, 'missing_rate': 0.05}
+        # The generator's code (in the source hash) fixes the column order
+        columns = FEATURE_SCHEMA
+    feature_cols = [c for c in columns if c not in EXCLUDE_COLUMNS]
+    return cache.key(source, CreditScoringPreprocessor(), feature_cols,
+                     target='default_90dpd', timestamp='application_date',
+                     split=code_fingerprint(create_splits))
+
+
+def prepare_data(data_path: Optional[str] = None, n_samples: int = 20000) -> Tuple[Dict, Any, List[str]]:
+    """
+    Load or generate the data, split it and preprocess the splits.
     
+    Returns:
+        ({'train'|'val'|'test': (X, y), 'segments': {split: segment label columns},
+          'drift_reference': raw feature bins of the training split},
+         fitted preprocessor, categorical features)
+    """
     # Step 1: Load or generate data
     if data_path and os.path.exists(data_path):
         print(f"\nLoading data from {data_path}...")
@@ -718,8 +790,7 @@ def main(data_path: str = None,
     preprocessor = CreditScoringPreprocessor()
     
     # Columns to exclude from features
-    exclude_cols = ['default_90dpd', 'default_probability_true', 'application_date', 'persona']
-    feature_cols = [c for c in train_df.columns if c not in exclude_cols]
+    feature_cols = [c for c in train_df.columns if c not in EXCLUDE_COLUMNS]
     
     train_processed = preprocessor.fit_transform(train_df[feature_cols])
     val_processed = preprocessor.transform(val_df[feature_cols])
@@ -729,15 +800,128 @@ def main(data_path: str = None,
     categorical_features = [c for c in preprocessor._get_categorical_features() 
                            if c in train_processed.columns]
     
-    # Prepare targets
-    y_train = train_df['default_90dpd'].reset_index(drop=True)
-    y_val = val_df['default_90dpd'].reset_index(drop=True)
-    y_test = test_df['default_90dpd'].reset_index(drop=True)
+    # Prepare targets and reset indices
+    splits = {
+        name: (processed.reset_index(drop=True), split_df['default_90dpd'].reset_index(drop=True))
+        for name, processed, split_df in (('train', train_processed, train_df),
+                                          ('val', val_processed, val_df),
+                                          ('test', test_processed, test_df))
+    }
+    splits['segments'] = {
+        name: split_df[[c for c in SEGMENT_COLUMNS if c in split_df.columns]].reset_index(drop=True)
+        for name, split_df in (('train', train_df), ('val', val_df), ('test', test_df))
+    }
+    # Bins of the raw features scoring requests are monitored against
+    drift_cols = feature_cols + [c for c in SEGMENT_COLUMNS if c in train_df.columns]
+    splits['drift_reference'] = DriftReference.fit(
+        train_df[drift_cols], drift_cols,
+        categorical_columns=train_df[drift_cols].select_dtypes(exclude=[np.number]).columns.tolist()
+    )
+    return splits, preprocessor, categorical_features
+
+
+def evaluation_report(model, splits: Dict, categorical_features: List[str], output_dir: str,
+                      n_bootstrap: int = 1000, cv_folds: int = 5, n_workers: int = 1) -> Dict:
+    """
+    Bootstrap confidence intervals of the test metrics and a k-fold
+    cross-validation on train + validation, overall and per segment.
+
+    Folds are trained with the final model's parameters for its best number
+    of rounds. The report is saved to <output_dir>/evaluation_report.json.
+    """
+    segments = splits.get('segments', {})
+    X_cv = pd.concat([splits['train'][0], splits['val'][0]], ignore_index=True)
+    y_cv = pd.concat([splits['train'][1], splits['val'][1]], ignore_index=True)
+    segments_cv = (pd.concat([segments['train'], segments['val']], ignore_index=True)
+                   if 'train' in segments else pd.DataFrame())
+    segments_test = segments.get('test', pd.DataFrame())
+    X_test, y_test = splits['test']
+
+    print(f"\nEvaluation report: {n_bootstrap} bootstrap resamples, {cv_folds}-fold CV, {n_workers} workers...")
+    report = run_evaluation(
+        y_test.to_numpy(), model.predict_proba(X_test),
+        segments_test={c: segments_test[c].to_numpy() for c in segments_test.columns},
+        X_cv=X_cv, y_cv=y_cv.to_numpy(), params=model.model.params,
+        num_boost_round=model.model.best_iteration or model.model.current_iteration(),
+        categorical_features=categorical_features,
+        segments_cv={c: segments_cv[c].to_numpy() for c in segments_cv.columns},
+        n_bootstrap=n_bootstrap, n_folds=cv_folds, n_workers=n_workers,
+        output_path=os.path.join(output_dir, 'evaluation_report.json')
+    )
+    print_report(report)
+    return report
+
+
+def save_drift_reference(model, splits: Dict, path: str) -> None:
+    """
+    Save the drift reference of live scoring: the raw feature bins of the
+    training split and the bins of the model's training predictions
+    (recorded as model_probability)
+    """
+    if 'drift_reference' not in splits:
+        return
+    scores = pd.DataFrame({'model_probability': model.predict_proba(splits['train'][0])})
+    splits['drift_reference'].join(DriftReference.fit(scores)).save(path)
+    print(f"Drift reference saved to {path}")
+
+
+def main(data_path: str = None,
+         output_dir: str = "model_artifacts",
+         n_samples: int = 20000,
+         tune_hyperparams: bool = True,
+         n_tuning_trials: int = 30,
+         tuning_options: Optional[Dict] = None,
+         cache_dir: Optional[str] = None,
+         n_bootstrap: int = 0,
+         cv_folds: int = 0,
+         eval_workers: int = 1):
+    """
+    Main training script.
+    
+    Args:
+        data_path: Path to data file (optional, uses synthetic if not provided)
+        output_dir: Directory for saving model artifacts
+        n_samples: Number of synthetic samples if no data provided
+        tune_hyperparams: Whether to run hyperparameter tuning
+        n_tuning_trials: Number of Optuna trials
+        tuning_options: Extra run_hyperparameter_tuning arguments
+        cache_dir: Dataset cache directory; reruns on unchanged data,
+            preprocessor and features skip preprocessing and binning
+        n_bootstrap: Bootstrap resamples of the test metrics (0: no evaluation report)
+        cv_folds: Cross-validation folds of the evaluation report (0: none)
+        eval_workers: Processes running bootstrap batches and folds
+    """
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Reset indices
-    train_processed = train_processed.reset_index(drop=True)
-    val_processed = val_processed.reset_index(drop=True)
-    test_processed = test_processed.reset_index(drop=True)
+    print("=" * 60)
+    print("CREDIT SCORING MODEL TRAINING PIPELINE")
+    print("=" * 60)
+    print(f"Output directory: {output_dir}")
+    print(f"Hyperparameter tuning: {tune_hyperparams}")
+    
+    # Steps 1-3: Load, split and preprocess (or reuse the cached result)
+    cache = DatasetCache(cache_dir) if cache_dir else None
+    cached = None
+    if cache is not None:
+        cache_key = dataset_cache_key(cache, data_path, n_samples)
+        cached = cache.load(cache_key)
+    if cached is not None:
+        print(f"\nLoaded preprocessed splits from dataset cache {cached.path}")
+        splits, preprocessor, categorical_features = (
+            cached.splits, cached.preprocessor, cached.categorical_features
+        )
+    else:
+        splits, preprocessor, categorical_features = prepare_data(data_path, n_samples)
+        if cache is not None:
+            cache.save(cache_key, splits, preprocessor, categorical_features)
+    
+    (train_processed, y_train), (val_processed, y_val), (test_processed, y_test) = (
+        splits['train'], splits['val'], splits['test']
+    )
+    datasets = None
+    if cache is not None:
+        datasets = cache.lgb_datasets(cache_key, train_processed, y_train, val_processed, y_val,
+                                      categorical_features)
     
     print(f"Processed feature count: {len(train_processed.columns)}")
     
@@ -748,7 +932,9 @@ def main(data_path: str = None,
         val_processed, y_val,
         categorical_features=categorical_features,
         tune_hyperparams=tune_hyperparams,
-        n_tuning_trials=n_tuning_trials
+        n_tuning_trials=n_tuning_trials,
+        tuning_options=tuning_options,
+        datasets=datasets
     )
     
     # Step 5: Evaluate on test set
@@ -756,10 +942,16 @@ def main(data_path: str = None,
         model, test_processed, y_test,
         output_dir=os.path.join(output_dir, 'evaluation')
     )
+    report_path = None
+    if n_bootstrap > 0 or cv_folds > 1:
+        evaluation_report(model, splits, categorical_features, os.path.join(output_dir, 'evaluation'),
+                          n_bootstrap=n_bootstrap, cv_folds=cv_folds, n_workers=eval_workers)
+        report_path = os.path.join(output_dir, 'evaluation', 'evaluation_report.json')
     
     # Step 6: Save artifacts
     model.save(os.path.join(output_dir, 'credit_scoring_model.joblib'))
     preprocessor.save(os.path.join(output_dir, 'preprocessor.joblib'))
+    save_drift_reference(model, splits, os.path.join(output_dir, 'drift_reference.json'))
     
     # Save feature list
     feature_list = {
@@ -773,14 +965,15 @@ def main(data_path: str = None,
     # Save training config
     training_config = {
         'model_version': model.model_version,
-        'n_samples': len(df),
-        'train_samples': len(train_df),
-        'val_samples': len(val_df),
-        'test_samples': len(test_df),
+        'n_samples': sum(len(splits[name][0]) for name in ('train', 'val', 'test')),
+        'train_samples': len(train_processed),
+        'val_samples': len(val_processed),
+        'test_samples': len(test_processed),
         'n_features': len(train_processed.columns),
         'hyperparams': model.params,
         'training_metrics': model.training_metrics,
         'evaluation_results': eval_results,
+        'evaluation_report': report_path,
         'training_timestamp': datetime.now().isoformat()
     }
     with open(os.path.join(output_dir, 'training_config.json'), 'w') as f:
@@ -794,6 +987,7 @@ def main(data_path: str = None,
     print("  - preprocessor.joblib")
     print("  - feature_list.json")
     print("  - training_config.json")
+    print("  - drift_reference.json")
     print("  - evaluation/")
     
     return model, preprocessor, eval_results
@@ -808,15 +1002,43 @@ if __name__ == "__main__":
     parser.add_argument('--samples', type=int, default=20000, help='Number of synthetic samples')
     parser.add_argument('--tune', action='store_true', help='Run hyperparameter tuning')
     parser.add_argument('--trials', type=int, default=30, help='Number of tuning trials')
+    parser.add_argument('--fast-tuning', action='store_true',
+                        help='Bin the data once for all trials and prune losing trials')
+    parser.add_argument('--pruner', choices=['median', 'hyperband'], default='median',
+                        help='Pruner used with --fast-tuning')
+    parser.add_argument('--study-storage', type=str, default=None,
+                        help='SQLite (*.db) or journal file keeping the study; re-running resumes it')
+    parser.add_argument('--study-name', type=str, default='lgb_tuning', help='Study name in --study-storage')
+    parser.add_argument('--tuning-workers', type=int, default=1,
+                        help='Worker processes sharing the study (needs --study-storage)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Reuse preprocessed splits and binned datasets across runs')
+    parser.add_argument('--bootstrap', type=int, default=0,
+                        help='Bootstrap resamples for confidence intervals of the test metrics')
+    parser.add_argument('--cv-folds', type=int, default=0, help='Stratified cross-validation folds')
+    parser.add_argument('--eval-workers', type=int, default=1,
+                        help='Processes running bootstrap batches and cross-validation folds')
     
     args = parser.parse_args()
+    tuning_options = {
+        'shared_datasets': args.fast_tuning,
+        'pruner': args.pruner if args.fast_tuning else None,
+        'storage': args.study_storage,
+        'study_name': args.study_name,
+        'n_workers': args.tuning_workers,
+    }
     
     main(
         data_path=args.data,
         output_dir=args.output,
         n_samples=args.samples,
         tune_hyperparams=args.tune,
-        n_tuning_trials=args.trials
+        n_tuning_trials=args.trials,
+        tuning_options=tuning_options,
+        cache_dir=args.cache_dir,
+        n_bootstrap=args.bootstrap,
+        cv_folds=args.cv_folds,
+        eval_workers=args.eval_workers
     )
 
 
@@ -2,36 +2,14 @@
 Asset Analysis for Account Aggregator Data
 Analyzes assets from AA JSON to calculate highest quantified amount and features
 """
-import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Union
 from datetime import datetime
 import logging
 
-logger = logging.getLogger(__name__)
-
-# Asset liquidity constants (days to convert to cash)
-LIQUIDITY_SCORING = {
-    'STOCKS': 1,           # T+2 settlement
-    'MUTUAL_FUNDS': 3,     # 3-4 days redemption
-    'LIQUID_FUNDS': 1,     # Same day/next day
-    'GOLD_DIGITAL': 2,     # 2-3 days
-    'GOLD_ETF': 2,         # 2-3 days
-    'BANK_FD': 7,          # Immediate but with penalty
-    'CORPORATE_FD': 14,    # 1-2 weeks
-    'PPF': 365,            # Lock-in, partial withdrawal after 7 years
-    'EPF': 60,             # 2 months notice for withdrawal
-    'VPF': 60,             # 2 months notice
-    'REAL_ESTATE': 180,    # 6 months minimum to sell
-    'INSURANCE': 90,       # 3 months surrender process
-    'GOLD_PHYSICAL': 3,    # 3-5 days to sell
-    'BONDS': 7,            # Listed bonds
-    'NPS': 1825,           # Lock-in till retirement
-    'CRYPTO': 1            # Instant (but high volatility)
-}
+from .holdings import default_analysis, portfolio_analyses
 
-# Assets to exclude from survivability calculation
-EXCLUDE_FROM_SURVIVABILITY = ['PPF', 'EPF', 'VPF', 'NPS', 'BONDS']
+logger = logging.getLogger(__name__)
 
 
 class AssetAnalyzer:
@@ -588,141 +566,45 @@ class AssetAnalyzer:
         else:
             return 'EQUITY_FUNDS'  # Default
     
-    def calculate_analysis(self) -> Dict:
+    def calculate_analysis(self, include_assets: bool = True) -> Dict:
         """
         Calculate comprehensive asset analysis
         
+        Args:
+            include_assets: Echo the loaded asset list under 'assets'; pass
+                False for large portfolios whose holdings are not needed
+        
         Returns:
             Dict with analysis including highest quantified amount
         """
         if len(self.assets) == 0:
-            return self._get_default_analysis()
-        
-        df = pd.DataFrame(self.assets)
-        
-        # Calculate total values
-        total_value = float(df['current_value'].sum())
-        total_invested = float(df['invested_value'].sum())
-        
-        # Find highest quantified amount (quantity/value)
-        highest_asset = None
-        highest_value = 0.0
-        
-        for asset in self.assets:
-            value = asset.get('current_value', 0)
-            # Also check quantity for stocks
-            if asset.get('type') == 'STOCKS':
-                quantity = asset.get('quantity', 0)
-                ltp = asset.get('ltp', 0)
-                if quantity > 0 and ltp > 0:
-                    value = quantity * ltp
-            
-            if value > highest_value:
-                highest_value = value
-                highest_asset = asset
-        
-        # Calculate survivability assets (exclude PF, NPS, Bonds)
-        survivability_assets = [
-            a for a in self.assets 
-            if a.get('subtype', a.get('type', '')) not in EXCLUDE_FROM_SURVIVABILITY
-        ]
-        survivability_value = sum(a.get('current_value', 0) for a in survivability_assets)
-        
-        # Liquidity analysis
-        liquid_value = 0.0
-        semi_liquid_value = 0.0
-        illiquid_value = 0.0
-        
-        for asset in self.assets:
-            asset_type = asset.get('subtype', asset.get('type', 'UNKNOWN'))
-            liquidity_days = LIQUIDITY_SCORING.get(asset_type, 30)
-            value = asset.get('current_value', 0)
-            
-            if liquidity_days <= 7:
-                liquid_value += value
-            elif liquidity_days <= 90:
-                semi_liquid_value += value
-            else:
-                illiquid_value += value
+            return self._get_default_analysis(include_assets)
         
-        # Asset breakdown by type
-        asset_breakdown = df.groupby('type')['current_value'].sum().to_dict()
-        
-        # Portfolio returns
-        portfolio_returns = 0.0
-        if total_invested > 0:
-            portfolio_returns = ((total_value - total_invested) / total_invested) * 100
-        
-        # Build analysis result
-        analysis = {
-            'total_asset_value': float(total_value),
-            'total_invested_value': float(total_invested),
-            'survivability_asset_value': float(survivability_value),
-            'portfolio_returns_pct': float(portfolio_returns),
-            'num_assets': len(self.assets),
-            'num_asset_types': int(df['type'].nunique()),
-            
-            # Highest quantified amount
-            'highest_quantified_amount': {
-                'value': float(highest_value) if highest_asset else 0.0,
-                'asset_type': highest_asset.get('type') if highest_asset else None,
-                'asset_name': highest_asset.get('name') if highest_asset else None,
-                'subtype': highest_asset.get('subtype') if highest_asset else None
-            },
-            
-            # Liquidity breakdown
-            'liquid_assets': float(liquid_value),
-            'semi_liquid_assets': float(semi_liquid_value),
-            'illiquid_assets': float(illiquid_value),
-            'liquidity_ratio': float(liquid_value / total_value) if total_value > 0 else 0.0,
-            
-            # Asset type breakdown
-            'stocks_value': float(asset_breakdown.get('STOCKS', 0)),
-            'mutual_funds_value': float(asset_breakdown.get('MUTUAL_FUNDS', 0)),
-            'fixed_deposits_value': float(asset_breakdown.get('FIXED_DEPOSIT', 0)),
-            'gold_value': float(asset_breakdown.get('GOLD', 0)),
-            'real_estate_value': float(asset_breakdown.get('REAL_ESTATE', 0)),
-            'insurance_value': float(asset_breakdown.get('INSURANCE', 0)),
-            'provident_fund_value': float(asset_breakdown.get('PROVIDENT_FUND', 0)),
-            'bonds_value': float(asset_breakdown.get('BONDS', 0)),
-            'nps_value': float(asset_breakdown.get('NPS', 0)),
-            'crypto_value': float(asset_breakdown.get('CRYPTO', 0)),
-            
-            # Detailed asset list
-            'assets': self.assets
-        }
-        
-        return analysis
+        # All aggregates in one columnar pass (see holdings.py)
+        return portfolio_analyses([self.assets], include_assets)[0]
     
-    def _get_default_analysis(self) -> Dict:
+    def _get_default_analysis(self, include_assets: bool = True) -> Dict:
         """Return default analysis when no assets"""
-        return {
-            'total_asset_value': 0.0,
-            'total_invested_value': 0.0,
-            'survivability_asset_value': 0.0,
-            'portfolio_returns_pct': 0.0,
-            'num_assets': 0,
-            'num_asset_types': 0,
-            'highest_quantified_amount': {
-                'value': 0.0,
-                'asset_type': None,
-                'asset_name': None,
-                'subtype': None
-            },
-            'liquid_assets': 0.0,
-            'semi_liquid_assets': 0.0,
-            'illiquid_assets': 0.0,
-            'liquidity_ratio': 0.0,
-            'stocks_value': 0.0,
-            'mutual_funds_value': 0.0,
-            'fixed_deposits_value': 0.0,
-            'gold_value': 0.0,
-            'real_estate_value': 0.0,
-            'insurance_value': 0.0,
-            'provident_fund_value': 0.0,
-            'bonds_value': 0.0,
-            'nps_value': 0.0,
-            'crypto_value': 0.0,
-            'assets': []
-        }
+        return default_analysis(include_assets)
+
 
+def analyze_aa_batch(aa_payloads: List[Dict], include_assets: bool = True) -> List[Dict]:
+    """
+    calculate_analysis() of many Account Aggregator payloads
+    
+    Each payload is loaded by its own AssetAnalyzer; the aggregates of all
+    portfolios are then computed together in one columnar pass.
+    
+    Args:
+        aa_payloads: AA JSON per portfolio (standard or SEBI format)
+        include_assets: Echo each portfolio's asset list under 'assets'
+    
+    Returns:
+        One analysis dict per payload, in order
+    """
+    portfolios = []
+    for aa_data in aa_payloads:
+        analyzer = AssetAnalyzer()
+        analyzer.load_from_aa_json(aa_data)
+        portfolios.append(analyzer.assets)
+    return portfolio_analyses(portfolios, include_assets)
@@ -0,0 +1,301 @@
+"""
+Columnar holdings model for asset portfolios
+
+The assets of one or many portfolios (as loaded by AssetAnalyzer) are
+flattened once into typed columns: one row per holding, rows of a
+portfolio contiguous and in load order. Each distinct asset (sub)type is
+looked up once in TYPE_TABLE, which holds its precomputed liquidity bucket
+and survivability flag. All aggregates of AssetAnalyzer.calculate_analysis
+are then array reductions over the rows, so wealth-heavy portfolios
+(thousands of demat/MF holdings) and batches of portfolios cost one pass
+rather than one Python loop per aggregate.
+
+Sums are accumulated in the same order as the per-asset code they replace,
+so the analysis values are identical to it.
+"""
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Asset liquidity constants (days to convert to cash)
+LIQUIDITY_SCORING = {
+    'STOCKS': 1,           # T+2 settlement
+    'MUTUAL_FUNDS': 3,     # 3-4 days redemption
+    'LIQUID_FUNDS': 1,     # Same day/next day
+    'GOLD_DIGITAL': 2,     # 2-3 days
+    'GOLD_ETF': 2,         # 2-3 days
+    'BANK_FD': 7,          # Immediate but with penalty
+    'CORPORATE_FD': 14,    # 1-2 weeks
+    'PPF': 365,            # Lock-in, partial withdrawal after 7 years
+    'EPF': 60,             # 2 months notice for withdrawal
+    'VPF': 60,             # 2 months notice
+    'REAL_ESTATE': 180,    # 6 months minimum to sell
+    'INSURANCE': 90,       # 3 months surrender process
+    'GOLD_PHYSICAL': 3,    # 3-5 days to sell
+    'BONDS': 7,            # Listed bonds
+    'NPS': 1825,           # Lock-in till retirement
+    'CRYPTO': 1            # Instant (but high volatility)
+}
+
+# Assets to exclude from survivability calculation
+EXCLUDE_FROM_SURVIVABILITY = ['PPF', 'EPF', 'VPF', 'NPS', 'BONDS']
+
+# Days assumed for (sub)types missing from LIQUIDITY_SCORING
+DEFAULT_LIQUIDITY_DAYS = 30
+
+# Liquidity buckets (upper bound in days, inclusive); slower -> ILLIQUID
+LIQUID, SEMI_LIQUID, ILLIQUID = 0, 1, 2
+LIQUID_MAX_DAYS = 7
+SEMI_LIQUID_MAX_DAYS = 90
+
+
+def liquidity_bucket(days: float) -> int:
+    """LIQUID, SEMI_LIQUID or ILLIQUID for days to convert to cash"""
+    if days <= LIQUID_MAX_DAYS:
+        return LIQUID
+    if days <= SEMI_LIQUID_MAX_DAYS:
+        return SEMI_LIQUID
+    return ILLIQUID
+
+
+# (Sub)type -> (liquidity bucket, counts towards survivability)
+TYPE_TABLE = {
+    key: (liquidity_bucket(LIQUIDITY_SCORING.get(key, DEFAULT_LIQUIDITY_DAYS)),
+          key not in EXCLUDE_FROM_SURVIVABILITY)
+    for key in list(LIQUIDITY_SCORING) + EXCLUDE_FROM_SURVIVABILITY
+}
+DEFAULT_TYPE_ENTRY = (liquidity_bucket(DEFAULT_LIQUIDITY_DAYS), True)
+
+# Analysis key -> asset type whose current value it reports
+BREAKDOWN_FIELDS = {
+    'stocks_value': 'STOCKS',
+    'mutual_funds_value': 'MUTUAL_FUNDS',
+    'fixed_deposits_value': 'FIXED_DEPOSIT',
+    'gold_value': 'GOLD',
+    'real_estate_value': 'REAL_ESTATE',
+    'insurance_value': 'INSURANCE',
+    'provident_fund_value': 'PROVIDENT_FUND',
+    'bonds_value': 'BONDS',
+    'nps_value': 'NPS',
+    'crypto_value': 'CRYPTO',
+}
+
+
+def flatten_holdings(portfolios: Sequence[Sequence[Dict]]) -> Dict[str, np.ndarray]:
+    """
+    One typed row per holding.
+
+    Args:
+        portfolios: Per portfolio, asset dicts as AssetAnalyzer loads them
+
+    Returns:
+        Dict with a row array per column: portfolio (position in
+        portfolios), type_code (index into 'types', -1 if missing),
+        current_value, invested_value, quantified_value (the value ranked
+        for the highest quantified amount), liquidity_bucket and
+        survivable; plus 'sizes' (holdings per portfolio), 'types' and
+        'assets' (the flattened asset dicts)
+    """
+    assets = [asset for assets in portfolios for asset in assets]
+    sizes = np.fromiter((len(assets) for assets in portfolios), dtype=np.int64, count=len(portfolios))
+
+    types = [asset.get('type') for asset in assets]
+    # Liquidity/survivability key: the subtype, falling back to the type
+    keys = [asset['subtype'] if 'subtype' in asset else asset.get('type', 'UNKNOWN') for asset in assets]
+    current = np.array([asset.get('current_value', 0) for asset in assets], dtype=np.float64)
+
+    # Stocks are ranked by quantity x last traded price when both are known
+    quantified = current.copy()
+    stocks = np.flatnonzero([t == 'STOCKS' for t in types])
+    if len(stocks):
+        quantity = np.array([assets[i].get('quantity', 0) for i in stocks], dtype=np.float64)
+        ltp = np.array([assets[i].get('ltp', 0) for i in stocks], dtype=np.float64)
+        priced = (quantity > 0) & (ltp > 0)
+        quantified[stocks[priced]] = quantity[priced] * ltp[priced]
+
+    type_codes, type_uniques = pd.factorize(np.array(types, dtype=object))
+    key_codes, key_uniques = pd.factorize(np.array(keys, dtype=object), use_na_sentinel=False)
+    entries = [TYPE_TABLE.get(key, DEFAULT_TYPE_ENTRY) for key in key_uniques]
+    buckets = np.array([bucket for bucket, _ in entries], dtype=np.int64)
+    survivable = np.array([flag for _, flag in entries], dtype=bool)
+
+    return {
+        'portfolio': np.repeat(np.arange(len(portfolios)), sizes),
+        'sizes': sizes,
+        'types': np.asarray(type_uniques, dtype=object),
+        'type_code': type_codes,
+        'current_value': current,
+        'invested_value': np.array([asset.get('invested_value', 0) for asset in assets], dtype=np.float64),
+        'quantified_value': quantified,
+        'liquidity_bucket': buckets[key_codes],
+        'survivable': survivable[key_codes],
+        'assets': assets,
+    }
+
+
+def compute_portfolio_aggregates(holdings: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-portfolio aggregates of flatten_holdings() output.
+
+    Returns:
+        Dict of arrays (one entry per portfolio): total_asset_value,
+        total_invested_value, survivability_asset_value,
+        portfolio_returns_pct, num_assets, num_asset_types, highest_value,
+        highest_index (row of the highest quantified holding, -1 if none),
+        liquid_assets, semi_liquid_assets, illiquid_assets, liquidity_ratio
+        and one entry per BREAKDOWN_FIELDS key
+    """
+    sizes = holdings['sizes']
+    n = len(sizes)
+    portfolio = holdings['portfolio']
+    current = holdings['current_value']
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+
+    # As DataFrame.sum: NaN skipped, pairwise summation within a portfolio
+    total = np.array([np.nansum(current[offsets[i]:offsets[i + 1]]) for i in range(n)])
+    invested = np.array([np.nansum(holdings['invested_value'][offsets[i]:offsets[i + 1]]) for i in range(n)])
+
+    # Left-to-right sums (as the per-asset loops) via bincount
+    survivability = np.bincount(portfolio, weights=np.where(holdings['survivable'], current, 0.0), minlength=n)
+    buckets = np.bincount(portfolio * 3 + holdings['liquidity_bucket'], weights=current, minlength=3 * n)
+    liquid, semi_liquid, illiquid = buckets[LIQUID::3], buckets[SEMI_LIQUID::3], buckets[ILLIQUID::3]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(invested > 0, ((total - invested) / invested) * 100, 0.0)
+        liquidity_ratio = np.where(total > 0, liquid / total, 0.0)
+
+    aggregates = {
+        'total_asset_value': total,
+        'total_invested_value': invested,
+        'survivability_asset_value': survivability,
+        'portfolio_returns_pct': returns,
+        'num_assets': sizes,
+    }
+    aggregates.update(_type_breakdown(holdings, n))
+    aggregates.update(_highest_quantified(holdings, offsets, n))
+    aggregates.update({
+        'liquid_assets': liquid,
+        'semi_liquid_assets': semi_liquid,
+        'illiquid_assets': illiquid,
+        'liquidity_ratio': liquidity_ratio,
+    })
+    return aggregates
+
+
+def _type_breakdown(holdings: Mapping[str, np.ndarray], n: int) -> Dict[str, np.ndarray]:
+    """num_asset_types and the BREAKDOWN_FIELDS values of each portfolio"""
+    codes = holdings['type_code']
+    typed = codes >= 0
+    n_types = len(holdings['types'])
+    group = holdings['portfolio'][typed] * n_types + codes[typed]
+
+    # groupby sum, as the per-portfolio DataFrame groupby (compensated)
+    sums = pd.Series(holdings['current_value'][typed]).groupby(group).sum()
+    present = sums.index.to_numpy(dtype=np.int64)
+    values = sums.to_numpy()
+
+    breakdown = {'num_asset_types': np.bincount(present // max(n_types, 1), minlength=n)}
+    position = {t: j for j, t in enumerate(holdings['types'])}
+    for field, asset_type in BREAKDOWN_FIELDS.items():
+        column = np.zeros(n)
+        if asset_type in position:
+            rows = np.flatnonzero(present % n_types == position[asset_type])
+            column[present[rows] // n_types] = values[rows]
+        breakdown[field] = column
+    return breakdown
+
+
+def _highest_quantified(holdings: Mapping[str, np.ndarray], offsets: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+    """Largest positive quantified value per portfolio (first holding on ties)"""
+    portfolio = holdings['portfolio']
+    value = holdings['quantified_value']
+    candidate = np.where(value > 0, value, -np.inf)
+
+    highest = np.full(n, -np.inf)
+    filled = np.flatnonzero(offsets[1:] > offsets[:-1])
+    if len(filled):
+        highest[filled] = np.maximum.reduceat(candidate, offsets[filled])
+
+    index = np.full(n, -1, dtype=np.int64)
+    hits = np.flatnonzero((candidate == highest[portfolio]) & (candidate > 0))
+    owners, first = np.unique(portfolio[hits], return_index=True)
+    index[owners] = hits[first]
+    return {'highest_value': np.where(index >= 0, highest, 0.0), 'highest_index': index}
+
+
+def default_analysis(include_assets: bool = True) -> Dict:
+    """Analysis of a portfolio without assets"""
+    analysis = {
+        'total_asset_value': 0.0,
+        'total_invested_value': 0.0,
+        'survivability_asset_value': 0.0,
+        'portfolio_returns_pct': 0.0,
+        'num_assets': 0,
+        'num_asset_types': 0,
+        'highest_quantified_amount': {
+            'value': 0.0,
+            'asset_type': None,
+            'asset_name': None,
+            'subtype': None
+        },
+        'liquid_assets': 0.0,
+        'semi_liquid_assets': 0.0,
+        'illiquid_assets': 0.0,
+        'liquidity_ratio': 0.0,
+    }
+    analysis.update({field: 0.0 for field in BREAKDOWN_FIELDS})
+    if include_assets:
+        analysis['assets'] = []
+    return analysis
+
+
+def portfolio_analyses(portfolios: Sequence[List[Dict]], include_assets: bool = True) -> List[Dict]:
+    """
+    AssetAnalyzer.calculate_analysis() result of each portfolio.
+
+    Args:
+        portfolios: Per portfolio, asset dicts as AssetAnalyzer loads them
+        include_assets: Echo each portfolio's asset list under 'assets'
+            (the same list object); False leaves the key out
+    """
+    holdings = flatten_holdings(portfolios)
+    aggregates = compute_portfolio_aggregates(holdings)
+    columns = {name: values.tolist() for name, values in aggregates.items()}
+    assets = holdings['assets']
+
+    analyses = []
+    for i, portfolio_assets in enumerate(portfolios):
+        if not portfolio_assets:
+            analyses.append(default_analysis(include_assets))
+            continue
+
+        highest = assets[columns['highest_index'][i]] if columns['highest_index'][i] >= 0 else None
+        analysis = {
+            'total_asset_value': columns['total_asset_value'][i],
+            'total_invested_value': columns['total_invested_value'][i],
+            'survivability_asset_value': columns['survivability_asset_value'][i],
+            'portfolio_returns_pct': columns['portfolio_returns_pct'][i],
+            'num_assets': columns['num_assets'][i],
+            'num_asset_types': columns['num_asset_types'][i],
+
+            # Highest quantified amount
+            'highest_quantified_amount': {
+                'value': columns['highest_value'][i],
+                'asset_type': highest.get('type') if highest else None,
+                'asset_name': highest.get('name') if highest else None,
+                'subtype': highest.get('subtype') if highest else None
+            },
+
+            # Liquidity breakdown
+            'liquid_assets': columns['liquid_assets'][i],
+            'semi_liquid_assets': columns['semi_liquid_assets'][i],
+            'illiquid_assets': columns['illiquid_assets'][i],
+            'liquidity_ratio': columns['liquidity_ratio'][i],
+        }
+        # Asset type breakdown
+        analysis.update({field: columns[field][i] for field in BREAKDOWN_FIELDS})
+        if include_assets:
+            analysis['assets'] = portfolio_assets
+        analyses.append(analysis)
+    return analyses
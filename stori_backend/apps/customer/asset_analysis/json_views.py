@@ -9,10 +9,51 @@ from django.utils import timezone
 import logging
 
 from apps.authentication.authentication import APIKeyAuthentication
-from .analyzer import AssetAnalyzer
+from config.result_cache import cached_response
+from .analyzer import AssetAnalyzer, analyze_aa_batch
 
 logger = logging.getLogger(__name__)
 
+# Portfolios accepted per batch request
+MAX_BATCH_PORTFOLIOS = 1000
+
+
+def include_assets_param(request, default=True) -> bool:
+    """?include_assets=false leaves the asset list out of the analysis"""
+    value = request.query_params.get('include_assets')
+    if value is None:
+        return default
+    return str(value).lower() not in ('false', '0', 'no')
+
+
+def build_summary(analysis):
+    """Response summary of an AssetAnalyzer.calculate_analysis() result"""
+    return {
+        'total_assets': analysis['num_assets'],
+        'total_value': analysis['total_asset_value'],
+        'survivability_value': analysis['survivability_asset_value'],
+        'highest_asset': analysis['highest_quantified_amount'],
+        'liquidity_breakdown': {
+            'liquid': analysis['liquid_assets'],
+            'semi_liquid': analysis['semi_liquid_assets'],
+            'illiquid': analysis['illiquid_assets'],
+            'liquidity_ratio': analysis['liquidity_ratio']
+        },
+        'asset_type_breakdown': {
+            'stocks': analysis['stocks_value'],
+            'mutual_funds': analysis['mutual_funds_value'],
+            'fixed_deposits': analysis['fixed_deposits_value'],
+            'gold': analysis['gold_value'],
+            'real_estate': analysis['real_estate_value'],
+            'insurance': analysis['insurance_value'],
+            'provident_fund': analysis['provident_fund_value'],
+            'bonds': analysis['bonds_value'],
+            'nps': analysis['nps_value'],
+            'crypto': analysis['crypto_value']
+        },
+        'portfolio_returns_pct': analysis['portfolio_returns_pct']
+    }
+
 
 class AssetAnalysisJSONView(APIView):
     """
@@ -55,6 +96,18 @@ class AssetAnalysisJSONView(APIView):
     """
     
     def post(self, request):
+        """Serve repeated submissions of the same AA data from the result cache"""
+        include_assets = include_assets_param(request)
+        return cached_response(
+            request,
+            namespace='asset_analysis_json',
+            payload={'aa_data': request.data, 'include_assets': include_assets},
+            compute=lambda: self._analyze(request, include_assets),
+            code_modules=(__name__, 'apps.customer.asset_analysis.analyzer',
+                          'apps.customer.asset_analysis.holdings')
+        )
+    
+    def _analyze(self, request, include_assets=True):
         """
         Analyze assets from AA JSON data
         
@@ -96,34 +149,10 @@ class AssetAnalysisJSONView(APIView):
             analyzer.load_from_aa_json(aa_data)
             
             # Calculate analysis
-            analysis = analyzer.calculate_analysis()
+            analysis = analyzer.calculate_analysis(include_assets=include_assets)
             
             # Build summary
-            summary = {
-                'total_assets': analysis['num_assets'],
-                'total_value': analysis['total_asset_value'],
-                'survivability_value': analysis['survivability_asset_value'],
-                'highest_asset': analysis['highest_quantified_amount'],
-                'liquidity_breakdown': {
-                    'liquid': analysis['liquid_assets'],
-                    'semi_liquid': analysis['semi_liquid_assets'],
-                    'illiquid': analysis['illiquid_assets'],
-                    'liquidity_ratio': analysis['liquidity_ratio']
-                },
-                'asset_type_breakdown': {
-                    'stocks': analysis['stocks_value'],
-                    'mutual_funds': analysis['mutual_funds_value'],
-                    'fixed_deposits': analysis['fixed_deposits_value'],
-                    'gold': analysis['gold_value'],
-                    'real_estate': analysis['real_estate_value'],
-                    'insurance': analysis['insurance_value'],
-                    'provident_fund': analysis['provident_fund_value'],
-                    'bonds': analysis['bonds_value'],
-                    'nps': analysis['nps_value'],
-                    'crypto': analysis['crypto_value']
-                },
-                'portfolio_returns_pct': analysis['portfolio_returns_pct']
-            }
+            summary = build_summary(analysis)
             
             # Prepare response
             response_data = {
@@ -148,3 +177,77 @@ class AssetAnalysisJSONView(APIView):
                 'message': f'Asset analysis failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class AssetAnalysisJSONBatchView(APIView):
+    """
+    Batch JSON analysis: asset analyses for many portfolios in one call
+    All portfolios' holdings are aggregated together in one columnar pass
+    Requires X-API-Key header for authentication
+    """
+    authentication_classes = [APIKeyAuthentication]
+    
+    def post(self, request):
+        """
+        POST /api/customer/asset-analysis/analyze-json/batch/
+        
+        Request Body:
+        {
+            "portfolios": [
+                {"portfolio_id": "APP-1", "aa_data": {"demat": {...}, "mutual_funds": {...}}},
+                {"portfolio_id": "APP-2", "aa_data": {"FIPS": [...]}},
+                ...
+            ]
+        }
+        
+        Response data.results holds, in request order, each portfolio's
+        analysis and summary (as the single-portfolio endpoint). Asset lists
+        are left out unless ?include_assets=true.
+        """
+        portfolios = request.data.get('portfolios') if isinstance(request.data, dict) else None
+        if not isinstance(portfolios, list) or not portfolios:
+            return Response({
+                'success': False,
+                'message': 'Expected JSON object with a non-empty "portfolios" list'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(portfolios) > MAX_BATCH_PORTFOLIOS:
+            return Response({
+                'success': False,
+                'message': f'At most {MAX_BATCH_PORTFOLIOS} portfolios per request (got {len(portfolios)})'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        for i, portfolio in enumerate(portfolios):
+            if not isinstance(portfolio, dict) or not isinstance(portfolio.get('aa_data'), dict):
+                return Response({
+                    'success': False,
+                    'message': f'portfolios[{i}]: expected an object with an "aa_data" object'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            include_assets = include_assets_param(request, default=False)
+            analyses = analyze_aa_batch([p['aa_data'] for p in portfolios], include_assets=include_assets)
+            
+            results = [
+                {
+                    'portfolio_id': portfolio.get('portfolio_id', i),
+                    'analysis': analysis,
+                    'summary': build_summary(analysis),
+                }
+                for i, (portfolio, analysis) in enumerate(zip(portfolios, analyses))
+            ]
+            
+            logger.info(f"Batch asset analysis completed for {len(results)} portfolios")
+            
+            return Response({
+                'success': True,
+                'message': f'{len(results)} portfolios analyzed',
+                'data': {
+                    'results': results,
+                    'processed_at': timezone.now().isoformat()
+                }
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            logger.error(f"Batch asset analysis failed: {str(e)}", exc_info=True)
+            return Response({
+                'success': False,
+                'message': f'Asset analysis failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .analyzer import AssetAnalyzer, analyze_aa_batch
+from .json_views import AssetAnalysisJSONBatchView, AssetAnalysisJSONView
+
+
+def aa_payload(stocks=(), pf_balance=None, fd_amount=None):
+    """Standard-format AA JSON with demat holdings (value, quantity, ltp), an EPF and a bank FD"""
+    data = {'demat': {'holdings': [
+        {'companyName': f'Stock {i}', 'currentValue': value, 'quantity': quantity, 'ltp': ltp}
+        for i, (value, quantity, ltp) in enumerate(stocks)
+    ]}}
+    if pf_balance is not None:
+        data['provident_fund'] = {'pf_accounts': [{'type': 'EPF', 'currentBalance': pf_balance}]}
+    if fd_amount is not None:
+        data['fixed_deposits'] = [{'bank': 'SBI', 'maturityAmount': fd_amount, 'principal': fd_amount}]
+    return data
+
+
+def analyze(aa_data, include_assets=True):
+    analyzer = AssetAnalyzer()
+    analyzer.load_from_aa_json(aa_data)
+    return analyzer.calculate_analysis(include_assets=include_assets)
+
+
+class AssetAnalyzerTests(SimpleTestCase):
+
+    def test_aggregates_and_liquidity_buckets(self):
+        analysis = analyze(aa_payload(stocks=[(1000.0, 10, 120.0), (5000.0, 0, 0)],
+                                      pf_balance=20000.0, fd_amount=8000.0))
+
+        self.assertEqual(analysis['total_asset_value'], 34000.0)
+        # EPF is left out of survivability
+        self.assertEqual(analysis['survivability_asset_value'], 14000.0)
+        # Stock subtypes (NSE) and BANK_FD are unknown/7 days, EPF 60 days
+        self.assertEqual(analysis['liquid_assets'], 8000.0)
+        self.assertEqual(analysis['semi_liquid_assets'], 26000.0)
+        self.assertEqual(analysis['illiquid_assets'], 0.0)
+        self.assertEqual(analysis['stocks_value'], 6000.0)
+        self.assertEqual(analysis['provident_fund_value'], 20000.0)
+        self.assertEqual(analysis['num_asset_types'], 3)
+        self.assertEqual(len(analysis['assets']), 4)
+
+    def test_highest_quantified_amount_prices_stocks(self):
+        # 10 x 3000 beats the 25000 FD although its current value is lower
+        analysis = analyze(aa_payload(stocks=[(1000.0, 10, 3000.0)], fd_amount=25000.0))
+
+        self.assertEqual(analysis['highest_quantified_amount'], {
+            'value': 30000.0, 'asset_type': 'STOCKS', 'asset_name': 'Stock 0', 'subtype': 'NSE'
+        })
+
+    def test_include_assets_opt_out(self):
+        analysis = analyze(aa_payload(stocks=[(1000.0, 1, 1000.0)]), include_assets=False)
+
+        self.assertNotIn('assets', analysis)
+        self.assertEqual(analysis['num_assets'], 1)
+        self.assertNotIn('assets', analyze({}, include_assets=False))
+        self.assertEqual(analyze({})['assets'], [])
+
+    def test_batch_matches_per_portfolio_calls(self):
+        payloads = [
+            aa_payload(stocks=[(1000.0, 10, 120.0), (float('nan'), 5, 10.0)], pf_balance=20000.0),
+            {},
+            aa_payload(stocks=[(0.1, 0, 0)] * 50, fd_amount=0.2),
+            {'other_investments': {'investments': [{'type': 'NPS', 'currentValue': 50000},
+                                                   {'type': 'CRYPTO', 'currentValue': 700}]}},
+        ]
+
+        batch = analyze_aa_batch(payloads)
+
+        for payload, analysis in zip(payloads, batch):
+            self.assertEqual(str(analysis), str(analyze(payload)))
+
+
+class AssetAnalysisJSONBatchViewTests(SimpleTestCase):
+
+    def post(self, view, payload, query=''):
+        request = APIRequestFactory().post(f'/api/customer/asset-analysis/analyze-json/{query}', payload, format='json')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return view.as_view()(request)
+
+    def test_portfolios_analyzed_in_request_order(self):
+        response = self.post(AssetAnalysisJSONBatchView, {'portfolios': [
+            {'portfolio_id': 'A', 'aa_data': aa_payload(stocks=[(1000.0, 1, 1000.0)])},
+            {'aa_data': aa_payload(pf_balance=5000.0)},
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['data']['results']
+        self.assertEqual(first['portfolio_id'], 'A')
+        self.assertEqual(first['summary']['total_value'], 1000.0)
+        self.assertNotIn('assets', first['analysis'])
+        self.assertEqual(second['portfolio_id'], 1)
+        self.assertEqual(second['analysis']['survivability_asset_value'], 0.0)
+
+    def test_rejects_invalid_payloads(self):
+        self.assertEqual(self.post(AssetAnalysisJSONBatchView, {'portfolios': []}).status_code, 400)
+        self.assertEqual(self.post(AssetAnalysisJSONBatchView, {'portfolios': [{'aa_data': []}]}).status_code, 400)
+
+    @mock.patch('apps.customer.asset_analysis.json_views.cached_response',
+                side_effect=lambda request, compute, **kwargs: compute())
+    def test_single_portfolio_include_assets_param(self, _):
+        payload = aa_payload(stocks=[(1000.0, 1, 1000.0)])
+
+        with_assets = self.post(AssetAnalysisJSONView, payload).data['data']['analysis']
+        without = self.post(AssetAnalysisJSONView, payload, '?include_assets=false').data['data']['analysis']
+
+        self.assertEqual(len(with_assets['assets']), 1)
+        self.assertNotIn('assets', without)
@@ -2,11 +2,12 @@
 URLs for Asset Analysis API
 """
 from django.urls import path
-from .json_views import AssetAnalysisJSONView
+from .json_views import AssetAnalysisJSONBatchView, AssetAnalysisJSONView
 
 app_name = 'asset_analysis'
 
 urlpatterns = [
     path('analyze-json/', AssetAnalysisJSONView.as_view(), name='analyze_json'),
+    path('analyze-json/batch/', AssetAnalysisJSONBatchView.as_view(), name='analyze_json_batch'),
 ]
 
@@ -0,0 +1,369 @@
+"""
+Account Aggregator JSON normalizer
+
+Supported layouts are declared as data (where accounts live, where their
+transactions live, which field aliases mean what) and compiled once at import
+into gather functions. A payload is walked once, each field is gathered into
+a column, and typing, debit/credit classification and deduplication run
+vectorized over those columns.
+"""
+import re
+import logging
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# AA / FIU layout: banks[] -> accounts[] -> one of TRANSACTION_CONTAINERS.
+# Containers are tried in order; the first that yields transactions wins.
+TRANSACTION_CONTAINERS = (
+    ('fraud_analysis', '*', 'transactions'),
+    ('transactions',),
+)
+
+# Canonical field -> source keys. The first truthy alias wins.
+AA_TRANSACTION_FIELDS = {
+    'date': ('transaction_date', 'date', 'transaction_timestamp'),
+    'amount': ('amount',),
+    'narration': ('narration',),
+    'balance': ('balance',),
+    'category': ('category',),
+}
+REQUIRED_AA_FIELDS = ('date', 'amount')
+
+# Debit/credit classification: category substrings first, then narration keywords,
+# then the sign of the amount
+DEBIT_CATEGORIES = ('debit', 'withdrawal', 'payment', 'expense', 'charge', 'fee',
+                    'cash withdrawal', 'transfer to', 'interest paid', 'int.pd')
+CREDIT_CATEGORIES = ('credit', 'deposit', 'salary', 'income', 'refund',
+                     'cash deposit', 'transfer from', 'transfer in',
+                     'interest received', 'interest recd')
+DEBIT_NARRATION_KEYWORDS = ('paid', 'debit', 'withdrawal', 'payment', 'charge', 'fee', 'wdl', 'sent')
+CREDIT_NARRATION_KEYWORDS = ('credit', 'deposit', 'salary', 'income', 'refund', 'received', 'credited', 'dep')
+
+# Standard (non-AA) transaction payloads: canonical column -> accepted column names, in priority order
+COLUMN_ALIASES = {
+    'date': ['date', 'transaction_date', 'txn_date', 'transactionDate', 'TransactionDate', 'Date', 'DATE',
+             'TxnDate', 'TXN_DATE', 'trans_date', 'TransDate'],
+    'description': ['description', 'narration', 'desc', 'nar', 'Description', 'Narration', 'DESCRIPTION',
+                    'NARRATION', 'remarks', 'Remarks', 'detail', 'Detail', 'transaction_description',
+                    'transactionDescription', 'TransactionDescription', 'narration_text', 'NarrationText',
+                    'txn_desc', 'TxnDesc'],
+    'amount': ['amount', 'Amount', 'AMOUNT', 'transaction_amount', 'transactionAmount', 'amt', 'Amt',
+               'TransactionAmount', 'AMT', 'txn_amount', 'TxnAmount', 'value', 'Value', 'VALUE'],
+    'balance': ['balance', 'Balance', 'BALANCE', 'current_balance', 'currentBalance', 'bal', 'Bal',
+                'closing_balance', 'closingBalance', 'available_balance', 'availableBalance',
+                'CurrentBalance', 'BAL', 'ClosingBalance', 'running_balance', 'RunningBalance'],
+    'debit': ['debit', 'Debit', 'DEBIT', 'amount_dr', 'amountDr', 'dr', 'Dr', 'DR', 'withdrawal', 'Withdrawal',
+              'AmountDr', 'AMOUNT_DR', 'debit_amount', 'DebitAmount', 'withdraw', 'Withdraw', 'WITHDRAWAL'],
+    'credit': ['credit', 'Credit', 'CREDIT', 'amount_cr', 'amountCr', 'cr', 'Cr', 'CR', 'deposit', 'Deposit',
+               'AmountCr', 'AMOUNT_CR', 'credit_amount', 'CreditAmount', 'DEPOSIT', 'deposit_amount',
+               'DepositAmount'],
+    'category': ['category', 'Category', 'CATEGORY', 'type', 'Type', 'TYPE', 'transaction_type',
+                 'transactionType', 'txn_type', 'txnType', 'TransactionType', 'TXN_TYPE',
+                 'transaction_category', 'TransactionCategory', 'txn_category', 'TxnCategory'],
+}
+
+OUTPUT_COLUMNS = ['date', 'description', 'debit', 'credit', 'amount', 'balance',
+                  'category', 'account_id', 'bank_name']
+
+
+def _compile_container(path: Sequence[str]) -> Callable[[dict], List[dict]]:
+    """Turn ('fraud_analysis', '*', 'transactions') into account -> list of transactions"""
+    def gather(node):
+        nodes = [node]
+        for step in path:
+            if step == '*':
+                nodes = [item for n in nodes if isinstance(n, list) for item in n]
+            else:
+                nodes = [n.get(step) for n in nodes if isinstance(n, dict)]
+        rows = []
+        for n in nodes:
+            if isinstance(n, list):
+                rows.extend(n)
+        return rows
+    gather.path = '.'.join('[]' if step == '*' else step for step in path).replace('.[]', '[]')
+    return gather
+
+
+def _compile_field(aliases: Sequence[str], default='') -> Callable[[list, List[dict]], list]:
+    """
+    Build complete(values, rows) for one field: values holds the first alias
+    (None where absent); remaining aliases fill in falsy entries, in order
+    """
+    rest = aliases[1:]
+
+    def complete(values, rows):
+        if not rest:
+            return [default if value is None else value for value in values] if None in values else values
+        for position, alias in enumerate(rest, start=1):
+            missing = [i for i, value in enumerate(values) if not value]
+            if not missing:
+                break
+            is_last = position == len(rest)
+            for i in missing:
+                values[i] = rows[i].get(alias, default) if is_last else rows[i].get(alias)
+        return values
+    return complete
+
+
+def _gather_columns(rows: List[dict]) -> Tuple[List[dict], List[list]]:
+    """
+    One pass over the transactions producing a list per field
+
+    The common case (every transaction has the primary key of every field)
+    runs through C-level itemgetters, which allocate nothing per row;
+    otherwise rows are read with .get().
+    """
+    try:
+        columns = [list(map(getter, rows)) for getter in _PRIMARY_GETTERS]
+    except (KeyError, TypeError, AttributeError):
+        rows = [row for row in rows if isinstance(row, dict)]
+        columns = [[row.get(aliases[0]) for row in rows] for aliases in AA_TRANSACTION_FIELDS.values()]
+    return rows, [complete(values, rows) for complete, values in zip(_FIELDS, columns)]
+
+
+def _compile_keywords(keywords: Sequence[str]) -> re.Pattern:
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+_CONTAINERS = [_compile_container(path) for path in TRANSACTION_CONTAINERS]
+_FIELDS = [_compile_field(aliases) for aliases in AA_TRANSACTION_FIELDS.values()]
+_PRIMARY_GETTERS = [itemgetter(aliases[0]) for aliases in AA_TRANSACTION_FIELDS.values()]
+_DEBIT_CATEGORY_RE = _compile_keywords(DEBIT_CATEGORIES)
+_CREDIT_CATEGORY_RE = _compile_keywords(CREDIT_CATEGORIES)
+_DEBIT_NARRATION_RE = _compile_keywords(DEBIT_NARRATION_KEYWORDS)
+_CREDIT_NARRATION_RE = _compile_keywords(CREDIT_NARRATION_KEYWORDS)
+
+
+def _factorize(values: list) -> Tuple[np.ndarray, np.ndarray]:
+    """(codes, distinct values); None is kept as a value of its own"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return pd.factorize(array, use_na_sentinel=False)
+
+
+def _search(values: Sequence[str], pattern: re.Pattern) -> np.ndarray:
+    return np.fromiter((pattern.search(v) is not None for v in values), dtype=bool, count=len(values))
+
+
+def _date_part(value):
+    """'2024-01-15 10:30:00' -> '2024-01-15'; other values unchanged"""
+    if isinstance(value, str) and ' ' in value:
+        return value.split()[0]
+    return value
+
+
+def _to_float(values: list) -> np.ndarray:
+    """Numeric column; non-numeric and missing values become NaN"""
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return pd.to_numeric(pd.Series(array), errors='coerce').to_numpy(dtype=float)
+
+
+def _first_occurrences(date_values, date_codes, narration_codes, account_idx, amount, balance) -> np.ndarray:
+    """
+    Mask of rows whose (date, amount, narration, balance, account) key was not seen before
+
+    Categorical parts are packed into one int64 and floats compared by bit
+    pattern (after folding -0.0 into 0.0). Rows are hashed in one vectorized
+    pass; only rows sharing a hash are compared exactly, so a hash collision
+    can never drop a transaction.
+    """
+    if len(date_codes) == 0:
+        return np.ones(0, dtype=bool)
+    date_keys = pd.factorize(date_values, use_na_sentinel=False)[0]
+    packed = date_keys[date_codes].astype(np.int64)
+    packed = packed * (int(narration_codes.max()) + 1) + narration_codes
+    packed = packed * (int(account_idx.max()) + 1) + account_idx
+    keys = pd.DataFrame({
+        'packed': packed,
+        'amount': (amount + 0.0).view(np.int64),
+        'balance': (balance + 0.0).view(np.int64),
+    })
+
+    keep = np.ones(len(keys), dtype=bool)
+    shared_hash = pd.util.hash_pandas_object(keys, index=False).duplicated(keep=False).to_numpy()
+    if shared_hash.any():
+        candidates = np.flatnonzero(shared_hash)
+        repeated = keys.iloc[candidates].duplicated(keep='first').to_numpy()
+        keep[candidates[repeated]] = False
+    return keep
+
+
+def _holder_name(account: dict) -> str:
+    holders = (account.get('customer_info') or {}).get('holders')
+    return holders[0].get('name', '') if holders else ''
+
+
+def _describe_account(bank_index: int, account_index: int) -> str:
+    return f"banks[{bank_index}].accounts[{account_index}]"
+
+
+def normalize_aa_payload(data: dict) -> Tuple[Optional[pd.DataFrame], Optional[Dict], List[str]]:
+    """
+    Normalize an Account Aggregator payload into one transactions DataFrame
+
+    Args:
+        data: Parsed AA JSON ({"banks": [{"bank": ..., "accounts": [...]}]})
+
+    Returns:
+        (transactions_df, account_info, diagnostics)
+        transactions_df has OUTPUT_COLUMNS; it is None (with account_info None)
+        when the payload is not in AA format. diagnostics lists layout problems
+        found on the way (accounts without a known transaction container,
+        transactions missing required fields, unparseable amounts).
+    """
+    diagnostics = []
+    if not isinstance(data, dict) or 'banks' not in data:
+        keys = sorted(data)[:20] if isinstance(data, dict) else []
+        diagnostics.append(f"Not Account Aggregator format: no 'banks' key (top-level keys: {keys})")
+        return None, None, diagnostics
+
+    columns = {name: [] for name in AA_TRANSACTION_FIELDS}
+    bank_names, account_numbers, counts = [], [], []
+    all_accounts = []
+
+    banks = data.get('banks') or []
+    if not isinstance(banks, list):
+        diagnostics.append(f"'banks' should be a list, got {type(banks).__name__}")
+        banks = []
+
+    for bank_index, bank in enumerate(banks):
+        bank_name = bank.get('bank', 'Unknown Bank')
+
+        for account_index, account in enumerate(bank.get('accounts', [])):
+            account_num = account.get('account_number', '')
+            all_accounts.append({
+                'account_number': account_num,
+                'bank_name': bank_name,
+                'ifsc': account.get('ifsc_code', ''),
+                'holder_name': _holder_name(account)
+            })
+
+            rows = []
+            for container in _CONTAINERS:
+                rows = container(account)
+                if rows:
+                    break
+            if not rows:
+                diagnostics.append(
+                    f"{_describe_account(bank_index, account_index)}: no transactions in any known "
+                    f"container ({', '.join(c.path for c in _CONTAINERS)}); "
+                    f"account keys: {sorted(account)[:20]}"
+                )
+                continue
+
+            rows, gathered = _gather_columns(rows)
+            sample = rows[0] if rows else {}
+            for field in REQUIRED_AA_FIELDS:
+                if not any(alias in sample for alias in AA_TRANSACTION_FIELDS[field]):
+                    diagnostics.append(
+                        f"{_describe_account(bank_index, account_index)}: transactions have no '{field}' "
+                        f"field (expected one of {list(AA_TRANSACTION_FIELDS[field])}); "
+                        f"transaction keys: {sorted(sample)[:20]}"
+                    )
+
+            for name, values in zip(AA_TRANSACTION_FIELDS, gathered):
+                columns[name].extend(values)
+            bank_names.append(bank_name)
+            account_numbers.append(account_num)
+            counts.append(len(rows))
+
+    account_info = dict(all_accounts[0]) if all_accounts else {}
+    if len(all_accounts) > 1:
+        account_info['multiple_accounts'] = True
+        account_info['total_accounts'] = len(all_accounts)
+        account_info['all_accounts'] = all_accounts
+        account_info['bank_name'] = ', '.join(dict.fromkeys(acc['bank_name'] for acc in all_accounts))
+    else:
+        account_info['multiple_accounts'] = False
+        account_info['total_accounts'] = 1
+
+    counts = np.asarray(counts, dtype=np.int64)
+    # Accounts listed twice under the same bank share one dedup scope
+    account_codes, account_keys = pd.factorize(
+        pd.Series([f"{bank}\x1f{number}" for bank, number in zip(bank_names, account_numbers)], dtype=object)
+    )
+    account_idx = np.repeat(account_codes, counts)
+    account_ids = np.asarray([f"{bank}_{number}" for bank, number in zip(bank_names, account_numbers)], dtype=object)
+
+    # String columns repeat heavily, so work on distinct values and expand by code
+    date_codes, date_values = _factorize(columns['date'])
+    date_values = np.array([_date_part(value) for value in date_values], dtype=object)
+    narration_codes, narration_values = _factorize(columns['narration'])
+    narration_values = np.array([str(value) for value in narration_values], dtype=object)
+    narration_lower = [value.lower() for value in narration_values]
+    category_codes, category_values = _factorize(columns['category'])
+    category_values = np.array([str(value).lower() for value in category_values], dtype=object)
+
+    amount = _to_float(columns['amount'])
+    invalid_amounts = int(np.isnan(amount).sum())
+    if invalid_amounts:
+        diagnostics.append(f"{invalid_amounts} transaction(s) have a missing or non-numeric amount; treated as 0")
+        amount = np.nan_to_num(amount, nan=0.0)
+    balance_raw = _to_float(columns['balance'])
+
+    # Same transaction reported twice for the same account (e.g. overlapping fetches).
+    # Dates are compared after trimming the time part, as distinct raw values can collapse.
+    keep = _first_occurrences(date_values, date_codes, narration_codes, account_idx, amount, balance_raw)
+    if not keep.all():
+        date_codes, narration_codes, category_codes = date_codes[keep], narration_codes[keep], category_codes[keep]
+        amount, balance_raw = amount[keep], balance_raw[keep]
+        account_rows = np.repeat(np.arange(len(counts)), counts)[keep]
+    else:
+        account_rows = np.repeat(np.arange(len(counts)), counts)
+
+    category_debit = _search(category_values, _DEBIT_CATEGORY_RE)[category_codes]
+    category_credit = _search(category_values, _CREDIT_CATEGORY_RE)[category_codes]
+    narration_debit = _search(narration_lower, _DEBIT_NARRATION_RE)[narration_codes]
+    narration_credit = _search(narration_lower, _CREDIT_NARRATION_RE)[narration_codes]
+
+    unclassified = ~category_debit & ~category_credit
+    is_debit = category_debit | (unclassified & (
+        narration_debit | (~narration_credit & (amount < 0))
+    ))
+    magnitude = np.abs(amount)
+
+    df = pd.DataFrame({
+        'date': date_values[date_codes],
+        'description': narration_values[narration_codes],
+        'debit': np.where(is_debit, magnitude, 0.0),
+        'credit': np.where(is_debit, 0.0, magnitude),
+        'amount': magnitude,
+        'balance': np.nan_to_num(balance_raw, nan=0.0),
+        'category': category_values[category_codes],
+        'account_id': account_ids[account_rows],
+        'bank_name': np.asarray(bank_names, dtype=object)[account_rows],
+    }, columns=OUTPUT_COLUMNS, copy=False)
+
+    if diagnostics:
+        logger.info(f"AA normalization diagnostics: {diagnostics}")
+    return df, account_info, diagnostics
+
+
+def normalize_column_aliases(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add canonical columns (date, description, amount, balance, debit, credit,
+    category) from the first matching alias in COLUMN_ALIASES. Original
+    columns are kept. Without any amount alias, amount = debit + credit.
+    """
+    present = set(df.columns)
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if canonical in present:
+            continue
+        source = next((alias for alias in aliases if alias in present), None)
+        if source is not None:
+            df[canonical] = df[source]
+        elif canonical == 'amount' and 'debit' in present and 'credit' in present:
+            df['amount'] = df['debit'].fillna(0) + df['credit'].fillna(0)
+        else:
+            continue
+        present.add(canonical)
+    return df
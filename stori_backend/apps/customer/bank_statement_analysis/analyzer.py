@@ -21,6 +21,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
 
+from .date_parsing import get_date_parser
+
 # Suppress pandas performance warnings for production
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 
@@ -333,12 +335,16 @@ def _process_chunk(df: pd.DataFrame, account_id: str, debug: bool = False) -> pd
         print(f"  Sample dates: {df['txn_date'].head(3).tolist()}")
     
     # Date parsing with multiple format attempts
-    df['txn_date'] = _parse_dates_robust(df['txn_date'])
+    date_report = {}
+    df['txn_date'] = _parse_dates_robust(df['txn_date'], date_report)
     
     if debug:
         print(f"\n[DEBUG] After date parsing:")
         print(f"  Sample dates: {df['txn_date'].head(3).tolist()}")
         print(f"  Null dates: {df['txn_date'].isnull().sum()}")
+        print(f"  Date format: {date_report.get('format')} "
+              f"(other formats: {date_report.get('other_formats', 0)}, "
+              f"ambiguous day/month: {date_report.get('ambiguous', 0)})")
     
     # Amount cleaning and validation
     # Handle formats like "72.0(Dr)", "4784.4(Cr)", "1,234.50", etc.
@@ -442,35 +448,15 @@ def _process_chunk(df: pd.DataFrame, account_id: str, debug: bool = False) -> pd
     return df
 
 
-def _parse_dates_robust(date_series: pd.Series) -> pd.Series:
+def _parse_dates_robust(date_series: pd.Series, report: Optional[Dict] = None) -> pd.Series:
     """
     Parse dates with multiple format attempts for Indian bank statements.
-    """
-    # Try pandas default parsing first
-    parsed = pd.to_datetime(date_series, errors='coerce')
-    
-    # If many failures, try common Indian formats
-    if parsed.isnull().sum() > len(date_series) * 0.1:
-        formats_to_try = [
-            '%d-%m-%Y',  # 31-12-2023
-            '%d/%m/%Y',  # 31/12/2023
-            '%d-%m-%y',  # 31-12-23
-            '%d/%m/%y',  # 31/12/23
-            '%Y-%m-%d',  # 2023-12-31
-            '%d.%m.%Y',  # 31.12.2023
-            '%d %b %Y',  # 31 Dec 2023
-            '%d-%b-%Y',  # 31-Dec-2023
-        ]
-        
-        for fmt in formats_to_try:
-            try:
-                parsed_attempt = pd.to_datetime(date_series, format=fmt, errors='coerce')
-                if parsed_attempt.isnull().sum() < parsed.isnull().sum():
-                    parsed = parsed_attempt
-            except:
-                continue
     
-    return parsed
+    The format is inferred once from the leading values and every distinct
+    string is parsed once with exact formats (see date_parsing.DateParser);
+    `report` receives the format used and the number of ambiguous values.
+    """
+    return get_date_parser().parse(date_series, report)
 
 
 def _remove_outliers(df: pd.DataFrame, column: str, threshold: float = OUTLIER_STD_THRESHOLD) -> pd.DataFrame:
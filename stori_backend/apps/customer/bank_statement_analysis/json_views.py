@@ -8,9 +8,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.utils import timezone
+import numpy as np
 import pandas as pd
 import json
 
+from config.result_cache import cached_response
+from .aa_normalizer import normalize_aa_payload, normalize_column_aliases
+from .date_parsing import get_date_parser
+
 from .analyzer import (
     compute_core_features, compute_behaviour_features,
     compute_advanced_features, compute_impulse_behavioral_features,
@@ -61,156 +66,16 @@ def extract_transactions_from_aa_format(data):
         ]
     }
     
+    Supported layouts and field aliases are declared in aa_normalizer.py.
+    
     Returns:
         List of transactions in standard format
         Account info dict
     """
-    transactions = []
-    account_info = {}
-    seen_transactions = set()  # For deduplication
-    
-    # Check if this is AA format
-    if 'banks' not in data:
+    df, account_info, _ = normalize_aa_payload(data)
+    if df is None:
         return None, None
-    
-    # Track all accounts for multi-account support
-    all_accounts = []
-    
-    # Extract from all banks and accounts
-    for bank in data.get('banks', []):
-        bank_name = bank.get('bank', 'Unknown Bank')
-        
-        for account in bank.get('accounts', []):
-            account_num = account.get('account_number', '')
-            account_ifsc = account.get('ifsc_code', '')
-            holder_name = account.get('customer_info', {}).get('holders', [{}])[0].get('name', '') if account.get('customer_info', {}).get('holders') else ''
-            
-            # Store account info for each account
-            all_accounts.append({
-                'account_number': account_num,
-                'bank_name': bank_name,
-                'ifsc': account_ifsc,
-                'holder_name': holder_name
-            })
-            
-            # Extract account info from first account (for backward compatibility)
-            if not account_info:
-                account_info = {
-                    'account_number': account_num,
-                    'bank_name': bank_name,
-                    'ifsc': account_ifsc,
-                    'holder_name': holder_name
-                }
-            
-            # Extract transactions from fraud_analysis OR transactions array
-            # Some formats have transactions directly in account
-            account_transactions = []
-            
-            # Method 1: Check fraud_analysis
-            for fraud_item in account.get('fraud_analysis', []):
-                account_transactions.extend(fraud_item.get('transactions', []))
-            
-            # Method 2: Check direct transactions array (if fraud_analysis not present)
-            if not account_transactions:
-                account_transactions = account.get('transactions', [])
-            
-            for txn in account_transactions:
-                    # Create unique key for deduplication
-                    # Handle different date field names: transaction_date, date, transaction_timestamp
-                    txn_date = txn.get('transaction_date') or txn.get('date') or txn.get('transaction_timestamp', '')
-                    if isinstance(txn_date, str) and ' ' in txn_date:
-                        txn_date = txn_date.split()[0]  # Extract date part if timestamp
-                    
-                    # Include bank and account in key to avoid false duplicates between different accounts
-                    txn_key = (
-                        txn_date,
-                        txn.get('amount'),
-                        txn.get('narration', ''),
-                        txn.get('balance'),
-                        bank_name,  # Include bank name to distinguish between accounts
-                        account_num  # Include account number
-                    )
-                    
-                    if txn_key in seen_transactions:
-                        continue
-                    seen_transactions.add(txn_key)
-                    
-                    # Convert to standard format
-                    amount = float(txn.get('amount', 0))
-                    category = str(txn.get('category', '')).lower()
-                    narration = str(txn.get('narration', ''))
-                    
-                    # Handle different date field names
-                    txn_date = txn.get('transaction_date') or txn.get('date') or txn.get('transaction_timestamp', '')
-                    if isinstance(txn_date, str) and ' ' in txn_date:
-                        txn_date = txn_date.split()[0]  # Extract date part if timestamp
-                    
-                    # Determine debit/credit based on category and narration
-                    debit = 0.0
-                    credit = 0.0
-                    
-                    # Check category first
-                    debit_categories = ['debit', 'withdrawal', 'payment', 'expense', 'charge', 'fee', 
-                                       'cash withdrawal', 'transfer to', 'interest paid', 'int.pd']
-                    credit_categories = ['credit', 'deposit', 'salary', 'income', 'refund', 
-                                        'cash deposit', 'transfer from', 'transfer in', 
-                                        'interest received', 'interest recd']
-                    
-                    if any(dc in category for dc in debit_categories):
-                        debit = abs(amount)
-                    elif any(cc in category for cc in credit_categories):
-                        credit = abs(amount)
-                    else:
-                        # Check narration
-                        narration_lower = narration.lower()
-                        if any(kw in narration_lower for kw in ['paid', 'debit', 'withdrawal', 'payment', 'charge', 'fee', 'wdl', 'sent']):
-                            debit = abs(amount)
-                        elif any(kw in narration_lower for kw in ['credit', 'deposit', 'salary', 'income', 'refund', 'received', 'credited', 'dep']):
-                            credit = abs(amount)
-                        else:
-                            # Default: positive amount = credit, negative = debit
-                            if amount < 0:
-                                debit = abs(amount)
-                            else:
-                                credit = abs(amount)
-                    
-                    # Create amount field - use the larger of debit or credit
-                    # This helps with compatibility with code that expects amount
-                    amount_value = max(debit, credit) if (debit > 0 or credit > 0) else abs(amount)
-                    
-                    standard_txn = {
-                        'date': txn_date,
-                        'description': narration,
-                        'debit': debit,
-                        'credit': credit,
-                        'amount': amount_value,  # Add amount field for compatibility
-                        'balance': float(txn.get('balance', 0)) if txn.get('balance') else 0.0,
-                        'category': category
-                    }
-                    
-                    # Add account identifier to transaction for multi-account tracking
-                    standard_txn['account_id'] = f"{bank_name}_{account_num}"
-                    standard_txn['bank_name'] = bank_name
-                    
-                    transactions.append(standard_txn)
-    
-    # If multiple accounts found, update account_info to reflect this
-    if len(all_accounts) > 1:
-        # Keep first account as primary, but add multi-account info
-        account_info['multiple_accounts'] = True
-        account_info['total_accounts'] = len(all_accounts)
-        account_info['all_accounts'] = all_accounts
-        # Combine bank names
-        bank_names = list(set([acc['bank_name'] for acc in all_accounts]))
-        if len(bank_names) > 1:
-            account_info['bank_name'] = ', '.join(bank_names)  # Show all banks
-        else:
-            account_info['bank_name'] = bank_names[0] if bank_names else account_info.get('bank_name', '')
-    else:
-        account_info['multiple_accounts'] = False
-        account_info['total_accounts'] = 1
-    
-    return transactions, account_info
+    return df.to_dict('records'), account_info
 
 
 class BankStatementJSONAnalysisView(APIView):
@@ -221,6 +86,23 @@ class BankStatementJSONAnalysisView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        """Serve repeated submissions of the same statement from the result cache"""
+        return cached_response(
+            request,
+            namespace='bank_statement_json',
+            payload=request.data,
+            compute=lambda: self._analyze(request),
+            code_modules=(
+                __name__,
+                'apps.customer.bank_statement_analysis.aa_normalizer',
+                'apps.customer.bank_statement_analysis.analyzer',
+                'apps.customer.bank_statement_analysis.date_parsing',
+                'apps.customer.credit_report_analysis.liability_detector',
+                'apps.customer.credit_report_analysis.recurring_payments',
+            )
+        )
+    
+    def _analyze(self, request):
         """
         Analyze bank statement from JSON data
         
@@ -257,37 +139,38 @@ class BankStatementJSONAnalysisView(APIView):
             # Extract transactions - try standard format first
             transactions = data.get('transactions', [])
             account_info = data.get('account_info', {})
+            df = None
             
             # If no transactions in standard format, try Account Aggregator format
             if not transactions:
-                aa_transactions, aa_account_info = extract_transactions_from_aa_format(data)
-                if aa_transactions is not None:  # None means not AA format, [] means AA format but no transactions
-                    transactions = aa_transactions
-                    if aa_account_info:
-                        account_info = aa_account_info
-                elif 'banks' in data:
-                    # It's AA format but no transactions found
+                aa_df, aa_account_info, diagnostics = normalize_aa_payload(data)
+                if aa_df is None or len(aa_df) == 0:
+                    if aa_df is not None:
+                        message = ('Account Aggregator format detected but no transactions found '
+                                   'in fraud_analysis or transactions sections')
+                    else:
+                        message = ('No transactions found in JSON data. Expected either: 1) top-level "transactions" array, '
+                                   'or 2) Account Aggregator format with "banks" -> "accounts" -> "fraud_analysis" -> "transactions"')
                     return Response({
                         'success': False,
-                        'message': 'Account Aggregator format detected but no transactions found in fraud_analysis sections'
+                        'message': message,
+                        'diagnostics': diagnostics
                     }, status=status.HTTP_400_BAD_REQUEST)
-            
-            if not transactions:
-                return Response({
-                    'success': False,
-                    'message': 'No transactions found in JSON data. Expected either: 1) top-level "transactions" array, or 2) Account Aggregator format with "banks" -> "accounts" -> "fraud_analysis" -> "transactions"'
-                }, status=status.HTTP_400_BAD_REQUEST)
+                df = aa_df
+                if aa_account_info:
+                    account_info = aa_account_info
             
             # Convert to DataFrame - ensure clean data structure
-            try:
-                df = pd.DataFrame(transactions)
-                # Reset index to avoid any index conflicts
-                df = df.reset_index(drop=True)
-            except Exception as e:
-                return Response({
-                    'success': False,
-                    'message': f'Failed to create DataFrame from transactions: {str(e)}. Please check transaction data format.'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            if df is None:
+                try:
+                    df = pd.DataFrame(transactions)
+                    # Reset index to avoid any index conflicts
+                    df = df.reset_index(drop=True)
+                except Exception as e:
+                    return Response({
+                        'success': False,
+                        'message': f'Failed to create DataFrame from transactions: {str(e)}. Please check transaction data format.'
+                    }, status=status.HTTP_400_BAD_REQUEST)
             
             # Remove any duplicate columns (pandas can create these in some cases)
             df = df.loc[:, ~df.columns.duplicated()]
@@ -318,119 +201,8 @@ class BankStatementJSONAnalysisView(APIView):
                         print(f"[DEBUG] Removed {initial_count - len(df)} duplicate transactions")
             
             # Normalize column names - support multiple formats
-            # Check for ALL possible column name variations and create unified columns
-            # Keep original columns, just add normalized ones (don't replace)
-            
-            # Date column variations - check all possibilities
-            date_columns = ['date', 'transaction_date', 'txn_date', 'transactionDate', 'TransactionDate', 'Date', 'DATE', 
-                          'transactionDate', 'TxnDate', 'TXN_DATE', 'trans_date', 'TransDate']
-            date_col = None
-            # Check all variations, prioritize exact match 'date' first
-            for col in date_columns:
-                if col in df.columns:
-                    date_col = col
-                    break
-            
-            # Create normalized 'date' column only if it doesn't exist and we found a variation
-            if 'date' not in df.columns and date_col:
-                df['date'] = df[date_col]
-            elif date_col and date_col != 'date' and 'date' not in df.columns:
-                df['date'] = df[date_col]
-            
-            # Description/Narration column variations - check all possibilities
-            desc_columns = ['description', 'narration', 'desc', 'nar', 'Description', 'Narration', 'DESCRIPTION', 'NARRATION', 
-                          'remarks', 'Remarks', 'detail', 'Detail', 'transaction_description', 'transactionDescription',
-                          'TransactionDescription', 'NARRATION', 'narration_text', 'NarrationText', 'txn_desc', 'TxnDesc']
-            desc_col = None
-            for col in desc_columns:
-                if col in df.columns:
-                    desc_col = col
-                    break
-            
-            # Create normalized 'description' column only if it doesn't exist
-            if 'description' not in df.columns and desc_col:
-                df['description'] = df[desc_col]
-            elif desc_col and desc_col != 'description' and 'description' not in df.columns:
-                df['description'] = df[desc_col]
-            
-            # Amount column variations - check all possibilities
-            amount_columns = ['amount', 'Amount', 'AMOUNT', 'transaction_amount', 'transactionAmount', 'amt', 'Amt',
-                           'TransactionAmount', 'AMT', 'txn_amount', 'TxnAmount', 'value', 'Value', 'VALUE']
-            amount_col = None
-            for col in amount_columns:
-                if col in df.columns:
-                    amount_col = col
-                    break
-            
-            # Create normalized 'amount' column only if it doesn't exist
-            if 'amount' not in df.columns:
-                if amount_col:
-                    df['amount'] = df[amount_col]
-                elif 'debit' in df.columns and 'credit' in df.columns:
-                    # If we have debit/credit but no amount, create amount from them
-                    df['amount'] = df['debit'].fillna(0) + df['credit'].fillna(0)
-            
-            # Balance column variations - check all possibilities
-            balance_columns = ['balance', 'Balance', 'BALANCE', 'current_balance', 'currentBalance', 'bal', 'Bal', 
-                             'closing_balance', 'closingBalance', 'available_balance', 'availableBalance',
-                             'CurrentBalance', 'BAL', 'closingBalance', 'ClosingBalance', 'running_balance', 'RunningBalance']
-            balance_col = None
-            for col in balance_columns:
-                if col in df.columns:
-                    balance_col = col
-                    break
-            
-            # Create normalized 'balance' column only if it doesn't exist
-            if 'balance' not in df.columns and balance_col:
-                df['balance'] = df[balance_col]
-            elif balance_col and balance_col != 'balance' and 'balance' not in df.columns:
-                df['balance'] = df[balance_col]
-            
-            # Debit column variations - check all possibilities
-            debit_columns = ['debit', 'Debit', 'DEBIT', 'amount_dr', 'amountDr', 'dr', 'Dr', 'DR', 'withdrawal', 'Withdrawal',
-                           'AmountDr', 'AMOUNT_DR', 'debit_amount', 'DebitAmount', 'withdraw', 'Withdraw', 'WITHDRAWAL']
-            debit_col = None
-            for col in debit_columns:
-                if col in df.columns:
-                    debit_col = col
-                    break
-            
-            # Create normalized 'debit' column only if it doesn't exist
-            if 'debit' not in df.columns and debit_col:
-                df['debit'] = df[debit_col]
-            elif debit_col and debit_col != 'debit' and 'debit' not in df.columns:
-                df['debit'] = df[debit_col]
-            
-            # Credit column variations - check all possibilities
-            credit_columns = ['credit', 'Credit', 'CREDIT', 'amount_cr', 'amountCr', 'cr', 'Cr', 'CR', 'deposit', 'Deposit',
-                            'AmountCr', 'AMOUNT_CR', 'credit_amount', 'CreditAmount', 'DEPOSIT', 'deposit_amount', 'DepositAmount']
-            credit_col = None
-            for col in credit_columns:
-                if col in df.columns:
-                    credit_col = col
-                    break
-            
-            # Create normalized 'credit' column only if it doesn't exist
-            if 'credit' not in df.columns and credit_col:
-                df['credit'] = df[credit_col]
-            elif credit_col and credit_col != 'credit' and 'credit' not in df.columns:
-                df['credit'] = df[credit_col]
-            
-            # Category column variations - check all possibilities
-            category_columns = ['category', 'Category', 'CATEGORY', 'type', 'Type', 'TYPE', 'transaction_type', 
-                              'transactionType', 'txn_type', 'txnType', 'TransactionType', 'TXN_TYPE',
-                              'transaction_category', 'TransactionCategory', 'txn_category', 'TxnCategory']
-            category_col = None
-            for col in category_columns:
-                if col in df.columns:
-                    category_col = col
-                    break
-            
-            # Create normalized 'category' column only if it doesn't exist
-            if 'category' not in df.columns and category_col:
-                df['category'] = df[category_col]
-            elif category_col and category_col != 'category' and 'category' not in df.columns:
-                df['category'] = df[category_col]
+            # Keep original columns, just add normalized ones (see COLUMN_ALIASES)
+            df = normalize_column_aliases(df)
             
             # Handle amount-based format (single amount column instead of separate debit/credit)
             # Check if we need to derive debit/credit from amount column
@@ -507,21 +279,18 @@ class BankStatementJSONAnalysisView(APIView):
                     df.loc[unclassified & category_credit, 'is_debit'] = False
                 
                 # Ensure no transaction is both debit and credit
-                df.loc[df['is_debit'] & df['is_credit'], 'credit'] = False
                 df.loc[df['is_debit'] & df['is_credit'], 'is_credit'] = False
                 
                 # Create signed amount: negative for debit, positive for credit
                 # This is what the user wants - debit as minus, credit as plus
-                df['amount_signed'] = df.apply(
-                    lambda row: -abs(row['amount']) if row['is_debit'] else abs(row['amount']), 
-                    axis=1
-                )
+                magnitude = df['amount'].abs()
+                df['amount_signed'] = np.where(df['is_debit'], -magnitude, magnitude)
                 
                 # Create debit and credit columns (positive values for analyzer compatibility)
                 if 'debit' not in df.columns:
-                    df['debit'] = df.apply(lambda row: abs(row['amount']) if row['is_debit'] else 0, axis=1)
+                    df['debit'] = np.where(df['is_debit'], magnitude, 0)
                 if 'credit' not in df.columns:
-                    df['credit'] = df.apply(lambda row: abs(row['amount']) if row['is_credit'] else 0, axis=1)
+                    df['credit'] = np.where(df['is_credit'], magnitude, 0)
             else:
                 # We have separate debit/credit columns, ensure they're numeric
                 if 'debit' in df.columns:
@@ -564,7 +333,7 @@ class BankStatementJSONAnalysisView(APIView):
                     df['amount_signed'] = 0
             
             # Convert date column
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            df['date'] = get_date_parser().parse(df['date'])
             df = df.dropna(subset=['date'])
             
             # Filter out invalid dates (before 2000 or after today)
@@ -645,27 +414,27 @@ class BankStatementJSONAnalysisView(APIView):
                 # Use .copy() to avoid conflicts when assigning to existing columns
                 df = df.copy()
                 df['amount'] = df['amount_signed'].abs()  # Absolute value for amount
-                df['type'] = df['amount_signed'].apply(lambda x: 'DR' if x < 0 else 'CR')
+                df['type'] = np.where(df['amount_signed'] < 0, 'DR', 'CR')
                 # Ensure amount_dr and amount_cr exist for analyzer
                 if 'amount_dr' not in df.columns:
-                    df['amount_dr'] = df.apply(lambda row: abs(row['amount_signed']) if row['amount_signed'] < 0 else 0, axis=1)
+                    df['amount_dr'] = np.where(df['amount_signed'] < 0, df['amount'], 0)
                 if 'amount_cr' not in df.columns:
-                    df['amount_cr'] = df.apply(lambda row: abs(row['amount_signed']) if row['amount_signed'] > 0 else 0, axis=1)
+                    df['amount_cr'] = np.where(df['amount_signed'] > 0, df['amount'], 0)
             else:
                 # Original format with separate debit/credit columns
                 # Use .copy() to avoid conflicts when assigning to existing columns
                 df = df.copy()
                 if 'amount_cr' in df.columns and 'amount_dr' in df.columns:
                     df['amount'] = df['amount_cr'].where(df['amount_cr'] > 0, df['amount_dr'])
-                    df['type'] = df['amount_cr'].apply(lambda x: 'CR' if x > 0 else 'DR')
+                    df['type'] = np.where(df['amount_cr'] > 0, 'CR', 'DR')
                 elif 'amount' in df.columns:
                     # Fallback: use amount column if debit/credit not available
                     # Convert to numeric first, then process
                     amount_series = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
-                    df['type'] = amount_series.apply(lambda x: 'CR' if x > 0 else 'DR')
+                    df['type'] = np.where(amount_series > 0, 'CR', 'DR')
                     df['amount'] = amount_series.abs()
-                    df['amount_dr'] = df.apply(lambda row: abs(row['amount']) if row['type'] == 'DR' else 0, axis=1)
-                    df['amount_cr'] = df.apply(lambda row: abs(row['amount']) if row['type'] == 'CR' else 0, axis=1)
+                    df['amount_dr'] = np.where(df['type'] == 'DR', df['amount'], 0)
+                    df['amount_cr'] = np.where(df['type'] == 'CR', df['amount'], 0)
             
             # Keep description if present (optional for analyzer)
             # Already in df if it was in transactions
@@ -676,10 +445,7 @@ class BankStatementJSONAnalysisView(APIView):
                 pass
             elif 'bank_name' in df.columns:
                 # Create account_id from bank_name and account_number
-                df['account_id'] = df.apply(
-                    lambda row: f"{row.get('bank_name', 'Unknown')}_{account_info.get('account_number', 'default')}",
-                    axis=1
-                )
+                df['account_id'] = df['bank_name'].astype(str) + f"_{account_info.get('account_number', 'default')}"
             else:
                 # Fallback: use account_number from account_info
                 df['account_id'] = account_info.get('account_number', 'default')
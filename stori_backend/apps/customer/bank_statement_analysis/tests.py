@@ -0,0 +1,235 @@
+import filecmp
+import os
+from unittest import mock, skipUnless
+
+import pandas as pd
+from django.conf import settings
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from config.result_cache import ResultCache
+from .aa_normalizer import normalize_aa_payload, normalize_column_aliases
+from .date_parsing import DateParser
+from .analyzer import monthly_aggregation
+from . import date_parsing, json_views
+from .json_views import BankStatementJSONAnalysisView, extract_transactions_from_aa_format
+
+
+def aa_payload(*accounts):
+    """accounts: (bank, account_number, transactions) tuples"""
+    banks = {}
+    for bank, number, transactions in accounts:
+        banks.setdefault(bank, []).append({
+            'account_number': number,
+            'ifsc_code': 'HDFC0001',
+            'customer_info': {'holders': [{'name': 'Rahul Sharma'}]},
+            'fraud_analysis': [{'transactions': transactions}]
+        })
+    return {'banks': [{'bank': bank, 'accounts': accts} for bank, accts in banks.items()]}
+
+
+def txn(date, amount, narration='', category='', balance=1000.0, **extra):
+    return {'transaction_date': date, 'amount': amount, 'narration': narration,
+            'category': category, 'balance': balance, **extra}
+
+
+class AANormalizerTests(SimpleTestCase):
+
+    def test_debit_credit_classification_order(self):
+        df, _, _ = normalize_aa_payload(aa_payload(('HDFC', '1', [
+            txn('2024-01-01', 500, 'salary received', 'Transfer to'),   # category wins
+            txn('2024-01-02', 500, 'ATM WDL', 'Others'),                 # narration keyword
+            txn('2024-01-03', 500, 'IMPS received', 'Others'),
+            txn('2024-01-04', -75, 'misc', 'Others'),                    # sign
+            txn('2024-01-05', 75, 'misc', 'Others'),
+        ])))
+
+        self.assertEqual(df['debit'].tolist(), [500.0, 500.0, 0.0, 75.0, 0.0])
+        self.assertEqual(df['credit'].tolist(), [0.0, 0.0, 500.0, 0.0, 75.0])
+        self.assertEqual(df['amount'].tolist(), [500.0, 500.0, 500.0, 75.0, 75.0])
+        self.assertEqual(df['category'].tolist()[0], 'transfer to')
+
+    def test_field_aliases_and_timestamps(self):
+        rows = [
+            {'date': '2024-02-01', 'amount': 10},
+            {'transaction_timestamp': '2024-02-02 10:15:00', 'amount': '20.5', 'balance': None},
+            {'transaction_date': '', 'date': '2024-02-03 08:00:00', 'amount': 30},
+        ]
+        df, _, diagnostics = normalize_aa_payload(aa_payload(('SBI', '9', rows)))
+
+        self.assertEqual(df['date'].tolist(), ['2024-02-01', '2024-02-02', '2024-02-03'])
+        self.assertEqual(df['amount'].tolist(), [10.0, 20.5, 30.0])
+        self.assertEqual(df['balance'].tolist(), [0.0, 0.0, 0.0])
+        self.assertEqual(df['description'].tolist(), ['', '', ''])
+        self.assertEqual(diagnostics, [])
+
+    def test_duplicates_are_dropped_per_account_only(self):
+        repeated = txn('2024-03-01', 100, 'UPI/123', 'Others')
+        df, account_info, _ = normalize_aa_payload(aa_payload(
+            ('HDFC', '1', [repeated, dict(repeated), txn('2024-03-01 09:00:00', 100, 'UPI/123', 'Others')]),
+            ('ICICI', '2', [dict(repeated)]),
+        ))
+
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df['account_id'].tolist(), ['HDFC_1', 'ICICI_2'])
+        self.assertTrue(account_info['multiple_accounts'])
+        self.assertEqual(account_info['bank_name'], 'HDFC, ICICI')
+        self.assertEqual(account_info['account_number'], '1')
+
+    def test_direct_transactions_container(self):
+        payload = {'banks': [{'bank': 'Axis', 'accounts': [
+            {'account_number': '5', 'transactions': [txn('2024-01-01', 10)]}
+        ]}]}
+        df, account_info, _ = normalize_aa_payload(payload)
+
+        self.assertEqual(len(df), 1)
+        self.assertFalse(account_info['multiple_accounts'])
+        self.assertEqual(account_info['holder_name'], '')
+
+    def test_unknown_layouts_are_diagnosed(self):
+        df, info, diagnostics = normalize_aa_payload({'statement': []})
+        self.assertIsNone(df)
+        self.assertIn("no 'banks' key", diagnostics[0])
+
+        payload = {'banks': [{'bank': 'Axis', 'accounts': [
+            {'account_number': '5', 'statement_lines': [{'dt': '2024-01-01'}]},
+            {'account_number': '6', 'transactions': [{'value_date': '2024-01-01', 'amt': 5}]},
+        ]}]}
+        df, _, diagnostics = normalize_aa_payload(payload)
+
+        self.assertIn('banks[0].accounts[0]: no transactions', diagnostics[0])
+        self.assertIn('statement_lines', diagnostics[0])
+        self.assertIn("banks[0].accounts[1]: transactions have no 'date' field", diagnostics[1])
+        self.assertIn("no 'amount' field", diagnostics[2])
+        self.assertIn('non-numeric amount', diagnostics[3])
+
+    def test_legacy_list_interface(self):
+        transactions, account_info = extract_transactions_from_aa_format(
+            aa_payload(('HDFC', '1', [txn('2024-01-01', -5, 'fee')]))
+        )
+        self.assertEqual(transactions, [{
+            'date': '2024-01-01', 'description': 'fee', 'debit': 5.0, 'credit': 0.0, 'amount': 5.0,
+            'balance': 1000.0, 'category': '', 'account_id': 'HDFC_1', 'bank_name': 'HDFC'
+        }])
+        self.assertEqual(extract_transactions_from_aa_format({'transactions': []}), (None, None))
+
+
+class ColumnAliasTests(SimpleTestCase):
+
+    def test_first_alias_wins_and_originals_are_kept(self):
+        df = normalize_column_aliases(pd.DataFrame({
+            'TxnDate': ['2024-01-01'], 'Date': ['2024-01-02'], 'Narration': ['x'],
+            'Withdrawal': [5.0], 'Deposit': [0.0], 'Balance': [10.0]
+        }))
+
+        self.assertEqual(df['date'].tolist(), ['2024-01-02'])
+        self.assertEqual(df['description'].tolist(), ['x'])
+        self.assertEqual(df['debit'].tolist(), [5.0])
+        self.assertIn('TxnDate', df.columns)
+        self.assertNotIn('amount', df.columns)
+
+    def test_amount_from_debit_and_credit(self):
+        df = normalize_column_aliases(pd.DataFrame({'debit': [5.0, None], 'credit': [None, 7.0]}))
+        self.assertEqual(df['amount'].tolist(), [5.0, 7.0])
+
+
+class DateParserTests(SimpleTestCase):
+
+    def test_format_inferred_from_sample_prefers_day_first(self):
+        report = {}
+        parsed = DateParser().parse(pd.Series(['05/01/2024', '06/02/2024', '05/01/2024', None]), report)
+
+        self.assertEqual(parsed.tolist()[:3], [pd.Timestamp('2024-01-05'), pd.Timestamp('2024-02-06'),
+                                               pd.Timestamp('2024-01-05')])
+        self.assertTrue(pd.isna(parsed.iloc[3]))
+        self.assertEqual(report['format'], '%d/%m/%Y')
+        self.assertEqual(report['ambiguous'], 3)
+        self.assertEqual(report['unique'], 2)
+
+        parsed = DateParser().parse(pd.Series(['12/31/2023', '01/15/2024']))
+        self.assertEqual(parsed.tolist(), [pd.Timestamp('2023-12-31'), pd.Timestamp('2024-01-15')])
+
+    def test_mixed_layouts_and_objects(self):
+        report = {}
+        parsed = DateParser().parse(pd.Series(
+            ['31-12-2023', ' 01-01-2024 ', '13 Feb 2024', pd.Timestamp('2024-03-01'), 'n/a'], dtype=object
+        ), report)
+
+        self.assertEqual(parsed.tolist()[:4], [pd.Timestamp('2023-12-31'), pd.Timestamp('2024-01-01'),
+                                               pd.Timestamp('2024-02-13'), pd.Timestamp('2024-03-01')])
+        self.assertTrue(pd.isna(parsed.iloc[4]))
+        self.assertEqual(report['format'], '%d-%m-%Y')
+        self.assertEqual(report['other_formats'], 1)
+        self.assertEqual(report['unparsed'], 1)
+
+    def test_cache_is_shared_and_bounded(self):
+        parser = DateParser(cache_size=3)
+        column = pd.Series(['2024-01-01', '2024-01-02', '2024-01-01'])
+        parser.parse(column)
+
+        report = {}
+        parser.parse(column, report)
+        self.assertEqual(report['cache_hits'], 3)
+
+        parser.parse(pd.Series(['2024-02-01', '2024-02-02']))
+        self.assertEqual(len(parser._cache), 3)
+
+
+PIPELINE_DATE_PARSING = os.path.join(os.path.dirname(settings.BASE_DIR), 'consumer_analysis_pipeline',
+                                     'date_parsing.py')
+
+
+class SharedDateParsingTests(SimpleTestCase):
+
+    @skipUnless(os.path.exists(PIPELINE_DATE_PARSING), 'consumer_analysis_pipeline not checked out')
+    def test_identical_to_the_pipeline_copy(self):
+        self.assertTrue(filecmp.cmp(date_parsing.__file__, PIPELINE_DATE_PARSING, shallow=False),
+                        f"{PIPELINE_DATE_PARSING} differs from {date_parsing.__file__}; change both")
+
+
+class BankStatementJSONAnalysisViewTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch('config.result_cache.get_result_cache', return_value=ResultCache(None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, payload):
+        request = APIRequestFactory().post('/api/customer/bank-statement/analyze-json/', payload, format='json')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return BankStatementJSONAnalysisView.as_view()(request)
+
+    def test_cache_key_covers_every_imported_analysis_module(self):
+        with mock.patch('apps.customer.bank_statement_analysis.json_views.cached_response',
+                        return_value=Response({})) as cached:
+            self.post({'transactions': []})
+
+        imported = {getattr(value, '__module__', None) for value in vars(json_views).values()}
+        imported = {name for name in imported if name and name.startswith('apps.')}
+        self.assertIn('apps.customer.bank_statement_analysis.date_parsing', imported)
+        self.assertLessEqual(imported, set(cached.call_args.kwargs['code_modules']))
+
+    def test_aa_payload_without_transactions_returns_diagnostics(self):
+        response = self.post({'banks': [{'bank': 'Axis', 'accounts': [{'account_number': '5'}]}]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Account Aggregator format detected', response.data['message'])
+        self.assertIn('banks[0].accounts[0]', response.data['diagnostics'][0])
+
+    def test_amount_only_statement_gets_credit_column(self):
+        transactions = [
+            {'Date': f'2024-0{1 + i % 6}-1{i % 9}', 'Narration': 'salary credit' if i % 4 == 0 else 'paid to shop',
+             'Amount': 1000.0 if i % 4 == 0 else -100.0, 'Balance': 5000.0}
+            for i in range(40)
+        ]
+        with mock.patch('apps.customer.bank_statement_analysis.json_views.detect_liabilities_simple',
+                        return_value={'active_loans': [], 'credit_cards': []}), \
+                mock.patch('apps.customer.bank_statement_analysis.json_views.monthly_aggregation',
+                           wraps=monthly_aggregation) as aggregate:
+            response = self.post({'transactions': transactions})
+
+        self.assertEqual(response.status_code, 200)
+        df = aggregate.call_args[0][0]
+        self.assertEqual(df['amount_cr'].sum(), 10 * 1000.0)
+        self.assertEqual(df['amount_dr'].sum(), 30 * 100.0)
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 import pandas as pd
 
+from config.json_codec import json_response
 from .models import BankStatementUpload, BankStatementAnalysisResult
 from .serializers import BankStatementUploadSerializer, BankStatementAnalysisResultSerializer
 from .analyzer import (
@@ -141,7 +142,7 @@ class BankStatementAnalysisViewSet(viewsets.ModelViewSet):
             analysis_result = upload.analysis_result
             serializer = BankStatementAnalysisResultSerializer(analysis_result)
             
-            return Response({
+            return json_response({
                 'success': True,
                 'data': serializer.data
             }, status=status.HTTP_200_OK)
@@ -163,7 +164,7 @@ class BankStatementAnalysisViewSet(viewsets.ModelViewSet):
         
         serializer = BankStatementAnalysisResultSerializer(results, many=True)
         
-        return Response({
+        return json_response({
             'success': True,
             'count': results.count(),
             'data': serializer.data
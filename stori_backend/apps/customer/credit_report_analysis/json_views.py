@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 
+from config.result_cache import TIMESTAMP_FIELDS, cached_response
 from .analyzer import extract_credit_features
 from datetime import datetime
 
@@ -235,6 +236,14 @@ def parse_bureau_format(data: dict) -> dict:
     return standardized
 
 
+def is_bureau_format(data: dict) -> bool:
+    """CIBIL/Experian response (rather than the flat score/accounts format)"""
+    return (
+        'result' in data and 
+        'result_json' in data.get('result', {})
+    ) or 'INProfileResponse' in data
+
+
 class CreditReportJSONAnalysisView(APIView):
     """
     Direct JSON analysis for Credit Report data
@@ -243,6 +252,22 @@ class CreditReportJSONAnalysisView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        """Serve repeated submissions of the same report from the result cache"""
+        timestamp_fields = TIMESTAMP_FIELDS
+        if isinstance(request.data, dict) and not is_bureau_format(request.data) \
+                and 'report_date' not in request.data:
+            # The summary falls back to today's date as the report date
+            timestamp_fields += ('report_date',)
+        return cached_response(
+            request,
+            namespace='credit_report_json',
+            payload=request.data,
+            compute=lambda: self._analyze(request),
+            code_modules=(__name__, 'apps.customer.credit_report_analysis.analyzer'),
+            timestamp_fields=timestamp_fields
+        )
+    
+    def _analyze(self, request):
         """
         Analyze credit report from JSON data
         
@@ -285,12 +310,7 @@ class CreditReportJSONAnalysisView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Check if this is bureau format (CIBIL/Experian/etc.)
-            is_bureau_format = (
-                'result' in credit_data and 
-                'result_json' in credit_data.get('result', {})
-            ) or 'INProfileResponse' in credit_data
-            
-            if is_bureau_format:
+            if is_bureau_format(credit_data):
                 # Parse bureau format and convert to standard format
                 try:
                     credit_data = parse_bureau_format(credit_data)
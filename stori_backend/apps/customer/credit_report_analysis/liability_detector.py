@@ -19,6 +19,16 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
+from .recurring_payments import (
+    KeywordAutomaton,
+    PatternSetMatcher,
+    factorize_text,
+    recurring_amount_groups,
+)
+
+# Columns checked, in order, for transaction dates (recurring payment periodicity)
+DATE_COLUMNS = ['txn_date', 'date']
+
 
 class LiabilityDetector:
     """
@@ -27,8 +37,17 @@ class LiabilityDetector:
     Combines multiple data sources for comprehensive liability assessment.
     """
     
-    def __init__(self):
-        """Initialize detector with patterns and thresholds."""
+    def __init__(self, amount_tolerance: float = 0.0):
+        """
+        Initialize detector with patterns and thresholds.
+        
+        Args:
+            amount_tolerance: Bank statement payments whose amounts differ
+                by at most this much (between neighbouring distinct amounts)
+                count as the same recurring payment; 0.0 matches exact amounts
+        """
+        self.amount_tolerance = amount_tolerance
+        
         # EMI/Loan patterns in bank statements
         self.emi_patterns = [
             r'\bemi\b',
@@ -76,6 +95,13 @@ class LiabilityDetector:
             'manappuram', 'home credit', 'money tap', 'early salary',
             'paysense', 'cashe', 'lazypay', 'simpl', 'zestmoney'
         ]
+        
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Pre-compile the description patterns (call again after changing them)"""
+        self._payment_matcher = PatternSetMatcher([self.emi_patterns, self.cc_patterns])
+        self._provider_automaton = KeywordAutomaton(self.loan_providers)
     
     def detect_liabilities(
         self,
@@ -234,6 +260,11 @@ class LiabilityDetector:
         - Recurring EMI payments
         - Credit card payments
         - Loan-related transactions
+        
+        Debits matching the EMI / credit card patterns are grouped by amount
+        (within self.amount_tolerance); amounts paid at least twice are
+        reported with their median interval between payments (interval_days,
+        None without dates).
         """
         result = {
             'has_data': False,
@@ -249,113 +280,114 @@ class LiabilityDetector:
         
         result['has_data'] = True
         
-        # Normalize description column
-        df = df.copy()
-        df['description'] = df['description'].astype(str).str.lower()
-        
-        # Normalize type column
+        # Normalize type column; debit transactions only
         if 'type' in df.columns:
-            df['type'] = df['type'].str.upper()
+            type_codes, types = factorize_text(df['type'], lambda t: t.str.upper())
+            debit = (types == 'DR')[type_codes]
         else:
-            df['type'] = 'DR'  # Default to debit
-        
-        # Filter debit transactions only
-        debits = df[df['type'] == 'DR'].copy()
+            debit = np.ones(len(df), dtype=bool)  # Default to debit
         
-        if debits.empty:
+        if not debit.any():
             return result
         
-        # Detect EMI patterns
-        emi_pattern = '|'.join(self.emi_patterns)
-        emi_mask = debits['description'].str.contains(emi_pattern, case=False, regex=True, na=False)
-        emi_transactions = debits[emi_mask].copy()
-        
-        if not emi_transactions.empty:
-            # Group by amount to find recurring EMIs
-            emi_amounts = emi_transactions.groupby('amount').agg({
-                'amount': 'count',
-                'description': lambda x: x.iloc[0] if len(x) > 0 else ''
-            }).reset_index()
-            emi_amounts.columns = ['amount', 'frequency', 'description']
+        # Normalize description column (each distinct description once)
+        desc_codes, descriptions = factorize_text(df['description'], lambda d: d.astype(str).str.lower())
+        debit_descriptions = np.unique(desc_codes[debit])
+        emi_descriptions = np.zeros(len(descriptions), dtype=bool)
+        cc_descriptions = np.zeros(len(descriptions), dtype=bool)
+        emi_descriptions[debit_descriptions], cc_descriptions[debit_descriptions] = (
+            self._payment_matcher.masks(descriptions[debit_descriptions])
+        )
+        dates = next((df[col] for col in DATE_COLUMNS if col in df.columns), None)
+        
+        # Detect recurring EMI payments (same amount at least twice)
+        emi_rows = np.flatnonzero(debit & emi_descriptions[desc_codes])
+        for emi_amount, frequency, desc, interval in self._recurring_payments(df, emi_rows, desc_codes, descriptions, dates):
+            # Estimate loan type from description
+            loan_type = self._infer_loan_type(desc)
+            bank = self._extract_bank_name(desc)
             
-            # Filter for recurring payments (at least 2 occurrences)
-            recurring_emis = emi_amounts[emi_amounts['frequency'] >= 2]
+            # Estimate outstanding (rough: EMI * 36 months average tenure)
+            estimated_outstanding = emi_amount * 36
             
-            for _, emi_row in recurring_emis.iterrows():
-                emi_amount = float(emi_row['amount'])
-                frequency = int(emi_row['frequency'])
-                desc = str(emi_row['description'])
-                
-                # Estimate loan type from description
-                loan_type = self._infer_loan_type(desc)
-                bank = self._extract_bank_name(desc)
-                
-                # Estimate outstanding (rough: EMI * 36 months average tenure)
-                estimated_outstanding = emi_amount * 36
-                
-                liability_item = {
-                    'source': 'bank_statement',
-                    'type': 'loan',
-                    'bank': bank,
-                    'outstanding': estimated_outstanding,
-                    'monthly_emi': emi_amount,
-                    'loan_type': loan_type,
-                    'frequency': frequency,
-                    'description': desc[:100]  # First 100 chars
-                }
-                
-                result['loans'].append(liability_item)
-                result['total_outstanding'] += estimated_outstanding
-                result['total_monthly_emi'] += emi_amount
-                result['detected_emi_patterns'].append({
-                    'amount': emi_amount,
-                    'frequency': frequency,
-                    'description': desc[:50]
-                })
-        
-        # Detect credit card payments
-        cc_pattern = '|'.join(self.cc_patterns)
-        cc_mask = debits['description'].str.contains(cc_pattern, case=False, regex=True, na=False)
-        cc_transactions = debits[cc_mask].copy()
-        
-        if not cc_transactions.empty:
-            # Group by amount to find recurring CC payments
-            cc_amounts = cc_transactions.groupby('amount').agg({
-                'amount': 'count',
-                'description': lambda x: x.iloc[0] if len(x) > 0 else ''
-            }).reset_index()
-            cc_amounts.columns = ['amount', 'frequency', 'description']
+            liability_item = {
+                'source': 'bank_statement',
+                'type': 'loan',
+                'bank': bank,
+                'outstanding': estimated_outstanding,
+                'monthly_emi': emi_amount,
+                'loan_type': loan_type,
+                'frequency': frequency,
+                'interval_days': interval,
+                'description': desc[:100]  # First 100 chars
+            }
             
-            # Filter for recurring payments
-            recurring_cc = cc_amounts[cc_amounts['frequency'] >= 2]
+            result['loans'].append(liability_item)
+            result['total_outstanding'] += estimated_outstanding
+            result['total_monthly_emi'] += emi_amount
+            result['detected_emi_patterns'].append({
+                'amount': emi_amount,
+                'frequency': frequency,
+                'interval_days': interval,
+                'description': desc[:50]
+            })
+        
+        # Detect recurring credit card payments
+        cc_rows = np.flatnonzero(debit & cc_descriptions[desc_codes])
+        for cc_amount, frequency, desc, interval in self._recurring_payments(df, cc_rows, desc_codes, descriptions, dates):
+            bank = self._extract_bank_name(desc)
             
-            for _, cc_row in recurring_cc.iterrows():
-                cc_amount = float(cc_row['amount'])
-                frequency = int(cc_row['frequency'])
-                desc = str(cc_row['description'])
-                bank = self._extract_bank_name(desc)
-                
-                # Estimate outstanding (rough: 3x monthly payment)
-                estimated_outstanding = cc_amount * 3
-                
-                liability_item = {
-                    'source': 'bank_statement',
-                    'type': 'credit_card',
-                    'bank': bank,
-                    'outstanding': estimated_outstanding,
-                    'monthly_emi': cc_amount,
-                    'credit_limit': estimated_outstanding * 2,  # Rough estimate
-                    'utilization': 50.0,  # Default estimate
-                    'frequency': frequency,
-                    'description': desc[:100]
-                }
-                
-                result['credit_cards'].append(liability_item)
-                result['total_outstanding'] += estimated_outstanding
-                result['total_monthly_emi'] += cc_amount
+            # Estimate outstanding (rough: 3x monthly payment)
+            estimated_outstanding = cc_amount * 3
+            
+            liability_item = {
+                'source': 'bank_statement',
+                'type': 'credit_card',
+                'bank': bank,
+                'outstanding': estimated_outstanding,
+                'monthly_emi': cc_amount,
+                'credit_limit': estimated_outstanding * 2,  # Rough estimate
+                'utilization': 50.0,  # Default estimate
+                'frequency': frequency,
+                'interval_days': interval,
+                'description': desc[:100]
+            }
+            
+            result['credit_cards'].append(liability_item)
+            result['total_outstanding'] += estimated_outstanding
+            result['total_monthly_emi'] += cc_amount
         
         return result
     
+    def _recurring_payments(
+        self,
+        df: pd.DataFrame,
+        rows: np.ndarray,
+        desc_codes: np.ndarray,
+        descriptions: np.ndarray,
+        dates: Optional[pd.Series]
+    ) -> List[Tuple[float, int, str, Optional[float]]]:
+        """
+        (amount, frequency, description, median days between payments) of
+        each recurring amount among the given rows, in ascending amount
+        order; the description is that of the amount's first payment
+        """
+        if len(rows) == 0:
+            return []
+        
+        groups = recurring_amount_groups(
+            df['amount'].iloc[rows],
+            dates.iloc[rows] if dates is not None else None,
+            tolerance=self.amount_tolerance
+        )
+        first_descriptions = descriptions[desc_codes[rows[groups['first_row']]]]
+        intervals = [None if np.isnan(days) else float(days) for days in groups['interval_days'].tolist()]
+        return [
+            (float(amount), int(frequency), str(desc), interval)
+            for amount, frequency, desc, interval
+            in zip(groups['amount'], groups['frequency'].tolist(), first_descriptions, intervals)
+        ]
+    
     def _combine_liability_sources(
         self,
         credit_liabilities: Dict,
@@ -434,9 +466,9 @@ class LiabilityDetector:
         """Extract bank name from transaction description."""
         desc_lower = description.lower()
         
-        for provider in self.loan_providers:
-            if provider in desc_lower:
-                return provider.title()
+        provider = self._provider_automaton.first(desc_lower)
+        if provider is not None:
+            return provider.title()
         
         # Try to extract from common patterns
         patterns = [
@@ -0,0 +1,197 @@
+"""
+Vectorized recurring payment detection for bank statements
+==========================================================
+
+Used by LiabilityDetector to find recurring EMI and credit card payments:
+
+- descriptions are factorized and each distinct description is normalized
+  and matched against the EMI and card patterns once, then mapped back to
+  the rows (statements repeat the same payees thousands of times); a
+  combined ASCII prefilter rejects the non-matching majority in one search
+- matched debits are bucketed by amount in one sort: amounts within
+  `tolerance` of their sorted neighbour share a bucket (0 = exact amounts)
+- each bucket's periodicity (median days between payments) comes from
+  date diffs of the bucket's rows sorted by date, in numpy
+- lender names are found with a compiled keyword automaton instead of a
+  substring test per provider
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from apps.customer.bank_statement_analysis.date_parsing import get_date_parser
+
+# Payments needed for an amount bucket to count as recurring
+MIN_OCCURRENCES = 2
+
+
+class KeywordAutomaton:
+    """
+    Compiled multi-keyword matcher.
+
+    One regex scan reports every keyword occurring in a text; at each
+    position the alternation tries keywords in list order, so the
+    earliest-listed keyword found anywhere is the same one a loop of
+    `keyword in text` tests over the list would return first.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = tuple(keywords)
+        self._rank = {}
+        for i, keyword in enumerate(self.keywords):
+            self._rank.setdefault(keyword, i)
+        # Zero-width lookahead, so overlapping keywords are all seen
+        self._pattern = re.compile('(?=(' + '|'.join(map(re.escape, self.keywords)) + '))') if self.keywords else None
+
+    def first(self, text: str) -> Optional[str]:
+        """Earliest-listed keyword occurring in text, None if none does"""
+        if self._pattern is None:
+            return None
+        found = {match.group(1) for match in self._pattern.finditer(text)}
+        return min(found, key=self._rank.__getitem__) if found else None
+
+
+class PatternSetMatcher:
+    """
+    Matches texts against several regex pattern lists at once.
+
+    Each list is compiled into one case-insensitive alternation (as
+    str.contains(pattern, case=False)). Most statement descriptions match
+    none of them, so every text is first checked against a single combined
+    prefilter compiled with re.ASCII, which skips Unicode case folding and
+    is several times faster; only texts it matches (and non-ASCII texts,
+    where ASCII and Unicode matching could differ) are matched per list.
+    """
+
+    def __init__(self, pattern_lists: Sequence[Sequence[str]]):
+        sources = ['|'.join(patterns) for patterns in pattern_lists]
+        self.patterns = [re.compile(source, re.IGNORECASE) for source in sources]
+        combined = '|'.join(f'(?:{source})' for source in sources)
+        # ASCII matching equals Unicode matching only for ASCII-only patterns
+        self._prefilter = None
+        if combined.isascii() and not re.search(r'\\[uUxN0-7]', combined):
+            self._prefilter = re.compile(combined, re.IGNORECASE | re.ASCII)
+
+    def masks(self, texts: np.ndarray) -> List[np.ndarray]:
+        """Per pattern list, which texts match it anywhere (non-strings never do)"""
+        masks = [np.zeros(len(texts), dtype=bool) for _ in self.patterns]
+        prefilter = self._prefilter
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                continue
+            if prefilter is not None and text.isascii() and prefilter.search(text) is None:
+                continue
+            for mask, pattern in zip(masks, self.patterns):
+                mask[i] = pattern.search(text) is not None
+        return masks
+
+
+def factorize_text(values: pd.Series, normalize: Callable[[pd.Series], pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (codes, normalized distinct values) of a text column, so that
+    normalized[codes] equals normalize(values) row by row.
+
+    Missing values keep their own codes (normalize sees them as they are).
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    normalized = normalize(pd.Series(uniques))
+    return codes, normalized.to_numpy(dtype=object)
+
+
+def recurring_amount_groups(
+    amounts: pd.Series,
+    dates: Optional[pd.Series] = None,
+    tolerance: float = 0.0,
+    min_occurrences: int = MIN_OCCURRENCES
+) -> Dict[str, np.ndarray]:
+    """
+    Recurring payments among the given transactions, by amount bucket.
+
+    Args:
+        amounts: Amounts of the candidate transactions, in statement order
+        dates: Their dates (datetimes or strings), or None
+        tolerance: Amounts within this of the next larger distinct amount
+            share a bucket; 0.0 groups exact amounts
+        min_occurrences: Payments needed for a bucket to be reported
+
+    Returns:
+        Dict of arrays, one entry per recurring bucket in ascending amount
+        order: amount (the bucket's most frequent amount, smallest on
+        ties), frequency, first_row (position of its first payment in
+        amounts) and interval_days (median days between consecutive
+        payments, NaN without two dated payments)
+    """
+    codes, uniques = pd.factorize(amounts, sort=True)
+    valid = codes >= 0
+    rows = np.flatnonzero(valid)
+    codes = codes[valid]
+    counts = np.bincount(codes, minlength=len(uniques))
+
+    if tolerance > 0 and len(uniques):
+        values = np.asarray(uniques, dtype=np.float64)
+        bucket_of_amount = np.concatenate([[0], np.cumsum(np.diff(values) > tolerance)])
+        # Representative amount: most frequent in the bucket, smallest on ties
+        order = np.lexsort((np.arange(len(uniques)), -counts, bucket_of_amount))
+        starts = np.flatnonzero(np.r_[True, np.diff(bucket_of_amount[order]) != 0])
+        representative = order[starts]
+    else:
+        bucket_of_amount = np.arange(len(uniques))
+        representative = np.arange(len(uniques))
+
+    bucket = bucket_of_amount[codes]
+    n_buckets = len(representative)
+    frequency = np.bincount(bucket, minlength=n_buckets)
+    first_row = np.full(n_buckets, -1, dtype=np.int64)
+    present, first = np.unique(bucket, return_index=True)
+    first_row[present] = rows[first]
+
+    keep = np.flatnonzero(frequency >= min_occurrences)
+    member = np.isin(bucket, keep)
+    position = np.full(n_buckets, -1, dtype=np.int64)
+    position[keep] = np.arange(len(keep))
+
+    interval = np.full(len(keep), np.nan)
+    if dates is not None and member.any():
+        interval = _median_intervals(position[bucket[member]], dates.iloc[rows[member]], len(keep))
+
+    return {
+        'amount': np.asarray(uniques, dtype=object)[representative[keep]],
+        'frequency': frequency[keep],
+        'first_row': first_row[keep],
+        'interval_days': interval,
+    }
+
+
+def _median_intervals(group: np.ndarray, dates: pd.Series, n_groups: int) -> np.ndarray:
+    """Median gap in days between consecutive dated rows of each group"""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = pd.to_datetime(dates, errors='coerce')
+    else:
+        parsed = get_date_parser().parse(dates)
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_localize(None)
+    days = parsed.to_numpy(dtype='datetime64[ns]')
+
+    dated = ~np.isnat(days)
+    group, days = group[dated], days[dated]
+    order = np.lexsort((days, group))
+    group, days = group[order], days[order]
+
+    same = group[1:] == group[:-1]
+    gaps = (np.diff(days).astype(np.int64) / 86400e9)[same]
+    gap_group = group[1:][same]
+
+    medians = np.full(n_groups, np.nan)
+    if len(gaps) == 0:
+        return medians
+    order = np.lexsort((gaps, gap_group))
+    gaps, gap_group = gaps[order], gap_group[order]
+    counts = np.bincount(gap_group, minlength=n_groups)
+    has_gaps = np.flatnonzero(counts)
+    starts = np.concatenate([[0], np.cumsum(counts)])[has_gaps]
+    size = counts[has_gaps]
+    medians[has_gaps] = (gaps[starts + (size - 1) // 2] + gaps[starts + size // 2]) / 2
+    return medians
@@ -0,0 +1,74 @@
+import pandas as pd
+from django.test import SimpleTestCase
+
+from .liability_detector import LiabilityDetector
+from .recurring_payments import KeywordAutomaton
+
+
+def statement(rows):
+    """Bank statement DataFrame from (date, description, amount, type) tuples"""
+    df = pd.DataFrame(rows, columns=['txn_date', 'description', 'amount', 'type'])
+    df['txn_date'] = pd.to_datetime(df['txn_date'])
+    return df
+
+
+def monthly(description, amount, months, day=5, type_='DR'):
+    return [(f'2024-{m:02d}-{day:02d}', description, amount, type_) for m in range(1, months + 1)]
+
+
+class BankStatementLiabilityTests(SimpleTestCase):
+
+    def test_recurring_emi_and_card_payments(self):
+        df = statement(
+            monthly('NACH/HDFC HOME LOAN EMI', 25000.0, 6)
+            + monthly('CRED APP CC BILL', 8000.0, 3, day=20)
+            + monthly('Swiggy', 450.0, 6, day=12)
+            + [('2024-03-15', 'LOAN DISBURSAL', 200000.0, 'CR'),
+               ('2024-04-02', 'personal loan emi', 9999.0, 'DR')]
+        )
+
+        result = LiabilityDetector()._extract_from_bank_statement(df)
+
+        loan, = result['loans']
+        self.assertEqual((loan['monthly_emi'], loan['frequency']), (25000.0, 6))
+        self.assertEqual((loan['bank'], loan['loan_type']), ('Hdfc', 'home_loan'))
+        self.assertEqual(loan['outstanding'], 25000.0 * 36)
+        self.assertEqual(loan['description'], 'nach/hdfc home loan emi')
+        self.assertAlmostEqual(loan['interval_days'], 30.0, delta=1.0)
+        card, = result['credit_cards']
+        self.assertEqual((card['monthly_emi'], card['frequency']), (8000.0, 3))
+        self.assertEqual(result['total_monthly_emi'], 33000.0)
+        self.assertEqual(result['detected_emi_patterns'][0]['amount'], 25000.0)
+
+    def test_amount_tolerance_buckets_nearby_amounts(self):
+        df = statement([('2024-01-05', 'Bajaj Finserv EMI', 5000.0, 'DR'),
+                        ('2024-02-05', 'Bajaj Finserv EMI', 5000.4, 'DR'),
+                        ('2024-03-05', 'Bajaj Finserv EMI', 5000.4, 'DR')])
+
+        self.assertEqual(LiabilityDetector()._extract_from_bank_statement(df)['loans'][0]['frequency'], 2)
+
+        loan, = LiabilityDetector(amount_tolerance=1.0)._extract_from_bank_statement(df)['loans']
+        self.assertEqual((loan['monthly_emi'], loan['frequency']), (5000.4, 3))
+        self.assertEqual(loan['description'], 'bajaj finserv emi')
+
+    def test_statement_without_dates_or_types(self):
+        df = pd.DataFrame({'description': ['ICICI LOAN EMI'] * 2 + [None], 'amount': [12000.0] * 3})
+
+        result = LiabilityDetector().detect_liabilities(bank_statement_df=df, monthly_income=40000.0)
+
+        loan, = result['active_loans']
+        self.assertEqual(loan['frequency'], 2)
+        self.assertIsNone(loan['interval_days'])
+        self.assertEqual(result['debt_ratios']['emi_to_income_ratio'], 30.0)
+
+
+class KeywordAutomatonTests(SimpleTestCase):
+
+    def test_earliest_listed_keyword_wins(self):
+        automaton = KeywordAutomaton(['hdfc', 'icici', 'home credit', 'cred'])
+
+        self.assertEqual(automaton.first('icici emi via hdfc'), 'hdfc')
+        # Overlapping keywords at one position: listed order decides
+        self.assertEqual(automaton.first('home credit loan'), 'home credit')
+        self.assertEqual(automaton.first('credit card'), 'cred')
+        self.assertIsNone(automaton.first('swiggy'))
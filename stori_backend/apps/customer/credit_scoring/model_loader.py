@@ -2,6 +2,7 @@
 Model Loader - Singleton pattern to load GBM model once
 """
 import os
+import sys
 import joblib
 import json
 import logging
@@ -16,6 +17,7 @@ class ModelLoader:
     _model = None
     _feature_names = None
     _metrics = None
+    _drift_recorder = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -76,10 +78,31 @@ class ModelLoader:
             
             logger.info("Model loaded successfully")
             
+            self._load_drift_recorder(os.path.join(stori_nbfc_dir, 'credit_scoring_pipeline'), model_dir)
+            
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             self._model = None
     
+    def _load_drift_recorder(self, pipeline_dir, model_dir):
+        """Record live feature/score drift when training saved a drift reference"""
+        try:
+            # drift_recorder lives in the pipeline, as fast_json does for the consumer API
+            if pipeline_dir not in sys.path:
+                sys.path.append(pipeline_dir)
+            from drift_recorder import load_recorder
+            
+            drift_dir = os.environ.get('CREDIT_DRIFT_DIR', os.path.join(model_dir, 'drift'))
+            self._drift_recorder = load_recorder(
+                os.path.join(model_dir, 'drift_reference.json'), drift_dir,
+                score_columns=['default_probability']
+            )
+            if self._drift_recorder is not None:
+                logger.info(f"Recording live drift to {self._drift_recorder.store.directory}")
+        except Exception as e:
+            logger.error(f"Error loading drift recorder: {str(e)}")
+            self._drift_recorder = None
+    
     @property
     def model(self):
         """Get the loaded model"""
@@ -98,4 +121,8 @@ class ModelLoader:
     def is_loaded(self):
         """Check if model is loaded"""
         return self._model is not None
-
+    
+    @property
+    def drift_recorder(self):
+        """Live drift recorder (None without a drift reference)"""
+        return self._drift_recorder
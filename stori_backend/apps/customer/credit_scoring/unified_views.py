@@ -553,6 +553,9 @@ class UnifiedCreditScoringView(APIView):
                 # LightGBM Booster - predict() returns probability directly for binary classification
                 default_prob = float(model.predict(df)[0])
             
+            if model_loader.drift_recorder is not None:
+                model_loader.drift_recorder.record(features, {'default_probability': default_prob})
+            
             credit_score = probability_to_score(default_prob)
             risk_info = score_to_risk_tier(credit_score)
             
@@ -603,6 +603,9 @@ class CreditScoreView(APIView):
                        f"utilization={input_data.get('credit_utilization_ratio', 0):.3f}, "
                        f"avg_balance={input_data.get('avg_balance', 0):.2f}")
             
+            if model_loader.drift_recorder is not None:
+                model_loader.drift_recorder.record(mapped_data, {'default_probability': default_prob})
+            
             credit_score = probability_to_score(default_prob)
             risk_info = score_to_risk_tier(credit_score)
             
@@ -704,6 +707,7 @@ class ModelHealthView(APIView):
             'model_loaded': is_loaded,
             'model_type': 'LightGBM' if is_loaded else None,
             'metrics': model_loader.metrics if is_loaded else None,
-            'feature_count': len(model_loader.feature_names) if is_loaded and model_loader.feature_names else 0
+            'feature_count': len(model_loader.feature_names) if is_loaded and model_loader.feature_names else 0,
+            'drift': model_loader.drift_recorder.status() if model_loader.drift_recorder else None
         }, status=status.HTTP_200_OK)
 
@@ -22,6 +22,8 @@ import warnings
 import json
 from datetime import datetime
 
+from .feature_engine import compute_itr_features, flatten_itr_years, itr_feature_dicts
+
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 
 # =========================================================
@@ -100,6 +102,20 @@ def load_itr_json(itr_path: str) -> Dict:
     else:
         raise ValueError(f"Unsupported file format: {file_path.suffix}")
     
+    return parse_itr_json(raw_itr)
+
+
+def parse_itr_json(raw_itr: Dict) -> Dict:
+    """
+    Standardize an ITR JSON document (Income Tax Portal format) already in
+    memory, e.g. a request body. See load_itr_json.
+    
+    Args:
+        raw_itr: Parsed ITR JSON ({"ITR": {"ITR1": {...}}})
+        
+    Returns:
+        Dict with standardized ITR data structure
+    """
     # Parse Income Tax Department JSON structure
     itr_root = raw_itr.get('ITR', {})
     
@@ -341,7 +357,11 @@ def load_multiple_itr_years(itr_files: List[Dict[str, str]]) -> List[Dict]:
             warnings.warn(f"Failed to load ITR {itr_file.get('path', 'unknown')}: {str(e)}")
             continue
     
-    # Sort by assessment year (newest first)
+    return sort_itr_years(itr_data_list)
+
+
+def sort_itr_years(itr_data_list: List[Dict]) -> List[Dict]:
+    """Sort ITR data dicts by assessment year (newest first), in place"""
     # Assessment year format: "2025" or "2024-25" - extract first year number
     def sort_key(x):
         year_str = str(x.get('assessment_year', '0'))
@@ -372,180 +392,7 @@ def extract_itr_features_single_year(itr_data: Dict) -> Dict[str, float]:
     Returns:
         Dict with ITR features
     """
-    features = {}
-    
-    # Extract income data
-    income = itr_data.get('income', {})
-    deductions = itr_data.get('deductions', {})
-    tax = itr_data.get('tax', {})
-    filing_status = itr_data.get('filing_status', {})
-    
-    # ==========================================
-    # INCOME FEATURES
-    # ==========================================
-    
-    features['itr_net_taxable_income'] = _safe_float(
-        income.get('net_taxable_income', income.get('total_income', 0.0))
-    )
-    
-    features['itr_gross_total_income'] = _safe_float(
-        income.get('gross_total_income', income.get('gross_income', 0.0))
-    )
-    
-    features['itr_salary_income'] = _safe_float(
-        income.get('salary_income', income.get('salary', 0.0))
-    )
-    
-    features['itr_business_income'] = _safe_float(
-        income.get('business_income', income.get('business', 0.0))
-    )
-    
-    features['itr_house_property_income'] = _safe_float(
-        income.get('house_property_income', income.get('house_property', 0.0))
-    )
-    
-    features['itr_capital_gains'] = _safe_float(
-        income.get('capital_gains', income.get('capital_gain', 0.0))
-    )
-    
-    # Income type classification
-    total_income = features['itr_net_taxable_income']
-    if total_income > 0:
-        salary_ratio = features['itr_salary_income'] / total_income
-        features['income_type_salaried'] = 1.0 if salary_ratio > 0.8 else 0.0
-    else:
-        features['income_type_salaried'] = 0.0
-    
-    # ==========================================
-    # DEDUCTIONS
-    # ==========================================
-    
-    features['itr_total_deductions'] = _safe_float(
-        deductions.get('total_deductions', 0.0)
-    )
-    
-    if total_income > 0:
-        features['itr_deductions_to_income_ratio'] = _safe_float(
-            features['itr_total_deductions'] / total_income
-        )
-    else:
-        features['itr_deductions_to_income_ratio'] = 0.0
-    
-    # ==========================================
-    # TAX COMPLIANCE
-    # ==========================================
-    
-    features['itr_filed_current_year'] = 1.0 if filing_status.get('filed', False) else 0.0
-    
-    features['itr_tax_paid'] = _safe_float(tax.get('tax_paid', 0.0))
-    
-    features['itr_tax_outstanding'] = _safe_float(tax.get('tax_outstanding', 0.0))
-    
-    features['itr_revision_filed'] = 1.0 if filing_status.get('revised', False) else 0.0
-    
-    # Filing delay calculation
-    filing_date = filing_status.get('filing_date', itr_data.get('filing_date', None))
-    due_date = itr_data.get('due_date', None)
-    
-    if filing_date and due_date:
-        try:
-            filing_dt = pd.to_datetime(filing_date)
-            due_dt = pd.to_datetime(due_date)
-            delay_days = (filing_dt - due_dt).days
-            features['itr_filing_delay_days'] = _safe_float(max(0, delay_days))
-        except:
-            features['itr_filing_delay_days'] = 0.0
-    else:
-        features['itr_filing_delay_days'] = 0.0
-    
-    # Tax compliance score
-    compliance_score = 1.0
-    
-    if not filing_status.get('filed', False):
-        compliance_score -= 0.5
-    
-    if features['itr_tax_outstanding'] > 0:
-        # Penalty based on outstanding amount relative to income
-        if total_income > 0:
-            outstanding_ratio = features['itr_tax_outstanding'] / total_income
-            compliance_score -= min(0.3, outstanding_ratio * 2)
-        else:
-            compliance_score -= 0.3
-    
-    if features['itr_filing_delay_days'] > 30:
-        compliance_score -= 0.2
-    elif features['itr_filing_delay_days'] > 0:
-        compliance_score -= 0.1
-    
-    if filing_status.get('assessment_pending', False):
-        compliance_score -= 0.2
-    
-    # Bonus for paying taxes (indicates earning capacity)
-    if features['itr_tax_paid'] > 0:
-        compliance_score += 0.1
-    
-    features['tax_compliance_score'] = _safe_float(max(0.0, min(1.0, compliance_score)))
-    
-    # Multi-year filing (will be updated if multiple years provided)
-    features['itr_filed_last_3_years'] = 0.0
-    
-    # Income growth and stability (will be updated if multiple years provided)
-    features['itr_income_growth_yoy'] = 0.0
-    features['itr_income_stability'] = 0.0
-    
-    # Income reconciliation (will be updated when bank statement data provided)
-    features['itr_income_to_bank_income_ratio'] = 0.0
-    
-    # ==========================================
-    # INCOME SOURCE RELIABILITY
-    # ==========================================
-    # Calculate reliability score based on:
-    # 1. TDS presence (indicates formal income)
-    # 2. Multiple income sources (diversification)
-    # 3. Consistency of income declaration
-    
-    reliability_score = 0.5  # Base score
-    
-    # TDS indicates formal, verified income
-    tds_amount = _safe_float(tax.get('tds_deducted', 0.0))
-    if tds_amount > 0:
-        reliability_score += 0.3
-        # Higher TDS relative to income = more reliable
-        if total_income > 0:
-            tds_ratio = tds_amount / total_income
-            if tds_ratio > 0.1:  # TDS > 10% of income
-                reliability_score += 0.1
-    
-    # Multiple income sources indicate diversification
-    income_sources_count = 0
-    if features['itr_salary_income'] > 0:
-        income_sources_count += 1
-    if features['itr_business_income'] > 0:
-        income_sources_count += 1
-    if features['itr_house_property_income'] > 0:
-        income_sources_count += 1
-    if features['itr_capital_gains'] > 0:
-        income_sources_count += 1
-    other_income = _safe_float(income.get('other_income', 0.0))
-    if other_income > 0:
-        income_sources_count += 1
-    
-    if income_sources_count >= 2:
-        reliability_score += 0.1
-    
-    # Salary income is generally more reliable than business
-    if features['itr_salary_income'] > 0 and features['income_type_salaried'] == 1.0:
-        reliability_score += 0.1
-    
-    # Cap at 1.0
-    features['income_source_reliability'] = min(1.0, reliability_score)
-    
-    # Additional income details for summary
-    features['itr_other_income'] = other_income
-    features['itr_tds_deducted'] = tds_amount
-    features['itr_tax_refund'] = _safe_float(tax.get('tax_refund', 0.0))
-    
-    return features
+    return extract_itr_features_batch([[itr_data]], multi_year=False)[0]
 
 
 # =========================================================
@@ -563,71 +410,34 @@ def extract_itr_features_multi_year(itr_data_list: List[Dict]) -> Dict[str, floa
     Returns:
         Dict with ITR features (including multi-year metrics)
     """
-    if len(itr_data_list) == 0:
-        return _get_default_itr_features()
-    
-    # Get current year features
-    current_year_features = extract_itr_features_single_year(itr_data_list[0])
-    
-    # ==========================================
-    # MULTI-YEAR ANALYSIS
-    # ==========================================
+    return extract_itr_features_batch([itr_data_list], multi_year=True)[0]
+
+
+def extract_itr_features_batch(
+    itr_bundles: List[List[Dict]],
+    multi_year: Optional[bool] = None
+) -> List[Dict[str, float]]:
+    """
+    Extract ITR features for many applicants at once.
     
-    # Check filing consistency (last 3 years)
-    if len(itr_data_list) >= 3:
-        filed_count = sum(
-            1 for itr in itr_data_list[:3]
-            if itr.get('filing_status', {}).get('filed', False)
-        )
-        current_year_features['itr_filed_last_3_years'] = 1.0 if filed_count >= 3 else 0.0
-    elif len(itr_data_list) >= 1:
-        # If only 1-2 years, check if all available years are filed
-        filed_count = sum(
-            1 for itr in itr_data_list
-            if itr.get('filing_status', {}).get('filed', False)
-        )
-        current_year_features['itr_filed_last_3_years'] = 1.0 if filed_count == len(itr_data_list) else 0.0
+    All years of all applicants are flattened into one table and the
+    features computed column-wise (see feature_engine), instead of walking
+    each applicant's ITRs separately.
     
-    # Income growth (Year-over-Year)
-    if len(itr_data_list) >= 2:
-        current_income = current_year_features['itr_net_taxable_income']
-        prev_year_features = extract_itr_features_single_year(itr_data_list[1])
-        prev_income = prev_year_features['itr_net_taxable_income']
-        
-        if prev_income > 0:
-            growth = (current_income - prev_income) / prev_income
-            current_year_features['itr_income_growth_yoy'] = _safe_float(growth)
-        else:
-            current_year_features['itr_income_growth_yoy'] = 0.0
-    else:
-        current_year_features['itr_income_growth_yoy'] = 0.0
-    
-    # Income stability (Coefficient of Variation across years)
-    if len(itr_data_list) >= 2:
-        incomes = []
-        for itr in itr_data_list:
-            income = itr.get('income', {})
-            net_income = income.get('net_taxable_income', income.get('total_income', 0.0))
-            if net_income > 0:
-                incomes.append(net_income)
+    Args:
+        itr_bundles: Per applicant, ITR data dicts sorted newest first
+        multi_year: True/False: as extract_itr_features_multi_year /
+                    extract_itr_features_single_year for every applicant;
+                    None: as build_itr_feature_vector (multi-year features
+                    for applicants with two or more years)
         
-        if len(incomes) >= 2:
-            mean_income = np.mean(incomes)
-            std_income = np.std(incomes)
-            
-            if mean_income > 0:
-                cv = std_income / mean_income
-                # Convert to stability score (lower CV = higher stability)
-                stability = 1.0 - min(cv, 1.0)
-                current_year_features['itr_income_stability'] = _safe_float(stability)
-            else:
-                current_year_features['itr_income_stability'] = 0.0
-        else:
-            current_year_features['itr_income_stability'] = 0.0
-    else:
-        current_year_features['itr_income_stability'] = 0.0
-    
-    return current_year_features
+    Returns:
+        Feature dicts in applicant order (default features for applicants
+        without ITRs)
+    """
+    itr_bundles = list(itr_bundles)
+    features = itr_feature_dicts(itr_bundles, multi_year)
+    return [f if bundle else _get_default_itr_features() for f, bundle in zip(features, itr_bundles)]
 
 
 # =========================================================
@@ -687,11 +497,8 @@ def build_itr_feature_vector(
             warnings.warn("No valid ITR data loaded")
             return pd.DataFrame([_get_default_itr_features()])
         
-        # Extract features
-        if len(itr_data_list) == 1:
-            features = extract_itr_features_single_year(itr_data_list[0])
-        else:
-            features = extract_itr_features_multi_year(itr_data_list)
+        # Extract features (multi-year metrics need two or more years)
+        features = extract_itr_features_batch([itr_data_list])[0]
         
         # Reconcile with bank statement if provided
         if bank_statement_annual_income is not None:
@@ -713,6 +520,42 @@ def build_itr_feature_vector(
     return feature_df
 
 
+def build_itr_feature_matrix(
+    itr_bundles: List[List[Dict]],
+    bank_statement_annual_incomes: Optional[List[Optional[float]]] = None
+) -> pd.DataFrame:
+    """
+    Batch version of build_itr_feature_vector for already loaded ITRs.
+    
+    Args:
+        itr_bundles: Per applicant, ITR data dicts sorted newest first
+                     (as returned by load_multiple_itr_years)
+        bank_statement_annual_incomes: Optional per-applicant annual bank
+                                       income (None: no reconciliation)
+        
+    Returns:
+        DataFrame with one row per applicant and ITR_FEATURE_NAMES columns
+    """
+    itr_bundles = list(itr_bundles)
+    years = flatten_itr_years(itr_bundles)
+    features = compute_itr_features(years, len(itr_bundles))
+    
+    if bank_statement_annual_incomes is not None:
+        # Vectorized reconcile_itr_with_bank_statement
+        bank_income = np.array(
+            [np.nan if v is None else v for v in bank_statement_annual_incomes], dtype=np.float64
+        )
+        itr_income = features['itr_net_taxable_income'].to_numpy()
+        matched = (bank_income > 0) & (itr_income > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = itr_income / bank_income
+        features['itr_income_to_bank_income_ratio'] = np.where(
+            matched & np.isfinite(ratio), ratio, 0.0
+        )
+    
+    return features[ITR_FEATURE_NAMES].reset_index(drop=True)
+
+
 # =========================================================
 # 7. HELPER FUNCTIONS
 # =========================================================
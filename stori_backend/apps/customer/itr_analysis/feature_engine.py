@@ -0,0 +1,357 @@
+"""
+Columnar ITR feature engine
+
+Every year of every applicant is flattened once into a typed table (one
+row per applicant-year, newest year first within an applicant). Per-year
+features are then computed as array operations over the current-year rows
+and the cross-year ones (YoY growth, income stability, filing consistency)
+as grouped reductions over all rows, so a batch of applicants costs one
+pass over their ITRs however many years each has.
+
+The fields read from the standardized ITR dicts (see
+analyzer.load_itr_json) are declared in YEAR_FIELDS; the feature
+definitions are those of analyzer.extract_itr_features_single_year and
+extract_itr_features_multi_year.
+"""
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Column -> (section of the standardized ITR, keys). The first key present
+# in the section wins (even if its value is empty); missing -> 0.0
+YEAR_FIELDS = {
+    'net_taxable_income': ('income', ('net_taxable_income', 'total_income')),
+    'gross_total_income': ('income', ('gross_total_income', 'gross_income')),
+    'salary_income': ('income', ('salary_income', 'salary')),
+    'business_income': ('income', ('business_income', 'business')),
+    'house_property_income': ('income', ('house_property_income', 'house_property')),
+    'capital_gains': ('income', ('capital_gains', 'capital_gain')),
+    'other_income': ('income', ('other_income',)),
+    'total_deductions': ('deductions', ('total_deductions',)),
+    'tax_paid': ('tax', ('tax_paid',)),
+    'tax_outstanding': ('tax', ('tax_outstanding',)),
+    'tds_deducted': ('tax', ('tds_deducted',)),
+    'tax_refund': ('tax', ('tax_refund',)),
+}
+
+# Boolean filing status flags (truthiness of filing_status[key])
+YEAR_FLAGS = ('filed', 'revised', 'assessment_pending')
+
+# Feature columns, in the key order of the analyzer's feature dicts
+FEATURE_COLUMNS = [
+    'itr_net_taxable_income',
+    'itr_gross_total_income',
+    'itr_salary_income',
+    'itr_business_income',
+    'itr_house_property_income',
+    'itr_capital_gains',
+    'income_type_salaried',
+    'itr_total_deductions',
+    'itr_deductions_to_income_ratio',
+    'itr_filed_current_year',
+    'itr_tax_paid',
+    'itr_tax_outstanding',
+    'itr_revision_filed',
+    'itr_filing_delay_days',
+    'tax_compliance_score',
+    'itr_filed_last_3_years',
+    'itr_income_growth_yoy',
+    'itr_income_stability',
+    'itr_income_to_bank_income_ratio',
+    'income_source_reliability',
+    'itr_other_income',
+    'itr_tds_deducted',
+    'itr_tax_refund',
+]
+
+# Years counted by itr_filed_last_3_years
+FILING_HISTORY_YEARS = 3
+
+# Distinct (filing date, due date) pairs whose delay is kept between calls
+DELAY_CACHE_SIZE = 4096
+
+
+def _to_float(value) -> float:
+    """float(value), NaN if it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _first_present(section: Dict, keys: Sequence[str]):
+    for key in keys:
+        if key in section:
+            return section[key]
+    return 0.0
+
+
+def filing_delay_days(filing_date, due_date) -> float:
+    """Days filed after the due date (0.0 if on time or not parseable)"""
+    try:
+        return _cached_filing_delay_days(filing_date, due_date)
+    except TypeError:  # unhashable values
+        return _filing_delay_days(filing_date, due_date)
+
+
+def _filing_delay_days(filing_date, due_date) -> float:
+    if not (filing_date and due_date):
+        return 0.0
+    try:
+        delay = float(max(0, (pd.to_datetime(filing_date) - pd.to_datetime(due_date)).days))
+    except Exception:
+        return 0.0
+    return delay if np.isfinite(delay) else 0.0
+
+
+_cached_filing_delay_days = lru_cache(maxsize=DELAY_CACHE_SIZE)(_filing_delay_days)
+
+
+def _finite(values: np.ndarray) -> np.ndarray:
+    """NaN/inf -> 0.0 (vectorized _safe_float)"""
+    return np.where(np.isfinite(values), values, 0.0)
+
+
+def flatten_itr_years(bundles: Sequence[Sequence[Dict]]) -> pd.DataFrame:
+    """
+    One typed row per applicant-year.
+
+    Args:
+        bundles: Per applicant, standardized ITR dicts sorted newest first
+
+    Returns:
+        DataFrame with applicant (position in bundles), year_rank (0 =
+        newest), a float column per YEAR_FIELDS entry (as filed, NaN if not
+        a number), the YEAR_FLAGS as bools and filing_delay_days
+    """
+    return pd.DataFrame(_flatten_columns(bundles))
+
+
+def _flatten_columns(bundles: Sequence[Sequence[Dict]]) -> Dict[str, np.ndarray]:
+    """flatten_itr_years() columns as arrays"""
+    applicant, year_rank = [], []
+    values = {column: [] for column in YEAR_FIELDS}
+    flags = {flag: [] for flag in YEAR_FLAGS}
+    delays = []
+
+    for i, years in enumerate(bundles):
+        for rank, itr in enumerate(years):
+            applicant.append(i)
+            year_rank.append(rank)
+            sections = {
+                'income': itr.get('income', {}),
+                'deductions': itr.get('deductions', {}),
+                'tax': itr.get('tax', {}),
+            }
+            for column, (section, keys) in YEAR_FIELDS.items():
+                values[column].append(_to_float(_first_present(sections[section], keys)))
+            filing_status = itr.get('filing_status', {})
+            for flag in YEAR_FLAGS:
+                flags[flag].append(bool(filing_status.get(flag, False)))
+            delays.append(filing_delay_days(filing_status.get('filing_date', itr.get('filing_date', None)),
+                                            itr.get('due_date', None)))
+
+    table = {'applicant': np.array(applicant, dtype=np.int64), 'year_rank': np.array(year_rank, dtype=np.int64)}
+    table.update({column: np.array(v, dtype=np.float64) for column, v in values.items()})
+    table.update({flag: np.array(v, dtype=bool) for flag, v in flags.items()})
+    table['filing_delay_days'] = np.array(delays, dtype=np.float64)
+    return table
+
+
+def compute_itr_features(
+    years: pd.DataFrame,
+    n_applicants: int,
+    multi_year: Optional[bool] = None
+) -> pd.DataFrame:
+    """
+    Feature table from flatten_itr_years() output.
+
+    Args:
+        years: flatten_itr_years() table
+        n_applicants: Number of bundles flattened (rows of the result)
+        multi_year: True: features of extract_itr_features_multi_year for
+            every applicant; False: extract_itr_features_single_year of the
+            newest year; None (build_itr_feature_vector): multi-year for
+            applicants with two or more years
+
+    Returns:
+        One row per applicant with FEATURE_COLUMNS (applicants without
+        years get zeros)
+    """
+    return pd.DataFrame(_feature_columns(years, n_applicants, multi_year), columns=FEATURE_COLUMNS)
+
+
+def itr_feature_dicts(bundles: Sequence[Sequence[Dict]], multi_year: Optional[bool] = None) -> List[Dict[str, float]]:
+    """
+    Feature dicts (FEATURE_COLUMNS order) of each bundle; the same values as
+    compute_itr_features(flatten_itr_years(bundles)) without building
+    DataFrames, which dominates the cost for a single applicant
+    """
+    features = _feature_columns(_flatten_columns(bundles), len(bundles), multi_year)
+    columns = [features[column].tolist() for column in FEATURE_COLUMNS]
+    return [dict(zip(FEATURE_COLUMNS, row)) for row in zip(*columns)]
+
+
+def _feature_columns(
+    years: Mapping[str, np.ndarray],
+    n_applicants: int,
+    multi_year: Optional[bool]
+) -> Dict[str, np.ndarray]:
+    """compute_itr_features() columns as arrays"""
+    applicant = np.asarray(years['applicant'])
+    rank = np.asarray(years['year_rank'])
+    n_years = np.bincount(applicant, minlength=n_applicants)
+
+    # Current (newest) year of each applicant
+    current = np.flatnonzero(rank == 0)
+    has_years = np.zeros(n_applicants, dtype=bool)
+    has_years[applicant[current]] = True
+
+    def current_values(column: str, fill=0.0) -> np.ndarray:
+        values = np.asarray(years[column])
+        out = np.full(n_applicants, fill, dtype=values.dtype)
+        out[applicant[current]] = values[current]
+        return out
+
+    safe = {column: _finite(current_values(column)) for column in YEAR_FIELDS}
+    filed = current_values('filed', False)
+    revised = current_values('revised', False)
+    pending = current_values('assessment_pending', False)
+    delay = current_values('filing_delay_days')
+
+    total = safe['net_taxable_income']
+    positive = total > 0
+    denom = np.where(positive, total, 1.0)
+
+    features = {
+        'itr_net_taxable_income': total,
+        'itr_gross_total_income': safe['gross_total_income'],
+        'itr_salary_income': safe['salary_income'],
+        'itr_business_income': safe['business_income'],
+        'itr_house_property_income': safe['house_property_income'],
+        'itr_capital_gains': safe['capital_gains'],
+    }
+    salaried = positive & (safe['salary_income'] / denom > 0.8)
+    features['income_type_salaried'] = salaried.astype(np.float64)
+    features['itr_total_deductions'] = safe['total_deductions']
+    features['itr_deductions_to_income_ratio'] = np.where(
+        positive, _finite(safe['total_deductions'] / denom), 0.0
+    )
+    features['itr_filed_current_year'] = filed.astype(np.float64)
+    features['itr_tax_paid'] = safe['tax_paid']
+    features['itr_tax_outstanding'] = safe['tax_outstanding']
+    features['itr_revision_filed'] = revised.astype(np.float64)
+    features['itr_filing_delay_days'] = delay
+
+    # Tax compliance: penalties and bonus applied in the analyzer's order
+    outstanding = safe['tax_outstanding']
+    outstanding_penalty = np.where(
+        outstanding > 0,
+        np.where(positive, np.minimum(0.3, outstanding / denom * 2), 0.3),
+        0.0
+    )
+    score = np.ones(n_applicants)
+    score = score - np.where(filed, 0.0, 0.5)
+    score = score - outstanding_penalty
+    score = score - np.select([delay > 30, delay > 0], [0.2, 0.1], 0.0)
+    score = score - np.where(pending, 0.2, 0.0)
+    score = score + np.where(safe['tax_paid'] > 0, 0.1, 0.0)
+    features['tax_compliance_score'] = _finite(np.clip(score, 0.0, 1.0))
+
+    # Cross-year features
+    cross_year = np.ones(n_applicants, dtype=bool) if multi_year else n_years >= 2
+    if multi_year is False:
+        cross_year[:] = False
+    features['itr_filed_last_3_years'] = np.where(cross_year, _filed_every_year(years, n_applicants), 0.0)
+    features['itr_income_growth_yoy'] = np.where(cross_year, _income_growth(years, total, n_applicants), 0.0)
+    features['itr_income_stability'] = np.where(cross_year, _income_stability(years, n_applicants), 0.0)
+
+    features['itr_income_to_bank_income_ratio'] = np.zeros(n_applicants)
+
+    # Income source reliability
+    tds = safe['tds_deducted']
+    sources = sum((safe[column] > 0).astype(np.int64) for column in (
+        'salary_income', 'business_income', 'house_property_income', 'capital_gains', 'other_income'
+    ))
+    reliability = np.full(n_applicants, 0.5)
+    reliability = reliability + np.where(tds > 0, 0.3, 0.0)
+    reliability = reliability + np.where((tds > 0) & positive & (tds / denom > 0.1), 0.1, 0.0)
+    reliability = reliability + np.where(sources >= 2, 0.1, 0.0)
+    reliability = reliability + np.where((safe['salary_income'] > 0) & salaried, 0.1, 0.0)
+    features['income_source_reliability'] = np.minimum(1.0, reliability)
+
+    features['itr_other_income'] = safe['other_income']
+    features['itr_tds_deducted'] = tds
+    features['itr_tax_refund'] = safe['tax_refund']
+
+    if not has_years.all():
+        for values in features.values():
+            values[~has_years] = 0.0
+    return features
+
+
+def _filed_every_year(years: Mapping[str, np.ndarray], n_applicants: int) -> np.ndarray:
+    """1.0 if each of the newest FILING_HISTORY_YEARS years was filed"""
+    recent = np.asarray(years['year_rank']) < FILING_HISTORY_YEARS
+    applicant = np.asarray(years['applicant'])[recent]
+    missed = np.bincount(applicant, weights=~np.asarray(years['filed'])[recent], minlength=n_applicants)
+    return (missed == 0).astype(np.float64)
+
+
+def _income_growth(years: Mapping[str, np.ndarray], current_income: np.ndarray, n_applicants: int) -> np.ndarray:
+    """Net taxable income growth over the previous year (0.0 without one)"""
+    previous = np.zeros(n_applicants)
+    rows = np.flatnonzero(np.asarray(years['year_rank']) == 1)
+    previous[np.asarray(years['applicant'])[rows]] = _finite(np.asarray(years['net_taxable_income'])[rows])
+
+    has_previous = previous > 0
+    growth = (current_income - previous) / np.where(has_previous, previous, 1.0)
+    return np.where(has_previous, _finite(growth), 0.0)
+
+
+def _income_stability(years: Mapping[str, np.ndarray], n_applicants: int) -> np.ndarray:
+    """
+    1 - min(CV, 1) of the positive net taxable incomes over all years
+    (0.0 with fewer than two)
+    """
+    income = np.asarray(years['net_taxable_income'])
+    keep = income > 0
+    applicant = np.asarray(years['applicant'])[keep]
+    income = income[keep]
+
+    counts = np.bincount(applicant, minlength=n_applicants)
+    stability = np.zeros(n_applicants)
+    groups = np.flatnonzero(counts >= 2)
+    if len(groups) == 0:
+        return stability
+
+    # Rows are grouped by applicant, in year order
+    sizes = counts[groups]
+    x = income[counts[applicant] >= 2]
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        mean = _group_sums(x, offsets, sizes) / sizes
+        deviation = x - np.repeat(mean, sizes)
+        std = np.sqrt(_group_sums(deviation * deviation, offsets, sizes) / sizes)
+
+        # np.sum switches to pairwise summation from 8 values on
+        for j in np.flatnonzero(sizes >= 8):
+            values = x[offsets[j]:offsets[j] + sizes[j]]
+            mean[j], std[j] = np.mean(values), np.std(values)
+
+        cv = std / mean
+    stability[groups] = np.where(mean > 0, _finite(1.0 - np.minimum(cv, 1.0)), 0.0)
+    return stability
+
+
+def _group_sums(x: np.ndarray, offsets: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """
+    Sum of each group, adding left to right as np.sum does for fewer than
+    8 values (np.add.reduceat associates differently)
+    """
+    grid = np.zeros((sizes.max(), len(sizes)))
+    grid[np.arange(len(x)) - np.repeat(offsets, sizes), np.repeat(np.arange(len(sizes)), sizes)] = x
+    return np.add.reduce(grid, axis=0)
+
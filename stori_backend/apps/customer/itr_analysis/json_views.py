@@ -8,9 +8,14 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 
-from .analyzer import extract_itr_features_single_year, load_itr_json
-import tempfile
-import os
+from config.result_cache import cached_response
+from .analyzer import (
+    ITR_FEATURE_NAMES,
+    build_itr_feature_matrix,
+    extract_itr_features_single_year,
+    parse_itr_json,
+    sort_itr_years,
+)
 
 
 class ITRJSONAnalysisView(APIView):
@@ -21,6 +26,17 @@ class ITRJSONAnalysisView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        """Serve repeated submissions of the same ITR from the result cache"""
+        return cached_response(
+            request,
+            namespace='itr_json',
+            payload=request.data,
+            compute=lambda: self._analyze(request),
+            code_modules=(__name__, 'apps.customer.itr_analysis.analyzer',
+                          'apps.customer.itr_analysis.feature_engine')
+        )
+    
+    def _analyze(self, request):
         """
         Analyze ITR from JSON data
         
@@ -59,19 +75,8 @@ class ITRJSONAnalysisView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Load and standardize ITR data
-            # Create a temporary file to use with load_itr_json
             try:
-                import json
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp_file:
-                    json.dump(itr_data, tmp_file)
-                    tmp_path = tmp_file.name
-                
-                try:
-                    standardized_itr = load_itr_json(tmp_path)
-                finally:
-                    # Clean up temp file
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
+                standardized_itr = parse_itr_json(itr_data)
             except Exception as e:
                 return Response({
                     'success': False,
@@ -137,3 +142,100 @@ class ITRJSONAnalysisView(APIView):
                 'message': f'Analysis failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+# Applicants accepted per batch request
+MAX_BATCH_APPLICANTS = 1000
+
+
+class ITRJSONBatchAnalysisView(APIView):
+    """
+    Batch JSON analysis: ITR feature vectors for many applicants in one call
+    All applicants' years are scored together by the columnar feature engine
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        """
+        Request Body:
+        {
+            "applicants": [
+                {
+                    "applicant_id": "APP-1",
+                    "itrs": [{"ITR": {"ITR1": {...}}}, {"ITR": {"ITR4": {...}}}],
+                    "bank_statement_annual_income": 600000    (optional)
+                },
+                ...
+            ]
+        }
+        
+        Response data.results holds, in request order, each applicant's
+        features (ITR_FEATURE_NAMES, as build_itr_feature_vector), the
+        assessment years used (newest first) and the ITRs that could not
+        be parsed.
+        """
+        applicants = request.data.get('applicants') if isinstance(request.data, dict) else None
+        if not isinstance(applicants, list) or not applicants:
+            return Response({
+                'success': False,
+                'message': 'Expected JSON object with a non-empty "applicants" list'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(applicants) > MAX_BATCH_APPLICANTS:
+            return Response({
+                'success': False,
+                'message': f'At most {MAX_BATCH_APPLICANTS} applicants per request (got {len(applicants)})'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            bundles, bank_incomes, errors = [], [], []
+            for i, applicant in enumerate(applicants):
+                if not isinstance(applicant, dict) or not isinstance(applicant.get('itrs'), list):
+                    return Response({
+                        'success': False,
+                        'message': f'applicants[{i}]: expected an object with an "itrs" list'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                bank_income = applicant.get('bank_statement_annual_income')
+                if bank_income is not None and (isinstance(bank_income, bool) or not isinstance(bank_income, (int, float))):
+                    return Response({
+                        'success': False,
+                        'message': f'applicants[{i}]: bank_statement_annual_income must be a number'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                
+                years, applicant_errors = [], []
+                for j, itr_json in enumerate(applicant['itrs']):
+                    try:
+                        years.append(parse_itr_json(itr_json))
+                    except Exception as e:
+                        applicant_errors.append({'index': j, 'message': f'Failed to parse ITR data: {str(e)}'})
+                bundles.append(sort_itr_years(years))
+                errors.append(applicant_errors)
+                bank_incomes.append(bank_income)
+            
+            features = build_itr_feature_matrix(bundles, bank_incomes).to_dict('records')
+            
+            results = [
+                {
+                    'applicant_id': applicant.get('applicant_id', i),
+                    'features': applicant_features,
+                    'assessment_years': [itr.get('assessment_year') for itr in years],
+                    'errors': applicant_errors,
+                }
+                for i, (applicant, years, applicant_features, applicant_errors)
+                in enumerate(zip(applicants, bundles, features, errors))
+            ]
+            
+            return Response({
+                'success': True,
+                'message': f'{len(results)} applicants analyzed',
+                'data': {
+                    'feature_names': ITR_FEATURE_NAMES,
+                    'results': results,
+                    'analysis_date': str(timezone.now())
+                }
+            }, status=status.HTTP_200_OK)
+            
+        except Exception as e:
+            return Response({
+                'success': False,
+                'message': f'Analysis failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .analyzer import (
+    ITR_FEATURE_NAMES,
+    build_itr_feature_matrix,
+    extract_itr_features_batch,
+    extract_itr_features_multi_year,
+    extract_itr_features_single_year,
+)
+from .json_views import ITRJSONBatchAnalysisView
+
+
+def itr_year(year, net_income, salary=0.0, tds=0.0, outstanding=0.0, filed=True,
+             filing_date='2024-07-31', due_date='2024-07-31', **income):
+    """Standardized ITR dict as load_itr_json returns it"""
+    return {
+        'assessment_year': year,
+        'filing_date': filing_date,
+        'due_date': due_date,
+        'income': {'net_taxable_income': net_income, 'gross_total_income': net_income * 1.1,
+                   'salary_income': salary, **income},
+        'deductions': {'total_deductions': 150000.0},
+        'tax': {'tax_paid': 50000.0, 'tds_deducted': tds, 'tax_outstanding': outstanding},
+        'filing_status': {'filed': filed, 'revised': False},
+    }
+
+
+def itr1_json(year, net_income, salary):
+    """Minimal Income Tax Portal ITR-1 document"""
+    return {'ITR': {'ITR1': {
+        'Form_ITR1': {'AssessmentYear': year},
+        'ITR1_IncomeDeductions': {'GrossSalary': salary, 'GrossTotIncome': net_income, 'TotalIncome': net_income},
+        'TaxPaid': {'TaxesPaid': {'TotalTaxesPaid': 25000}},
+    }}}
+
+
+class ITRFeatureEngineTests(SimpleTestCase):
+
+    def test_single_year_features(self):
+        features = extract_itr_features_single_year(
+            itr_year('2024-25', 1000000.0, salary=900000.0, tds=120000.0, outstanding=10000.0,
+                     filing_date='2024-08-20', due_date='2024-07-31')
+        )
+
+        self.assertEqual(features['income_type_salaried'], 1.0)
+        self.assertEqual(features['itr_deductions_to_income_ratio'], 0.15)
+        self.assertEqual(features['itr_filing_delay_days'], 20.0)
+        # 1.0 - 0.02 (outstanding) - 0.1 (late) + 0.1 (tax paid)
+        self.assertAlmostEqual(features['tax_compliance_score'], 0.98)
+        # 0.5 + 0.3 (TDS) + 0.1 (TDS > 10%) + 0.1 (salaried)
+        self.assertAlmostEqual(features['income_source_reliability'], 1.0)
+        self.assertEqual(features['itr_filed_last_3_years'], 0.0)
+        self.assertEqual(features['itr_income_growth_yoy'], 0.0)
+
+    def test_multi_year_growth_stability_and_filing(self):
+        years = [itr_year('2024-25', 1200000.0), itr_year('2023-24', 1000000.0),
+                 itr_year('2022-23', 800000.0), itr_year('2021-22', 0.0, filed=False)]
+
+        features = extract_itr_features_multi_year(years)
+
+        self.assertAlmostEqual(features['itr_income_growth_yoy'], 0.2)
+        # CV of (1.2M, 1.0M, 0.8M); the zero-income year is left out
+        self.assertAlmostEqual(features['itr_income_stability'], 1 - 0.2 * (2 / 3) ** 0.5)
+        # Only the newest three years count
+        self.assertEqual(features['itr_filed_last_3_years'], 1.0)
+
+        years[1]['filing_status']['filed'] = False
+        self.assertEqual(extract_itr_features_multi_year(years)['itr_filed_last_3_years'], 0.0)
+
+    def test_batch_matches_per_applicant_calls(self):
+        bundles = [
+            [itr_year('2024-25', 1500000.0, salary=400000.0, business_income=1100000.0),
+             itr_year('2023-24', 1300000.0)],
+            [itr_year('2024-25', 600000.0, salary=600000.0, tds=30000.0)],
+            [],
+            [itr_year('2024-25', 0.0), itr_year('2023-24', 500000.0), itr_year('2022-23', 450000.0)],
+        ]
+
+        batch = extract_itr_features_batch(bundles)
+
+        self.assertEqual(batch[0], extract_itr_features_multi_year(bundles[0]))
+        self.assertEqual(batch[1], extract_itr_features_single_year(bundles[1][0]))
+        self.assertEqual(batch[2], {name: 0.0 for name in ITR_FEATURE_NAMES})
+        self.assertEqual(batch[3], extract_itr_features_multi_year(bundles[3]))
+        self.assertEqual(list(batch[0]), list(extract_itr_features_single_year(bundles[0][0])))
+
+    def test_feature_matrix_reconciles_with_bank_income(self):
+        bundles = [[itr_year('2024-25', 900000.0)], [itr_year('2024-25', 900000.0)], []]
+
+        matrix = build_itr_feature_matrix(bundles, [1000000.0, None, 1000000.0])
+
+        self.assertEqual(list(matrix.columns), ITR_FEATURE_NAMES)
+        self.assertEqual(matrix['itr_income_to_bank_income_ratio'].tolist(), [0.9, 0.0, 0.0])
+        self.assertEqual(matrix.iloc[2].sum(), 0.0)
+
+
+class ITRJSONBatchAnalysisViewTests(SimpleTestCase):
+
+    def post(self, payload):
+        request = APIRequestFactory().post('/api/customer/itr/analyze-json/batch/', payload, format='json')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return ITRJSONBatchAnalysisView.as_view()(request)
+
+    def test_applicants_scored_in_request_order(self):
+        response = self.post({'applicants': [
+            {'applicant_id': 'A', 'itrs': [itr1_json('2023-24', 800000, 800000),
+                                           itr1_json('2024-25', 1000000, 1000000)],
+             'bank_statement_annual_income': 1000000},
+            {'applicant_id': 'B', 'itrs': [{'ITR': {'ITR2': {}}}]},
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['data']['results']
+        self.assertEqual(first['assessment_years'], ['2024-25', '2023-24'])
+        self.assertAlmostEqual(first['features']['itr_income_growth_yoy'], 0.25)
+        self.assertEqual(first['features']['itr_income_to_bank_income_ratio'], 1.0)
+        self.assertEqual(second['applicant_id'], 'B')
+        self.assertEqual(second['errors'][0]['index'], 0)
+        self.assertEqual(set(second['features'].values()), {0.0})
+
+    def test_rejects_invalid_payloads(self):
+        self.assertEqual(self.post({'applicants': []}).status_code, 400)
+        self.assertEqual(self.post({'applicants': [{'itrs': 'x'}]}).status_code, 400)
+        response = self.post({'applicants': [{'itrs': [], 'bank_statement_annual_income': 'lots'}]})
+        self.assertEqual(response.status_code, 400)
@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import ITRAnalysisViewSet
-from .json_views import ITRJSONAnalysisView
+from .json_views import ITRJSONAnalysisView, ITRJSONBatchAnalysisView
 
 router = DefaultRouter()
 router.register(r'', ITRAnalysisViewSet, basename='itr-analysis')
@@ -9,6 +9,7 @@ router.register(r'', ITRAnalysisViewSet, basename='itr-analysis')
 urlpatterns = [
     # JSON-based analysis (for Account Aggregator)
     path('analyze-json/', ITRJSONAnalysisView.as_view(), name='itr-analyze-json'),
+    path('analyze-json/batch/', ITRJSONBatchAnalysisView.as_view(), name='itr-analyze-json-batch'),
     
     # File-based analysis (original)
     path('', include(router.urls)),
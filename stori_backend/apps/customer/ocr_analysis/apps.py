@@ -1,9 +1,28 @@
+import logging
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class OcrAnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.customer.ocr_analysis'
     verbose_name = 'OCR Analysis'
-
-
+    
+    def ready(self):
+        """Load OCR engines / face models when the worker starts (KYC_OCR_WARMUP, FACE_MATCH_WARMUP)"""
+        from django.conf import settings
+        
+        if getattr(settings, 'KYC_OCR_WARMUP', False):
+            from .kyc_ocr_views import get_ocr_engine_manager
+            health = get_ocr_engine_manager().warm_up()
+            logger.info(f"OCR engines warmed: {health}")
+        
+        if getattr(settings, 'FACE_MATCH_WARMUP', False):
+            try:
+                from .face_match import FaceModelPool
+            except ImportError as e:
+                logger.warning(f"Face matching unavailable, skipping warm-up: {str(e)}")
+                return
+            FaceModelPool.get_instance().warm_up()
@@ -6,9 +6,13 @@ Uses multiple models for high accuracy face verification
 
 import os
 import base64
+import hashlib
 import logging
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Union, Tuple
-from pathlib import Path
 import cv2
 import numpy as np
 from PIL import Image
@@ -19,6 +23,8 @@ try:
 except ImportError:
     raise ImportError("DeepFace not installed. Run: pip install deepface")
 
+from .image_pipeline import decode_image, jpeg_dimensions, resize_to_max
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -53,6 +59,113 @@ class FaceMatchConfig:
     SIMILARITY_THRESHOLD = 0.40  # Lower is more similar (for cosine distance)
     ENFORCE_DETECTION = True  # Raise error if no face detected
     
+    # Pass decoded arrays straight to the embedding model instead of
+    # round-tripping through JPEG files on disk
+    IN_MEMORY_PIPELINE = True
+    
+    # Face embeddings kept per (image content, model, detector) so a selfie
+    # matched against several documents / models is embedded only once
+    EMBEDDING_CACHE_SIZE = 256
+    
+    # Models loaded when a worker starts (see FaceModelPool.warm_up)
+    WARM_MODELS = ['Facenet512']
+    
+    # Longest image side kept for detection; larger photos are decoded at
+    # reduced resolution / downscaled before any filtering
+    MAX_IMAGE_DIMENSION = 1600
+
+
+def _find_threshold(model_name: str, distance_metric: str) -> float:
+    """Look up DeepFace's verification threshold for a model/metric pair"""
+    try:
+        from deepface.modules.verification import find_threshold
+        return float(find_threshold(model_name, distance_metric))
+    except ImportError:
+        # Older DeepFace releases
+        from deepface.commons import distance as dst
+        return float(dst.findThreshold(model_name, distance_metric))
+
+
+def compute_distances(
+    source: np.ndarray,
+    candidates: np.ndarray,
+    distance_metric: str = 'cosine'
+) -> np.ndarray:
+    """
+    Vectorized distance between every source and candidate embedding
+    
+    Args:
+        source: Embeddings of shape (n, d) or (d,)
+        candidates: Embeddings of shape (m, d) or (d,)
+        distance_metric: 'cosine', 'euclidean' or 'euclidean_l2'
+        
+    Returns:
+        Distance matrix of shape (n, m)
+    """
+    a = np.atleast_2d(np.asarray(source, dtype=np.float64))
+    b = np.atleast_2d(np.asarray(candidates, dtype=np.float64))
+    
+    if distance_metric in ('cosine', 'euclidean_l2'):
+        a = a / np.linalg.norm(a, axis=1, keepdims=True).clip(min=1e-12)
+        b = b / np.linalg.norm(b, axis=1, keepdims=True).clip(min=1e-12)
+    
+    if distance_metric == 'cosine':
+        return 1.0 - a @ b.T
+    if distance_metric in ('euclidean', 'euclidean_l2'):
+        sq = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+        return np.sqrt(np.maximum(sq, 0.0))
+    
+    raise ValueError(f"Unsupported distance metric: {distance_metric}")
+
+
+class FaceEmbeddingCache:
+    """Thread-safe LRU cache of face embeddings keyed by image content and model"""
+    
+    def __init__(self, max_size: int = FaceMatchConfig.EMBEDDING_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def content_hash(image: np.ndarray) -> str:
+        """Hash of the decoded pixels (shape included)"""
+        digest = hashlib.blake2b(np.ascontiguousarray(image).tobytes(), digest_size=16)
+        digest.update(str(image.shape).encode())
+        return digest.hexdigest()
+    
+    def get(self, key: Tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            embeddings = self._entries.get(key)
+            if embeddings is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embeddings
+    
+    def put(self, key: Tuple, embeddings: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = embeddings
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# Shared by every matcher in the process
+embedding_cache = FaceEmbeddingCache()
+    
 
 class FaceMatchResult:
     """Result object for face matching"""
@@ -118,7 +231,8 @@ class FaceMatcher:
         model_name: str = FaceMatchConfig.DEFAULT_MODEL,
         detector_backend: str = FaceMatchConfig.DEFAULT_BACKEND,
         distance_metric: str = 'cosine',
-        enforce_detection: bool = FaceMatchConfig.ENFORCE_DETECTION
+        enforce_detection: bool = FaceMatchConfig.ENFORCE_DETECTION,
+        in_memory: bool = FaceMatchConfig.IN_MEMORY_PIPELINE
     ):
         """
         Initialize Face Matcher
@@ -128,11 +242,14 @@ class FaceMatcher:
             detector_backend: Backend for face detection
             distance_metric: Distance metric ('cosine', 'euclidean', 'euclidean_l2')
             enforce_detection: Whether to raise error if face not detected
+            in_memory: Embed decoded arrays directly (falls back to
+                       request-unique scratch files if this fails)
         """
         self.model_name = model_name
         self.detector_backend = detector_backend
         self.distance_metric = distance_metric
         self.enforce_detection = enforce_detection
+        self.in_memory = in_memory
         
         logger.info(f"Initialized FaceMatcher with model: {model_name}, "
                    f"backend: {detector_backend}")
@@ -155,6 +272,10 @@ class FaceMatcher:
             # If it's a file path
             if isinstance(image_input, str):
                 if os.path.exists(image_input):
+                    with open(image_input, 'rb') as f:
+                        image_data = f.read()
+                    if jpeg_dimensions(image_data):
+                        return self._decode_jpeg(image_data)
                     img = cv2.imread(image_input)
                     if img is None:
                         raise ValueError(f"Could not read image from {image_input}")
@@ -163,6 +284,8 @@ class FaceMatcher:
                 # Try to decode as base64
                 try:
                     image_data = base64.b64decode(image_input)
+                    if jpeg_dimensions(image_data):
+                        return self._decode_jpeg(image_data)
                     image = Image.open(io.BytesIO(image_data))
                     return np.array(image)
                 except Exception:
@@ -170,6 +293,8 @@ class FaceMatcher:
             
             # If it's bytes
             if isinstance(image_input, bytes):
+                if jpeg_dimensions(image_input):
+                    return self._decode_jpeg(image_input)
                 image = Image.open(io.BytesIO(image_input))
                 return np.array(image)
             
@@ -179,16 +304,27 @@ class FaceMatcher:
             logger.error(f"Error loading image: {str(e)}")
             raise
     
+    @staticmethod
+    def _decode_jpeg(image_data: bytes) -> np.ndarray:
+        """Decode JPEG bytes to RGB, at reduced resolution when large enough"""
+        img = decode_image(image_data, FaceMatchConfig.MAX_IMAGE_DIMENSION)
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """
         Preprocess image for better face detection
         
+        The image is downscaled to FaceMatchConfig.MAX_IMAGE_DIMENSION first so
+        blur and CLAHE run at target resolution rather than on the raw photo.
+        
         Args:
             image: Input image as numpy array
             
         Returns:
             Preprocessed image
         """
+        image = resize_to_max(image, FaceMatchConfig.MAX_IMAGE_DIMENSION)
+        
         # Convert to RGB if needed
         if len(image.shape) == 2:  # Grayscale
             image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
@@ -229,70 +365,193 @@ class FaceMatcher:
         try:
             logger.info(f"Starting face verification for {document_type}")
             
-            # Load and preprocess images
+            # Load images
             img1 = self._load_image(user_image)
             img2 = self._load_image(document_image)
             
-            img1 = self._preprocess_image(img1)
-            img2 = self._preprocess_image(img2)
+            match_result = self.verify_loaded(img1, img2, document_type)
             
-            # Save temporarily for DeepFace processing
-            temp_dir = Path("temp_face_match")
-            temp_dir.mkdir(exist_ok=True)
+            logger.info(f"Verification complete: {match_result}")
+            return match_result
+            
+        except Exception as e:
+            logger.error(f"Error during face verification: {str(e)}")
+            raise
+    
+    def verify_loaded(
+        self,
+        img1: np.ndarray,
+        img2: np.ndarray,
+        document_type: str = "Unknown"
+    ) -> FaceMatchResult:
+        """
+        Verify two already-decoded images (embeddings come from the cache when possible)
+        
+        Args:
+            img1: User's photo as returned by _load_image
+            img2: Document image as returned by _load_image
+            document_type: Type of document for logging
             
-            img1_path = temp_dir / "user_temp.jpg"
-            img2_path = temp_dir / f"doc_temp_{document_type}.jpg"
+        Returns:
+            FaceMatchResult object with matching details
+        """
+        if self.in_memory:
+            try:
+                distance, threshold = self._verify_in_memory(img1, img2)
+                pipeline = 'in_memory'
+            except (TypeError, AttributeError) as e:
+                # DeepFace build without array input support
+                logger.warning(f"In-memory face match unavailable ({e}), "
+                               f"using scratch files")
+                pipeline = 'scratch_files'
+                distance, threshold = self._verify_with_scratch_files(img1, img2)
+        else:
+            pipeline = 'scratch_files'
+            distance, threshold = self._verify_with_scratch_files(img1, img2)
+        
+        return self._build_result(distance, threshold, document_type, pipeline)
+    
+    def _build_result(
+        self,
+        distance: float,
+        threshold: float,
+        document_type: str,
+        pipeline: str
+    ) -> FaceMatchResult:
+        """Turn a face distance into a FaceMatchResult"""
+        # Calculate confidence score (0-100)
+        
+        # Convert distance to confidence (inverse relationship)
+        if self.distance_metric == 'cosine':
+            # Cosine distance: 0 = identical, 1 = completely different
+            confidence = max(0, min(100, (1 - distance) * 100))
+        else:
+            # Euclidean: lower is better
+            confidence = max(0, min(100, (1 - distance / threshold) * 100))
+        
+        return FaceMatchResult(
+            is_match=distance <= threshold,
+            confidence=confidence,
+            distance=distance,
+            threshold=threshold,
+            model_used=self.model_name,
+            document_type=document_type,
+            details={
+                'detector_backend': self.detector_backend,
+                'distance_metric': self.distance_metric,
+                'pipeline': pipeline
+            }
+        )
+    
+    def _cache_key(self, image: np.ndarray) -> Tuple:
+        return (
+            FaceEmbeddingCache.content_hash(image),
+            self.model_name,
+            self.detector_backend,
+            self.enforce_detection
+        )
+    
+    def _represent(self, images: Union[np.ndarray, List[np.ndarray]]) -> List:
+        """Run DeepFace.represent on preprocessed RGB image(s)"""
+        if isinstance(images, list):
+            # DeepFace works on OpenCV's BGR channel order
+            img_path = [cv2.cvtColor(img, cv2.COLOR_RGB2BGR) for img in images]
+        else:
+            img_path = cv2.cvtColor(images, cv2.COLOR_RGB2BGR)
+        return DeepFace.represent(
+            img_path=img_path,
+            model_name=self.model_name,
+            detector_backend=self.detector_backend,
+            enforce_detection=self.enforce_detection
+        )
+    
+    @staticmethod
+    def _stack(faces: List[Dict]) -> np.ndarray:
+        return np.asarray([face['embedding'] for face in faces], dtype=np.float64)
+    
+    def embed_faces(self, image: np.ndarray) -> np.ndarray:
+        """
+        Compute embeddings for every face detected in an image
+        
+        Args:
+            image: Image as returned by _load_image (preprocessed here on cache miss)
+            
+        Returns:
+            Array of shape (n_faces, embedding_dim)
+        """
+        key = self._cache_key(image)
+        embeddings = embedding_cache.get(key)
+        if embeddings is None:
+            embeddings = self._stack(self._represent(self._preprocess_image(image)))
+            embedding_cache.put(key, embeddings)
+        return embeddings
+    
+    def embed_many(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        Embed several images, running all cache misses through one model forward pass
+        
+        Args:
+            images: Images as returned by _load_image
+            
+        Returns:
+            One (n_faces, embedding_dim) array per input image
+        """
+        keys = [self._cache_key(img) for img in images]
+        results = [embedding_cache.get(key) for key in keys]
+        missing = [i for i, emb in enumerate(results) if emb is None]
+        
+        if missing:
+            batch = self._represent([self._preprocess_image(images[i]) for i in missing])
+            if len(missing) == 1 and batch and isinstance(batch[0], dict):
+                # Single-image batches come back unwrapped on some DeepFace versions
+                batch = [batch]
+            for i, faces in zip(missing, batch):
+                results[i] = self._stack(faces)
+                embedding_cache.put(keys[i], results[i])
+        
+        return results
+    
+    def _verify_in_memory(self, img1: np.ndarray, img2: np.ndarray) -> Tuple[float, float]:
+        """
+        Compare all face pairs of two images in one vectorized step
+        
+        Returns:
+            (distance, threshold) for the closest pair of faces
+        """
+        return self._compare_embeddings(self.embed_faces(img1), self.embed_faces(img2))
+    
+    def _compare_embeddings(self, emb1: np.ndarray, emb2: np.ndarray) -> Tuple[float, float]:
+        distances = compute_distances(emb1, emb2, self.distance_metric)
+        threshold = _find_threshold(self.model_name, self.distance_metric)
+        return float(distances.min()), threshold
+    
+    def _verify_with_scratch_files(self, img1: np.ndarray, img2: np.ndarray) -> Tuple[float, float]:
+        """
+        Fallback: hand DeepFace file paths inside a request-unique scratch directory
+        
+        Returns:
+            (distance, threshold) reported by DeepFace.verify
+        """
+        img1 = self._preprocess_image(img1)
+        img2 = self._preprocess_image(img2)
+        
+        with tempfile.TemporaryDirectory(prefix="face_match_") as temp_dir:
+            img1_path = os.path.join(temp_dir, "user.jpg")
+            img2_path = os.path.join(temp_dir, "document.jpg")
             
-            cv2.imwrite(str(img1_path), cv2.cvtColor(img1, cv2.COLOR_RGB2BGR))
-            cv2.imwrite(str(img2_path), cv2.cvtColor(img2, cv2.COLOR_RGB2BGR))
+            cv2.imwrite(img1_path, cv2.cvtColor(img1, cv2.COLOR_RGB2BGR))
+            cv2.imwrite(img2_path, cv2.cvtColor(img2, cv2.COLOR_RGB2BGR))
             
-            # Perform face verification
             result = DeepFace.verify(
-                img1_path=str(img1_path),
-                img2_path=str(img2_path),
+                img1_path=img1_path,
+                img2_path=img2_path,
                 model_name=self.model_name,
                 detector_backend=self.detector_backend,
                 distance_metric=self.distance_metric,
                 enforce_detection=self.enforce_detection
             )
-            
-            # Clean up temp files
-            img1_path.unlink(missing_ok=True)
-            img2_path.unlink(missing_ok=True)
-            
-            # Calculate confidence score (0-100)
-            distance = result['distance']
-            threshold = result['threshold']
-            
-            # Convert distance to confidence (inverse relationship)
-            if self.distance_metric == 'cosine':
-                # Cosine distance: 0 = identical, 1 = completely different
-                confidence = max(0, min(100, (1 - distance) * 100))
-            else:
-                # Euclidean: lower is better
-                confidence = max(0, min(100, (1 - distance / threshold) * 100))
-            
-            is_match = result['verified']
-            
-            match_result = FaceMatchResult(
-                is_match=is_match,
-                confidence=confidence,
-                distance=distance,
-                threshold=threshold,
-                model_used=self.model_name,
-                document_type=document_type,
-                details={
-                    'detector_backend': self.detector_backend,
-                    'distance_metric': self.distance_metric
-                }
-            )
-            
-            logger.info(f"Verification complete: {match_result}")
-            return match_result
-            
-        except Exception as e:
-            logger.error(f"Error during face verification: {str(e)}")
-            raise
+        
+        return float(result['distance']), float(result['threshold'])
     
     def verify_multiple_documents(
         self,
@@ -303,6 +562,10 @@ class FaceMatcher:
         """
         Verify user face against multiple documents
         
+        The selfie is embedded once and all document faces are embedded in a
+        single batched forward pass; each document then costs one distance
+        computation.
+        
         Args:
             user_image: User's photo
             documents: Dictionary with document_type as key and image as value
@@ -313,16 +576,39 @@ class FaceMatcher:
             Dictionary with document_type as key and FaceMatchResult as value
         """
         results = {}
+        loaded = {}
+        
+        try:
+            user_img = self._load_image(user_image)
+        except Exception as e:
+            logger.error(f"Error loading user image: {str(e)}")
+            return {doc_type: None for doc_type in documents}
         
         for doc_type, doc_image in documents.items():
             try:
-                result = self.verify_faces(user_image, doc_image, doc_type)
+                loaded[doc_type] = self._load_image(doc_image)
+            except Exception as e:
+                logger.error(f"Error verifying {doc_type}: {str(e)}")
+                results[doc_type] = None
+        
+        if self.in_memory and loaded:
+            try:
+                self.embed_many([user_img] + list(loaded.values()))
+            except Exception as e:
+                # One bad image fails the whole batch; per-document calls below
+                # isolate it while reusing whatever was already cached
+                logger.warning(f"Batched embedding failed ({e}), embedding documents individually")
+        
+        for doc_type, doc_img in loaded.items():
+            try:
+                result = self.verify_loaded(user_img, doc_img, doc_type)
+                logger.info(f"Verification complete: {result}")
                 results[doc_type] = result
             except Exception as e:
                 logger.error(f"Error verifying {doc_type}: {str(e)}")
                 results[doc_type] = None
         
-        return results
+        return {doc_type: results[doc_type] for doc_type in documents}
     
     def get_detailed_verification_report(
         self,
@@ -414,6 +700,9 @@ class MultiModelFaceMatcher:
         """
         Verify faces using multiple models and return consensus result
         
+        Images are decoded once; each model then works from cached
+        embeddings, so the consensus is a set of distance comparisons.
+        
         Args:
             user_image: User's photo
             document_image: Document image
@@ -422,11 +711,48 @@ class MultiModelFaceMatcher:
         Returns:
             Dictionary with consensus result and individual model results
         """
+        img1 = self.matchers[0]._load_image(user_image)
+        img2 = self.matchers[0]._load_image(document_image)
+        return self._consensus(img1, img2, document_type)
+    
+    def verify_documents_consensus(
+        self,
+        user_image: Union[str, bytes, np.ndarray],
+        documents: Dict[str, Union[str, bytes, np.ndarray]]
+    ) -> Dict[str, Dict]:
+        """
+        Consensus verification of one selfie against several documents
+        
+        Each model embeds the selfie and all documents in one batched pass.
+        
+        Args:
+            user_image: User's photo
+            documents: Dictionary with document_type as key and image as value
+            
+        Returns:
+            Dictionary with document_type as key and consensus result as value
+        """
+        loader = self.matchers[0]
+        user_img = loader._load_image(user_image)
+        loaded = {doc_type: loader._load_image(img) for doc_type, img in documents.items()}
+        
+        for matcher in self.matchers:
+            try:
+                matcher.embed_many([user_img] + list(loaded.values()))
+            except Exception as e:
+                logger.warning(f"Batched embedding failed for {matcher.model_name}: {str(e)}")
+        
+        return {
+            doc_type: self._consensus(user_img, doc_img, doc_type)
+            for doc_type, doc_img in loaded.items()
+        }
+    
+    def _consensus(self, img1: np.ndarray, img2: np.ndarray, document_type: str) -> Dict:
         results = []
         
         for matcher in self.matchers:
             try:
-                result = matcher.verify_faces(user_image, document_image, document_type)
+                result = matcher.verify_loaded(img1, img2, document_type)
                 results.append(result)
             except Exception as e:
                 logger.error(f"Error with model {matcher.model_name}: {str(e)}")
@@ -469,6 +795,77 @@ class MultiModelFaceMatcher:
             return "No Consensus"
 
 
+class FaceModelPool:
+    """
+    Singleton pool of ready-to-use matchers, one per (model, detector)
+    
+    warm_up() builds the recognition and detection models up front so the
+    first request in a worker does not pay the model-load latency.
+    """
+    
+    _instance = None
+    
+    def __init__(self):
+        self._matchers = {}
+        self._lock = threading.Lock()
+        self.load_times = {}
+    
+    @classmethod
+    def get_instance(cls) -> 'FaceModelPool':
+        """Get singleton instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def get_matcher(
+        self,
+        model_name: str = FaceMatchConfig.DEFAULT_MODEL,
+        detector_backend: str = FaceMatchConfig.DEFAULT_BACKEND
+    ) -> FaceMatcher:
+        """Shared FaceMatcher for a model/detector pair (matchers hold no request state)"""
+        key = (model_name, detector_backend)
+        with self._lock:
+            if key not in self._matchers:
+                self._matchers[key] = FaceMatcher(model_name, detector_backend)
+            return self._matchers[key]
+    
+    def warm_up(
+        self,
+        models: Optional[List[str]] = None,
+        detector_backend: str = FaceMatchConfig.DEFAULT_BACKEND
+    ) -> Dict[str, float]:
+        """
+        Load model weights into memory
+        
+        Args:
+            models: Recognition models to load (defaults to FaceMatchConfig.WARM_MODELS)
+            detector_backend: Face detector to load alongside them
+            
+        Returns:
+            Load time in seconds per model
+        """
+        for model_name in models or FaceMatchConfig.WARM_MODELS:
+            start = time.perf_counter()
+            try:
+                DeepFace.build_model(model_name)
+                self.get_matcher(model_name, detector_backend)
+                self.load_times[model_name] = round(time.perf_counter() - start, 3)
+                logger.info(f"Warmed face model {model_name} in {self.load_times[model_name]}s")
+            except Exception as e:
+                logger.error(f"Could not warm face model {model_name}: {str(e)}")
+        
+        if detector_backend != 'skip':
+            try:
+                DeepFace.build_model(task='face_detector', model_name=detector_backend)
+            except TypeError:
+                # Older DeepFace releases build detectors lazily
+                pass
+            except Exception as e:
+                logger.error(f"Could not warm face detector {detector_backend}: {str(e)}")
+        
+        return dict(self.load_times)
+
+
 # Convenience functions for easy usage
 
 def verify_identity_documents(
@@ -506,17 +903,13 @@ def verify_identity_documents(
     # Create matcher and verify
     if use_multi_model:
         matcher = MultiModelFaceMatcher()
-        results = {}
-        for doc_type, doc_image in documents.items():
-            results[doc_type] = matcher.verify_faces_consensus(
-                user_photo_path, doc_image, doc_type
-            )
+        results = matcher.verify_documents_consensus(user_photo_path, documents)
         return {
             'verification_type': 'multi_model_consensus',
             'results': results
         }
     else:
-        matcher = FaceMatcher()
+        matcher = FaceModelPool.get_instance().get_matcher()
         return matcher.get_detailed_verification_report(user_photo_path, documents)
 
 
@@ -0,0 +1,207 @@
+"""
+Downscale-first image pipeline for KYC OCR and face matching
+
+Phone photos arrive at 8-12MP while OCR and face models work at ~2000px or
+less. Everything expensive (bilateral filter, blur, CLAHE) therefore runs
+after the image has been reduced:
+
+1. JPEGs are decoded at 1/2, 1/4 or 1/8 scale (cv2.IMREAD_REDUCED_*) when the
+   reduced image is still at least the target size
+2. The image is resized to the target maximum dimension
+3. Document images are cropped to the detected card region
+4. Filters run on the (much smaller) result
+"""
+import io
+import time
+import logging
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (scale divisor, imdecode flag) from largest reduction to smallest
+REDUCED_DECODE_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+]
+
+# Card crop is only trusted if it covers a plausible share of the photo
+MIN_ROI_AREA_RATIO = 0.20
+MAX_ROI_AREA_RATIO = 0.95
+ROI_MARGIN_RATIO = 0.03
+ROI_DETECTION_DIMENSION = 500
+
+
+class StageTimer:
+    """Collects per-stage timings (ms) for one image"""
+
+    def __init__(self):
+        self.timings = {}
+        self._start = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = round((now - self._start) * 1000, 2)
+        self._start = now
+
+
+def jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG header without decoding pixels
+
+    Returns:
+        (width, height), or None if data is not a parseable JPEG
+    """
+    if data[:2] != b'\xff\xd8':
+        return None
+
+    stream = io.BytesIO(data)
+    stream.seek(2)
+    while True:
+        marker = stream.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        # SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC) carry the frame size
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            segment = stream.read(7)
+            if len(segment) < 7:
+                return None
+            height = int.from_bytes(segment[3:5], 'big')
+            width = int.from_bytes(segment[5:7], 'big')
+            return width, height
+        length = stream.read(2)
+        if len(length) < 2:
+            return None
+        stream.seek(int.from_bytes(length, 'big') - 2, io.SEEK_CUR)
+
+
+def decode_image(data: bytes, max_dimension: Optional[int] = None) -> np.ndarray:
+    """
+    Decode image bytes to a 3-channel BGR array, using reduced-resolution
+    JPEG decoding when the target size allows it
+
+    Args:
+        data: Encoded image bytes
+        max_dimension: Target maximum dimension (None = full resolution)
+
+    Returns:
+        BGR image (not yet resized to max_dimension)
+    """
+    nparr = np.frombuffer(data, np.uint8)
+    flag = cv2.IMREAD_COLOR
+
+    if max_dimension:
+        dims = jpeg_dimensions(data)
+        if dims:
+            for divisor, reduced_flag in REDUCED_DECODE_FLAGS:
+                if max(dims) // divisor >= max_dimension:
+                    flag = reduced_flag
+                    break
+
+    img = cv2.imdecode(nparr, flag)
+    if img is None:
+        raise ValueError("Invalid image file. Could not decode image.")
+    return img
+
+
+def resize_to_max(img: np.ndarray, max_dimension: int) -> np.ndarray:
+    """Downscale so the longer side is at most max_dimension (never upscales)"""
+    height, width = img.shape[:2]
+    if max(height, width) <= max_dimension:
+        return img
+    scale = max_dimension / max(height, width)
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(img, new_size, interpolation=cv2.INTER_AREA)
+
+
+def find_document_roi(img: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Locate the ID card in a photo from its outline
+
+    Detection runs on a small grayscale copy; the box is scaled back up.
+
+    Returns:
+        (x, y, w, h) in img coordinates, or None if no plausible card was found
+    """
+    height, width = img.shape[:2]
+    scale = min(1.0, ROI_DETECTION_DIMENSION / max(height, width))
+    small = cv2.resize(img, (max(1, int(width * scale)), max(1, int(height * scale))),
+                       interpolation=cv2.INTER_AREA) if scale < 1.0 else img
+
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    edges = cv2.Canny(gray, 50, 150)
+    edges = cv2.dilate(edges, np.ones((3, 3), np.uint8), iterations=2)
+
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+
+    x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    area_ratio = (w * h) / float(small.shape[0] * small.shape[1])
+    if not (MIN_ROI_AREA_RATIO <= area_ratio <= MAX_ROI_AREA_RATIO):
+        return None
+
+    # Back to full coordinates with a small safety margin
+    margin_x = int(w * ROI_MARGIN_RATIO)
+    margin_y = int(h * ROI_MARGIN_RATIO)
+    x0 = max(0, int((x - margin_x) / scale))
+    y0 = max(0, int((y - margin_y) / scale))
+    x1 = min(width, int((x + w + margin_x) / scale))
+    y1 = min(height, int((y + h + margin_y) / scale))
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def ensure_bgr(img: np.ndarray) -> np.ndarray:
+    """Normalize grayscale / BGRA images to 3-channel BGR"""
+    if len(img.shape) == 2 or img.shape[2] == 1:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    if img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+    return img
+
+
+def prepare_document_image(
+    data: bytes,
+    max_dimension: int = 2000,
+    crop_to_document: bool = True,
+    timings: Optional[Dict] = None
+) -> np.ndarray:
+    """
+    Decode -> resize -> crop to card -> denoise, for OCR
+
+    Args:
+        data: Encoded image bytes
+        max_dimension: Longest side after resizing
+        crop_to_document: Crop to the detected card outline before filtering
+        timings: Optional dict that receives per-stage timings in ms
+
+    Returns:
+        BGR image ready for OCR
+    """
+    timer = StageTimer()
+
+    img = ensure_bgr(decode_image(data, max_dimension))
+    timer.mark('decode')
+
+    img = resize_to_max(img, max_dimension)
+    timer.mark('resize')
+
+    if crop_to_document:
+        roi = find_document_roi(img)
+        if roi:
+            x, y, w, h = roi
+            img = img[y:y + h, x:x + w]
+        timer.mark('roi')
+
+    # Light denoising on color image (preserves color channels)
+    img = cv2.bilateralFilter(img, 9, 75, 75)
+    timer.mark('denoise')
+
+    if timings is not None:
+        timings.update(timer.timings)
+        timings['output_shape'] = list(img.shape[:2])
+    return img
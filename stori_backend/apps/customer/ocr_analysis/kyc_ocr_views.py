@@ -4,8 +4,11 @@ Extracts structured data from PAN and Aadhaar documents using PaddleOCR
 """
 import re
 import cv2
-import numpy as np
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -13,6 +16,10 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils import timezone
 import logging
 
+from config.result_cache import cached_response
+from .image_pipeline import prepare_document_image
+from .ocr_engines import OCREngine, OCREngineError, OCREngineManager
+
 # Disable OneDNN to avoid compatibility issues on Windows
 # Must be set before importing PaddleOCR/PaddlePaddle
 os.environ['FLAGS_onednn'] = '0'
@@ -30,11 +37,17 @@ logger = logging.getLogger(__name__)
 _paddle_ocr = None
 _easy_ocr = None
 _tesseract_ocr = None  # Tesseract OCR (no PyTorch dependency, more stable on Windows)
+_ocr_engine_manager = None  # Shared engine manager (health, pooling, metrics)
+_ocr_engine_manager_lock = threading.Lock()
 USE_EASYOCR = False  # Set to True to use EasyOCR instead of PaddleOCR
 
 # Configuration: Skip PyTorch-based OCRs if they keep failing (set to True to use only Tesseract)
 SKIP_PYTORCH_OCR = True  # Set to True to skip PaddleOCR and EasyOCR (use only Tesseract)
 
+# Preprocessing: longest image side fed to OCR, and whether to crop to the detected card
+OCR_MAX_DIMENSION = 2000
+OCR_CROP_TO_DOCUMENT = True
+
 
 def get_tesseract_ocr():
     """Get Tesseract OCR - no PyTorch dependency, most stable on Windows"""
@@ -138,48 +151,54 @@ def get_easy_ocr():
     return _easy_ocr
 
 
+def _init_paddle_ocr():
+    """Initialize a PaddleOCR instance (no fallback to other engines)"""
+    # Try to set PaddlePaddle device to CPU explicitly and disable OneDNN
+    try:
+        import paddle
+        paddle.set_device('cpu')
+        # Try to disable OneDNN in PaddlePaddle (API may vary by version)
+        try:
+            paddle.fluid.core.set_onednn_enabled(False)
+        except (AttributeError, ImportError):
+            # API might not exist in this version, try alternative
+            try:
+                import paddle.fluid as fluid
+                fluid.core.set_onednn_enabled(False)
+            except:
+                pass
+    except Exception as e:
+        # If paddle not available or method doesn't exist, continue
+        logger.debug(f"Could not set PaddlePaddle device/OneDNN settings: {str(e)}")
+    
+    from paddleocr import PaddleOCR
+    
+    # Environment variables already set at module level
+    # Initialize with minimal parameters - PaddleOCR 3.x has different API
+    try:
+        # Minimal initialization - just language
+        paddle_ocr = PaddleOCR(lang='en')
+    except TypeError:
+        # If lang parameter fails, try without any parameters
+        try:
+            paddle_ocr = PaddleOCR()
+        except Exception as e2:
+            logger.error(f"PaddleOCR initialization failed: {str(e2)}")
+            raise
+    except Exception as e:
+        logger.error(f"PaddleOCR initialization error: {str(e)}")
+        raise
+    
+    logger.info("PaddleOCR initialized successfully")
+    return paddle_ocr
+
+
 def get_paddle_ocr():
     """Get or initialize PaddleOCR instance (singleton pattern)"""
     global _paddle_ocr, USE_EASYOCR
     if _paddle_ocr is None:
         try:
-            # Try to set PaddlePaddle device to CPU explicitly and disable OneDNN
-            try:
-                import paddle
-                paddle.set_device('cpu')
-                # Try to disable OneDNN in PaddlePaddle (API may vary by version)
-                try:
-                    paddle.fluid.core.set_onednn_enabled(False)
-                except (AttributeError, ImportError):
-                    # API might not exist in this version, try alternative
-                    try:
-                        import paddle.fluid as fluid
-                        fluid.core.set_onednn_enabled(False)
-                    except:
-                        pass
-            except Exception as e:
-                # If paddle not available or method doesn't exist, continue
-                logger.debug(f"Could not set PaddlePaddle device/OneDNN settings: {str(e)}")
-            
-            from paddleocr import PaddleOCR
-            
-            # Environment variables already set at module level
-            # Initialize with minimal parameters - PaddleOCR 3.x has different API
-            try:
-                # Minimal initialization - just language
-                _paddle_ocr = PaddleOCR(lang='en')
-            except TypeError:
-                # If lang parameter fails, try without any parameters
-                try:
-                    _paddle_ocr = PaddleOCR()
-                except Exception as e2:
-                    logger.error(f"PaddleOCR initialization failed: {str(e2)}")
-                    raise
-            except Exception as e:
-                logger.error(f"PaddleOCR initialization error: {str(e)}")
-                raise
-            
-            logger.info("PaddleOCR initialized successfully")
+            _paddle_ocr = _init_paddle_ocr()
         except ImportError as e:
             error_msg = f"PaddleOCR not installed. Install with: pip install paddlepaddle paddleocr. Error: {str(e)}"
             logger.error(error_msg)
@@ -201,6 +220,70 @@ def get_paddle_ocr():
     return _paddle_ocr
 
 
+def get_ocr_engine_manager():
+    """
+    Get the per-process OCR engine manager (singleton pattern)
+    
+    Engine order follows SKIP_PYTORCH_OCR / USE_EASYOCR: PaddleOCR -> EasyOCR -> Tesseract,
+    or Tesseract only when PyTorch-based engines are skipped.
+    """
+    global _ocr_engine_manager
+    if _ocr_engine_manager is None:
+        with _ocr_engine_manager_lock:
+            if _ocr_engine_manager is None:
+                from django.conf import settings
+                
+                tesseract = OCREngine(
+                    'tesseract', get_tesseract_ocr,
+                    lambda _, img: extract_text_from_tesseract(img),
+                    thread_safe=True  # Each call runs its own tesseract process
+                )
+                if SKIP_PYTORCH_OCR:
+                    engines = [tesseract]
+                else:
+                    paddle = OCREngine(
+                        'paddleocr', _init_paddle_ocr,
+                        lambda ocr, img: extract_text_from_paddleocr(ocr.ocr(img))
+                    )
+                    easy = OCREngine(
+                        'easyocr', get_easy_ocr,
+                        lambda reader, img: extract_text_from_easyocr(reader.readtext(img))
+                    )
+                    engines = [easy, paddle, tesseract] if USE_EASYOCR else [paddle, easy, tesseract]
+                
+                _ocr_engine_manager = OCREngineManager(
+                    engines,
+                    max_concurrency=getattr(settings, 'KYC_OCR_MAX_CONCURRENCY', 2)
+                )
+    return _ocr_engine_manager
+
+
+# Python packages behind each engine (their versions go into result cache keys)
+OCR_ENGINE_PACKAGES = {
+    'paddleocr': 'paddleocr',
+    'easyocr': 'easyocr',
+    'tesseract': 'pytesseract',
+}
+
+
+@lru_cache(maxsize=1)
+def ocr_model_version():
+    """
+    Identify everything outside this code that changes OCR output:
+    engine order, engine package versions and preprocessing settings
+    """
+    from importlib import metadata
+    
+    engines = []
+    for engine in get_ocr_engine_manager().engines:
+        try:
+            version = metadata.version(OCR_ENGINE_PACKAGES.get(engine.name, engine.name))
+        except metadata.PackageNotFoundError:
+            version = 'missing'
+        engines.append(f"{engine.name}={version}")
+    return f"{','.join(engines)};max_dim={OCR_MAX_DIMENSION};crop={OCR_CROP_TO_DOCUMENT}"
+
+
 def extract_text_from_paddleocr(ocr_result):
     """
     Extract text from PaddleOCR result structure
@@ -326,12 +409,17 @@ def extract_text_from_tesseract(image_array):
         raise
 
 
-def preprocess_image(image_file):
+def preprocess_image(image_file, timings=None):
     """
     Preprocess image using OpenCV for better OCR accuracy
     
+    Downscale-first: JPEGs are decoded at reduced resolution when possible,
+    resized to OCR_MAX_DIMENSION and cropped to the detected card before the
+    bilateral filter runs (see image_pipeline.py).
+    
     Args:
         image_file: Django uploaded file
+        timings: Optional dict that receives per-stage timings in ms
         
     Returns:
         Preprocessed numpy array image (BGR format for PaddleOCR)
@@ -340,40 +428,13 @@ def preprocess_image(image_file):
     file_bytes = image_file.read()
     image_file.seek(0)  # Reset file pointer
     
-    # Convert to numpy array
-    nparr = np.frombuffer(file_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    
-    if img is None:
-        raise ValueError("Invalid image file. Could not decode image.")
-    
     # PaddleOCR 3.x expects color images (BGR format with 3 channels)
-    # Keep image in color format - minimal preprocessing
-    
-    # Ensure image has 3 channels (BGR format)
-    if len(img.shape) == 2:
-        # If grayscale, convert to BGR
-        img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-    elif len(img.shape) == 3:
-        if img.shape[2] == 4:
-            # If RGBA, convert to BGR
-            img = cv2.cvtColor(img, cv2.COLOR_RGBA2BGR)
-        elif img.shape[2] == 1:
-            # If single channel, convert to BGR
-            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-        # If already 3 channels (BGR), keep as is
-    
-    # Optional: Light denoising on color image (preserves color channels)
-    img = cv2.bilateralFilter(img, 9, 75, 75)
-    
-    # Optional: Resize if image is too large (PaddleOCR works better with reasonable sizes)
-    height, width = img.shape[:2]
-    max_dimension = 2000
-    if max(height, width) > max_dimension:
-        scale = max_dimension / max(height, width)
-        new_width = int(width * scale)
-        new_height = int(height * scale)
-        img = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    img = prepare_document_image(
+        file_bytes,
+        max_dimension=OCR_MAX_DIMENSION,
+        crop_to_document=OCR_CROP_TO_DOCUMENT,
+        timings=timings
+    )
     
     # Final check: ensure 3-channel BGR format
     if len(img.shape) != 3 or img.shape[2] != 3:
@@ -1503,6 +1564,96 @@ def extract_aadhaar_back_fields(ocr_text):
     return result
 
 
+KYC_DOCUMENT_TYPES = ['PAN', 'AADHAAR_FRONT', 'AADHAAR_BACK', 'OTHER']
+ALLOWED_IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']
+
+# Batch endpoint: multipart field name -> document type
+BATCH_DOCUMENT_FIELDS = {
+    'pan_image': 'PAN',
+    'aadhaar_front_image': 'AADHAAR_FRONT',
+    'aadhaar_back_image': 'AADHAAR_BACK',
+}
+
+
+class KYCDocumentError(Exception):
+    """Document could not be processed; carries the HTTP status to respond with"""
+    
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def ocr_failure_message(error):
+    """Human-readable message for an OCREngineError (keeps installation hints)"""
+    if len(error.attempts) == 1:
+        # Single configured engine: its own message already explains the fix
+        return error.attempts[0].get('error') or str(error)
+    return (
+        f'All OCR libraries failed. Errors: {error}\n\n'
+        'Quick Fix: Install Tesseract OCR (no PyTorch dependency):\n'
+        '1. Download: https://digi.bib.uni-mannheim.de/tesseract/tesseract-ocr-w64-setup-5.4.0.20240605.exe\n'
+        '2. Install and check "Add to PATH"\n'
+        '3. Restart server\n'
+        'Or set SKIP_PYTORCH_OCR = True in kyc_ocr_views.py to use only Tesseract'
+    )
+
+
+def extract_document_fields(document_type, ocr_text):
+    """Parse OCR text into structured fields for a document type"""
+    if document_type == 'PAN':
+        return extract_pan_fields(ocr_text)
+    elif document_type == 'AADHAAR_FRONT':
+        return extract_aadhaar_front_fields(ocr_text)
+    elif document_type == 'AADHAAR_BACK':
+        return extract_aadhaar_back_fields(ocr_text)
+    # OTHER: return raw OCR text
+    return {
+        'raw_text': ocr_text,
+        'lines': ocr_text.split('\n')
+    }
+
+
+def process_kyc_document(document_type, image_file):
+    """
+    Validate, preprocess, OCR and parse one uploaded KYC document
+    
+    Returns:
+        (extracted_data, ocr_text, ocr_report)
+        
+    Raises:
+        KYCDocumentError: With the message/status the API should return
+    """
+    # Validate file type
+    file_name = image_file.name.lower()
+    if not any(file_name.endswith(ext.lower()) for ext in ALLOWED_IMAGE_EXTENSIONS):
+        raise KYCDocumentError(f'Invalid file type. Allowed: {", ".join(ALLOWED_IMAGE_EXTENSIONS)}')
+    
+    # Preprocess image
+    preprocess_timings = {}
+    try:
+        processed_image = preprocess_image(image_file, timings=preprocess_timings)
+    except Exception as e:
+        logger.error(f"Image preprocessing failed: {str(e)}")
+        raise KYCDocumentError(f'Image preprocessing failed: {str(e)}')
+    
+    # Run OCR through the engine manager (known-broken engines are skipped)
+    try:
+        ocr_text, ocr_report = get_ocr_engine_manager().run(processed_image)
+    except OCREngineError as e:
+        logger.error(f"All OCR engines failed for {document_type}: {str(e)}")
+        raise KYCDocumentError(ocr_failure_message(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    ocr_report['preprocessing_ms'] = preprocess_timings
+    
+    # Validate OCR text
+    if not ocr_text or not ocr_text.strip():
+        raise KYCDocumentError(
+            'No text detected in image. Please ensure the document is clear and readable.'
+        )
+    
+    return extract_document_fields(document_type, ocr_text), ocr_text, ocr_report
+
+
 class KYCDocumentOCRView(APIView):
     """
     KYC Document OCR API
@@ -1511,6 +1662,27 @@ class KYCDocumentOCRView(APIView):
     parser_classes = [MultiPartParser, FormParser]
     
     def post(self, request):
+        """Serve repeated uploads of the same document image from the result cache"""
+        image_file = request.FILES.get('document_image')
+        if not image_file:
+            return self._process(request)
+        
+        image_bytes = image_file.read()
+        image_file.seek(0)
+        return cached_response(
+            request,
+            namespace='kyc_document_ocr',
+            payload=(
+                request.data.get('document_type', '').upper(),
+                request.query_params.get('debug', 'false').lower() == 'true',
+                image_bytes
+            ),
+            compute=lambda: self._process(request),
+            code_modules=(__name__, 'apps.customer.ocr_analysis.image_pipeline'),
+            model_version=ocr_model_version()
+        )
+    
+    def _process(self, request):
         """
         Process KYC document and extract fields
         
@@ -1533,7 +1705,7 @@ class KYCDocumentOCRView(APIView):
             # Get document type
             document_type = request.data.get('document_type', '').upper()
             
-            if document_type not in ['PAN', 'AADHAAR_FRONT', 'AADHAAR_BACK', 'OTHER']:
+            if document_type not in KYC_DOCUMENT_TYPES:
                 return Response({
                     'success': False,
                     'message': f'Invalid document_type. Must be one of: PAN, AADHAAR_FRONT, AADHAAR_BACK, OTHER'
@@ -1547,112 +1719,17 @@ class KYCDocumentOCRView(APIView):
                     'message': 'document_image file is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Validate file type
-            allowed_extensions = ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']
-            file_name = image_file.name.lower()
-            if not any(file_name.endswith(ext.lower()) for ext in allowed_extensions):
-                return Response({
-                    'success': False,
-                    'message': f'Invalid file type. Allowed: {", ".join(allowed_extensions)}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Preprocess image
             try:
-                processed_image = preprocess_image(image_file)
-            except Exception as e:
-                logger.error(f"Image preprocessing failed: {str(e)}")
-                return Response({
-                    'success': False,
-                    'message': f'Image preprocessing failed: {str(e)}'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Run OCR - try PaddleOCR first, then EasyOCR, then Tesseract as final fallback
-            # Or skip PyTorch-based OCRs if SKIP_PYTORCH_OCR is True
-            ocr_text = None
-            last_error = None
-            
-            if SKIP_PYTORCH_OCR:
-                # Skip PaddleOCR and EasyOCR, use Tesseract directly
-                logger.info("Skipping PyTorch-based OCRs (PaddleOCR/EasyOCR), using Tesseract directly...")
-                try:
-                    ocr_text = extract_text_from_tesseract(processed_image)
-                    logger.info("Successfully used Tesseract OCR")
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"Tesseract OCR failed: {error_msg}")
-                    return Response({
-                        'success': False,
-                        'message': error_msg  # Error message already contains installation instructions
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            else:
-                # Try PaddleOCR first
-                try:
-                    ocr = get_paddle_ocr()
-                    ocr_result = ocr.ocr(processed_image)
-                    ocr_text = extract_text_from_paddleocr(ocr_result)
-                    logger.info("Successfully used PaddleOCR")
-                except Exception as e:
-                    error_msg = str(e)
-                    last_error = f"PaddleOCR: {error_msg}"
-                    logger.warning(f"PaddleOCR failed: {error_msg}. Trying EasyOCR fallback...")
-                    
-                    # Try EasyOCR as fallback
-                    try:
-                        easy_ocr = get_easy_ocr()
-                        ocr_result_easy = easy_ocr.readtext(processed_image)
-                        ocr_text = extract_text_from_easyocr(ocr_result_easy)
-                        logger.info("Successfully used EasyOCR as fallback")
-                    except Exception as e2:
-                        error_msg2 = str(e2)
-                        last_error = f"{last_error}; EasyOCR: {error_msg2}"
-                        logger.warning(f"EasyOCR also failed: {error_msg2}. Trying Tesseract OCR as final fallback...")
-                        
-                        # Try Tesseract OCR as final fallback (no PyTorch dependency)
-                        try:
-                            ocr_text = extract_text_from_tesseract(processed_image)
-                            logger.info("Successfully used Tesseract OCR as final fallback")
-                        except Exception as e3:
-                            error_msg3 = str(e3)
-                            last_error = f"{last_error}; Tesseract: {error_msg3}"
-                            logger.error(f"All OCR libraries failed. {last_error}")
-                            return Response({
-                                'success': False,
-                                'message': (
-                                    f'All OCR libraries failed. Errors: {last_error}\n\n'
-                                    'Quick Fix: Install Tesseract OCR (no PyTorch dependency):\n'
-                                    '1. Download: https://digi.bib.uni-mannheim.de/tesseract/tesseract-ocr-w64-setup-5.4.0.20240605.exe\n'
-                                    '2. Install and check "Add to PATH"\n'
-                                    '3. Restart server\n'
-                                    'Or set SKIP_PYTORCH_OCR = True in kyc_ocr_views.py to use only Tesseract'
-                                )
-                            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            # Validate OCR text
-            if not ocr_text or not ocr_text.strip():
+                extracted_data, ocr_text, ocr_report = process_kyc_document(document_type, image_file)
+            except KYCDocumentError as e:
                 return Response({
                     'success': False,
-                    'message': 'No text detected in image. Please ensure the document is clear and readable.'
-                }, status=status.HTTP_400_BAD_REQUEST)
+                    'message': e.message
+                }, status=e.status_code)
             
             # Check if debug mode (return raw OCR text)
             debug_mode = request.query_params.get('debug', 'false').lower() == 'true'
             
-            # Extract fields based on document type
-            extracted_data = {}
-            
-            if document_type == 'PAN':
-                extracted_data = extract_pan_fields(ocr_text)
-            elif document_type == 'AADHAAR_FRONT':
-                extracted_data = extract_aadhaar_front_fields(ocr_text)
-            elif document_type == 'AADHAAR_BACK':
-                extracted_data = extract_aadhaar_back_fields(ocr_text)
-            else:  # OTHER
-                # For other documents, return raw OCR text
-                extracted_data = {
-                    'raw_text': ocr_text,
-                    'lines': ocr_text.split('\n')
-                }
-            
             # Add raw OCR text in debug mode
             response_data = {
                 'success': True,
@@ -1661,6 +1738,10 @@ class KYCDocumentOCRView(APIView):
                 'metadata': {
                     'document_type': document_type,
                     'ocr_text_length': len(ocr_text),
+                    'ocr_engine': ocr_report['engine'],
+                    'ocr_latency_ms': ocr_report['latency_ms'],
+                    'ocr_fallbacks': ocr_report['fallbacks'],
+                    'preprocessing_ms': ocr_report['preprocessing_ms'],
                     'processed_at': str(timezone.now())
                 }
             }
@@ -1668,7 +1749,8 @@ class KYCDocumentOCRView(APIView):
             if debug_mode:
                 response_data['debug'] = {
                     'raw_ocr_text': ocr_text,
-                    'ocr_lines': ocr_text.split('\n')
+                    'ocr_lines': ocr_text.split('\n'),
+                    'ocr_attempts': ocr_report['attempts']
                 }
             
             return Response(response_data, status=status.HTTP_200_OK)
@@ -1680,3 +1762,97 @@ class KYCDocumentOCRView(APIView):
                 'message': f'Processing failed: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class KYCDocumentBatchOCRView(APIView):
+    """
+    Batch KYC Document OCR API
+    Processes PAN and Aadhaar front/back in one request, concurrently
+    """
+    parser_classes = [MultiPartParser, FormParser]
+    
+    def get(self, request):
+        """Per-engine health, latency and fallback counters for this worker"""
+        return Response({
+            'success': True,
+            'data': get_ocr_engine_manager().stats()
+        }, status=status.HTTP_200_OK)
+    
+    def post(self, request):
+        """
+        Process several KYC documents and extract fields
+        
+        Request (at least one file):
+        - pan_image: PAN card image
+        - aadhaar_front_image: Aadhaar front image
+        - aadhaar_back_image: Aadhaar back image
+        
+        Response:
+        {
+            "success": true,
+            "data": {"PAN": {...}, "AADHAAR_FRONT": {...}, "AADHAAR_BACK": {...}},
+            "errors": {"AADHAAR_BACK": "..."},
+            "metadata": {...}
+        }
+        """
+        try:
+            documents = {
+                document_type: request.FILES[field]
+                for field, document_type in BATCH_DOCUMENT_FIELDS.items()
+                if field in request.FILES
+            }
+            if not documents:
+                return Response({
+                    'success': False,
+                    'message': f'At least one of {", ".join(BATCH_DOCUMENT_FIELDS)} is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=len(documents)) as pool:
+                futures = {
+                    document_type: pool.submit(process_kyc_document, document_type, image_file)
+                    for document_type, image_file in documents.items()
+                }
+            
+            data, errors, ocr_reports = {}, {}, {}
+            error_status = status.HTTP_400_BAD_REQUEST
+            for document_type, future in futures.items():
+                try:
+                    extracted_data, ocr_text, ocr_report = future.result()
+                    data[document_type] = extracted_data
+                    ocr_reports[document_type] = {
+                        'engine': ocr_report['engine'],
+                        'latency_ms': ocr_report['latency_ms'],
+                        'fallbacks': ocr_report['fallbacks'],
+                        'preprocessing_ms': ocr_report['preprocessing_ms'],
+                        'ocr_text_length': len(ocr_text)
+                    }
+                except KYCDocumentError as e:
+                    errors[document_type] = e.message
+                    error_status = max(error_status, e.status_code)
+                except Exception as e:
+                    logger.error(f"KYC OCR processing error for {document_type}: {str(e)}", exc_info=True)
+                    errors[document_type] = f'Processing failed: {str(e)}'
+                    error_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+            
+            return Response({
+                'success': bool(data),
+                'message': (
+                    'Documents processed successfully' if not errors
+                    else f'{len(data)}/{len(documents)} documents processed'
+                ),
+                'data': data,
+                'errors': errors,
+                'metadata': {
+                    'document_types': list(documents),
+                    'ocr': ocr_reports,
+                    'total_latency_ms': round((time.perf_counter() - start) * 1000, 1),
+                    'processed_at': str(timezone.now())
+                }
+            }, status=status.HTTP_200_OK if data else error_status)
+            
+        except Exception as e:
+            logger.error(f"KYC batch OCR processing error: {str(e)}", exc_info=True)
+            return Response({
+                'success': False,
+                'message': f'Processing failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
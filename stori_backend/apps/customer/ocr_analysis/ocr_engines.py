@@ -0,0 +1,196 @@
+"""
+OCR Engine Manager
+Keeps OCR engines warm, remembers which ones are broken in this process,
+bounds concurrent OCR per worker and records per-engine latency/fallbacks
+"""
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class OCREngineError(Exception):
+    """Raised when every available OCR engine failed for an image"""
+
+    def __init__(self, message: str, attempts: List[Dict]):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class OCREngine:
+    """One OCR backend: how to initialize it and how to read text with it"""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], object],
+        runner: Callable[[object, object], str],
+        thread_safe: bool = False
+    ):
+        """
+        Args:
+            name: Engine name used in reports (e.g. 'paddleocr')
+            loader: Returns the initialized engine handle (raises if unavailable)
+            runner: runner(handle, image) -> OCR text
+            thread_safe: Whether the handle may be used from several threads at once
+        """
+        self.name = name
+        self.loader = loader
+        self.runner = runner
+        self.thread_safe = thread_safe
+        self.handle = None
+        self.healthy = None  # None = not tried yet
+        self.error = None
+        self._init_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def ensure_loaded(self) -> bool:
+        """Initialize once; a failed initialization is remembered, not retried"""
+        if self.healthy is not None:
+            return self.healthy
+        with self._init_lock:
+            if self.healthy is None:
+                start = time.perf_counter()
+                try:
+                    self.handle = self.loader()
+                    self.healthy = True
+                    logger.info(f"OCR engine {self.name} ready in "
+                                f"{(time.perf_counter() - start) * 1000:.0f} ms")
+                except Exception as e:
+                    self.error = str(e)
+                    self.healthy = False
+                    logger.warning(f"OCR engine {self.name} unavailable, skipping it "
+                                   f"for this process: {self.error}")
+        return self.healthy
+
+    def read_text(self, image) -> str:
+        if self.thread_safe:
+            return self.runner(self.handle, image)
+        with self._run_lock:
+            return self.runner(self.handle, image)
+
+
+class OCREngineManager:
+    """
+    Runs OCR through an ordered list of engines with fallback
+
+    - warm_up() initializes every engine up front (worker start)
+    - engines that fail to initialize are skipped for the rest of the process
+    - a bounded semaphore caps concurrent OCR calls per worker
+    """
+
+    def __init__(self, engines: List[OCREngine], max_concurrency: int = 2):
+        self.engines = engines
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            engine.name: {'calls': 0, 'failures': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            for engine in engines
+        }
+        self._fallbacks = 0
+        self._requests = 0
+
+    def warm_up(self) -> Dict[str, Dict]:
+        """Initialize all engines now instead of on the first request"""
+        for engine in self.engines:
+            engine.ensure_loaded()
+        return self.health()
+
+    def health(self) -> Dict[str, Dict]:
+        return {
+            engine.name: {
+                'status': {None: 'not_loaded', True: 'healthy', False: 'unavailable'}[engine.healthy],
+                'error': engine.error
+            }
+            for engine in self.engines
+        }
+
+    def reset_health(self, name: Optional[str] = None) -> None:
+        """Allow a previously failed engine to be initialized again (e.g. after installing it)"""
+        for engine in self.engines:
+            if name is None or engine.name == name:
+                with engine._init_lock:
+                    engine.healthy = None
+                    engine.error = None
+                    engine.handle = None
+
+    def run(self, image) -> Tuple[str, Dict]:
+        """
+        Extract text from a preprocessed image
+
+        Returns:
+            (ocr_text, report) where report lists every engine attempt with its latency
+
+        Raises:
+            OCREngineError: If no engine produced text
+        """
+        attempts = []
+
+        with self._slots:
+            for engine in self.engines:
+                if not engine.ensure_loaded():
+                    attempts.append({'engine': engine.name, 'status': 'skipped', 'error': engine.error})
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    text = engine.read_text(image)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    self._record(engine.name, elapsed, failed=False)
+                    attempts.append({'engine': engine.name, 'status': 'ok', 'latency_ms': round(elapsed, 1)})
+                    fallbacks = sum(1 for a in attempts if a['status'] == 'failed')
+                    self._record_request(fallbacks)
+                    return text, {
+                        'engine': engine.name,
+                        'latency_ms': round(elapsed, 1),
+                        'fallbacks': fallbacks,
+                        'attempts': attempts
+                    }
+                except Exception as e:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    self._record(engine.name, elapsed, failed=True)
+                    attempts.append({
+                        'engine': engine.name, 'status': 'failed',
+                        'latency_ms': round(elapsed, 1), 'error': str(e)
+                    })
+                    logger.warning(f"OCR engine {engine.name} failed: {str(e)}")
+
+        self._record_request(sum(1 for a in attempts if a['status'] == 'failed'))
+        errors = '; '.join(f"{a['engine']}: {a.get('error')}" for a in attempts)
+        raise OCREngineError(errors, attempts)
+
+    def _record(self, name: str, elapsed_ms: float, failed: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats[name]
+            stats['calls'] += 1
+            stats['failures'] += int(failed)
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+
+    def _record_request(self, fallbacks: int) -> None:
+        with self._stats_lock:
+            self._requests += 1
+            self._fallbacks += fallbacks
+
+    def stats(self) -> Dict:
+        """Per-engine latency/failure counters and fallback totals for this process"""
+        with self._stats_lock:
+            engines = {
+                name: {
+                    'calls': s['calls'],
+                    'failures': s['failures'],
+                    'avg_latency_ms': round(s['total_ms'] / s['calls'], 1) if s['calls'] else None,
+                    'max_latency_ms': round(s['max_ms'], 1)
+                }
+                for name, s in self._stats.items()
+            }
+            totals = {'requests': self._requests, 'fallbacks': self._fallbacks}
+
+        health = self.health()
+        for name in engines:
+            engines[name].update(health[name])
+
+        return {'engines': engines, 'max_concurrency': self.max_concurrency, **totals}
@@ -0,0 +1,433 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import cv2
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .face_match import FaceMatchConfig, FaceMatcher, MultiModelFaceMatcher, compute_distances, embedding_cache
+from .image_pipeline import (
+    decode_image, find_document_roi, jpeg_dimensions, prepare_document_image, resize_to_max
+)
+from config.result_cache import MemoryBackend, ResultCache
+from .kyc_ocr_views import KYCDocumentBatchOCRView, KYCDocumentOCRView
+from .ocr_engines import OCREngine, OCREngineError, OCREngineManager
+
+
+def fake_represent(img_path, **kwargs):
+    """Deterministic stand-in for the embedding model: mean colour per channel"""
+    if isinstance(img_path, list):
+        return [fake_represent(img, **kwargs) for img in img_path]
+    embedding = img_path.reshape(-1, 3).mean(axis=0) + 1.0
+    return [{'embedding': embedding.tolist(), 'facial_area': {}, 'face_confidence': 1.0}]
+
+
+def solid_image(rgb, size=64):
+    image = np.zeros((size, size, 3), dtype=np.uint8)
+    image[:] = rgb
+    return image
+
+
+class ComputeDistancesTests(SimpleTestCase):
+
+    def test_matches_scalar_formulas(self):
+        rng = np.random.default_rng(0)
+        a = rng.normal(size=(3, 128))
+        b = rng.normal(size=(4, 128))
+
+        cosine = compute_distances(a, b, 'cosine')
+        euclidean = compute_distances(a, b, 'euclidean')
+        self.assertEqual(cosine.shape, (3, 4))
+
+        for i in range(3):
+            for j in range(4):
+                expected = 1 - a[i] @ b[j] / (np.linalg.norm(a[i]) * np.linalg.norm(b[j]))
+                self.assertAlmostEqual(cosine[i, j], expected, places=10)
+                self.assertAlmostEqual(euclidean[i, j], np.linalg.norm(a[i] - b[j]), places=8)
+
+    def test_rejects_unknown_metric(self):
+        with self.assertRaises(ValueError):
+            compute_distances(np.ones(4), np.ones(4), 'manhattan')
+
+
+@mock.patch('apps.customer.ocr_analysis.face_match.DeepFace.represent', side_effect=fake_represent)
+class InMemoryFaceMatchTests(SimpleTestCase):
+
+    def setUp(self):
+        embedding_cache.clear()
+
+    def test_no_files_written(self, represent):
+        matcher = FaceMatcher()
+        with mock.patch('apps.customer.ocr_analysis.face_match.cv2.imwrite') as imwrite:
+            result = matcher.verify_faces(solid_image((200, 30, 30)), solid_image((200, 30, 30)), 'PAN')
+
+        imwrite.assert_not_called()
+        self.assertTrue(result.is_match)
+        self.assertEqual(result.details['pipeline'], 'in_memory')
+        # Identical pixels are embedded once
+        self.assertEqual(represent.call_count, 1)
+
+    def test_concurrent_requests_do_not_cross_contaminate(self, represent):
+        matcher = FaceMatcher()
+        identities = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (200, 200, 30)]
+        barrier = threading.Barrier(len(identities))
+
+        def run(index):
+            rgb = identities[index % len(identities)]
+            if index < len(identities):
+                barrier.wait()
+            return matcher.verify_faces(solid_image(rgb), solid_image(rgb), f'doc_{index}')
+
+        with ThreadPoolExecutor(max_workers=len(identities)) as pool:
+            results = list(pool.map(run, range(32)))
+
+        for index, result in enumerate(results):
+            self.assertEqual(result.document_type, f'doc_{index}')
+            self.assertTrue(result.is_match)
+            self.assertAlmostEqual(result.distance, 0.0, places=6)
+
+        mismatch = matcher.verify_faces(solid_image(identities[0]), solid_image(identities[1]), 'PAN')
+        self.assertFalse(mismatch.is_match)
+
+    def test_falls_back_to_unique_scratch_dirs(self, represent):
+        represent.side_effect = TypeError('array input not supported')
+        seen_dirs = []
+
+        def fake_verify(img1_path, img2_path, **kwargs):
+            seen_dirs.append(os.path.dirname(img1_path))
+            self.assertEqual(os.path.dirname(img1_path), os.path.dirname(img2_path))
+            return {'distance': 0.1, 'threshold': 0.3, 'verified': True}
+
+        matcher = FaceMatcher()
+        with mock.patch('apps.customer.ocr_analysis.face_match.DeepFace.verify', side_effect=fake_verify):
+            first = matcher.verify_faces(solid_image((1, 2, 3)), solid_image((1, 2, 3)), 'PAN')
+            matcher.verify_faces(solid_image((1, 2, 3)), solid_image((1, 2, 3)), 'PAN')
+
+        self.assertEqual(first.details['pipeline'], 'scratch_files')
+        self.assertNotEqual(seen_dirs[0], seen_dirs[1])
+        self.assertFalse(any(os.path.exists(d) for d in seen_dirs))
+
+
+@mock.patch('apps.customer.ocr_analysis.face_match.DeepFace.represent', side_effect=fake_represent)
+class EmbeddingReuseTests(SimpleTestCase):
+
+    def setUp(self):
+        embedding_cache.clear()
+
+    def test_selfie_embedded_once_across_documents(self, represent):
+        selfie = solid_image((200, 30, 30))
+        documents = {
+            'Aadhaar': solid_image((200, 30, 30)),
+            'PAN': solid_image((30, 200, 30)),
+            'Voter_ID': solid_image((200, 30, 30), size=48),
+        }
+
+        results = FaceMatcher().verify_multiple_documents(selfie, documents)
+
+        # One batched call covering the selfie and all three documents
+        self.assertEqual(represent.call_count, 1)
+        self.assertEqual(len(represent.call_args.kwargs['img_path']), 4)
+        self.assertEqual(list(results), ['Aadhaar', 'PAN', 'Voter_ID'])
+        self.assertTrue(results['Aadhaar'].is_match)
+        self.assertFalse(results['PAN'].is_match)
+        self.assertTrue(results['Voter_ID'].is_match)
+
+    def test_batch_failure_isolated_per_document(self, represent):
+        def represent_without_green(img_path, **kwargs):
+            images = img_path if isinstance(img_path, list) else [img_path]
+            if any(img[..., 1].mean() > 150 for img in images):
+                raise ValueError('Face could not be detected')
+            return fake_represent(img_path, **kwargs)
+
+        represent.side_effect = represent_without_green
+        selfie = solid_image((200, 30, 30))
+        results = FaceMatcher().verify_multiple_documents(
+            selfie, {'Aadhaar': solid_image((200, 30, 30)), 'PAN': solid_image((30, 200, 30))}
+        )
+
+        self.assertTrue(results['Aadhaar'].is_match)
+        self.assertIsNone(results['PAN'])
+
+    def test_cache_keyed_by_model(self, represent):
+        image = solid_image((10, 20, 30))
+        FaceMatcher('Facenet512').embed_faces(image)
+        FaceMatcher('Facenet512').embed_faces(image)
+        FaceMatcher('ArcFace').embed_faces(image)
+
+        self.assertEqual(represent.call_count, 2)
+        self.assertEqual(embedding_cache.stats()['hits'], 1)
+
+    def test_consensus_reuses_embeddings(self, represent):
+        matcher = MultiModelFaceMatcher(models=['Facenet512', 'ArcFace', 'VGG-Face'])
+        selfie = solid_image((200, 30, 30))
+        documents = {'Aadhaar': solid_image((200, 30, 30)), 'PAN': solid_image((200, 30, 30), size=48)}
+
+        results = matcher.verify_documents_consensus(selfie, documents)
+
+        # One batched forward pass per model, none per document
+        self.assertEqual(represent.call_count, 3)
+        for result in results.values():
+            self.assertTrue(result['is_match'])
+            self.assertEqual(result['total_models'], 3)
+
+
+def broken_loader():
+    raise ImportError('engine not installed')
+
+
+class OCREngineManagerTests(SimpleTestCase):
+
+    def test_broken_engine_skipped_without_retry(self):
+        loader = mock.Mock(side_effect=broken_loader)
+        manager = OCREngineManager([
+            OCREngine('paddleocr', loader, lambda handle, img: 'never'),
+            OCREngine('tesseract', lambda: 'handle', lambda handle, img: 'TEXT', thread_safe=True),
+        ])
+
+        for _ in range(3):
+            text, report = manager.run(None)
+            self.assertEqual(text, 'TEXT')
+            self.assertEqual(report['engine'], 'tesseract')
+            self.assertEqual(report['attempts'][0]['status'], 'skipped')
+
+        loader.assert_called_once()
+        self.assertEqual(manager.health()['paddleocr']['status'], 'unavailable')
+
+    def test_runtime_failures_counted_as_fallbacks(self):
+        def flaky(handle, img):
+            raise RuntimeError('bad image')
+
+        manager = OCREngineManager([
+            OCREngine('easyocr', lambda: 'handle', flaky),
+            OCREngine('tesseract', lambda: 'handle', lambda handle, img: 'TEXT', thread_safe=True),
+        ])
+        _, report = manager.run(None)
+        manager.run(None)
+
+        stats = manager.stats()
+        self.assertEqual(report['fallbacks'], 1)
+        self.assertEqual(stats['fallbacks'], 2)
+        self.assertEqual(stats['engines']['easyocr']['failures'], 2)
+        self.assertEqual(stats['engines']['tesseract']['calls'], 2)
+        # A runtime error does not mark the engine broken
+        self.assertEqual(stats['engines']['easyocr']['status'], 'healthy')
+
+    def test_all_engines_failing_raises(self):
+        manager = OCREngineManager([OCREngine('tesseract', broken_loader, lambda handle, img: '')])
+        with self.assertRaises(OCREngineError) as ctx:
+            manager.run(None)
+        self.assertEqual(ctx.exception.attempts[0]['engine'], 'tesseract')
+
+    def test_concurrency_bounded(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow(handle, img):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+            return 'TEXT'
+
+        manager = OCREngineManager(
+            [OCREngine('tesseract', lambda: 'handle', slow, thread_safe=True)], max_concurrency=2
+        )
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(manager.run, range(16)))
+
+        self.assertEqual(peak[0], 2)
+
+
+def upload(name, rgb=(255, 255, 255)):
+    ok, encoded = cv2.imencode('.png', solid_image(rgb, size=32))
+    return SimpleUploadedFile(name, encoded.tobytes(), content_type='image/png')
+
+
+class KYCDocumentBatchOCRViewTests(SimpleTestCase):
+
+    def setUp(self):
+        calls = []
+
+        def read_text(handle, img):
+            calls.append(threading.get_ident())
+            return 'INCOME TAX DEPARTMENT\nABCDE1234F\n1234 5678 9012'
+
+        self.calls = calls
+        self.manager = OCREngineManager(
+            [OCREngine('tesseract', lambda: 'handle', read_text, thread_safe=True)], max_concurrency=3
+        )
+        patcher = mock.patch(
+            'apps.customer.ocr_analysis.kyc_ocr_views.get_ocr_engine_manager', return_value=self.manager
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, files):
+        request = APIRequestFactory().post('/api/kyc/document-ocr/batch/', files, format='multipart')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return KYCDocumentBatchOCRView.as_view()(request)
+
+    def test_processes_all_documents(self):
+        response = self.post({
+            'pan_image': upload('pan.png'),
+            'aadhaar_front_image': upload('front.png'),
+            'aadhaar_back_image': upload('back.png'),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['data']), {'PAN', 'AADHAAR_FRONT', 'AADHAAR_BACK'})
+        self.assertEqual(response.data['errors'], {})
+        self.assertEqual(response.data['metadata']['ocr']['PAN']['engine'], 'tesseract')
+        self.assertEqual(response.data['data']['PAN'].get('pan_number'), 'ABCDE1234F')
+        self.assertEqual(len(self.calls), 3)
+
+    def test_reports_per_document_errors(self):
+        response = self.post({'pan_image': upload('pan.png'), 'aadhaar_back_image': upload('back.gif')})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('PAN', response.data['data'])
+        self.assertIn('Invalid file type', response.data['errors']['AADHAAR_BACK'])
+
+    def test_requires_a_document(self):
+        self.assertEqual(self.post({}).status_code, 400)
+
+    def test_stats(self):
+        self.post({'pan_image': upload('pan.png')})
+        request = APIRequestFactory().get('/api/kyc/document-ocr/batch/')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        response = KYCDocumentBatchOCRView.as_view()(request)
+
+        self.assertEqual(response.data['data']['engines']['tesseract']['calls'], 1)
+
+
+class KYCDocumentOCRCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.read_text = mock.Mock(return_value='INCOME TAX DEPARTMENT\nABCDE1234F')
+        manager = OCREngineManager([OCREngine('tesseract', lambda: 'handle', self.read_text, thread_safe=True)])
+        for target, value in [('kyc_ocr_views.get_ocr_engine_manager', manager),
+                              ('kyc_ocr_views.ocr_model_version', 'tesseract=test')]:
+            patcher = mock.patch(f'apps.customer.ocr_analysis.{target}', return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('config.result_cache.get_result_cache', return_value=ResultCache(MemoryBackend()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, document_type, image):
+        request = APIRequestFactory().post(
+            '/api/kyc/document-ocr/', {'document_type': document_type, 'document_image': image}, format='multipart'
+        )
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return KYCDocumentOCRView.as_view()(request)
+
+    def test_same_image_is_read_once(self):
+        first = self.post('PAN', upload('pan.png'))
+        second = self.post('PAN', upload('pan_again.png'))
+
+        self.assertEqual(self.read_text.call_count, 1)
+        self.assertFalse(first.data['cache']['hit'])
+        self.assertTrue(second.data['cache']['hit'])
+        self.assertEqual(second.data['data'], first.data['data'])
+
+    def test_different_image_or_type_is_a_miss(self):
+        self.post('PAN', upload('pan.png'))
+        self.post('PAN', upload('pan.png', rgb=(250, 250, 250)))
+        self.post('OTHER', upload('pan.png'))
+
+        self.assertEqual(self.read_text.call_count, 3)
+
+
+KYC_FIXTURES = {
+    'PAN': ['INCOME TAX DEPARTMENT', 'RAHUL KUMAR SHARMA', '15/08/1990', 'ABCDE1234F'],
+    'AADHAAR_FRONT': ['Government of India', 'Rahul Kumar Sharma', 'DOB: 15/08/1990', '1234 5678 9012'],
+    'AADHAAR_BACK': ['Address: S/O Suresh Sharma', '12 MG Road, Andheri East', 'Mumbai 400069'],
+}
+
+
+def synthetic_card_photo(lines, size=(1600, 1200)):
+    """Phone-style photo: noisy background with a light ID card carrying dark text"""
+    width, height = size
+    img = np.random.default_rng(0).integers(60, 110, (height, width, 3), dtype=np.uint8)
+    box = (width // 6, height // 5, width * 2 // 3, height * 3 // 5)
+    x, y, w, h = box
+    img[y:y + h, x:x + w] = (235, 240, 245)
+    for i, text in enumerate(lines):
+        cv2.putText(img, text, (x + w // 20, y + (i + 1) * h // (len(lines) + 1)),
+                    cv2.FONT_HERSHEY_SIMPLEX, w / 1100, (20, 20, 20), max(1, w // 450), cv2.LINE_AA)
+    ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 92])
+    return encoded.tobytes(), box
+
+
+def legacy_preprocess(data, max_dimension):
+    """Filter-then-resize order used before the downscale-first pipeline"""
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    img = cv2.bilateralFilter(img, 9, 75, 75)
+    return resize_to_max(img, max_dimension)
+
+
+class ImagePipelineTests(SimpleTestCase):
+
+    def test_jpeg_dimensions_from_header(self):
+        data, _ = synthetic_card_photo(['ABCDE1234F'], size=(640, 480))
+        self.assertEqual(jpeg_dimensions(data), (640, 480))
+        ok, png = cv2.imencode('.png', solid_image((1, 2, 3)))
+        self.assertIsNone(jpeg_dimensions(png.tobytes()))
+
+    def test_reduced_decode_only_when_large_enough(self):
+        data, _ = synthetic_card_photo(['ABCDE1234F'], size=(1600, 1200))
+        self.assertEqual(decode_image(data, 800).shape[:2], (600, 800))
+        self.assertEqual(decode_image(data, 1000).shape[:2], (1200, 1600))
+        self.assertEqual(decode_image(data).shape[:2], (1200, 1600))
+
+    def test_fixture_accuracy_preserved(self):
+        for document_type, lines in KYC_FIXTURES.items():
+            data, _ = synthetic_card_photo(lines)
+            legacy = legacy_preprocess(data, 800)
+            current = prepare_document_image(data, 800, crop_to_document=False)
+
+            self.assertEqual(legacy.shape, current.shape, document_type)
+            self.assertGreater(cv2.PSNR(legacy, current), 35, document_type)
+
+            binarize = lambda img: cv2.threshold(
+                cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+            )[1]
+            self.assertGreater((binarize(legacy) == binarize(current)).mean(), 0.995, document_type)
+
+    def test_crop_keeps_whole_card(self):
+        for document_type, lines in KYC_FIXTURES.items():
+            data, (x, y, w, h) = synthetic_card_photo(lines)
+            roi = find_document_roi(cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR))
+
+            self.assertIsNotNone(roi, document_type)
+            rx, ry, rw, rh = roi
+            self.assertLessEqual(rx, x)
+            self.assertLessEqual(ry, y)
+            self.assertGreaterEqual(rx + rw, x + w)
+            self.assertGreaterEqual(ry + rh, y + h)
+            self.assertLess(rw * rh, 1600 * 1200 * 0.8)
+
+    def test_no_crop_without_card_outline(self):
+        ok, encoded = cv2.imencode('.jpg', solid_image((240, 240, 240), size=400))
+        self.assertIsNone(find_document_roi(decode_image(encoded.tobytes())))
+
+    def test_timings_reported(self):
+        data, _ = synthetic_card_photo(KYC_FIXTURES['PAN'])
+        timings = {}
+        prepare_document_image(data, 800, timings=timings)
+        self.assertEqual(set(timings), {'decode', 'resize', 'roi', 'denoise', 'output_shape'})
+
+    def test_face_preprocessing_at_target_resolution(self):
+        large = np.full((2400, 3200, 3), 128, dtype=np.uint8)
+        processed = FaceMatcher()._preprocess_image(large)
+        self.assertEqual(max(processed.shape[:2]), FaceMatchConfig.MAX_IMAGE_DIMENSION)
+
+        data, _ = synthetic_card_photo(['Government of India'], size=(4000, 3000))
+        loaded = FaceMatcher()._load_image(data)
+        self.assertEqual(loaded.shape[:2], (1500, 2000))
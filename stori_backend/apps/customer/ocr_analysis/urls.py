@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import DocumentUploadViewSet, FaceMatchViewSet
-from .kyc_ocr_views import KYCDocumentOCRView
+from .kyc_ocr_views import KYCDocumentOCRView, KYCDocumentBatchOCRView
 
 router = DefaultRouter()
 router.register(r'documents', DocumentUploadViewSet, basename='document-upload')
@@ -11,6 +11,8 @@ urlpatterns = [
     path('', include(router.urls)),
     # KYC Document OCR endpoint
     path('document-ocr/', KYCDocumentOCRView.as_view(), name='kyc-document-ocr'),
+    # Batch: PAN + Aadhaar front/back in one request (GET: OCR engine stats)
+    path('document-ocr/batch/', KYCDocumentBatchOCRView.as_view(), name='kyc-document-ocr-batch'),
 ]
 
 
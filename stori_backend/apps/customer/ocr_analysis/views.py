@@ -58,15 +58,15 @@ class FaceMatchViewSet(viewsets.ModelViewSet):
         try:
             # Lazy import face matcher
             try:
-                from .face_match import FaceMatcher
+                from .face_match import FaceModelPool
             except ImportError as e:
                 return Response({
                     'success': False,
                     'message': f'Face matching dependencies not installed: {str(e)}'
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
-            # Initialize face matcher
-            matcher = FaceMatcher(
+            # Shared matcher (models are loaded once per worker)
+            matcher = FaceModelPool.get_instance().get_matcher(
                 model_name='Facenet512',
                 detector_backend='retinaface'
             )
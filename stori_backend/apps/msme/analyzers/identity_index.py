@@ -0,0 +1,511 @@
+"""
+Persistent Cross-Applicant Identity Index
+=========================================
+Synthetic identities reuse pieces of other identities: a phone, PAN or
+device shared with differently named applicants, or the same person
+re-applying with a slightly altered name or address. Comparing a new
+applicant with every stored one is O(N) string comparisons per request.
+IdentityIndex keeps the book in a SQLite file and answers in a few index
+lookups:
+
+- names and addresses are normalized (case, punctuation, titles, common
+  address abbreviations, token order) and shingled into character 3-grams
+- each shingle set gets a MinHash signature; its bands are stored as LSH
+  buckets, and a query only looks at identities sharing at least
+  MIN_BAND_HITS buckets with it, i.e. likely to have a Jaccard similarity
+  near or above the threshold. Two hits rather than one keep identities
+  that merely share a city name out of the candidates
+- candidates are verified with the exact Jaccard similarity, so matches
+  are exactly those the brute-force scan (match_records) finds, except
+  for pairs the banding misses: with the default 48 bands of 4 rows that
+  is about 0.003% of pairs at the 0.7 threshold and vanishing above it
+- PAN, Aadhaar, phone, device and email are exact keys, looked up directly
+
+Records are inserted (or replaced) one at a time or in batches and are
+committed to disk immediately, so the index grows incrementally between
+requests and is shared by every process that opens the same file.
+
+This file is kept byte-identical in consumer_analysis_pipeline/ and
+stori_backend/apps/msme/analyzers/; a backend test fails when the two
+copies differ, so change both together.
+
+Usage:
+    index = IdentityIndex('identities.sqlite3')
+    matches = index.query(applicant, exclude='APP-42')
+    index.add('APP-42', applicant)
+"""
+
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+INDEX_VERSION = 1
+
+DEFAULT_NUM_PERM = 192
+DEFAULT_BANDS = 48
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_SEED = 1
+
+# Buckets a stored identity must share with a query to be verified
+MIN_BAND_HITS = 2
+
+SHINGLE_SIZE = 3
+
+# Record keys read for each field; the first non-empty one is used
+NAME_KEYS = ('name',)
+ADDRESS_KEYS = ('address', 'current_address', 'registered_address')
+EXACT_KEYS = {
+    'pan': ('pan',),
+    'aadhaar': ('aadhaar',),
+    'phone': ('phone', 'mobile'),
+    'device': ('device_id', 'device_fingerprint'),
+    'email': ('email',),
+}
+FUZZY_FIELDS = ('name', 'address')
+
+NAME_TITLES = {'MR', 'MRS', 'MS', 'MISS', 'DR', 'PROF', 'SHRI', 'SMT'}
+ADDRESS_ABBREVIATIONS = {
+    'ROAD': 'RD', 'STREET': 'ST', 'LANE': 'LN', 'APARTMENT': 'APT', 'APARTMENTS': 'APT',
+    'BUILDING': 'BLDG', 'SECTOR': 'SEC', 'NAGAR': 'NGR', 'COLONY': 'CLNY', 'FLOOR': 'FLR',
+    'NEAR': 'NR', 'OPPOSITE': 'OPP', 'NUMBER': 'NO',
+}
+
+# SQLite host parameters per statement (the historical minimum limit)
+MAX_SQL_PARAMS = 900
+
+# Records hashed and written together by add_many
+ADD_CHUNK_SIZE = 256
+
+_NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+
+def normalize_name(value) -> str:
+    """Upper-case name tokens without punctuation or titles, sorted"""
+    if not isinstance(value, str):
+        return ''
+    tokens = [token for token in _NON_ALNUM.split(value.upper()) if token and token not in NAME_TITLES]
+    return ' '.join(sorted(tokens))
+
+
+def normalize_address(value) -> str:
+    """Upper-case address tokens with common words abbreviated, sorted"""
+    if not isinstance(value, str):
+        return ''
+    tokens = [ADDRESS_ABBREVIATIONS.get(token, token) for token in _NON_ALNUM.split(value.upper()) if token]
+    return ' '.join(sorted(tokens))
+
+
+def normalize_key(kind: str, value) -> Optional[str]:
+    """Canonical exact-key value, None if missing or too short to identify anyone"""
+    if value is None or isinstance(value, bool):
+        return None
+    text = str(value).strip()
+    if kind == 'phone':
+        digits = re.sub(r'\D', '', text)
+        # Last 10 digits: drops +91 / leading 0
+        return digits[-10:] if len(digits) >= 7 else None
+    if kind == 'aadhaar':
+        digits = re.sub(r'\D', '', text)
+        return digits or None
+    if kind == 'pan':
+        text = _NON_ALNUM.sub('', text.upper())
+    elif kind == 'email':
+        text = text.lower()
+    return text or None
+
+
+def shingles(text: str) -> Set[str]:
+    """Character 3-grams of a normalized value, padded at the ends"""
+    if not text:
+        return set()
+    padded = f' {text} '
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def _first_value(record: Dict, keys: Sequence[str]):
+    for key in keys:
+        value = record.get(key)
+        if value:
+            return value
+    return None
+
+
+def identity_fields(record: Dict) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    (fuzzy, exact) normalized fields of a record
+
+    fuzzy: {'name', 'address'} normalized strings ('' if missing)
+    exact: {kind: canonical value} for the EXACT_KEYS present
+    """
+    fuzzy = {
+        'name': normalize_name(_first_value(record, NAME_KEYS)),
+        'address': normalize_address(_first_value(record, ADDRESS_KEYS)),
+    }
+    exact = {}
+    for kind, keys in EXACT_KEYS.items():
+        value = normalize_key(kind, _first_value(record, keys))
+        if value:
+            exact[kind] = value
+    return fuzzy, exact
+
+
+def match_reasons(
+    fuzzy: Dict[str, str],
+    exact: Dict[str, str],
+    other_fuzzy: Dict[str, str],
+    other_exact: Dict[str, str],
+    threshold: float,
+    query_shingles: Optional[Dict[str, Set[str]]] = None
+) -> Tuple[List[str], Dict[str, float]]:
+    """
+    Why two identities match: the exact keys they share and the fuzzy
+    fields whose Jaccard similarity reaches the threshold
+
+    Returns:
+        (matched_on, similarities) - matched_on lists exact key kinds, then
+        'name'/'address'; similarities holds both fields' Jaccard values
+    """
+    matched = [kind for kind, value in exact.items() if other_exact.get(kind) == value]
+    similarities = {}
+    for field in FUZZY_FIELDS:
+        mine = query_shingles[field] if query_shingles is not None else shingles(fuzzy[field])
+        similarity = jaccard(mine, shingles(other_fuzzy[field]))
+        similarities[field] = similarity
+        if similarity >= threshold:
+            matched.append(field)
+    return matched, similarities
+
+
+def match_records(
+    record: Dict,
+    records: Iterable[Tuple[str, Dict]],
+    threshold: float = DEFAULT_THRESHOLD,
+    exclude: Optional[str] = None
+) -> List[Dict]:
+    """
+    Brute-force matching: compare record with every (record_id, record)
+
+    Same criteria and result format as IdentityIndex.query(); O(N) per
+    call, kept as the reference the index is checked against.
+    """
+    fuzzy, exact = identity_fields(record)
+    query_shingles = {field: shingles(fuzzy[field]) for field in FUZZY_FIELDS}
+    matches = []
+    for record_id, other in records:
+        record_id = str(record_id)
+        if record_id == exclude:
+            continue
+        other_fuzzy, other_exact = identity_fields(other)
+        matched, similarities = match_reasons(fuzzy, exact, other_fuzzy, other_exact, threshold, query_shingles)
+        if matched:
+            matches.append(_match(record_id, other, matched, similarities))
+    return _sorted_matches(matches)
+
+
+def _match(record_id: str, record: Dict, matched: List[str], similarities: Dict[str, float]) -> Dict:
+    return {
+        'record_id': record_id,
+        'record': record,
+        'matched_on': matched,
+        'name_similarity': round(similarities['name'], 4),
+        'address_similarity': round(similarities['address'], 4),
+    }
+
+
+def _sorted_matches(matches: List[Dict]) -> List[Dict]:
+    """Exact-key matches first, then by best similarity"""
+    def key(match):
+        exact = any(reason not in FUZZY_FIELDS for reason in match['matched_on'])
+        return (not exact, -max(match['name_similarity'], match['address_similarity']), match['record_id'])
+    return sorted(matches, key=key)
+
+
+class MinHasher:
+    """
+    MinHash signatures of shingle sets and their LSH band keys
+
+    Shingles are hashed with CRC32 and permuted with multiply-shift hashes
+    whose coefficients come from a fixed seed, so signatures (and stored
+    bucket keys) are the same in every process.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS, seed: int = DEFAULT_SEED):
+        if num_perm % bands:
+            raise ValueError(f'num_perm ({num_perm}) must be a multiple of bands ({bands})')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._band_salt = rng.integers(1, 2 ** 63, bands, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: Sequence[Set[str]]) -> np.ndarray:
+        """
+        (len(shingle_sets), num_perm) minimum permuted hash per set and
+        permutation, all sets hashed in one pass; empty sets must be left out
+        """
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for shingle_set in shingle_sets for s in shingle_set),
+                             dtype=np.uint64)
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        starts = np.cumsum([0] + [len(shingle_set) for shingle_set in shingle_sets[:-1]])
+        return np.minimum.reduceat(permuted, starts, axis=0)
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        """(num_perm,) minimum permuted hash per permutation"""
+        return self.signatures([shingle_set])[0]
+
+    def band_keys_many(self, shingle_sets: Sequence[Set[str]], fields: Sequence[int]) -> List[List[int]]:
+        """
+        Signed 64-bit bucket key per band of each shingle set; fields[i]
+        keeps name and address buckets apart. Empty sets get no keys.
+        """
+        keys: List[List[int]] = [[] for _ in shingle_sets]
+        present = [i for i, shingle_set in enumerate(shingle_sets) if shingle_set]
+        if not present:
+            return keys
+        rows = self.signatures([shingle_sets[i] for i in present]).reshape(len(present), self.bands, self.rows)
+        key = self._band_salt[None, :] * (np.asarray([fields[i] for i in present], dtype=np.uint64)[:, None] + 1)
+        for column in range(self.rows):
+            key = (key ^ rows[:, :, column]) * np.uint64(0x100000001B3)
+        for i, band_keys in zip(present, key.view(np.int64).tolist()):
+            keys[i] = band_keys
+        return keys
+
+    def band_keys(self, shingle_set: Set[str], field: int) -> List[int]:
+        """Signed 64-bit bucket key per band (field keeps name and address buckets apart)"""
+        return self.band_keys_many([shingle_set], [field])[0]
+
+
+class IdentityIndex:
+    """
+    SQLite-backed identity index with exact-key lookups and MinHash LSH
+    blocking on names and addresses (see module docstring)
+
+    Args:
+        path: SQLite file; ':memory:' (default) for a throwaway index
+        num_perm, bands, threshold, seed: LSH parameters. An existing
+            index keeps the ones it was built with; passing different
+            values raises ValueError
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS identities (
+            id INTEGER PRIMARY KEY,
+            record_id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            address TEXT NOT NULL,
+            exact TEXT NOT NULL,
+            record TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS exact_keys (
+            key TEXT NOT NULL, identity INTEGER NOT NULL, PRIMARY KEY (key, identity)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS buckets (
+            bucket INTEGER NOT NULL, identity INTEGER NOT NULL, PRIMARY KEY (bucket, identity)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(
+        self,
+        path: str = ':memory:',
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        threshold: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+        requested = {'version': INDEX_VERSION, 'num_perm': num_perm, 'bands': bands,
+                     'threshold': threshold, 'seed': seed}
+        defaults = {'version': INDEX_VERSION, 'num_perm': DEFAULT_NUM_PERM, 'bands': DEFAULT_BANDS,
+                    'threshold': DEFAULT_THRESHOLD, 'seed': DEFAULT_SEED}
+        stored = {key: json.loads(value) for key, value in self._conn.execute('SELECT key, value FROM meta')}
+        if stored:
+            for key, value in requested.items():
+                if value is not None and stored.get(key) != value:
+                    raise ValueError(f'{path} was built with {key}={stored.get(key)!r}, not {value!r}')
+            params = stored
+        else:
+            params = {key: defaults[key] if value is None else value for key, value in requested.items()}
+            with self._conn:
+                self._conn.executemany('INSERT INTO meta VALUES (?, ?)',
+                                       [(key, json.dumps(value)) for key, value in params.items()])
+
+        self.threshold = float(params['threshold'])
+        self.hasher = MinHasher(params['num_perm'], params['bands'], params['seed'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM identities').fetchone()[0]
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.get(record_id) is not None
+
+    def get(self, record_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT record FROM identities WHERE record_id = ?', (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # ---------- Inserts ----------
+
+    def add(self, record_id: str, record: Dict) -> None:
+        """Insert a record, replacing any stored under the same id"""
+        self.add_many([(record_id, record)])
+
+    def add_many(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """Insert (record_id, record) pairs in one transaction; returns how many"""
+        count = 0
+        items = iter(items)
+        with self._lock, self._conn:
+            while True:
+                # Later duplicates of a record_id replace earlier ones, as with add()
+                chunk = {str(record_id): record for record_id, record in itertools.islice(items, ADD_CHUNK_SIZE)}
+                if not chunk:
+                    break
+                fields = [identity_fields(record) for record in chunk.values()]
+                buckets = self._buckets_many([fuzzy for fuzzy, _ in fields])
+                key_rows, bucket_rows = [], []
+                for (record_id, record), (fuzzy, exact), record_buckets in zip(chunk.items(), fields, buckets):
+                    self._delete(record_id)
+                    identity = self._conn.execute(
+                        'INSERT INTO identities (record_id, name, address, exact, record) VALUES (?, ?, ?, ?, ?)',
+                        (record_id, fuzzy['name'], fuzzy['address'], json.dumps(exact),
+                         json.dumps(record, default=str))
+                    ).lastrowid
+                    key_rows.extend((key, identity) for key in self._exact_keys(exact))
+                    bucket_rows.extend((bucket, identity) for bucket in record_buckets)
+                # In key order, B-tree inserts land next to each other
+                self._conn.executemany('INSERT OR IGNORE INTO exact_keys VALUES (?, ?)', sorted(key_rows))
+                self._conn.executemany('INSERT OR IGNORE INTO buckets VALUES (?, ?)', sorted(bucket_rows))
+                count += len(chunk)
+        return count
+
+    def remove(self, record_id: str) -> bool:
+        """Delete a record; False if it was not indexed"""
+        with self._lock, self._conn:
+            return self._delete(str(record_id))
+
+    def _delete(self, record_id: str) -> bool:
+        row = self._conn.execute('SELECT id, name, address, exact FROM identities WHERE record_id = ?',
+                                 (record_id,)).fetchone()
+        if row is None:
+            return False
+        identity, name, address, exact = row
+        # Keys and buckets are recomputed from the stored normalized fields
+        self._conn.executemany('DELETE FROM exact_keys WHERE key = ? AND identity = ?',
+                               [(key, identity) for key in self._exact_keys(json.loads(exact))])
+        self._conn.executemany('DELETE FROM buckets WHERE bucket = ? AND identity = ?',
+                               [(bucket, identity) for bucket in self._buckets({'name': name, 'address': address})])
+        self._conn.execute('DELETE FROM identities WHERE id = ?', (identity,))
+        return True
+
+    @staticmethod
+    def _exact_keys(exact: Dict[str, str]) -> List[str]:
+        return [f'{kind}:{value}' for kind, value in exact.items()]
+
+    def _buckets(self, fuzzy: Dict[str, str]) -> List[int]:
+        return self._buckets_many([fuzzy])[0]
+
+    def _buckets_many(self, fuzzies: List[Dict[str, str]]) -> List[List[int]]:
+        """Name and address bucket keys of each record, hashed together"""
+        shingle_sets = [shingles(fuzzy[field]) for fuzzy in fuzzies for field in FUZZY_FIELDS]
+        field_numbers = list(range(len(FUZZY_FIELDS))) * len(fuzzies)
+        keys = self.hasher.band_keys_many(shingle_sets, field_numbers)
+        per_record = len(FUZZY_FIELDS)
+        return [sum(keys[i:i + per_record], []) for i in range(0, len(keys), per_record)]
+
+    # ---------- Queries ----------
+
+    def query(self, record: Dict, exclude: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Stored identities matching a record
+
+        Args:
+            record: Identity dict (name, address, pan, aadhaar, phone,
+                device_id, email; see the *_KEYS constants)
+            exclude: record_id to leave out (the applicant itself)
+            limit: Return at most this many matches
+
+        Returns:
+            [{'record_id', 'record', 'matched_on', 'name_similarity',
+            'address_similarity'}, ...], exact-key matches first, then by
+            similarity (as match_records)
+        """
+        fuzzy, exact = identity_fields(record)
+        query_shingles = {field: shingles(fuzzy[field]) for field in FUZZY_FIELDS}
+        with self._lock:
+            shared: Dict[int, List[str]] = {}
+            for key, identity in self._lookup('SELECT key, identity FROM exact_keys WHERE key IN ({})',
+                                              self._exact_keys(exact)):
+                shared.setdefault(identity, []).append(key.split(':', 1)[0])
+            hits: Dict[int, int] = {}
+            for identity, count in self._lookup(
+                    'SELECT identity, COUNT(*) FROM buckets WHERE bucket IN ({}) GROUP BY identity',
+                    self._buckets(fuzzy)):
+                hits[identity] = hits.get(identity, 0) + count
+            candidates = set(shared)
+            candidates.update(identity for identity, count in hits.items() if count >= MIN_BAND_HITS)
+            rows = self._lookup('SELECT id, record_id, name, address FROM identities WHERE id IN ({})',
+                                sorted(candidates))
+
+            found = []
+            for identity, record_id, name, address in rows:
+                if record_id == exclude:
+                    continue
+                # Exact keys come from the lookup above, in EXACT_KEYS order like match_reasons
+                kinds = shared.get(identity, ())
+                matched = [kind for kind in exact if kind in kinds]
+                similarities = {}
+                for field, other in (('name', name), ('address', address)):
+                    similarities[field] = jaccard(query_shingles[field], shingles(other))
+                    if similarities[field] >= self.threshold:
+                        matched.append(field)
+                if matched:
+                    found.append((identity, record_id, matched, similarities))
+            stored = dict(self._lookup('SELECT id, record FROM identities WHERE id IN ({})',
+                                       [identity for identity, *_ in found]))
+
+        matches = [_match(record_id, json.loads(stored[identity]), matched, similarities)
+                   for identity, record_id, matched, similarities in found]
+        matches = _sorted_matches(matches)
+        return matches[:limit] if limit is not None else matches
+
+    def _lookup(self, sql: str, values: List) -> List[Tuple]:
+        """Rows of sql, whose IN ({}) is filled with values in chunks"""
+        rows = []
+        for start in range(0, len(values), MAX_SQL_PARAMS):
+            chunk = values[start:start + MAX_SQL_PARAMS]
+            rows.extend(self._conn.execute(sql.format(','.join('?' * len(chunk))), chunk))
+        return rows
@@ -12,8 +12,11 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union
 from datetime import datetime, timedelta
+import json
 import re
 
+from .identity_index import IdentityIndex
+
 
 class MSMESyntheticIdentityAnalyzer:
     """
@@ -52,7 +55,8 @@ class MSMESyntheticIdentityAnalyzer:
         directors_data: List[Dict],
         gstin_data: Optional[Dict] = None,
         criminal_records: Optional[List[Dict]] = None,
-        mca_data: Optional[Dict] = None
+        mca_data: Optional[Dict] = None,
+        criminal_index: Optional[IdentityIndex] = None
     ) -> Dict:
         """
         Comprehensive MSME synthetic identity and fraud detection.
@@ -63,6 +67,8 @@ class MSMESyntheticIdentityAnalyzer:
             gstin_data: GST verification data
             criminal_records: Criminal background check results
             mca_data: MCA/ROC registration data
+            criminal_index: Persistent index of criminal records; each
+                director is also looked up in it by name, PAN and Aadhaar
             
         Returns:
             Dict with risk scores and detailed findings
@@ -81,7 +87,7 @@ class MSMESyntheticIdentityAnalyzer:
         
         # Check 1: Director Criminal History (CRITICAL)
         criminal_risk, criminal_details = self._check_director_criminal_history(
-            directors_data, criminal_records
+            directors_data, criminal_records, criminal_index
         )
         total_risk += criminal_risk
         results['director_criminal_risk_score'] = criminal_risk
@@ -142,10 +148,12 @@ class MSMESyntheticIdentityAnalyzer:
     def _check_director_criminal_history(
         self,
         directors_data: List[Dict],
-        criminal_records: Optional[List[Dict]]
+        criminal_records: Optional[List[Dict]],
+        criminal_index: Optional[IdentityIndex] = None
     ) -> Tuple[float, Dict]:
         """
         Check criminal history of all directors/promoters.
+        Records come from criminal_records and/or criminal_index.
         
         CRITICAL CHECK - Financial fraud history is deal-breaker.
         
@@ -164,7 +172,7 @@ class MSMESyntheticIdentityAnalyzer:
         
         risk = 0.0
         
-        if not criminal_records:
+        if not criminal_records and criminal_index is None:
             details['status'] = 'not_verified'
             details['flags'].append("Criminal history not verified")
             return 0.1, details  # Small risk for not checking
@@ -185,9 +193,19 @@ class MSMESyntheticIdentityAnalyzer:
             
             # Match criminal records to this director
             director_records = [
-                rec for rec in criminal_records
+                rec for rec in criminal_records or []
                 if self._match_person(rec, director_name, director_pan, director_aadhaar)
             ]
+            if criminal_index is not None:
+                director_records.extend(match['record'] for match in criminal_index.query(
+                    {'name': director_name, 'pan': director_pan, 'aadhaar': director_aadhaar}
+                ))
+            
+            # A record supplied both ways (or twice) is one case
+            unique_records = {}
+            for record in director_records:
+                unique_records.setdefault(self._record_identity(record), record)
+            director_records = list(unique_records.values())
             
             if director_records:
                 details['directors_with_records'] += 1
@@ -521,6 +539,11 @@ class MSMESyntheticIdentityAnalyzer:
     
     # Helper methods
     
+    @staticmethod
+    def _record_identity(record: Dict) -> str:
+        """Record as IdentityIndex stores it (JSON), with keys sorted"""
+        return json.dumps(record, default=str, sort_keys=True)
+    
     def _match_person(
         self,
         record: Dict,
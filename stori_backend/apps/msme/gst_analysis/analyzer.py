@@ -18,6 +18,8 @@ from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 import statistics
 
+from .period_engine import gst_period_analyses
+
 
 class GSTAnalyzer:
     """
@@ -102,6 +104,30 @@ class GSTAnalyzer:
                 'status': 'failed'
             }
     
+    def analyze_gst_multi_period(
+        self,
+        gstin: str,
+        returns: List[Dict],
+        filing_history: Optional[List[Dict]] = None,
+        include_monthly: bool = True
+    ) -> Dict:
+        """
+        Turnover trends, GSTR-1 vs GSTR-3B reconciliation and filing gaps
+        across all returns of one GSTIN
+        
+        Args:
+            gstin: GST number
+            returns: [{'return_type', 'return_period', 'gst_data'}, ...]
+            filing_history (optional): Historical filings
+            include_monthly: Add the month by month GSTR-1/GSTR-3B turnover
+        
+        Returns:
+            {'gstin', 'features', 'monthly_turnover', 'errors'}; see
+            period_engine.gst_period_analyses
+        """
+        entry = {'gstin': gstin, 'returns': returns, 'filing_history': filing_history or []}
+        return gst_period_analyses([entry], include_monthly=include_monthly)[0]
+    
     def analyze_filing_regularity(
         self,
         filing_history: List[Dict],
@@ -673,3 +699,16 @@ class GSTAnalyzer:
         
         return 'General Trade'
 
+
+def analyze_gst_batch(entries: List[Dict], include_monthly: bool = True) -> List[Dict]:
+    """
+    Multi-period analysis of many GSTINs in one columnar pass
+    
+    Args:
+        entries: Per GSTIN, {'gstin', 'returns': [...], 'filing_history': [...]}
+        include_monthly: Add each GSTIN's month by month turnover
+    
+    Returns:
+        Per entry, in order, as GSTAnalyzer.analyze_gst_multi_period
+    """
+    return gst_period_analyses(entries, include_monthly=include_monthly)
@@ -0,0 +1,100 @@
+"""
+GST Analysis JSON Views
+=======================
+
+JSON-based multi-period GST analysis (returns sent in the request body)
+"""
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from django.utils import timezone
+
+from .analyzer import analyze_gst_batch
+from .period_engine import FEATURE_COLUMNS
+
+# GSTINs accepted per batch request
+MAX_BATCH_GSTINS = 1000
+
+
+def include_monthly_param(request, default=True) -> bool:
+    """?include_monthly=false leaves the month by month turnover out"""
+    value = request.query_params.get('include_monthly')
+    if value is None:
+        return default
+    return str(value).lower() not in ('false', '0', 'no')
+
+
+class GSTMultiPeriodBatchView(APIView):
+    """
+    Batch JSON analysis: multi-period GST analysis for many GSTINs in one call
+    All GSTINs' returns are analyzed together by the columnar period engine
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        POST /api/msme/gst/analyze-json/batch/
+
+        Request Body:
+        {
+            "gstins": [
+                {
+                    "gstin": "27AAAAA0000A1Z5",
+                    "returns": [
+                        {"return_type": "gstr3b", "return_period": "04-2024", "gst_data": {...}},
+                        {"return_type": "gstr1", "return_period": "04-2024", "gst_data": {...}},
+                        ...
+                    ],
+                    "filing_history": [...]    (optional)
+                },
+                ...
+            ]
+        }
+
+        Response data.results holds, in request order, each GSTIN's
+        features (feature_names), month by month GSTR-1/GSTR-3B turnover
+        (unless ?include_monthly=false) and the returns left out.
+        """
+        entries = request.data.get('gstins') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response({
+                'success': False,
+                'message': 'Expected JSON object with a non-empty "gstins" list'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > MAX_BATCH_GSTINS:
+            return Response({
+                'success': False,
+                'message': f'At most {MAX_BATCH_GSTINS} GSTINs per request (got {len(entries)})'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict) or not isinstance(entry.get('returns'), list):
+                return Response({
+                    'success': False,
+                    'message': f'gstins[{i}]: expected an object with a "returns" list'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if not isinstance(entry.get('filing_history', []), list):
+                return Response({
+                    'success': False,
+                    'message': f'gstins[{i}]: filing_history must be a list'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = analyze_gst_batch(entries, include_monthly=include_monthly_param(request))
+
+            return Response({
+                'success': True,
+                'message': f'{len(results)} GSTINs analyzed',
+                'data': {
+                    'feature_names': FEATURE_COLUMNS,
+                    'results': results,
+                    'analysis_date': str(timezone.now())
+                }
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'message': f'Analysis failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,478 @@
+"""
+Columnar GST multi-period engine
+
+Every return of every GSTIN in a request is flattened once into a typed
+table keyed by (entity, period), where entity is the GSTIN's position in
+the request. Turnover trends, GSTR-1 vs GSTR-3B reconciliation and filing
+gaps are then grouped array operations over all GSTINs at once instead of
+one GSTAnalyzer pass per return:
+
+- return periods (MM-YYYY, or the portal's MMYYYY) are parsed once per
+  distinct string into month numbers
+- the invoice taxable values of every GSTR-1 are summed in one bincount
+- each GSTIN's months from its first to its last outward return (GSTR-1
+  or GSTR-3B) form a dense range of slots, so per-month values, missing
+  months and gaps are plain array lookups
+
+Turnover is read the way GSTAnalyzer.analyze_revenue reads one return
+(b2b + b2c invoices, else taxable_turnover, else total_revenue); a month's
+turnover is its GSTR-3B figure, or its GSTR-1 one if no GSTR-3B was
+filed. Monthly filing is assumed: a quarterly (QRMP) filer's non-quarter
+months count as missing.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Return kinds. OTHER (GSTR-2A/2B, unrecognized) returns only add to the
+# tax and ITC totals
+GSTR1, GSTR3B, OTHER = 0, 1, 2
+RETURN_KINDS = {'gstr1': GSTR1, 'gstr3b': GSTR3B}
+
+# Month numbers are year * 12 + month - 1; GST was introduced in July 2017
+FIRST_GST_PERIOD = 2017 * 12 + 6
+LAST_GST_PERIOD = 2099 * 12 + 11
+PERIOD_PATTERN = r'^\s*(\d{2})-?(\d{4})\s*$'
+
+# Column -> key of the return's gst_data, summed per GSTIN (missing -> 0.0)
+AMOUNT_FIELDS = {
+    'tax_liability': 'total_tax_liability',
+    'tax_paid': 'total_tax_paid',
+    'itc_claimed': 'itc_claimed',
+    'itc_utilized': 'itc_utilized',
+}
+
+# GSTR-1 vs GSTR-3B difference (% of GSTR-3B turnover) above which a month
+# counts as mismatched, the threshold analyze_mismatches flags at
+MISMATCH_THRESHOLD_PCT = 5.0
+
+FILED_STATUSES = ('filed_on_time', 'filed_late')
+
+# Months compared by the MoM, QoQ and YoY growth features
+GROWTH_WINDOWS = {'mom_turnover_growth': 1, 'qoq_turnover_growth': 3, 'yoy_turnover_growth': 12}
+
+FEATURE_COLUMNS = [
+    'first_period',
+    'last_period',
+    'returns_analyzed',
+    'months_covered',
+    'months_with_turnover',
+    'total_turnover',
+    'avg_monthly_turnover',
+    'mom_turnover_growth',
+    'qoq_turnover_growth',
+    'yoy_turnover_growth',
+    'turnover_volatility',
+    'gstr1_turnover',
+    'gstr3b_turnover',
+    'reconciled_periods',
+    'gstr1_3b_mismatch_pct',
+    'mismatched_periods',
+    'max_period_mismatch_pct',
+    'missing_periods',
+    'gstr1_missing_periods',
+    'gstr3b_missing_periods',
+    'longest_filing_gap_months',
+    'gst_filing_regularity',
+    'late_filings',
+    'missed_filings',
+    'avg_delay_days',
+    'total_gst_liability',
+    'total_gst_paid',
+    'outstanding_gst',
+    'total_itc_claimed',
+    'total_itc_utilized',
+    'itc_to_turnover_ratio',
+    'effective_gst_rate',
+]
+
+
+def normalize_return_type(value) -> str:
+    """'GSTR-3B', 'gstr_3b', 'GSTR3B' -> 'gstr3b' ('' if not a string)"""
+    if not isinstance(value, str):
+        return ''
+    return ''.join(value.lower().replace('-', '').replace('_', '').split())
+
+
+def parse_periods(values: Sequence) -> np.ndarray:
+    """Month numbers of MM-YYYY / MMYYYY periods, -1 where invalid or before GST"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parts = pd.Series(uniques, dtype=object).map(lambda v: v if isinstance(v, str) else '')
+    parts = parts.str.extract(PERIOD_PATTERN).astype(float).to_numpy()
+    month, year = parts[:, 0], parts[:, 1]
+    number = year * 12 + month - 1
+    valid = (month >= 1) & (month <= 12) & (number >= FIRST_GST_PERIOD) & (number <= LAST_GST_PERIOD)
+    number = np.where(valid, number, -1).astype(np.int64)
+    periods = np.full(len(codes), -1, dtype=np.int64)
+    known = codes >= 0
+    periods[known] = number[codes[known]]
+    return periods
+
+
+def format_period(number: int) -> str:
+    """Month number -> 'MM-YYYY'"""
+    return f'{number % 12 + 1:02d}-{number // 12}'
+
+
+def _amounts(values: List) -> np.ndarray:
+    """Floats of JSON values, 0.0 where missing or not a finite number"""
+    try:
+        values = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+    return np.where(np.isfinite(values), values, 0.0)
+
+
+def flatten_gst_returns(entries: Sequence[Dict]) -> Tuple[pd.DataFrame, List[List[Dict]]]:
+    """
+    One typed row per GSTIN return.
+
+    Args:
+        entries: Per GSTIN, {'gstin', 'returns': [{'return_type',
+            'return_period', 'gst_data'}, ...]}; return_period may instead
+            be given inside gst_data
+
+    Returns:
+        (returns, errors): DataFrame with entity (position in entries),
+        return_type (normalized), kind, period (month number), turnover
+        and the AMOUNT_FIELDS columns; a later return of the same type and
+        period replaces an earlier one (revised returns). errors lists,
+        per entry, the returns left out ({'index', 'message'})
+    """
+    entity, return_types, kinds, raw_periods, positions = [], [], [], [], []
+    direct_turnover, has_invoices = [], []
+    invoice_counts, invoice_values = [], []
+    amounts = {column: [] for column in AMOUNT_FIELDS}
+    errors = [[] for _ in entries]
+    normalized_types = {}
+
+    for i, entry in enumerate(entries):
+        for j, gst_return in enumerate(entry.get('returns') or []):
+            data = gst_return.get('gst_data') if isinstance(gst_return, dict) else None
+            if not isinstance(data, dict):
+                errors[i].append({'index': j, 'message': 'Expected an object with a "gst_data" object'})
+                continue
+            entity.append(i)
+            positions.append(j)
+            raw_periods.append(gst_return.get('return_period', data.get('return_period')))
+
+            # Turnover as analyze_revenue reads it: invoices, else 3B summary, else generic
+            invoices = 'b2b' in data or 'b2c' in data
+            has_invoices.append(invoices)
+            count = 0
+            if invoices:
+                for section in ('b2b', 'b2c'):
+                    section_invoices = data.get(section) or []
+                    try:
+                        values = [invoice.get('taxable_value', 0) for invoice in section_invoices]
+                    except AttributeError:
+                        values = [invoice.get('taxable_value', 0) if isinstance(invoice, dict) else 0
+                                  for invoice in section_invoices]
+                    invoice_values.extend(values)
+                    count += len(values)
+                direct_turnover.append(0)
+            else:
+                direct_turnover.append(data.get('taxable_turnover', data.get('total_revenue', 0)))
+            invoice_counts.append(count)
+
+            raw_type = gst_return.get('return_type')
+            if isinstance(raw_type, str):
+                return_type = normalized_types.get(raw_type)
+                if return_type is None:
+                    return_type = normalized_types[raw_type] = normalize_return_type(raw_type)
+            else:
+                return_type = ''
+            if return_type not in RETURN_KINDS:
+                inferred = 'gstr1' if invoices else 'gstr3b' if 'taxable_turnover' in data else None
+                return_type = return_type or inferred or ''
+            return_types.append(return_type)
+            kinds.append(RETURN_KINDS.get(return_type, OTHER))
+            for column, key in AMOUNT_FIELDS.items():
+                amounts[column].append(data.get(key, 0))
+
+    n_rows = len(entity)
+    turnover = _amounts(direct_turnover)
+    if invoice_values:
+        # bincount adds each return's invoices left to right, as the analyzer's loop does
+        invoice_row = np.repeat(np.arange(n_rows), invoice_counts)
+        invoice_sums = np.bincount(invoice_row, weights=_amounts(invoice_values), minlength=n_rows)
+        turnover = np.where(np.array(has_invoices, dtype=bool), invoice_sums, turnover)
+
+    returns = pd.DataFrame({
+        'entity': np.array(entity, dtype=np.int64),
+        'return_type': pd.Categorical(return_types),
+        'kind': np.array(kinds, dtype=np.int8),
+        'period': parse_periods(raw_periods),
+        'turnover': turnover,
+        **{column: _amounts(values) for column, values in amounts.items()},
+    })
+
+    invalid = np.flatnonzero(returns['period'].to_numpy() < 0)
+    for row in invalid:
+        errors[entity[row]].append({
+            'index': positions[row],
+            'message': f'Invalid return_period {raw_periods[row]!r}: expected MM-YYYY from 07-2017 on'
+        })
+    returns = returns[returns['period'] >= 0]
+    returns = returns.drop_duplicates(['entity', 'return_type', 'period'], keep='last')
+    for entry_errors in errors:
+        entry_errors.sort(key=lambda error: error['index'])
+    return returns.reset_index(drop=True), errors
+
+
+def flatten_filing_history(entries: Sequence[Dict]) -> pd.DataFrame:
+    """One row per filing_history record: entity, status, days_delay"""
+    entity, statuses, delays = [], [], []
+    for i, entry in enumerate(entries):
+        for filing in entry.get('filing_history') or []:
+            if isinstance(filing, dict):
+                entity.append(i)
+                statuses.append(filing.get('status'))
+                delays.append(filing.get('days_delay', 0))
+    return pd.DataFrame({
+        'entity': np.array(entity, dtype=np.int64),
+        'status': pd.Categorical(statuses),
+        'days_delay': _amounts(delays),
+    })
+
+
+def period_grid(returns: pd.DataFrame, n_entities: int) -> pd.DataFrame:
+    """
+    One row per GSTIN month from its first to its last outward return.
+
+    Returns:
+        DataFrame sorted by (entity, period) with gstr1 and gstr3b
+        turnover (NaN where not filed) and turnover (GSTR-3B, else
+        GSTR-1; NaN if neither was filed)
+    """
+    outward = returns[returns['kind'] != OTHER]
+    entity = outward['entity'].to_numpy()
+    period = outward['period'].to_numpy()
+    kind = outward['kind'].to_numpy()
+
+    first = np.full(n_entities, np.iinfo(np.int64).max)
+    last = np.full(n_entities, -1)
+    np.minimum.at(first, entity, period)
+    np.maximum.at(last, entity, period)
+    span = np.where(last >= 0, last - first + 1, 0)
+    offsets = np.concatenate([[0], np.cumsum(span)])
+
+    slot_entity = np.repeat(np.arange(n_entities), span)
+    slot_period = first[slot_entity] + np.arange(offsets[-1]) - offsets[slot_entity]
+    slot = offsets[entity] + period - first[entity]
+    values = {}
+    for name, code in (('gstr1', GSTR1), ('gstr3b', GSTR3B)):
+        column = np.full(offsets[-1], np.nan)
+        is_kind = kind == code
+        column[slot[is_kind]] = outward['turnover'].to_numpy()[is_kind]
+        values[name] = column
+
+    return pd.DataFrame({
+        'entity': slot_entity,
+        'period': slot_period,
+        'gstr1': values['gstr1'],
+        'gstr3b': values['gstr3b'],
+        'turnover': np.where(np.isnan(values['gstr3b']), values['gstr1'], values['gstr3b']),
+    })
+
+
+def compute_period_features(
+    returns: pd.DataFrame,
+    filings: pd.DataFrame,
+    n_entities: int,
+    grid: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    FEATURE_COLUMNS for every GSTIN (one row per entity, in order).
+
+    Turnover trend features follow analyze_revenue over the GSTIN's
+    monthly turnover in period order (months without a return skipped);
+    the filing regularity ones follow analyze_filing_regularity over its
+    filing_history. Amounts and percentages are rounded to 2 decimals
+    (avg_delay_days to 1).
+    """
+    if grid is None:
+        grid = period_grid(returns, n_entities)
+    n = n_entities
+    slot_entity = grid['entity'].to_numpy()
+    gstr1, gstr3b, turnover = (grid[column].to_numpy() for column in ('gstr1', 'gstr3b', 'turnover'))
+    filed = ~np.isnan(turnover)
+    span = np.bincount(slot_entity, minlength=n)
+
+    features = {}
+    features.update(_turnover_trends(turnover[filed], slot_entity[filed], n))
+    features.update(_reconciliation(gstr1, gstr3b, slot_entity, n))
+    features.update(_filing_gaps(filed, gstr1, gstr3b, slot_entity, span, n))
+    features.update(_filing_regularity(filings, n))
+
+    entity = returns['entity'].to_numpy()
+    sums = {column: np.bincount(entity, weights=returns[column].to_numpy(), minlength=n) for column in AMOUNT_FIELDS}
+    total = features['total_turnover']
+    positive = total > 0
+    safe_total = np.where(positive, total, 1.0)
+    features['total_gst_liability'] = sums['tax_liability']
+    features['total_gst_paid'] = sums['tax_paid']
+    features['outstanding_gst'] = sums['tax_liability'] - sums['tax_paid']
+    features['total_itc_claimed'] = sums['itc_claimed']
+    features['total_itc_utilized'] = sums['itc_utilized']
+    features['itc_to_turnover_ratio'] = np.where(positive, sums['itc_claimed'] / safe_total * 100, 0.0)
+    features['effective_gst_rate'] = np.where(positive, sums['tax_liability'] / safe_total * 100, 0.0)
+
+    periods = grid['period'].to_numpy()
+    ends = np.cumsum(span)
+    for name, position in (('first_period', ends - span), ('last_period', ends - 1)):
+        features[name] = [format_period(int(periods[p])) if months else None for p, months in zip(position, span)]
+    features['returns_analyzed'] = np.bincount(entity, minlength=n)
+    features['months_covered'] = span
+
+    # Rounded with round() as the analyzer does (np.round can differ at ties)
+    for column, values in features.items():
+        if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+            digits = 1 if column == 'avg_delay_days' else 2
+            features[column] = [round(value, digits) for value in values.tolist()]
+    return pd.DataFrame({column: features[column] for column in FEATURE_COLUMNS})
+
+
+def _turnover_trends(series: np.ndarray, group: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+    """Total, average, growth and volatility of each group's series"""
+    count = np.bincount(group, minlength=n)
+    total = np.bincount(group, weights=series, minlength=n)
+    mean = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+
+    # Last 24 values of each group, newest in column 0
+    window = 2 * max(GROWTH_WINDOWS.values())
+    from_end = np.cumsum(count)[group] - 1 - np.arange(len(series))
+    tail = np.zeros((n, window))
+    recent = from_end < window
+    tail[group[recent], from_end[recent]] = series[recent]
+
+    features = {
+        'months_with_turnover': count,
+        'total_turnover': total,
+        'avg_monthly_turnover': mean,
+    }
+    for name, months in GROWTH_WINDOWS.items():
+        current, previous = _oldest_first_sum(tail, 0, months), _oldest_first_sum(tail, months, 2 * months)
+        ok = (count >= 2 * months) & (previous > 0)
+        features[name] = np.where(ok, (current - previous) / np.where(ok, previous, 1.0) * 100, 0.0)
+
+    # Coefficient of variation (sample standard deviation), as statistics.stdev
+    deviation = series - mean[group]
+    squares = np.bincount(group, weights=deviation * deviation, minlength=n)
+    ok = (count >= 3) & (mean > 0)
+    std = np.sqrt(squares / np.maximum(count - 1, 1))
+    features['turnover_volatility'] = np.where(ok, std / np.where(ok, mean, 1.0) * 100, 0.0)
+    return features
+
+
+def _oldest_first_sum(tail: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Sum of tail columns [start, stop) added oldest first, as sum(values[-stop:-start])"""
+    total = tail[:, stop - 1].copy()
+    for column in range(stop - 2, start - 1, -1):
+        total += tail[:, column]
+    return total
+
+
+def _reconciliation(gstr1: np.ndarray, gstr3b: np.ndarray, group: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+    """GSTR-1 vs GSTR-3B turnover over the months both were filed"""
+    has1, has3b = ~np.isnan(gstr1), ~np.isnan(gstr3b)
+    both = has1 & has3b
+    r1, r3b, g = gstr1[both], gstr3b[both], group[both]
+
+    r1_total = np.bincount(g, weights=r1, minlength=n)
+    r3b_total = np.bincount(g, weights=r3b, minlength=n)
+    ok = r3b_total > 0
+    overall = np.where(ok, np.abs(r1_total - r3b_total) / np.where(ok, r3b_total, 1.0) * 100, 0.0)
+
+    # A nil GSTR-3B against GSTR-1 sales is a full mismatch
+    month_pct = np.where(r3b > 0, np.abs(r1 - r3b) / np.where(r3b > 0, r3b, 1.0) * 100,
+                         np.where(r1 != 0, 100.0, 0.0))
+    worst = np.zeros(n)
+    np.maximum.at(worst, g, month_pct)
+
+    return {
+        'gstr1_turnover': np.bincount(group[has1], weights=gstr1[has1], minlength=n),
+        'gstr3b_turnover': np.bincount(group[has3b], weights=gstr3b[has3b], minlength=n),
+        'reconciled_periods': np.bincount(g, minlength=n),
+        'gstr1_3b_mismatch_pct': overall,
+        'mismatched_periods': np.bincount(g[month_pct > MISMATCH_THRESHOLD_PCT], minlength=n),
+        'max_period_mismatch_pct': worst,
+    }
+
+
+def _filing_gaps(
+    filed: np.ndarray,
+    gstr1: np.ndarray,
+    gstr3b: np.ndarray,
+    group: np.ndarray,
+    span: np.ndarray,
+    n: int
+) -> Dict[str, np.ndarray]:
+    """Months without returns within each GSTIN's range, and the longest run of them"""
+    # A range starts and ends with a filed month, so runs never cross GSTINs
+    filed_slots = np.flatnonzero(filed)
+    longest = np.zeros(n, dtype=np.int64)
+    np.maximum.at(longest, group[filed_slots[1:]], np.diff(filed_slots) - 1)
+    return {
+        'missing_periods': span - np.bincount(group[filed], minlength=n),
+        'gstr1_missing_periods': span - np.bincount(group[~np.isnan(gstr1)], minlength=n),
+        'gstr3b_missing_periods': span - np.bincount(group[~np.isnan(gstr3b)], minlength=n),
+        'longest_filing_gap_months': longest,
+    }
+
+
+def _filing_regularity(filings: pd.DataFrame, n: int) -> Dict[str, np.ndarray]:
+    """analyze_filing_regularity over each GSTIN's filing_history"""
+    entity = filings['entity'].to_numpy()
+    status = filings['status'].astype(object).to_numpy()
+    delay = filings['days_delay'].to_numpy()
+
+    expected = np.bincount(entity, minlength=n)
+    filed = np.bincount(entity[np.isin(status, FILED_STATUSES)], minlength=n)
+    late = np.bincount(entity[status == 'filed_late'], minlength=n)
+    delayed = delay > 0
+    delay_count = np.bincount(entity[delayed], minlength=n)
+    delay_total = np.bincount(entity[delayed], weights=delay[delayed], minlength=n)
+    return {
+        'gst_filing_regularity': np.where(expected > 0, (filed - late) / np.maximum(expected, 1) * 100, 0.0),
+        'late_filings': late,
+        'missed_filings': np.bincount(entity[status == 'not_filed'], minlength=n),
+        'avg_delay_days': np.where(delay_count > 0, delay_total / np.maximum(delay_count, 1), 0.0),
+    }
+
+
+def gst_period_analyses(entries: Sequence[Dict], include_monthly: bool = True) -> List[Dict]:
+    """
+    Multi-period analysis of every GSTIN in one columnar pass.
+
+    Args:
+        entries: Per GSTIN, {'gstin', 'returns': [...], 'filing_history':
+            [...] (optional)}; see flatten_gst_returns
+        include_monthly: Add each GSTIN's month by month GSTR-1/GSTR-3B
+            turnover (None for months without that return)
+
+    Returns:
+        Per entry, in order: {'gstin', 'features' (FEATURE_COLUMNS),
+        'monthly_turnover' (if include_monthly), 'errors'}
+    """
+    returns, errors = flatten_gst_returns(entries)
+    grid = period_grid(returns, len(entries))
+    features = compute_period_features(returns, flatten_filing_history(entries), len(entries), grid)
+
+    results = [
+        {'gstin': entry.get('gstin'), 'features': entry_features, 'errors': entry_errors}
+        for entry, entry_features, entry_errors in zip(entries, features.to_dict('records'), errors)
+    ]
+    if include_monthly:
+        monthly = [[] for _ in entries]
+        columns = (grid[column].to_numpy() for column in ('entity', 'period', 'gstr1', 'gstr3b'))
+        for entity, period, gstr1, gstr3b in zip(*columns):
+            monthly[entity].append({
+                'period': format_period(int(period)),
+                'gstr1_turnover': None if np.isnan(gstr1) else round(float(gstr1), 2),
+                'gstr3b_turnover': None if np.isnan(gstr3b) else round(float(gstr3b), 2),
+            })
+        for result, months in zip(results, monthly):
+            result['monthly_turnover'] = months
+    return results
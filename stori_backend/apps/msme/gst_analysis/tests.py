@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .analyzer import GSTAnalyzer, analyze_gst_batch
+from .json_views import GSTMultiPeriodBatchView
+
+
+def gstr1(period, *invoice_values):
+    return {'return_type': 'GSTR-1', 'return_period': period,
+            'gst_data': {'b2b': [{'taxable_value': value} for value in invoice_values]}}
+
+
+def gstr3b(period, turnover, liability=0.0, paid=0.0):
+    return {'return_type': 'GSTR-3B', 'return_period': period, 'gst_data': {
+        'taxable_turnover': turnover, 'total_tax_liability': liability, 'total_tax_paid': paid}}
+
+
+def monthly_3b(turnovers, start_month=1, year=2024):
+    return [gstr3b(f'{start_month + i:02d}-{year}', turnover) for i, turnover in enumerate(turnovers)]
+
+
+class GSTPeriodEngineTests(SimpleTestCase):
+
+    def test_trends_reconciliation_and_gaps(self):
+        returns = [
+            gstr3b('01-2024', 1000.0, liability=180.0, paid=100.0), gstr1('01-2024', 600.0, 400.0),
+            gstr3b('02-2024', 1200.0), gstr1('02-2024', 1500.0),
+            # March and April not filed
+            gstr3b('05-2024', 900.0),
+            gstr1('06-2024', 1800.0),
+        ]
+
+        result = GSTAnalyzer().analyze_gst_multi_period('27AAAAA0000A1Z5', returns)
+
+        features = result['features']
+        self.assertEqual((features['first_period'], features['last_period']), ('01-2024', '06-2024'))
+        # June has only a GSTR-1, which stands in for its turnover
+        self.assertEqual(features['total_turnover'], 4900.0)
+        self.assertEqual(features['mom_turnover_growth'], 100.0)
+        self.assertEqual(features['gstr1_turnover'], 4300.0)
+        self.assertEqual(features['gstr3b_turnover'], 3100.0)
+        self.assertEqual(features['reconciled_periods'], 2)
+        self.assertEqual(features['gstr1_3b_mismatch_pct'], round(300 / 2200 * 100, 2))
+        self.assertEqual((features['mismatched_periods'], features['max_period_mismatch_pct']), (1, 25.0))
+        self.assertEqual((features['missing_periods'], features['longest_filing_gap_months']), (2, 2))
+        self.assertEqual((features['gstr1_missing_periods'], features['gstr3b_missing_periods']), (3, 3))
+        self.assertEqual(features['outstanding_gst'], 80.0)
+        self.assertEqual(result['monthly_turnover'][2], {'period': '03-2024', 'gstr1_turnover': None,
+                                                         'gstr3b_turnover': None})
+        self.assertEqual(result['errors'], [])
+
+    def test_growth_windows_and_filing_regularity(self):
+        turnovers = [100.0 + 7 * i + (i % 5) * 13 for i in range(24)]
+        returns = [gstr3b(f'{i % 12 + 1:02d}-{2022 + i // 12}', turnover) for i, turnover in enumerate(turnovers)]
+        history = [{'status': 'filed_late', 'days_delay': 3}, {'status': 'filed_on_time'}, {'status': 'not_filed'}]
+
+        features = GSTAnalyzer().analyze_gst_multi_period('X', returns, history)['features']
+
+        expected_qoq = (sum(turnovers[-3:]) - sum(turnovers[-6:-3])) / sum(turnovers[-6:-3]) * 100
+        expected_yoy = (sum(turnovers[-12:]) - sum(turnovers[:12])) / sum(turnovers[:12]) * 100
+        self.assertEqual(features['qoq_turnover_growth'], round(expected_qoq, 2))
+        self.assertEqual(features['yoy_turnover_growth'], round(expected_yoy, 2))
+        filing = GSTAnalyzer().analyze_filing_regularity(history, 'X')
+        self.assertEqual(features['gst_filing_regularity'], filing['gst_filing_regularity'])
+        self.assertEqual(features['avg_delay_days'], filing['avg_delay_days'])
+        self.assertEqual((features['late_filings'], features['missed_filings']), (1, 1))
+
+    def test_revised_untyped_and_invalid_returns(self):
+        returns = [
+            gstr3b('04-2024', 500.0),
+            gstr3b('042024', 800.0),  # revised, portal period format
+            {'return_period': '05-2024', 'gst_data': {'taxable_turnover': 100.0}},  # inferred GSTR-3B
+            {'return_type': 'gstr2b', 'return_period': '05-2024', 'gst_data': {'itc_claimed': 40.0}},
+            gstr3b('13-2024', 1.0),
+            gstr3b('01-2016', 1.0),
+            'not a return',
+        ]
+
+        result = analyze_gst_batch([{'gstin': 'A', 'returns': returns}, {'gstin': 'B', 'returns': []}])
+
+        features = result[0]['features']
+        self.assertEqual(features['returns_analyzed'], 3)
+        self.assertEqual(features['total_turnover'], 900.0)
+        self.assertEqual(features['total_itc_claimed'], 40.0)
+        self.assertEqual([error['index'] for error in result[0]['errors']], [4, 5, 6])
+        self.assertEqual(result[1]['features']['months_covered'], 0)
+        self.assertIsNone(result[1]['features']['first_period'])
+
+    def test_batch_matches_single_gstin_calls(self):
+        entries = [
+            {'gstin': 'A', 'returns': monthly_3b([10.0, 0.0, 30.0, 45.5]) + [gstr1('03-2024', 31.0)]},
+            {'gstin': 'B', 'returns': [], 'filing_history': [{'status': 'not_filed'}]},
+            {'gstin': 'A', 'returns': monthly_3b([5.0] * 8, start_month=3, year=2023)},
+        ]
+
+        batch = analyze_gst_batch(entries)
+
+        for entry, result in zip(entries, batch):
+            single = GSTAnalyzer().analyze_gst_multi_period(entry['gstin'], entry['returns'],
+                                                            entry.get('filing_history'))
+            self.assertEqual(result, single)
+
+
+class GSTMultiPeriodBatchViewTests(SimpleTestCase):
+
+    def post(self, payload, query=''):
+        request = APIRequestFactory().post(f'/api/msme/gst/analyze-json/batch/{query}', payload, format='json')
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        return GSTMultiPeriodBatchView.as_view()(request)
+
+    def test_gstins_analyzed_in_request_order(self):
+        response = self.post({'gstins': [
+            {'gstin': 'A', 'returns': monthly_3b([100.0, 150.0])},
+            {'gstin': 'B', 'returns': monthly_3b([50.0])},
+        ]}, '?include_monthly=false')
+
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['data']['results']
+        self.assertEqual((first['gstin'], first['features']['mom_turnover_growth']), ('A', 50.0))
+        self.assertEqual((second['gstin'], second['features']['total_turnover']), ('B', 50.0))
+        self.assertNotIn('monthly_turnover', first)
+
+    def test_rejects_invalid_payloads(self):
+        self.assertEqual(self.post({'gstins': []}).status_code, 400)
+        self.assertEqual(self.post({'gstins': [{'gstin': 'A'}]}).status_code, 400)
+        self.assertEqual(self.post({'gstins': [{'returns': [], 'filing_history': {}}]}).status_code, 400)
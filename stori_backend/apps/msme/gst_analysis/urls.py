@@ -6,6 +6,7 @@ GST Analysis URLs
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import GSTUploadViewSet, GSTAnalysisResultViewSet, GSTFilingHistoryViewSet
+from .json_views import GSTMultiPeriodBatchView
 
 # Create router
 router = DefaultRouter()
@@ -14,6 +15,9 @@ router.register(r'results', GSTAnalysisResultViewSet, basename='gst-result')
 router.register(r'filing-history', GSTFilingHistoryViewSet, basename='gst-filing-history')
 
 urlpatterns = [
+    # JSON-based multi-period analysis
+    path('analyze-json/batch/', GSTMultiPeriodBatchView.as_view(), name='gst-analyze-json-batch'),
+    
     path('', include(router.urls)),
 ]
 
@@ -1,3 +1,148 @@
-from django.test import TestCase
+import filecmp
+import os
+import random
+import tempfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .analyzers import identity_index
+from .analyzers.identity_index import IdentityIndex, match_records
+from .analyzers.synthetic_identity_analyzer import MSMESyntheticIdentityAnalyzer
+
+SYLLABLES = ['ra', 'hu', 'la', 'pri', 'ya', 'su', 're', 'an', 'ki', 'ta', 'vi', 'ja', 'de', 'mo', 'han', 'ku',
+             'mar', 'si', 'pa', 'tel', 'na', 'ga', 'ne', 'sa', 'ro', 'ha', 'ni', 'ma', 'li', 'ka', 'ar', 'jun']
+CITIES = ['Bengaluru', 'Mumbai', 'Pune', 'Delhi', 'Chennai', 'Hyderabad', 'Jaipur', 'Indore']
+
+
+def synthetic_identities(n, seed=0):
+    """(record_id, record) pairs; about one in ten re-uses part of an earlier identity"""
+    rng = random.Random(seed)
+
+    def word():
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+    records = []
+    for i in range(n):
+        if records and rng.random() < 0.1:
+            record = dict(rng.choice(records)[1])
+            kind = rng.randrange(4)
+            if kind == 0:
+                name = record['name']
+                cut = rng.randrange(1, len(name) - 1)
+                record['name'] = 'Mr. ' + name[:cut] + name[cut + 1:]
+            elif kind == 1:
+                record['name'] = ' '.join(reversed(record['name'].split()))
+                record['phone'] = str(rng.randrange(6_000_000_000, 10_000_000_000))
+            elif kind == 2:
+                record['address'] = record['address'].replace('Road', 'Rd').replace(',', '')
+                record['pan'] = None
+            else:
+                record['name'] = f'{word()} {word()}'
+            record['device_id'] = f'dev-{rng.randrange(n)}'
+        else:
+            record = {
+                'name': f'{word()} {word()}',
+                'address': f'{rng.randint(1, 999)}, {word()} {word()} Road, {rng.choice(CITIES)} '
+                           f'{rng.randint(110000, 859999)}',
+                'phone': str(rng.randrange(6_000_000_000, 10_000_000_000)),
+                'pan': f'{word().upper()[:5]:A<5}{rng.randint(1000, 9999)}F',
+                'device_id': f'dev-{i}',
+            }
+        records.append((f'APP-{i}', record))
+    return records
+
+
+class IdentityIndexTests(SimpleTestCase):
+
+    def test_matches_brute_force_scan(self):
+        records = synthetic_identities(1500)
+        index = IdentityIndex()
+        index.add_many(records)
+
+        found = 0
+        for record_id, record in records[::10]:
+            matches = index.query(record, exclude=record_id)
+            self.assertEqual(matches, match_records(record, records, exclude=record_id))
+            found += len(matches)
+        self.assertGreater(found, 20)
+
+    def test_normalized_fuzzy_and_exact_matches(self):
+        index = IdentityIndex()
+        index.add('A1', {'name': 'Rahul Kumar Sharma', 'address': '12, MG Road, Pune 411001',
+                         'pan': 'abcde1234f', 'phone': '+91 98765-43210'})
+        index.add('A2', {'name': 'Priya Shah', 'address': '4 Lake View Road, Mumbai 400001', 'device_id': 'd-9'})
+
+        [match] = index.query({'name': 'Dr. Sharma Rahul Kumar', 'address': 'Flat 3, Juhu, Mumbai'})
+        self.assertEqual((match['record_id'], match['matched_on']), ('A1', ['name']))
+        self.assertEqual(match['name_similarity'], 1.0)
+        self.assertEqual(index.query({'address': '12 MG Rd., Pune 411001'})[0]['matched_on'], ['address'])
+        self.assertEqual([m['record_id'] for m in index.query({'phone': '09876543210', 'device_id': 'd-9'})],
+                         ['A1', 'A2'])
+        self.assertEqual(index.query({'pan': 'ABCDE1234F'}, exclude='A1'), [])
+
+    def test_upsert_remove_and_reopen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'identities.sqlite3')
+            with IdentityIndex(path) as index:
+                index.add_many([('A1', {'name': 'Rahul Kumar', 'pan': 'ABCDE1234F'}),
+                                ('A2', {'name': 'Priya Shah', 'pan': 'PQRST1111K'})])
+                index.add('A1', {'name': 'Rahul Kumar', 'pan': 'ZZZZZ9999Z'})
+                self.assertTrue(index.remove('A2'))
+                self.assertFalse(index.remove('A2'))
+
+            with IdentityIndex(path) as index:
+                self.assertEqual(len(index), 1)
+                self.assertNotIn('A2', index)
+                self.assertEqual(index.query({'pan': 'ABCDE1234F'}), [])
+                self.assertEqual(index.query({'pan': 'ZZZZZ9999Z'})[0]['record'],
+                                 {'name': 'Rahul Kumar', 'pan': 'ZZZZZ9999Z'})
+                self.assertEqual(index.query({'name': 'Priya Shah'}), [])
+
+            with self.assertRaises(ValueError):
+                IdentityIndex(path, bands=16)
+
+
+PIPELINE_IDENTITY_INDEX = os.path.join(os.path.dirname(settings.BASE_DIR), 'consumer_analysis_pipeline',
+                                       'identity_index.py')
+
+
+class SharedIdentityIndexTests(SimpleTestCase):
+
+    @skipUnless(os.path.exists(PIPELINE_IDENTITY_INDEX), 'consumer_analysis_pipeline not checked out')
+    def test_identical_to_the_pipeline_copy(self):
+        self.assertTrue(filecmp.cmp(identity_index.__file__, PIPELINE_IDENTITY_INDEX, shallow=False),
+                        f"{PIPELINE_IDENTITY_INDEX} differs from {identity_index.__file__}; change both")
+
+
+class DirectorCriminalIndexTests(SimpleTestCase):
+
+    def test_directors_looked_up_in_criminal_index(self):
+        criminal_index = IdentityIndex()
+        criminal_index.add_many([
+            ('C1', {'name': 'Suresh Verma', 'pan': 'ABCDE1234F', 'offense': 'Bank fraud', 'status': 'Convicted'}),
+            ('C2', {'name': 'Anil Mehta', 'offense': 'Cheating', 'status': 'Pending'}),
+        ])
+        directors = [{'name': 'S. Verma', 'pan': 'ABCDE1234F'}, {'name': 'Mehta Anil'}, {'name': 'Kiran Rao'}]
+
+        details = MSMESyntheticIdentityAnalyzer().analyze_msme_synthetic_risk(
+            {'business_name': 'Acme Traders'}, directors, criminal_index=criminal_index
+        )['checks']['director_criminal_history']
+
+        self.assertEqual((details['convicted_directors'], details['pending_cases']), (1, 1))
+        self.assertEqual([d['has_criminal_record'] for d in details['director_details']], [True, True, False])
+        self.assertNotIn('status', details)
+
+    def test_record_from_list_and_index_counted_once(self):
+        record = {'name': 'Suresh Verma', 'pan': 'ABCDE1234F', 'offense': 'Bank fraud', 'status': 'Convicted'}
+        criminal_index = IdentityIndex()
+        criminal_index.add('C1', record)
+
+        details = MSMESyntheticIdentityAnalyzer().analyze_msme_synthetic_risk(
+            {'business_name': 'Acme Traders'}, [{'name': 'Suresh Verma', 'pan': 'ABCDE1234F'}],
+            criminal_records=[dict(reversed(list(record.items()))), record], criminal_index=criminal_index
+        )['checks']['director_criminal_history']
+
+        self.assertEqual((details['financial_fraud_cases'], details['convicted_directors']), (1, 1))
+        self.assertEqual(details['director_details'][0]['financial_crimes'], 1)
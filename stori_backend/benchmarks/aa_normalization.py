@@ -0,0 +1,195 @@
+"""
+AA JSON normalization benchmark: nested-loop extraction + row-wise df.apply
+vs the compiled columnar normalizer
+
+Usage (from stori_backend/):
+    python -m benchmarks.aa_normalization                      # 50k transactions, 4 accounts
+    python -m benchmarks.aa_normalization --transactions 200000 --accounts 8
+    python -m benchmarks.aa_normalization --payload path/to/aa.json
+
+"Normalization" covers everything from the parsed payload to the typed
+DataFrame with amount_signed / debit / credit: AA extraction, deduplication,
+column aliasing and debit/credit derivation. Both paths must yield the same
+transactions.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.customer.bank_statement_analysis.aa_normalizer import normalize_aa_payload, normalize_column_aliases
+
+NARRATIONS = [
+    'UPI/P2M/SWIGGY/payment', 'NEFT-SALARY-ACME CORP', 'ATM WDL MUMBAI', 'IMPS received from RAHUL',
+    'POS AMAZON', 'ACH D- HDFC LOAN EMI', 'CASH DEP BRANCH', 'INT.PD', 'UPI/P2P/SENT/9876543210',
+    'REFUND FLIPKART', 'NACH-SIP-AXIS MF', 'BIL/ELECTRICITY/MSEDCL'
+]
+CATEGORIES = ['Transfer to', 'Salary', 'Cash Withdrawal', 'Transfer from', 'Shopping', 'EMI',
+              'Cash Deposit', 'Interest', 'Others', 'Refund', 'Investment', 'Bills']
+
+
+def synthetic_payload(transactions=50000, accounts=4, duplicate_ratio=0.02, seed=0):
+    """Multi-bank AA payload with a few duplicated transactions (overlapping fetches)"""
+    rng = np.random.default_rng(seed)
+    per_account = transactions // accounts
+    banks = {}
+    for a in range(accounts):
+        bank = f"Bank {a % 3}"
+        dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 540, per_account), unit='D')
+        picks = rng.integers(0, len(NARRATIONS), per_account)
+        amounts = np.round(rng.lognormal(7, 1.2, per_account), 2) * np.where(rng.random(per_account) < 0.1, -1, 1)
+        txns = [{
+            'amount': float(amounts[i]),
+            'balance': float(round(rng.uniform(0, 200000), 2)),
+            'transaction_date': f"{dates[i].date()} 10:{i % 60:02d}:00" if i % 5 == 0 else str(dates[i].date()),
+            'narration': f"{NARRATIONS[picks[i]]}/{i % 97}",
+            'category': CATEGORIES[picks[i]],
+        } for i in range(per_account)]
+        txns.extend(txns[:int(per_account * duplicate_ratio)])
+        account = {'account_number': f"00{a}12345", 'ifsc_code': f"BANK000{a}",
+                   'customer_info': {'holders': [{'name': 'Rahul Sharma'}]},
+                   'fraud_analysis': [{'transactions': txns}]}
+        banks.setdefault(bank, []).append(account)
+    return {'banks': [{'bank': bank, 'accounts': accts} for bank, accts in banks.items()]}
+
+
+def legacy_extract(data):
+    """extract_transactions_from_aa_format before the columnar normalizer"""
+    transactions, seen = [], set()
+    for bank in data.get('banks', []):
+        bank_name = bank.get('bank', 'Unknown Bank')
+        for account in bank.get('accounts', []):
+            account_num = account.get('account_number', '')
+            account_transactions = []
+            for fraud_item in account.get('fraud_analysis', []):
+                account_transactions.extend(fraud_item.get('transactions', []))
+            if not account_transactions:
+                account_transactions = account.get('transactions', [])
+            for txn in account_transactions:
+                txn_date = txn.get('transaction_date') or txn.get('date') or txn.get('transaction_timestamp', '')
+                if isinstance(txn_date, str) and ' ' in txn_date:
+                    txn_date = txn_date.split()[0]
+                key = (txn_date, txn.get('amount'), txn.get('narration', ''), txn.get('balance'), bank_name, account_num)
+                if key in seen:
+                    continue
+                seen.add(key)
+                amount = float(txn.get('amount', 0))
+                category = str(txn.get('category', '')).lower()
+                narration = str(txn.get('narration', ''))
+                debit = credit = 0.0
+                if any(c in category for c in ['debit', 'withdrawal', 'payment', 'expense', 'charge', 'fee',
+                                               'cash withdrawal', 'transfer to', 'interest paid', 'int.pd']):
+                    debit = abs(amount)
+                elif any(c in category for c in ['credit', 'deposit', 'salary', 'income', 'refund', 'cash deposit',
+                                                 'transfer from', 'transfer in', 'interest received', 'interest recd']):
+                    credit = abs(amount)
+                else:
+                    lower = narration.lower()
+                    if any(k in lower for k in ['paid', 'debit', 'withdrawal', 'payment', 'charge', 'fee', 'wdl', 'sent']):
+                        debit = abs(amount)
+                    elif any(k in lower for k in ['credit', 'deposit', 'salary', 'income', 'refund', 'received', 'credited', 'dep']):
+                        credit = abs(amount)
+                    elif amount < 0:
+                        debit = abs(amount)
+                    else:
+                        credit = abs(amount)
+                transactions.append({
+                    'date': txn_date, 'description': narration, 'debit': debit, 'credit': credit,
+                    'amount': max(debit, credit) if (debit > 0 or credit > 0) else abs(amount),
+                    'balance': float(txn.get('balance', 0)) if txn.get('balance') else 0.0,
+                    'category': category, 'account_id': f"{bank_name}_{account_num}", 'bank_name': bank_name
+                })
+    return transactions
+
+
+LEGACY_ALIASES = {
+    'date': ['date', 'transaction_date', 'txn_date', 'transactionDate', 'TransactionDate', 'Date', 'DATE'],
+    'description': ['description', 'narration', 'desc', 'nar', 'Description', 'Narration', 'remarks'],
+    'amount': ['amount', 'Amount', 'AMOUNT', 'transaction_amount', 'transactionAmount', 'amt'],
+    'balance': ['balance', 'Balance', 'BALANCE', 'current_balance', 'closing_balance'],
+    'debit': ['debit', 'Debit', 'DEBIT', 'amount_dr', 'dr', 'withdrawal'],
+    'credit': ['credit', 'Credit', 'CREDIT', 'amount_cr', 'cr', 'deposit'],
+    'category': ['category', 'Category', 'CATEGORY', 'type', 'Type', 'transaction_type'],
+}
+
+
+def legacy_normalize(data):
+    df = pd.DataFrame(legacy_extract(data)).reset_index(drop=True)
+    df = df.loc[:, ~df.columns.duplicated()]
+    for canonical, aliases in LEGACY_ALIASES.items():
+        col = next((c for c in aliases if c in df.columns), None)
+        if canonical not in df.columns and col:
+            df[canonical] = df[col]
+    df['debit'] = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
+    df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
+    df['amount_signed'] = df['credit'] - df['debit']
+    df['type'] = df['amount_signed'].apply(lambda x: 'DR' if x < 0 else 'CR')
+    df['account_id'] = df.apply(lambda row: f"{row.get('bank_name', 'Unknown')}_x", axis=1)
+    return df
+
+
+def new_normalize(data):
+    df, _, _ = normalize_aa_payload(data)
+    df = normalize_column_aliases(df)
+    df['debit'] = pd.to_numeric(df['debit'], errors='coerce').fillna(0)
+    df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
+    df['amount_signed'] = df['credit'] - df['debit']
+    df['type'] = np.where(df['amount_signed'] < 0, 'DR', 'CR')
+    df['account_id'] = df['bank_name'].astype(str) + '_x'
+    return df
+
+
+def timed(fn, payload, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(payload)
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=50000)
+    parser.add_argument('--accounts', type=int, default=4)
+    parser.add_argument('--payload', help='AA JSON file instead of the synthetic payload')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload) as f:
+            payload = json.load(f)
+    else:
+        payload = synthetic_payload(args.transactions, args.accounts)
+
+    total = sum(len(fa['transactions']) for b in payload['banks'] for a in b['accounts']
+                for fa in a.get('fraud_analysis', [])) or sum(
+        len(a.get('transactions', [])) for b in payload['banks'] for a in b['accounts'])
+    print(f"Payload: {total} transactions in "
+          f"{sum(len(b['accounts']) for b in payload['banks'])} accounts\n")
+
+    _, extract_legacy_ms = timed(legacy_extract, payload, args.repeats)
+    _, extract_new_ms = timed(normalize_aa_payload, payload, args.repeats)
+    legacy_df, legacy_ms = timed(legacy_normalize, payload, args.repeats)
+    new_df, new_ms = timed(new_normalize, payload, args.repeats)
+
+    print(f"{'stage':<28}{'legacy ms':>12}{'columnar ms':>14}{'speedup':>10}")
+    print(f"{'AA extraction + dedup':<28}{extract_legacy_ms:>12.1f}{extract_new_ms:>14.1f}"
+          f"{extract_legacy_ms / extract_new_ms:>9.1f}x")
+    print(f"{'full normalization':<28}{legacy_ms:>12.1f}{new_ms:>14.1f}{legacy_ms / new_ms:>9.1f}x")
+
+    columns = ['date', 'description', 'debit', 'credit', 'amount', 'balance', 'category', 'bank_name', 'type']
+    identical = legacy_df[columns].reset_index(drop=True).equals(new_df[columns].reset_index(drop=True))
+    print(f"\nRows: legacy {len(legacy_df)}, columnar {len(new_df)}; identical output: {identical}")
+
+
+if __name__ == '__main__':
+    main()
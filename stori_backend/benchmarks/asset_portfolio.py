@@ -0,0 +1,107 @@
+"""
+Asset analysis benchmark: per-portfolio calculate_analysis() vs one batch call
+
+Usage (from stori_backend/):
+    python -m benchmarks.asset_portfolio                  # 2000 portfolios
+    python -m benchmarks.asset_portfolio --portfolios 500 --holdings 5000
+
+Each synthetic portfolio holds up to --holdings demat/MF/FD/PF/other assets
+(already loaded, as AssetAnalyzer.load_from_aa_json leaves them). "per
+portfolio" calls calculate_analysis() once per portfolio, as the
+single-portfolio endpoint does; "batch" aggregates every portfolio with one
+portfolio_analyses() call without echoing the asset lists. "differs" counts
+portfolios whose analyses are not identical (asset lists aside).
+"""
+import argparse
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.customer.asset_analysis.analyzer import AssetAnalyzer
+from apps.customer.asset_analysis.holdings import portfolio_analyses
+
+# (type, subtypes) of the synthetic holdings
+ASSET_KINDS = [
+    ('STOCKS', ['NSE', 'BSE']),
+    ('MUTUAL_FUNDS', ['EQUITY_FUNDS', 'DEBT_FUNDS', 'LIQUID_FUNDS', 'ETF']),
+    ('FIXED_DEPOSIT', ['BANK_FD', 'CORPORATE_FD']),
+    ('GOLD', ['DIGITAL', 'ETF', 'SGB']),
+    ('PROVIDENT_FUND', ['EPF', 'PPF']),
+    ('NPS', ['NPS']),
+    ('CRYPTO', ['CRYPTO']),
+]
+
+
+def synthetic_portfolios(portfolios, max_holdings, seed=0):
+    """Per portfolio, asset dicts as AssetAnalyzer loads them"""
+    rng = np.random.default_rng(seed)
+    result = []
+    for _ in range(portfolios):
+        assets = []
+        for _ in range(int(rng.integers(1, max_holdings + 1))):
+            asset_type, subtypes = ASSET_KINDS[int(rng.choice(len(ASSET_KINDS), p=[.45, .35, .06, .05, .04, .03, .02]))]
+            current = round(float(rng.lognormal(10, 1.5)), 2)
+            invested = round(current / float(rng.uniform(0.7, 1.4)), 2)
+            asset = {
+                'type': asset_type,
+                'subtype': subtypes[int(rng.integers(len(subtypes)))],
+                'name': f'{asset_type} {len(assets)}',
+                'current_value': current,
+                'invested_value': invested,
+                'returns_pct': (current - invested) / invested * 100,
+            }
+            if asset_type == 'STOCKS':
+                asset['quantity'] = float(rng.integers(1, 500))
+                asset['ltp'] = round(current / asset['quantity'] * float(rng.uniform(0.95, 1.05)), 2)
+            assets.append(asset)
+        result.append(assets)
+    return result
+
+
+def per_portfolio(portfolios):
+    analyses = []
+    for assets in portfolios:
+        analyzer = AssetAnalyzer()
+        analyzer.assets = assets
+        analyses.append(analyzer.calculate_analysis())
+    return analyses
+
+
+def measure(fn, repeats):
+    """(result, median seconds)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--portfolios', type=int, default=2000)
+    parser.add_argument('--holdings', type=int, default=200)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    portfolios = synthetic_portfolios(args.portfolios, args.holdings)
+    n_holdings = sum(len(p) for p in portfolios)
+
+    single, single_s = measure(lambda: per_portfolio(portfolios), args.repeats)
+    batch, batch_s = measure(lambda: portfolio_analyses(portfolios, include_assets=False), args.repeats)
+
+    differs = sum({k: v for k, v in a.items() if k != 'assets'} != b for a, b in zip(single, batch))
+    print(f"{args.portfolios} portfolios, {n_holdings} holdings")
+    print(f"  per portfolio: {single_s:8.3f} s  ({single_s / args.portfolios * 1e6:9.1f} us/portfolio)")
+    print(f"  batch:         {batch_s:8.3f} s  ({batch_s / args.portfolios * 1e6:9.1f} us/portfolio)")
+    print(f"  speedup:       {single_s / batch_s:8.1f}x   differs: {differs}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Face match latency benchmark: in-memory embedding vs scratch-file pipeline
+
+Usage (from stori_backend/):
+    python -m benchmarks.face_match_latency --user selfie.jpg --document aadhaar.jpg
+    python -m benchmarks.face_match_latency            # synthetic images, no detector
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from apps.customer.ocr_analysis.face_match import FaceMatcher, embedding_cache
+
+
+def time_calls(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user', help='User selfie path (default: synthetic image)')
+    parser.add_argument('--document', help='Document image path (default: synthetic image)')
+    parser.add_argument('--model', default='Facenet512')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.user and args.document:
+        user_image, document_image = args.user, args.document
+        detector, enforce = 'retinaface', True
+    else:
+        rng = np.random.default_rng(42)
+        user_image = rng.integers(0, 255, size=(1200, 900, 3), dtype=np.uint8)
+        document_image = user_image.copy()
+        detector, enforce = 'skip', False
+
+    print("=" * 70)
+    print(f"FACE MATCH LATENCY - model={args.model}, detector={detector}, runs={args.runs}")
+    print("=" * 70)
+
+    for label, in_memory, cached in (('scratch_files', False, False),
+                                     ('in_memory', True, False),
+                                     ('in_memory_cached', True, True)):
+        matcher = FaceMatcher(args.model, detector, enforce_detection=enforce, in_memory=in_memory)
+        # Warm-up call loads the model weights
+        matcher.verify_faces(user_image, document_image, 'Benchmark')
+
+        def run():
+            if not cached:
+                embedding_cache.clear()
+            matcher.verify_faces(user_image, document_image, 'Benchmark')
+
+        timings = time_calls(run, args.runs)
+        print(f"{label:<18} median={statistics.median(timings):8.1f} ms  "
+              f"min={min(timings):8.1f} ms  max={max(timings):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+GST multi-period benchmark: per-return GSTAnalyzer loop vs columnar batch
+
+Usage (from stori_backend/):
+    python -m benchmarks.gst_periods                   # 2000 GSTINs x 36 months
+    python -m benchmarks.gst_periods --gstins 500 --months 60 --invoices 200
+
+Each synthetic GSTIN files a GSTR-1 (with up to --invoices invoices) and a
+GSTR-3B for most of --months months, with occasional skipped months and
+GSTR-1/3B differences. "per return" runs GSTAnalyzer.analyze_revenue /
+analyze_tax_compliance on one return at a time and builds the trend,
+reconciliation and gap features from Python lists (what a caller has to
+do today); "batch" is one analyze_gst_batch() call. "differs" counts GSTINs
+with a feature more than 0.01 apart.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.msme.gst_analysis.analyzer import GSTAnalyzer, analyze_gst_batch
+from apps.msme.gst_analysis.period_engine import MISMATCH_THRESHOLD_PCT
+
+START_PERIOD = 2021 * 12
+
+
+def synthetic_entries(gstins, months, max_invoices, seed=0):
+    """Per GSTIN, {'gstin', 'returns', 'filing_history'}"""
+    rng = np.random.default_rng(seed)
+    entries = []
+    for g in range(gstins):
+        level = float(rng.lognormal(13, 1))
+        returns, history = [], []
+        for m in range(months):
+            if rng.random() < 0.05:
+                history.append({'status': 'not_filed', 'days_delay': 0})
+                continue
+            period = f'{(START_PERIOD + m) % 12 + 1:02d}-{(START_PERIOD + m) // 12}'
+            n = int(rng.integers(1, max_invoices + 1))
+            values = np.round(rng.dirichlet(np.ones(n)) * level * float(rng.uniform(0.6, 1.4)), 2)
+            b2b = [{'taxable_value': float(v)} for v in values[: n // 2]]
+            b2c = [{'taxable_value': float(v)} for v in values[n // 2:]]
+            r1 = sum(v['taxable_value'] for v in b2b + b2c)
+            r3b = round(r1 * (1.0 if rng.random() < 0.8 else float(rng.uniform(0.8, 1.2))), 2)
+            returns.append({'return_type': 'gstr1', 'return_period': period, 'gst_data': {'b2b': b2b, 'b2c': b2c}})
+            returns.append({'return_type': 'gstr3b', 'return_period': period, 'gst_data': {
+                'taxable_turnover': r3b,
+                'total_tax_liability': round(r3b * 0.18, 2),
+                'total_tax_paid': round(r3b * 0.18 * float(rng.uniform(0.8, 1.0)), 2),
+                'itc_claimed': round(r3b * 0.1, 2),
+            }})
+            late = rng.random() < 0.2
+            history.append({'status': 'filed_late' if late else 'filed_on_time',
+                            'days_delay': int(rng.integers(1, 30)) if late else 0})
+        entries.append({'gstin': f'27AAAAA{g:04d}A1Z5', 'returns': returns, 'filing_history': history})
+    return entries
+
+
+def per_return_features(entry):
+    """The batch features, one GSTAnalyzer call per return plus Python lists"""
+    analyzer = GSTAnalyzer()
+    by_period = {}
+    liability = paid = 0
+    for gst_return in entry['returns']:
+        month, year = gst_return['return_period'].split('-')
+        period = int(year) * 12 + int(month) - 1
+        data = dict(gst_return['gst_data'], return_period=gst_return['return_period'])
+        revenue = analyzer.analyze_revenue(data)['monthly_revenue'][gst_return['return_period']]
+        by_period.setdefault(period, {})[gst_return['return_type']] = revenue
+        tax = analyzer.analyze_tax_compliance(data)
+        liability += tax['total_gst_liability']
+        paid += tax['total_gst_paid']
+
+    periods = sorted(by_period)
+    values = [by_period[p].get('gstr3b', by_period[p].get('gstr1')) for p in periods]
+    total = sum(values)
+    mean = total / len(values)
+    growth = {}
+    for name, k in (('mom_turnover_growth', 1), ('qoq_turnover_growth', 3), ('yoy_turnover_growth', 12)):
+        previous = sum(values[-2 * k:-k]) if len(values) >= 2 * k else 0
+        growth[name] = (sum(values[-k:]) - previous) / previous * 100 if previous > 0 else 0
+    both = [by_period[p] for p in periods if len(by_period[p]) == 2]
+    r1, r3b = sum(b['gstr1'] for b in both), sum(b['gstr3b'] for b in both)
+    gaps = [b - a - 1 for a, b in zip(periods, periods[1:])]
+    filing = analyzer.analyze_filing_regularity(entry['filing_history'], entry['gstin'])
+    return {
+        'total_turnover': total,
+        'avg_monthly_turnover': mean,
+        **growth,
+        'turnover_volatility': statistics.stdev(values) / mean * 100 if len(values) >= 3 and mean > 0 else 0,
+        'gstr1_3b_mismatch_pct': abs(r1 - r3b) / r3b * 100 if r3b > 0 else 0,
+        'mismatched_periods': sum(abs(b['gstr1'] - b['gstr3b']) / b['gstr3b'] * 100 > MISMATCH_THRESHOLD_PCT
+                                  for b in both),
+        'missing_periods': periods[-1] - periods[0] + 1 - len(periods),
+        'longest_filing_gap_months': max(gaps, default=0),
+        'gst_filing_regularity': filing['gst_filing_regularity'],
+        'avg_delay_days': filing['avg_delay_days'],
+        'outstanding_gst': liability - paid,
+    }
+
+
+def measure(fn, repeats):
+    """(result, median seconds)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gstins', type=int, default=2000)
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--invoices', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.gstins, args.months, args.invoices)
+    n_returns = sum(len(entry['returns']) for entry in entries)
+
+    loop, loop_s = measure(lambda: [per_return_features(entry) for entry in entries], args.repeats)
+    batch, batch_s = measure(lambda: analyze_gst_batch(entries, include_monthly=False), args.repeats)
+
+    differs = sum(
+        any(abs(round(value, 2) - result['features'][name]) > 0.01 for name, value in expected.items())
+        for expected, result in zip(loop, batch)
+    )
+    print(f"{args.gstins} GSTINs, {n_returns} returns")
+    print(f"  per return: {loop_s:8.3f} s  ({loop_s / n_returns * 1e6:7.1f} us/return)")
+    print(f"  batch:      {batch_s:8.3f} s  ({batch_s / n_returns * 1e6:7.1f} us/return)")
+    print(f"  speedup:    {loop_s / batch_s:8.1f}x   differs: {differs}")
+
+
+if __name__ == '__main__':
+    main()
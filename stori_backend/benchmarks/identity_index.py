@@ -0,0 +1,127 @@
+"""
+Identity index benchmark: IdentityIndex lookups vs the brute-force scan
+
+Usage (from stori_backend/):
+    python -m benchmarks.identity_index                    # 100k identities
+    python -m benchmarks.identity_index --identities 1000000 --path /tmp/identities.sqlite3
+
+About 5% of the synthetic applicants re-use part of an earlier identity
+(same person with a title and a typo, reordered name with a new phone,
+abbreviated address, new name on a shared device). "build" is one
+add_many() of every identity, "add" a single incremental insert into the
+full index; "query" is per applicant, "brute force" is match_records()
+over all identities for --brute-force of the queries. "differs" counts
+queries whose matches differ from the brute-force ones.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.msme.analyzers.identity_index import IdentityIndex, match_records
+
+SYLLABLES = ['ra', 'hu', 'la', 'pri', 'ya', 'su', 're', 'sh', 'an', 'ki', 'ta', 'vi', 'ja', 'de', 'mo', 'han',
+             'ku', 'mar', 'si', 'ng', 'pa', 'tel', 'na', 'ir', 'ga', 'ne', 'sa', 'ro', 'ha', 'ni', 'ma', 'li',
+             'ka', 'ru', 'bh', 'av', 'ar', 'jun']
+STREET_KINDS = ['Road', 'Main Road', 'Street', 'Cross', 'Nagar', 'Colony', 'Lane', 'Sector 4']
+CITIES = ['Bengaluru', 'Mumbai', 'Pune', 'Delhi', 'Chennai', 'Hyderabad', 'Kolkata', 'Jaipur', 'Noida', 'Indore']
+
+
+def synthetic_identities(n, seed=0):
+    """(record_id, record) pairs"""
+    rng = np.random.default_rng(seed)
+
+    def word(k):
+        return ''.join(SYLLABLES[i] for i in rng.integers(0, len(SYLLABLES), k)).capitalize()
+
+    firsts = [word(2) for _ in range(3000)]
+    lasts = [word(int(rng.integers(2, 4))) for _ in range(2000)]
+    streets = [f'{word(2)} {word(2)} {STREET_KINDS[int(rng.integers(len(STREET_KINDS)))]}' for _ in range(5000)]
+
+    def name():
+        return f'{firsts[int(rng.integers(len(firsts)))]} {lasts[int(rng.integers(len(lasts)))]}'
+
+    records = []
+    for i in range(n):
+        if records and rng.random() < 0.05:
+            base = records[int(rng.integers(len(records)))][1]
+            record = dict(base)
+            kind = int(rng.integers(4))
+            if kind == 0:
+                cut = int(rng.integers(1, len(base['name']) - 1))
+                record['name'] = 'Mr. ' + base['name'][:cut] + base['name'][cut + 1:]
+            elif kind == 1:
+                record['name'] = ' '.join(reversed(base['name'].split()))
+                record['phone'] = str(int(rng.integers(6e9, 1e10)))
+            elif kind == 2:
+                record['address'] = base['address'].replace('Road', 'Rd').replace(',', '')
+                record['pan'] = None
+            else:
+                record['name'] = name()
+            record['device_id'] = f'dev-{int(rng.integers(n))}'
+        else:
+            record = {
+                'name': name(),
+                'address': f'{int(rng.integers(1, 999))}, {streets[int(rng.integers(len(streets)))]}, '
+                           f'{CITIES[int(rng.integers(len(CITIES)))]} {int(rng.integers(110000, 860000))}',
+                'phone': str(int(rng.integers(6e9, 1e10))),
+                'pan': f'{word(3).upper()[:5]:A<5}{int(rng.integers(1000, 9999))}F',
+                'device_id': f'dev-{i}',
+            }
+        records.append((f'APP-{i}', record))
+    return records
+
+
+def timed(fn):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--identities', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--brute-force', type=int, default=20)
+    parser.add_argument('--path', default=':memory:', help='SQLite file (must not exist yet)')
+    args = parser.parse_args()
+
+    records = synthetic_identities(args.identities + 1)
+    new_id, new_record = records.pop()
+    rng = np.random.default_rng(1)
+    queries = [records[i] for i in rng.integers(0, len(records), args.queries)]
+
+    with IdentityIndex(args.path) as index:
+        _, build_s = timed(lambda: index.add_many(records))
+        _, add_s = timed(lambda: index.add(new_id, new_record))
+
+        query_times, results = [], []
+        for record_id, record in queries:
+            matches, seconds = timed(lambda: index.query(record, exclude=record_id))
+            results.append(matches)
+            query_times.append(seconds)
+
+        brute = [timed(lambda: match_records(record, records, exclude=record_id))
+                 for record_id, record in queries[:args.brute_force]]
+        differs = sum(matches != expected for matches, (expected, _) in zip(results, brute))
+
+    p50, p95 = np.percentile(query_times, [50, 95])
+    brute_s = statistics.median(seconds for _, seconds in brute)
+    print(f"{args.identities} identities, {args.queries} queries, "
+          f"{sum(map(len, results)) / len(results):.2f} matches/query")
+    print(f"  build:       {build_s:8.2f} s  ({build_s / len(records) * 1e6:7.1f} us/identity)")
+    print(f"  add:         {add_s * 1e3:8.2f} ms")
+    print(f"  query:       {p50 * 1e3:8.2f} ms p50, {p95 * 1e3:.2f} ms p95")
+    print(f"  brute force: {brute_s * 1e3:8.2f} ms median")
+    print(f"  speedup:     {brute_s / p50:8.1f}x   differs: {differs}/{len(brute)}")
+
+
+if __name__ == '__main__':
+    main()
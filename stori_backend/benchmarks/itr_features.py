@@ -0,0 +1,93 @@
+"""
+ITR feature benchmark: per-applicant extraction vs one batch call
+
+Usage (from stori_backend/):
+    python -m benchmarks.itr_features                  # 20000 applicants
+    python -m benchmarks.itr_features --applicants 5000 --years 5
+
+Each synthetic applicant has 1..--years standardized ITRs (as returned by
+load_itr_json). "per applicant" calls extract_itr_features_multi_year()
+once per applicant, as the single-applicant endpoints do; "batch" scores
+everyone with one extract_itr_features_batch() call. "differs" counts
+applicants whose feature dicts are not identical.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.customer.itr_analysis.analyzer import extract_itr_features_batch, extract_itr_features_multi_year
+
+
+def synthetic_bundles(applicants, max_years, seed=0):
+    """Per applicant, standardized ITR dicts sorted newest first"""
+    rng = np.random.default_rng(seed)
+    bundles = []
+    for _ in range(applicants):
+        n_years = int(rng.integers(1, max_years + 1))
+        base = float(rng.lognormal(13.5, 0.6))
+        salaried = rng.random() < 0.6
+        years = []
+        for k in range(n_years):
+            income = round(base * (1 + rng.normal(0.08, 0.1)) ** -k, 2)
+            years.append({
+                'assessment_year': f'{2025 - k}-{26 - k}',
+                'filing_date': f'{2024 - k}-0{7 + int(rng.integers(0, 3))}-{int(rng.integers(10, 29))}',
+                'due_date': f'{2024 - k}-07-31',
+                'income': {
+                    'net_taxable_income': income,
+                    'gross_total_income': round(income * 1.15, 2),
+                    'salary_income': round(income * 0.95, 2) if salaried else 0.0,
+                    'business_income': 0.0 if salaried else income,
+                    'house_property_income': 0.0,
+                    'capital_gains': float(rng.choice([0.0, 25000.0])),
+                    'other_income': round(income * 0.02, 2),
+                },
+                'deductions': {'total_deductions': min(150000.0, round(income * 0.1, 2))},
+                'tax': {'tax_paid': round(income * 0.08, 2), 'tds_deducted': round(income * 0.07, 2) if salaried else 0.0,
+                        'tax_outstanding': float(rng.choice([0.0, 0.0, 0.0, 5000.0])), 'tax_refund': 0.0},
+                'filing_status': {'filed': bool(rng.random() < 0.97), 'revised': bool(rng.random() < 0.05),
+                                  'assessment_pending': False},
+            })
+        bundles.append(years)
+    return bundles
+
+
+def measure(fn, repeats):
+    """(result, median seconds)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--applicants', type=int, default=20000)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    bundles = synthetic_bundles(args.applicants, args.years)
+    n_years = sum(len(b) for b in bundles)
+
+    single, single_s = measure(lambda: [extract_itr_features_multi_year(b) for b in bundles], args.repeats)
+    batch, batch_s = measure(lambda: extract_itr_features_batch(bundles, multi_year=True), args.repeats)
+
+    differs = sum(a != b for a, b in zip(single, batch))
+    print(f"{args.applicants} applicants, {n_years} ITR years")
+    print(f"  per applicant: {single_s:8.3f} s  ({single_s / args.applicants * 1e6:7.1f} us/applicant)")
+    print(f"  batch:         {batch_s:8.3f} s  ({batch_s / args.applicants * 1e6:7.1f} us/applicant)")
+    print(f"  speedup:       {single_s / batch_s:8.1f}x   differs: {differs}")
+
+
+if __name__ == '__main__':
+    main()
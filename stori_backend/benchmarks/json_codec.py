@@ -0,0 +1,142 @@
+"""
+JSON codec benchmark: DRF JSONParser/JSONRenderer vs the orjson codec
+
+Usage (from stori_backend/):
+    python -m benchmarks.json_codec                       # 50k AA transactions
+    python -m benchmarks.json_codec --transactions 200000 --repeats 3
+
+For each endpoint's typical payload it measures request parsing, response
+rendering (including numpy/pandas values in the features) and the peak
+memory of both (tracemalloc), plus whole-document vs streamed rendering of
+a stored bank statement result with its transaction list.
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+import tracemalloc
+
+import django
+import numpy as np
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.aa_normalization import synthetic_payload
+from config.json_codec import ORJSONParser, ORJSONRenderer, iter_json
+
+
+def bureau_payload(accounts=400, enquiries=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'bureau': 'CIBIL', 'score': 742,
+        'accounts': [{
+            'account_type': ['Credit Card', 'Personal Loan', 'Home Loan', 'Auto Loan'][i % 4],
+            'sanctioned_amount': float(rng.integers(10000, 5000000)),
+            'current_balance': float(rng.integers(0, 500000)),
+            'date_opened': f"20{10 + i % 14}-0{1 + i % 9}-15",
+            'payment_history': [{'month': f"2024-{m:02d}", 'dpd': int(rng.integers(0, 3))} for m in range(1, 13)],
+        } for i in range(accounts)],
+        'enquiries': [{'date': f"2024-0{1 + i % 9}-01", 'purpose': 'Personal Loan', 'amount': 100000.0}
+                      for i in range(enquiries)],
+    }
+
+
+def gst_payload(returns=36, invoices=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'gstin': '27ABCDE1234F1Z5',
+        'returns': [{
+            'period': f"{1 + r % 12:02d}20{22 + r // 12}", 'return_type': 'GSTR-3B',
+            'taxable_value': float(rng.uniform(1e5, 1e7)), 'igst': float(rng.uniform(0, 1e5)),
+            'invoices': [{'number': f"INV{r}-{i}", 'value': float(rng.uniform(100, 100000)),
+                          'counterparty': f"29XYZAB{i % 500:04d}C1Z2"} for i in range(invoices)],
+        } for r in range(returns)],
+    }
+
+
+def analysis_response(features=400, months=24, seed=0):
+    """Response of an analysis view: numpy feature values and monthly arrays"""
+    rng = np.random.default_rng(seed)
+    return {
+        'success': True, 'message': 'Analysis complete',
+        'data': {
+            'features': {f"feature_{i}": np.float64(rng.normal()) for i in range(features)},
+            'monthly': {f"series_{i}": rng.normal(size=months) for i in range(20)},
+            'counts': {f"count_{i}": np.int64(i) for i in range(100)},
+        },
+    }
+
+
+def stored_result(transactions):
+    """BankStatementAnalysisResult as returned by the result endpoint"""
+    return {'success': True, 'data': {
+        'features': {f"feature_{i}": float(i) for i in range(200)},
+        'transactions': [{
+            'date': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", 'description': f"UPI/P2M/MERCHANT/{i % 997}",
+            'debit': float(i % 5000), 'credit': 0.0, 'balance': 150000.0 - i, 'category': 'Shopping',
+        } for i in range(transactions)],
+    }}
+
+
+def measure(fn, repeats):
+    """(median ms, peak MiB)"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak / 2 ** 20
+
+
+def row(label, legacy, fast):
+    print(f"{label:<34}{legacy[0]:>10.1f}{fast[0]:>10.1f}{legacy[0] / fast[0]:>8.1f}x"
+          f"{legacy[1]:>10.1f}{fast[1]:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=50000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        'bank-statement/analyze-json': synthetic_payload(args.transactions),
+        'credit-report/analyze-json': bureau_payload(),
+        'gst/analyze': gst_payload(),
+    }
+
+    print(f"{'':<34}{'DRF ms':>10}{'orjson ms':>10}{'speedup':>9}{'DRF MiB':>10}{'orjson MiB':>12}")
+    for endpoint, payload in payloads.items():
+        body = JSONRenderer().render(payload)
+        print(f"{endpoint} ({len(body) / 2 ** 20:.1f} MiB body)")
+        row('  parse request',
+            measure(lambda: JSONParser().parse(io.BytesIO(body)), args.repeats),
+            measure(lambda: ORJSONParser().parse(io.BytesIO(body)), args.repeats))
+
+    response = analysis_response()
+    print('analysis response (400 numpy features, 20 monthly arrays)')
+    row('  render response',
+        measure(lambda: JSONRenderer().render(response), args.repeats),
+        measure(lambda: ORJSONRenderer().render(response), args.repeats))
+
+    result = stored_result(args.transactions)
+    print(f"bank-statement/{{id}}/result ({args.transactions} transactions)")
+    row('  DRF whole vs orjson streamed',
+        measure(lambda: JSONRenderer().render(result), args.repeats),
+        measure(lambda: sum(len(chunk) for chunk in iter_json(result)), args.repeats))
+    row('  orjson whole vs streamed',
+        measure(lambda: ORJSONRenderer().render(result), args.repeats),
+        measure(lambda: sum(len(chunk) for chunk in iter_json(result)), args.repeats))
+
+
+if __name__ == '__main__':
+    main()
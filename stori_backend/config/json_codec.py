@@ -0,0 +1,239 @@
+"""
+Fast JSON codec for DRF
+
+AA bank statements, bureau reports and GST returns arrive as multi-megabyte
+JSON, and analysis responses carry large nested feature dicts and
+transaction lists. When orjson is installed (settings.FAST_JSON) the
+parser and renderer below replace DRF's stdlib-based JSONParser and
+JSONRenderer:
+
+- ORJSONParser: parses the request body in one C call
+- ORJSONRenderer: serializes numpy arrays/scalars, pandas values,
+  datetimes, Decimals and UUIDs natively (no per-value float(...) needed)
+- StreamingJSONResponse: emits large 'transactions' arrays in chunks
+  instead of building the whole document in memory
+
+Without orjson everything falls back to the stdlib json module with DRF's
+encoder (numpy/pandas support included), only slower.
+"""
+import json
+import math
+import datetime
+import decimal
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.functional import Promise
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Arrays under these keys are streamed in batches by StreamingJSONResponse
+STREAM_KEYS = ('transactions',)
+STREAM_CHUNK_BYTES = 64 * 1024
+STREAM_BATCH_ITEMS = 500
+
+if ORJSON_AVAILABLE:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def default(obj):
+    """
+    Serialize values orjson (or the stdlib) does not handle natively
+
+    Mirrors rest_framework.utils.encoders.JSONEncoder for Django/stdlib
+    types and adds pandas/numpy values; NaN/NaT/NA become null.
+    """
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        representation = obj.isoformat()
+        return representation[:-6] + 'Z' if representation.endswith('+00:00') else representation
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('list')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):  # Series, Index, object/datetime ndarrays
+        return obj.tolist()
+    if hasattr(obj, '__getitem__') and hasattr(obj, 'keys'):
+        return dict(obj)
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class _StdlibEncoder(JSONEncoder):
+    """DRF's encoder plus the numpy/pandas handling of default()"""
+
+    def default(self, obj):
+        if isinstance(obj, (np.generic, pd.Timestamp, pd.DataFrame)) or obj is pd.NaT or obj is pd.NA:
+            return default(obj)
+        return super().default(obj)
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        option = ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(
+        data, cls=_StdlibEncoder, ensure_ascii=False, indent=2 if indent else None,
+        separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
+
+
+class ORJSONParser(BaseParser):
+    """Parses JSON request bodies with orjson"""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return loads(stream.read())
+        except ValueError as exc:  # orjson.JSONDecodeError subclasses ValueError
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renders responses with orjson
+
+    Honours the `indent` media type parameter DRF's JSONRenderer accepts
+    (orjson only supports two-space indentation).
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = False
+        if accepted_media_type:
+            params = dict(
+                param.strip().split('=', 1) for param in accepted_media_type.split(';')[1:] if '=' in param
+            )
+            indent = params.get('indent', '0').isdigit() and int(params.get('indent', '0')) > 0
+        return dumps(data, indent=indent)
+
+
+def iter_json(data, stream_keys: Iterable[str] = STREAM_KEYS,
+              chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Encode `data` as JSON in chunks of roughly `chunk_bytes`
+
+    Dicts and lists on the path to a list stored under one of
+    `stream_keys` are written member by member and the list itself in
+    batches of STREAM_BATCH_ITEMS; everything else is encoded in one piece. Concatenating the chunks
+    gives the same document as dumps(data).
+    """
+    stream_keys = frozenset(stream_keys)
+    buffer, size = [], 0
+
+    def contains_stream(value):
+        if isinstance(value, dict):
+            return any(
+                (key in stream_keys and isinstance(item, list)) or contains_stream(item)
+                for key, item in value.items()
+            )
+        return isinstance(value, list) and any(contains_stream(item) for item in value)
+
+    def pieces(value, streamed=False):
+        if streamed:
+            # Encode a batch of items at a time and drop the batch's brackets
+            yield b'['
+            for start in range(0, len(value), STREAM_BATCH_ITEMS):
+                yield (b',' if start else b'') + dumps(value[start:start + STREAM_BATCH_ITEMS])[1:-1]
+            yield b']'
+        elif isinstance(value, list) and contains_stream(value):
+            yield b'['
+            for i, item in enumerate(value):
+                if i:
+                    yield b','
+                yield from pieces(item)
+            yield b']'
+        elif isinstance(value, dict) and contains_stream(value):
+            yield b'{'
+            for i, (key, item) in enumerate(value.items()):
+                yield (b',' if i else b'') + dumps(str(key)) + b':'
+                yield from pieces(item, key in stream_keys and isinstance(item, list))
+            yield b'}'
+        else:
+            yield dumps(value)
+
+    for piece in pieces(data):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """JSON response whose transaction arrays are streamed via iter_json()"""
+
+    def __init__(self, data, status=200, stream_keys: Iterable[str] = STREAM_KEYS, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(iter_json(data, stream_keys), status=status, **kwargs)
+
+
+def count_streamed_items(data, stream_keys: Iterable[str] = STREAM_KEYS) -> int:
+    """Total length of the lists under `stream_keys` in a response payload"""
+    if isinstance(data, dict):
+        return sum(
+            len(value) if key in stream_keys and isinstance(value, list) else count_streamed_items(value, stream_keys)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return sum(count_streamed_items(item, stream_keys) for item in data)
+    return 0
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """
+    Response for payloads that may carry large transaction lists
+
+    Streams when the payload holds more than settings.JSON_STREAM_MIN_ITEMS
+    transactions, otherwise returns a regular DRF Response (content
+    negotiation, browsable API) so small responses are unchanged.
+    """
+    threshold = getattr(settings, 'JSON_STREAM_MIN_ITEMS', 5000)
+    if threshold and count_streamed_items(data) > threshold:
+        return StreamingJSONResponse(data, status=status)
+    return Response(data, status=status)
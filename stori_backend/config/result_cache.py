@@ -0,0 +1,481 @@
+"""
+Content-addressed cache for analysis results
+
+The same AA bank JSON, credit report, ITR or KYC image is often submitted
+several times for one application (re-runs, manual review, rescoring).
+Analysis views look up their successful response by a hash of:
+
+- the canonical input (JSON with sorted keys, or raw file bytes)
+- the source code of the modules that produce the result
+- a model/config version string and RESULT_CACHE['VERSION']
+
+so any change to the input, the analyzer code or the model invalidates
+the entry automatically.
+
+Backends (settings.RESULT_CACHE['BACKEND']):
+- 'memory': per-process LRU
+- 'filesystem': JSON files under LOCATION, shared by workers on one host
+- 'redis': any Redis-compatible server at REDIS_URL, shared by all hosts
+- 'none': caching disabled
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import importlib
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'BACKEND': 'memory',
+    'TTL': 24 * 60 * 60,
+    'MAX_ENTRIES': 512,
+    'LOCATION': None,
+    'REDIS_URL': 'redis://localhost:6379/1',
+    'KEY_PREFIX': 'stori:result:',
+    'VERSION': '1',
+}
+
+# Query parameter that forces recomputation (and refreshes the entry)
+REFRESH_PARAM = 'refresh'
+
+# Response fields holding the time the analysis ran; restamped on a hit so
+# a cached body never reports when it was first computed
+TIMESTAMP_FIELDS = ('analysis_date', 'processed_at')
+
+
+def content_hash(*parts) -> str:
+    """
+    Hash request content in a representation-independent way
+
+    Bytes are hashed as-is; anything else is serialized as canonical JSON
+    (sorted keys, no whitespace), so key order and formatting of the
+    submitted JSON do not change the hash.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, (bytes, bytearray, memoryview)):
+            part = json.dumps(part, sort_keys=True, separators=(',', ':'),
+                              ensure_ascii=False, cls=JSONEncoder).encode('utf-8')
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint(modules: tuple) -> str:
+    """
+    Hash the source files of the given modules (dotted names)
+
+    Computed once per process; deploying changed analyzer code yields new keys.
+    """
+    digest = hashlib.sha256()
+    for name in modules:
+        module = importlib.import_module(name)
+        path = getattr(module, '__file__', None)
+        digest.update(name.encode('utf-8'))
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _encode(entry: Dict) -> bytes:
+    return json.dumps(entry, cls=JSONEncoder, ensure_ascii=False).encode('utf-8')
+
+
+def _decode(raw: bytes) -> Dict:
+    return json.loads(raw)
+
+
+def restamp(data, fields: Iterable[str], now=None):
+    """
+    Replace the string values of the given keys (at any depth) with the current time
+
+    The stored format is kept: a date ('2024-01-15'), ISO 8601
+    ('2024-01-15T10:00:00+00:00') or str(datetime) ('2024-01-15 10:00:00+00:00').
+    """
+    fields = frozenset(fields)
+    now = now or timezone.now()
+
+    def stamp(old: str) -> str:
+        if len(old) == 10:
+            return now.date().isoformat()
+        return now.isoformat() if 'T' in old else str(now)
+
+    def walk(value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in fields and isinstance(item, str):
+                    value[key] = stamp(item)
+                else:
+                    walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(data)
+    return data
+
+
+class MemoryBackend:
+    """Thread-safe LRU with per-entry expiry (one copy per worker process)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 512, **kwargs):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, raw = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return raw
+
+    def set(self, key: str, raw: bytes, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, raw)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FileSystemBackend:
+    """
+    One file per entry under a directory, shared by all workers on a host
+
+    An entry expires at the 'expires_at' time stored in it by
+    ResultCache.set() (creation + TTL) and is deleted when read after that;
+    the least recently written files are removed once the directory holds
+    more than max_entries.
+    """
+
+    name = 'filesystem'
+
+    def __init__(self, location: str, max_entries: int = 512, **kwargs):
+        self.location = str(location)
+        self.max_entries = max_entries
+        os.makedirs(self.location, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.location, f"{key}.json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        entry = _decode(raw)
+        if entry.get('expires_at', 0) < time.time():
+            self.delete(key)
+            return None
+        return raw
+
+    def set(self, key: str, raw: bytes, ttl: int) -> None:
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.location, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.location) if e.name.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.location):
+            if entry.name.endswith('.json'):
+                self.delete(entry.name[:-len('.json')])
+
+    def __len__(self):
+        return sum(1 for e in os.scandir(self.location) if e.name.endswith('.json'))
+
+
+class RedisBackend:
+    """
+    Redis (or any server speaking its protocol) with native key expiry
+
+    Size is bounded with a sorted-set index of keys by insertion time.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str = None, max_entries: int = 512,
+                 key_prefix: str = 'stori:result:', client=None, **kwargs):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.max_entries = max_entries
+        self.key_prefix = key_prefix
+        self.index_key = f"{key_prefix}index"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.key_prefix + key)
+
+    def set(self, key: str, raw: bytes, ttl: int) -> None:
+        full_key = self.key_prefix + key
+        pipe = self.client.pipeline()
+        pipe.set(full_key, raw, ex=ttl)
+        pipe.zadd(self.index_key, {full_key: time.time()})
+        pipe.zcard(self.index_key)
+        size = pipe.execute()[-1]
+
+        if size > self.max_entries:
+            oldest = self.client.zrange(self.index_key, 0, size - self.max_entries - 1)
+            if oldest:
+                pipe = self.client.pipeline()
+                pipe.delete(*oldest)
+                pipe.zrem(self.index_key, *oldest)
+                pipe.execute()
+
+    def delete(self, key: str) -> None:
+        full_key = self.key_prefix + key
+        self.client.delete(full_key)
+        self.client.zrem(self.index_key, full_key)
+
+    def clear(self) -> None:
+        keys = self.client.zrange(self.index_key, 0, -1)
+        if keys:
+            self.client.delete(*keys)
+        self.client.delete(self.index_key)
+
+    def __len__(self):
+        return self.client.zcard(self.index_key)
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'filesystem': FileSystemBackend,
+    'redis': RedisBackend,
+}
+
+
+class ResultCache:
+    """Stores successful analysis responses by content key"""
+
+    def __init__(self, backend=None, ttl: int = DEFAULT_SETTINGS['TTL'],
+                 version: str = DEFAULT_SETTINGS['VERSION']):
+        """
+        Args:
+            backend: Backend instance (None disables caching)
+            ttl: Seconds an entry stays valid
+            version: Global version, bump to invalidate every entry
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.version = version
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def make_key(self, namespace: str, payload, code_modules: Iterable[str] = (),
+                 model_version: str = '') -> str:
+        """
+        Args:
+            namespace: Analysis name (e.g. 'bank_statement_json')
+            payload: Request content (JSON-serializable, bytes, or a tuple of those)
+            code_modules: Dotted names of modules whose source determines the result
+            model_version: Model / engine / config identifier
+        """
+        parts = payload if isinstance(payload, tuple) else (payload,)
+        fingerprint = code_fingerprint(tuple(code_modules))
+        return f"{namespace}:" + content_hash(
+            namespace, self.version, fingerprint, model_version, *parts
+        )[:40]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry ({'value', 'created_at'}) or None"""
+        if not self.enabled:
+            return None
+        try:
+            raw = self.backend.get(self._storage_key(key))
+        except Exception as e:
+            # A broken cache must never fail the analysis itself
+            self._count('errors')
+            logger.warning(f"Result cache read failed ({self.backend.name}): {str(e)}")
+            return None
+        self._count('hits' if raw is not None else 'misses')
+        return _decode(raw) if raw is not None else None
+
+    def set(self, key: str, value: Dict) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        entry = {'value': value, 'created_at': now, 'expires_at': now + self.ttl}
+        try:
+            self.backend.set(self._storage_key(key), _encode(entry), self.ttl)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Result cache write failed ({self.backend.name}): {str(e)}")
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['backend'] = self.backend.name if self.enabled else 'none'
+        stats['ttl'] = self.ttl
+        return stats
+
+    @staticmethod
+    def _storage_key(key: str) -> str:
+        # Namespaced keys contain ':' which is not portable in file names
+        return key.replace(':', '-')
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def build_result_cache(options: Dict) -> ResultCache:
+    """Create a ResultCache from a RESULT_CACHE-style settings dict"""
+    options = {**DEFAULT_SETTINGS, **options}
+    backend_name = (options['BACKEND'] or 'none').lower()
+
+    backend = None
+    if backend_name != 'none':
+        if backend_name not in BACKENDS:
+            raise ValueError(f"Unknown RESULT_CACHE backend '{backend_name}'. "
+                             f"Use one of: {', '.join(BACKENDS)}, none")
+        location = options['LOCATION'] or os.path.join(tempfile.gettempdir(), 'stori_result_cache')
+        backend = BACKENDS[backend_name](
+            location=location,
+            url=options['REDIS_URL'],
+            max_entries=options['MAX_ENTRIES'],
+            key_prefix=options['KEY_PREFIX'],
+        )
+
+    return ResultCache(backend=backend, ttl=options['TTL'], version=str(options['VERSION']))
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache configured from settings.RESULT_CACHE"""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                try:
+                    _result_cache = build_result_cache(getattr(settings, 'RESULT_CACHE', {}))
+                except Exception as e:
+                    logger.error(f"Result cache unavailable, analyses will not be cached: {str(e)}")
+                    _result_cache = ResultCache(backend=None)
+    return _result_cache
+
+
+def cached_response(
+    request,
+    namespace: str,
+    payload,
+    compute: Callable[[], Response],
+    code_modules: Iterable[str] = (),
+    model_version: str = '',
+    timestamp_fields: Iterable[str] = TIMESTAMP_FIELDS
+) -> Response:
+    """
+    Serve an analysis from the result cache, computing and storing it on a miss
+
+    Only successful (200, success=True) responses are stored. Every response
+    gets a 'cache' block: {'hit', 'key', 'backend', 'cached_at', 'age_seconds'}.
+    Pass ?refresh=true to recompute and overwrite the stored result. On a hit
+    the timestamp_fields are restamped with the current time.
+
+    Args:
+        request: DRF request (for the refresh flag)
+        namespace: Analysis name used as key prefix
+        payload: Request content that determines the result
+        compute: Runs the analysis and returns the Response
+        code_modules: Modules whose source code determines the result
+        model_version: Model / engine / config identifier
+        timestamp_fields: Response keys holding the analysis time
+
+    Returns:
+        Response
+    """
+    cache = get_result_cache()
+    if not cache.enabled:
+        return compute()
+
+    start = time.perf_counter()
+    key = cache.make_key(namespace, payload, code_modules, model_version)
+    refresh = str(request.query_params.get(REFRESH_PARAM, 'false')).lower() == 'true'
+
+    entry = None if refresh else cache.get(key)
+    if entry is not None:
+        data = restamp(entry['value'], timestamp_fields)
+        data['cache'] = {
+            'hit': True,
+            'key': key,
+            'backend': cache.backend.name,
+            'cached_at': entry['created_at'],
+            'age_seconds': round(time.time() - entry['created_at'], 1),
+            'lookup_ms': round((time.perf_counter() - start) * 1000, 2)
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    response = compute()
+    data = response.data
+    if response.status_code == status.HTTP_200_OK and isinstance(data, dict) and data.get('success'):
+        cache.set(key, data)
+        data['cache'] = {'hit': False, 'key': key, 'backend': cache.backend.name, 'refreshed': refresh}
+    return response
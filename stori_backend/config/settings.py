@@ -5,6 +5,7 @@ Django settings for STORI NBFC Backend project.
 from pathlib import Path
 from decouple import config
 import os
+import importlib.util
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -156,6 +157,12 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# orjson parser/renderer for DRF (falls back to DRF's stdlib JSON when orjson is missing)
+FAST_JSON = config('FAST_JSON', default=True, cast=bool) and importlib.util.find_spec('orjson') is not None
+
+# Responses with more transactions than this are streamed (0 disables streaming)
+JSON_STREAM_MIN_ITEMS = config('JSON_STREAM_MIN_ITEMS', default=5000, cast=int)
+
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -170,10 +177,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'config.json_codec.ORJSONRenderer' if FAST_JSON else 'rest_framework.renderers.JSONRenderer',
     ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),  # Browsable API only in DEBUG mode
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'config.json_codec.ORJSONParser' if FAST_JSON else 'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
@@ -231,6 +238,24 @@ ANALYSIS_SETTINGS = {
     'OUTPUT_DIR': BASE_DIR / 'analysis_output',
 }
 
+# Load face recognition models when each worker starts
+FACE_MATCH_WARMUP = config('FACE_MATCH_WARMUP', default=False, cast=bool)
+
+# KYC OCR: initialize engines at worker start, cap concurrent OCR calls per worker
+KYC_OCR_WARMUP = config('KYC_OCR_WARMUP', default=False, cast=bool)
+KYC_OCR_MAX_CONCURRENCY = config('KYC_OCR_MAX_CONCURRENCY', default=2, cast=int)
+
+# Cache of analysis results keyed by input content + analyzer code/model version
+# BACKEND: memory (per process), filesystem (per host), redis (shared), none
+RESULT_CACHE = {
+    'BACKEND': config('RESULT_CACHE_BACKEND', default='memory'),
+    'TTL': config('RESULT_CACHE_TTL', default=24 * 60 * 60, cast=int),
+    'MAX_ENTRIES': config('RESULT_CACHE_MAX_ENTRIES', default=512, cast=int),
+    'LOCATION': config('RESULT_CACHE_LOCATION', default=str(BASE_DIR / 'result_cache')),
+    'REDIS_URL': config('RESULT_CACHE_REDIS_URL', default='redis://localhost:6379/1'),
+    'VERSION': config('RESULT_CACHE_VERSION', default='1'),
+}
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -0,0 +1,328 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.customer.credit_report_analysis.json_views import CreditReportJSONAnalysisView
+from .json_codec import ORJSONParser, ORJSONRenderer, dumps, iter_json, json_response
+from .result_cache import (
+    FileSystemBackend, MemoryBackend, RedisBackend, ResultCache, build_result_cache,
+    cached_response, code_fingerprint, content_hash
+)
+
+
+class FakeRedis:
+    """Just enough of the redis-py client for RedisBackend"""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.zsets.pop(key, None)
+
+    def zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update(mapping)
+
+    def zcard(self, name):
+        return len(self.zsets.get(name, {}))
+
+    def zrange(self, name, start, end):
+        members = sorted(self.zsets.get(name, {}).items(), key=lambda item: item[1])
+        members = [member for member, _ in members]
+        return members[start:] if end == -1 else members[start:end + 1]
+
+    def zrem(self, name, *members):
+        for member in members:
+            self.zsets.get(name, {}).pop(member, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def request(path='/api/analysis/', query=''):
+    req = APIRequestFactory().post(f"{path}?{query}" if query else path, {}, format='json')
+    req.query_params = req.GET
+    return req
+
+
+class ContentHashTests(SimpleTestCase):
+
+    def test_key_order_and_formatting_do_not_matter(self):
+        self.assertEqual(
+            content_hash({'a': 1, 'b': [1, 2, {'c': 'x'}]}),
+            content_hash({'b': [1, 2, {'c': 'x'}], 'a': 1})
+        )
+
+    def test_content_changes_the_hash(self):
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 2}))
+        self.assertNotEqual(content_hash(b'image-1'), content_hash(b'image-2'))
+
+    def test_code_and_model_version_change_the_key(self):
+        cache = ResultCache(MemoryBackend())
+        base = cache.make_key('itr', {'a': 1}, ('config.result_cache',), 'v1')
+
+        self.assertNotEqual(base, cache.make_key('itr', {'a': 1}, ('config.result_cache',), 'v2'))
+        self.assertNotEqual(base, cache.make_key('itr', {'a': 1}, ('config.exceptions',), 'v1'))
+        self.assertNotEqual(base, ResultCache(MemoryBackend(), version='2').make_key(
+            'itr', {'a': 1}, ('config.result_cache',), 'v1'))
+
+    def test_editing_a_listed_module_changes_the_key(self):
+        package = tempfile.mkdtemp()
+        path = os.path.join(package, 'fingerprinted_analyzer.py')
+        with open(path, 'w') as f:
+            f.write("THRESHOLD = 1\n")
+        sys.path.insert(0, package)
+        self.addCleanup(sys.path.remove, package)
+        self.addCleanup(sys.modules.pop, 'fingerprinted_analyzer', None)
+        self.addCleanup(code_fingerprint.cache_clear)
+
+        cache = ResultCache(MemoryBackend())
+        modules = ('config.result_cache', 'fingerprinted_analyzer')
+        base = cache.make_key('bank', {'a': 1}, modules)
+
+        with open(path, 'w') as f:
+            f.write("THRESHOLD = 2\n")
+        code_fingerprint.cache_clear()  # a deploy starts new processes
+        self.assertNotEqual(base, cache.make_key('bank', {'a': 1}, modules))
+
+
+class BackendTests(SimpleTestCase):
+
+    def backends(self):
+        location = tempfile.mkdtemp()
+        return [
+            MemoryBackend(max_entries=2),
+            FileSystemBackend(location=location, max_entries=2),
+            RedisBackend(client=FakeRedis(), max_entries=2),
+        ]
+
+    def test_round_trip_ttl_and_size_eviction(self):
+        for backend in self.backends():
+            with self.subTest(backend=backend.name):
+                cache = ResultCache(backend, ttl=60)
+                for i in range(3):
+                    cache.set(f"ns:{i}", {'success': True, 'n': i})
+                    time.sleep(0.01)  # distinct mtimes / scores
+
+                self.assertIsNone(cache.get('ns:0'))
+                self.assertEqual(cache.get('ns:2')['value'], {'success': True, 'n': 2})
+                self.assertEqual(len(backend), 2)
+
+                cache.clear()
+                self.assertIsNone(cache.get('ns:2'))
+
+    def test_expired_entries_are_misses(self):
+        for backend in self.backends()[:2]:
+            with self.subTest(backend=backend.name):
+                cache = ResultCache(backend, ttl=60)
+                cache.set('ns:old', {'success': True})
+                with mock.patch('config.result_cache.time.time', return_value=time.time() + 61):
+                    self.assertIsNone(cache.get('ns:old'))
+
+    def test_backend_errors_do_not_propagate(self):
+        backend = mock.Mock(name='backend')
+        backend.name = 'redis'
+        backend.get.side_effect = ConnectionError('down')
+        backend.set.side_effect = ConnectionError('down')
+        cache = ResultCache(backend)
+
+        self.assertIsNone(cache.get('ns:key'))
+        cache.set('ns:key', {'success': True})
+        self.assertEqual(cache.stats()['errors'], 2)
+
+    def test_build_from_settings(self):
+        self.assertFalse(build_result_cache({'BACKEND': 'none'}).enabled)
+        cache = build_result_cache({'BACKEND': 'filesystem', 'LOCATION': tempfile.mkdtemp(), 'TTL': 5})
+        self.assertEqual((cache.backend.name, cache.ttl), ('filesystem', 5))
+        with self.assertRaises(ValueError):
+            build_result_cache({'BACKEND': 'memcached'})
+
+
+class CachedResponseTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(MemoryBackend())
+        patcher = mock.patch('config.result_cache.get_result_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.compute = mock.Mock(side_effect=lambda: Response({'success': True, 'data': {'x': 1}}))
+
+    def call(self, payload, query=''):
+        return cached_response(request(query=query), 'test', payload, self.compute, ('config.result_cache',))
+
+    def test_second_call_is_served_from_cache(self):
+        first = self.call({'a': 1, 'b': 2})
+        second = self.call({'b': 2, 'a': 1})
+
+        self.assertEqual(self.compute.call_count, 1)
+        self.assertFalse(first.data['cache']['hit'])
+        self.assertTrue(second.data['cache']['hit'])
+        self.assertEqual(second.data['data'], {'x': 1})
+        self.assertEqual(first.data['cache']['key'], second.data['cache']['key'])
+
+    def test_refresh_recomputes(self):
+        self.call({'a': 1})
+        response = self.call({'a': 1}, query='refresh=true')
+
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertFalse(response.data['cache']['hit'])
+        self.assertTrue(response.data['cache']['refreshed'])
+
+    def test_failures_are_not_cached(self):
+        self.compute.side_effect = lambda: Response(
+            {'success': False, 'message': 'bad'}, status=status.HTTP_400_BAD_REQUEST
+        )
+        self.call({'a': 1})
+        response = self.call({'a': 1})
+
+        self.assertEqual(self.compute.call_count, 2)
+        self.assertNotIn('cache', response.data)
+
+    def test_hit_restamps_analysis_time(self):
+        self.compute.side_effect = lambda: Response({'success': True, 'data': {
+            'summary': {'analysis_date': '2024-01-15 10:00:00+00:00'},
+            'documents': [{'processed_at': '2024-01-15T10:00:00+00:00', 'issued': '2020-01-01'}],
+        }})
+        self.call({'a': 1})
+        later = datetime(2024, 3, 1, 9, 30, tzinfo=dt_timezone.utc)
+        with mock.patch('config.result_cache.timezone.now', return_value=later):
+            response = self.call({'a': 1})
+
+        self.assertTrue(response.data['cache']['hit'])
+        self.assertEqual(response.data['data'], {
+            'summary': {'analysis_date': '2024-03-01 09:30:00+00:00'},
+            'documents': [{'processed_at': '2024-03-01T09:30:00+00:00', 'issued': '2020-01-01'}],
+        })
+
+    def test_disabled_cache_always_computes(self):
+        self.cache.backend = None
+        self.call({'a': 1})
+        self.call({'a': 1})
+        self.assertEqual(self.compute.call_count, 2)
+
+
+class CreditReportCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(MemoryBackend())
+        patcher = mock.patch('config.result_cache.get_result_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, payload):
+        req = APIRequestFactory().post('/api/customer/credit-report/analyze-json/', payload, format='json')
+        force_authenticate(req, user=mock.Mock(is_authenticated=True))
+        return CreditReportJSONAnalysisView.as_view()(req)
+
+    def test_resubmission_skips_analysis(self):
+        report = {'score': 742, 'bureau': 'CIBIL', 'accounts': [], 'enquiries': []}
+        target = 'apps.customer.credit_report_analysis.json_views.extract_credit_features'
+        with mock.patch(target, return_value={'credit_score': 742}) as extract:
+            first = self.post(report)
+            second = self.post(dict(reversed(list(report.items()))))
+
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.data['cache']['hit'])
+        self.assertEqual(second.data['data']['features'], first.data['data']['features'])
+
+    def test_defaulted_report_date_is_restamped(self):
+        later = datetime(2024, 3, 1, 9, 30, tzinfo=dt_timezone.utc)
+        report = {'score': 742, 'bureau': 'CIBIL', 'accounts': [], 'enquiries': []}
+        self.post(report)
+        self.post({**report, 'report_date': '2024-01-15'})
+        with mock.patch('config.result_cache.timezone.now', return_value=later):
+            defaulted = self.post(report)
+            given = self.post({**report, 'report_date': '2024-01-15'})
+
+        self.assertTrue(defaulted.data['cache']['hit'] and given.data['cache']['hit'])
+        self.assertEqual(defaulted.data['data']['summary']['report_date'], '2024-03-01')
+        self.assertEqual(given.data['data']['summary']['report_date'], '2024-01-15')
+        self.assertEqual(defaulted.data['data']['summary']['analysis_date'], '2024-03-01 09:30:00+00:00')
+
+
+class JSONCodecTests(SimpleTestCase):
+
+    def test_numpy_and_pandas_values_render_natively(self):
+        rendered = ORJSONRenderer().render({
+            'income': np.float64(52000.5),
+            'months': np.int64(12),
+            'flags': np.array([True, False]),
+            'missing': np.nan,
+            'last_txn': pd.Timestamp('2024-03-31 10:00:00', tz='UTC'),
+            'no_date': pd.NaT,
+            'limit': Decimal('1500.25'),
+            'balances': pd.Series([1.0, 2.5]),
+            1: 'non-string key',
+        })
+
+        self.assertEqual(json.loads(rendered), {
+            'income': 52000.5, 'months': 12, 'flags': [True, False], 'missing': None,
+            'last_txn': '2024-03-31T10:00:00Z', 'no_date': None, 'limit': 1500.25,
+            'balances': [1.0, 2.5], '1': 'non-string key'
+        })
+
+    def test_indent_media_type_parameter(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO('{"naam": "राहुल"}'.encode())), {'naam': 'राहुल'})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"a": '))
+
+    def test_streamed_document_matches_full_encoding(self):
+        data = {
+            'success': True,
+            'data': [{'summary': {'n': 3}, 'transactions': [{'amount': np.float64(i)} for i in range(300)]}],
+        }
+        chunks = list(iter_json(data, chunk_bytes=512))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b''.join(chunks), dumps(data))
+
+    @override_settings(JSON_STREAM_MIN_ITEMS=100)
+    def test_only_large_transaction_lists_are_streamed(self):
+        small = json_response({'data': {'transactions': [{}] * 100}})
+        large = json_response({'data': {'transactions': [{}] * 101}})
+
+        self.assertIsInstance(small, Response)
+        self.assertIsInstance(large, StreamingHttpResponse)
+        self.assertEqual(len(json.loads(b''.join(large.streaming_content))['data']['transactions']), 101)